@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for fetch-my-weather.
+
+Run the suite with ``python -m benchmarks``, compare two result files with
+``python -m benchmarks.compare`` and time cold starts with
+``python -m benchmarks.import_time``.
+"""
@@ -0,0 +1,80 @@
+"""
+Compares two benchmark result files written by ``python -m benchmarks``.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json NEW.json [--threshold 1.10]
+
+Prints the median time of every benchmark in both files and the ratio
+new/baseline, and exits with status 1 if any ratio is above the threshold.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _load(path: str) -> dict[str, Any]:
+    results: dict[str, Any] = json.loads(Path(path).read_text(encoding="utf-8"))[
+        "results"
+    ]
+    return results
+
+
+def compare(
+    baseline: dict[str, Any], new: dict[str, Any], threshold: float
+) -> list[str]:
+    """
+    Prints a comparison table.
+
+    Args:
+        baseline: Results of the reference run, keyed by benchmark name.
+        new: Results of the run to check.
+        threshold: Ratio above which a benchmark counts as a regression.
+
+    Returns:
+        The names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(f"{'benchmark':<36}{'baseline us':>14}{'new us':>14}{'ratio':>8}")
+    for name in sorted(baseline.keys() & new.keys()):
+        before = baseline[name]["median_us"]
+        after = new[name]["median_us"]
+        ratio = after / before if before else float("inf")
+        marker = ""
+        if ratio > threshold:
+            regressions.append(name)
+            marker = "  slower"
+        elif ratio < 1 / threshold:
+            marker = "  faster"
+        print(f"{name:<36}{before:>14.2f}{after:>14.2f}{ratio:>8.2f}{marker}")
+    for name in sorted(baseline.keys() ^ new.keys()):
+        print(f"{name:<36}  (only in {'baseline' if name in baseline else 'new'})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare two fetch-my-weather benchmark result files.",
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("new")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.10,
+        help="new/baseline ratio that counts as a regression (default 1.10)",
+    )
+    args = parser.parse_args(argv)
+
+    regressions = compare(_load(args.baseline), _load(args.new), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Runs the bundled fake wttr.in in a child process, so the server doesn't compete
+with the code being measured for the GIL.
+"""
+
+import multiprocessing
+from types import TracebackType
+
+from fetch_my_weather.fake_server import FakeWttrServer
+
+
+def _serve(days: int, urls: "multiprocessing.Queue[str]") -> None:
+    """Runs the server in a child process until it is terminated."""
+    server = FakeWttrServer(days=days)
+    urls.put(server.base_url)
+    server.serve_forever()
+
+
+class FakeWttr:
+    """
+    Serves wttr.in-like responses on a free local port::
+
+        with FakeWttr() as server:
+            client = WeatherClient(base_url=server.base_url)
+    """
+
+    def __init__(self, days: int = 3) -> None:
+        """
+        Create the server; it starts when entering the ``with`` block.
+
+        Args:
+            days: Forecast days in the j1 payload.
+        """
+        self._days = days
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self.base_url = ""  # Set once the server is listening
+
+    def __enter__(self) -> "FakeWttr":
+        context = multiprocessing.get_context("spawn")
+        urls: multiprocessing.Queue[str] = context.Queue()
+        self._process = context.Process(
+            target=_serve, args=(self._days, urls), daemon=True
+        )
+        self._process.start()
+        self.base_url = urls.get(timeout=30)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
@@ -0,0 +1,103 @@
+"""
+Import-time benchmark for the fetch-my-weather package.
+
+Each scenario runs in a fresh interpreter, several times, and the median wall
+time is reported together with the heavy dependencies it ended up loading.
+"eager import" loads every public name, which is what ``import
+fetch_my_weather`` did before the package switched to lazy imports.
+
+Usage:
+    python -m benchmarks.import_time [--runs 15] [--json results.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+# Scenario name -> code to time, run after the interpreter has started
+SCENARIOS = {
+    "import": "import fetch_my_weather",
+    "eager import": (
+        "import fetch_my_weather\n"
+        "for name in fetch_my_weather.__all__:\n"
+        "    getattr(fetch_my_weather, name)"
+    ),
+    "first mock call": (
+        "import fetch_my_weather\n"
+        "fetch_my_weather.get_weather(location='Perth', use_mock=True)"
+    ),
+    "first offline moon call": (
+        "import fetch_my_weather\n"
+        "fetch_my_weather.get_weather(is_moon=True, format='text', offline_moon=True)"
+    ),
+}
+
+HEAVY_MODULES = ("requests", "pydantic", "numpy", "asyncio")
+
+_RUNNER = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile({code!r}, "<scenario>", "exec"))
+elapsed = time.perf_counter() - start
+loaded = [name for name in {modules!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def run_scenario(code: str, runs: int) -> dict[str, Any]:
+    """
+    Times a scenario in fresh interpreters.
+
+    Args:
+        code: The code to time.
+        runs: How many interpreters to start.
+
+    Returns:
+        The median and minimum time in milliseconds, and the heavy modules
+        that were loaded.
+    """
+    timings = []
+    loaded: list[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _RUNNER.format(code=code, modules=HEAVY_MODULES)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["seconds"] * 1000)
+        loaded = result["loaded"]
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "loaded": loaded,
+    }
+
+
+def main() -> None:
+    """Run every scenario and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15, help="runs per scenario")
+    parser.add_argument("--json", metavar="PATH", help="also write results here")
+    args = parser.parse_args()
+
+    results = {name: run_scenario(code, args.runs) for name, code in SCENARIOS.items()}
+
+    print(f"{'scenario':<26}{'median ms':>10}{'min ms':>10}  loaded")
+    for name, result in results.items():
+        loaded = ", ".join(result["loaded"]) or "-"
+        print(
+            f"{name:<26}{result['median_ms']:>10.1f}{result['min_ms']:>10.1f}  {loaded}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Benchmark suite for the fetch-my-weather hot paths.
+
+Everything runs offline: cache misses go to a local fake wttr.in over
+loopback (``fetch_my_weather.fake_server``, run in a child process), and the
+parse benchmarks use the same j1 payload of realistic size. Groups:
+
+- ``build_url``: URL construction for each kind of request
+- ``get_weather``: cache hits and misses for every format
+- ``parse``: JSON decoding and model validation of a 3-day j1 response
+- ``mock``: mock mode for every format
+- ``batch``: ``get_weather_many`` fan-out at 1, 10, 100 and 1000 workers
+
+Usage:
+    python -m benchmarks [--filter parse] [--quick] [--output results.json]
+
+Compare two result files with ``python -m benchmarks.compare``.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pydantic
+
+import fetch_my_weather
+from fetch_my_weather import codec
+from fetch_my_weather.batch import get_weather_many
+from fetch_my_weather.core import WeatherClient, _build_url
+from fetch_my_weather.fake_server import j1_payload
+from fetch_my_weather.models import (
+    LazyWeatherResponse,
+    TypedWeatherResponse,
+    WeatherResponse,
+    construct_trusted,
+)
+from fetch_my_weather.sqlite_cache import SQLiteCache
+
+from .fake_server import FakeWttr
+
+FORMATS = ("json", "raw_json", "text", "png")
+BATCH_SIZES = (1, 10, 100, 1000)
+
+Case = Callable[[], object]
+
+
+def _build_url_cases() -> dict[str, Case]:
+    return {
+        "build_url/json": lambda: _build_url(location="London", format="json"),
+        "build_url/text_options": lambda: _build_url(
+            location="New York", units="m", view_options="0q", lang="fr"
+        ),
+        "build_url/png": lambda: _build_url(
+            location="Paris", format="png", png_options="t"
+        ),
+        "build_url/moon": lambda: _build_url(
+            is_moon=True, moon_date="2025-04-13", moon_location_hint="Paris"
+        ),
+        "build_url/fields": lambda: _build_url(
+            location="Oslo", units="m", fields=["temperature", "humidity", "wind"]
+        ),
+    }
+
+
+def _get_weather_cases(cache_dir: Path, base_url: str) -> dict[str, Case]:
+    hit_client = WeatherClient(base_url=base_url)
+    miss_client = WeatherClient(cache_duration=0, base_url=base_url)
+    sqlite_client = WeatherClient(
+        cache=SQLiteCache(cache_dir / "bench.db"), base_url=base_url
+    )
+    cases: dict[str, Case] = {}
+    for fmt in FORMATS:
+        # Warm the caches so the hit benchmarks never go to the server
+        hit_client.get_weather(location="London", format=fmt)
+        sqlite_client.get_weather(location="London", format=fmt)
+        cases[f"get_weather/hit/{fmt}"] = lambda fmt=fmt: hit_client.get_weather(
+            location="London", format=fmt
+        )
+        cases[f"get_weather/hit_sqlite/{fmt}"] = lambda fmt=fmt: (
+            sqlite_client.get_weather(location="London", format=fmt)
+        )
+        cases[f"get_weather/miss/{fmt}"] = lambda fmt=fmt: miss_client.get_weather(
+            location="London", format=fmt
+        )
+    return cases
+
+
+def _missing_values(payload: dict[str, Any]) -> dict[str, Any]:
+    """Blanks some values the way wttr.in does when it has no data."""
+    payload = json.loads(json.dumps(payload))
+    payload["current_condition"][0]["uvIndex"] = ""
+    for day in payload["weather"]:
+        day["astronomy"][0]["moonrise"] = "No moonrise"
+        for hour in day["hourly"]:
+            hour["WindGustKmph"] = ""
+    return payload
+
+
+def _parse_cases() -> dict[str, Case]:
+    payload = j1_payload()
+    missing = _missing_values(payload)
+    text = json.dumps(payload, indent=4)
+    return {
+        "parse/codec_loads": lambda: codec.loads(text),
+        "parse/WeatherResponse": lambda: WeatherResponse.parse_obj(payload),
+        "parse/TypedWeatherResponse": lambda: TypedWeatherResponse.parse_obj(payload),
+        "parse/TypedWeatherResponse_missing": lambda: TypedWeatherResponse.parse_obj(
+            missing
+        ),
+        "parse/LazyWeatherResponse": lambda: LazyWeatherResponse.parse_obj(payload),
+        "parse/construct_trusted": lambda: construct_trusted(WeatherResponse, payload),
+    }
+
+
+def _mock_cases() -> dict[str, Case]:
+    client = WeatherClient(use_mock=True)
+    trusted = WeatherClient(use_mock=True, trusted=True)
+    cases: dict[str, Case] = {
+        f"mock/{fmt}": lambda fmt=fmt: client.get_weather(format=fmt) for fmt in FORMATS
+    }
+    cases["mock/json_trusted"] = lambda: trusted.get_weather()
+    return cases
+
+
+def _batch_cases(base_url: str) -> dict[str, Case]:
+    cases: dict[str, Case] = {}
+    for size in BATCH_SIZES:
+        # No caching, so every run fans out to the server again
+        client = WeatherClient(cache_duration=0, pool_size=size, base_url=base_url)
+        locations = [f"City{i}" for i in range(size)]
+        cases[f"batch/{size}"] = lambda c=client, items=locations: get_weather_many(
+            items, max_workers=len(items), client=c
+        )
+    return cases
+
+
+def _number_for(case: Case, target: float) -> int:
+    """Finds how many calls take at least ``target`` seconds."""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(case, number=number)
+        if elapsed >= target:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, int(target / elapsed) + 1))
+
+
+def measure(case: Case, repeat: int, target: float) -> dict[str, Any]:
+    """
+    Times one benchmark case.
+
+    Args:
+        case: The function to call.
+        repeat: How many timed runs to make.
+        target: Minimum duration of each run, in seconds.
+
+    Returns:
+        Per-call statistics in microseconds.
+    """
+    number = _number_for(case, target)
+    runs = [t / number * 1e6 for t in timeit.repeat(case, number=number, repeat=repeat)]
+    median = statistics.median(runs)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": min(runs),
+        "median_us": median,
+        "mean_us": statistics.fmean(runs),
+        "stdev_us": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "ops_per_sec": 1e6 / median if median else None,
+    }
+
+
+def _environment() -> dict[str, Any]:
+    """Describes what the results were measured with."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import numpy
+
+        numpy_version: str | None = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "package_version": fetch_my_weather.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+        "json_backend": codec.get_json_backend(),
+        "numpy": numpy_version,
+        "timestamp": time.time(),
+    }
+
+
+def run(name_filter: str = "", quick: bool = False) -> dict[str, Any]:
+    """
+    Runs the benchmark suite.
+
+    Args:
+        name_filter: Only run benchmarks whose name contains this.
+        quick: Fewer and shorter runs, for smoke tests.
+
+    Returns:
+        The environment and the results of every benchmark, keyed by name.
+    """
+    repeat, target = (3, 0.02) if quick else (7, 0.2)
+    results: dict[str, Any] = {}
+    with FakeWttr() as server, tempfile.TemporaryDirectory() as cache_dir:
+        groups: list[Callable[[], dict[str, Case]]] = [
+            _build_url_cases,
+            lambda: _get_weather_cases(Path(cache_dir), server.base_url),
+            _parse_cases,
+            _mock_cases,
+            lambda: _batch_cases(server.base_url),
+        ]
+        for build in groups:
+            cases = build()
+            for name, case in cases.items():
+                if name_filter not in name:
+                    continue
+                if name.startswith("batch/"):
+                    # One call is already a whole fan-out
+                    result = measure(case, repeat=3 if quick else 5, target=0)
+                    size = int(name.split("/")[1])
+                    result["items"] = size
+                    result["items_per_sec"] = size / result["median_us"] * 1e6
+                else:
+                    result = measure(case, repeat, target)
+                result["group"] = name.split("/")[0]
+                results[name] = result
+                print(
+                    f"{name:<36}{result['median_us']:>14.2f} us"
+                    f"  (±{result['stdev_us']:.2f})",
+                    file=sys.stderr,
+                )
+    return {"environment": _environment(), "results": results}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the fetch-my-weather hot paths offline.",
+    )
+    parser.add_argument("--filter", default="", help="only run matching names")
+    parser.add_argument("--quick", action="store_true", help="short smoke run")
+    parser.add_argument("--output", metavar="PATH", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    report = run(args.filter, args.quick)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
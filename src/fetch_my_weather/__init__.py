@@ -8,32 +8,200 @@ for educational use.
 
 __version__ = "0.4.0"
 
-from .core import (
-    clear_cache,
-    get_weather,
-    set_cache_duration,
-    set_mock_mode,
-    set_user_agent,
-)
-from .models import (
-    Astronomy,
-    CurrentCondition,
-    DailyForecast,
-    HourlyForecast,
-    NearestArea,
-    ResponseMetadata,
-    ResponseWrapper,
-    WeatherResponse,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .astronomy import get_astronomy, moon_phase
+    from .async_client import AsyncWeatherClient, async_get_weather, close_async_client
+    from .batch import get_weather_many, iter_weather_many
+    from .cache import CacheBackend, LRUCache
+    from .circuit import CircuitBreaker
+    from .codec import set_json_backend
+    from .core import (
+        WeatherClient,
+        clear_cache,
+        close_transport,
+        get_cache_stats,
+        get_stats,
+        get_weather,
+        set_base_url,
+        set_cache_backend,
+        set_cache_duration,
+        set_cache_limits,
+        set_circuit_breaker,
+        set_lazy_models,
+        set_metrics,
+        set_mock_mode,
+        set_offline_moon,
+        set_pool_size,
+        set_rate_limiter,
+        set_request_coalescing,
+        set_retry_policy,
+        set_stale_window,
+        set_timeouts,
+        set_transport,
+        set_trusted_models,
+        set_typed_models,
+        set_user_agent,
+    )
+    from .fake_server import FakeWttrServer
+    from .frame import ForecastFrame
+    from .metrics import InMemoryMetrics, Metrics, to_prometheus
+    from .models import (
+        Astronomy,
+        CurrentCondition,
+        DailyForecast,
+        HourlyForecast,
+        LazyDailyForecast,
+        LazyTypedDailyForecast,
+        LazyTypedWeatherResponse,
+        LazyWeatherResponse,
+        MoonPhase,
+        NearestArea,
+        ResponseMetadata,
+        ResponseTimings,
+        ResponseWrapper,
+        TypedAstronomy,
+        TypedCurrentCondition,
+        TypedDailyForecast,
+        TypedHourlyForecast,
+        TypedNearestArea,
+        TypedWeatherResponse,
+        WeatherFields,
+        WeatherResponse,
+    )
+    from .ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+    from .retry import Backoff, RetryPolicy
+    from .sqlite_cache import SQLiteCache
+    from .transport import WeatherTransport
+
+# Public name -> submodule that defines it. The submodules are imported on
+# first access (PEP 562), so ``import fetch_my_weather`` doesn't load requests,
+# pydantic or NumPy until they are needed.
+_LAZY_IMPORTS = {
+    "get_astronomy": "astronomy",
+    "moon_phase": "astronomy",
+    "AsyncWeatherClient": "async_client",
+    "async_get_weather": "async_client",
+    "close_async_client": "async_client",
+    "get_weather_many": "batch",
+    "iter_weather_many": "batch",
+    "CacheBackend": "cache",
+    "LRUCache": "cache",
+    "CircuitBreaker": "circuit",
+    "set_json_backend": "codec",
+    "WeatherClient": "core",
+    "clear_cache": "core",
+    "close_transport": "core",
+    "get_cache_stats": "core",
+    "get_stats": "core",
+    "get_weather": "core",
+    "set_base_url": "core",
+    "set_cache_backend": "core",
+    "set_cache_duration": "core",
+    "set_cache_limits": "core",
+    "set_circuit_breaker": "core",
+    "set_lazy_models": "core",
+    "set_metrics": "core",
+    "set_mock_mode": "core",
+    "set_offline_moon": "core",
+    "set_pool_size": "core",
+    "set_rate_limiter": "core",
+    "set_request_coalescing": "core",
+    "set_retry_policy": "core",
+    "set_stale_window": "core",
+    "set_timeouts": "core",
+    "set_transport": "core",
+    "set_trusted_models": "core",
+    "set_typed_models": "core",
+    "set_user_agent": "core",
+    "FakeWttrServer": "fake_server",
+    "ForecastFrame": "frame",
+    "InMemoryMetrics": "metrics",
+    "Metrics": "metrics",
+    "to_prometheus": "metrics",
+    "Astronomy": "models",
+    "CurrentCondition": "models",
+    "DailyForecast": "models",
+    "HourlyForecast": "models",
+    "LazyDailyForecast": "models",
+    "LazyTypedDailyForecast": "models",
+    "LazyTypedWeatherResponse": "models",
+    "LazyWeatherResponse": "models",
+    "MoonPhase": "models",
+    "NearestArea": "models",
+    "ResponseMetadata": "models",
+    "ResponseTimings": "models",
+    "ResponseWrapper": "models",
+    "TypedAstronomy": "models",
+    "TypedCurrentCondition": "models",
+    "TypedDailyForecast": "models",
+    "TypedHourlyForecast": "models",
+    "TypedNearestArea": "models",
+    "TypedWeatherResponse": "models",
+    "WeatherFields": "models",
+    "WeatherResponse": "models",
+    "FileTokenBucket": "ratelimit",
+    "RateLimiter": "ratelimit",
+    "TokenBucket": "ratelimit",
+    "Backoff": "retry",
+    "RetryPolicy": "retry",
+    "SQLiteCache": "sqlite_cache",
+    "WeatherTransport": "transport",
+}
 
 # For convenience, provide the most commonly used functions at the top level
 __all__ = [
     # Functions
     "get_weather",
+    "async_get_weather",
+    "close_async_client",
+    "get_weather_many",
+    "iter_weather_many",
     "clear_cache",
     "set_cache_duration",
+    "set_cache_limits",
+    "set_cache_backend",
+    "set_stale_window",
+    "set_request_coalescing",
+    "set_json_backend",
+    "get_cache_stats",
+    "set_retry_policy",
+    "set_rate_limiter",
+    "set_circuit_breaker",
+    "set_timeouts",
+    "set_metrics",
+    "get_stats",
+    "to_prometheus",
     "set_user_agent",
+    "set_base_url",
     "set_mock_mode",
+    "set_typed_models",
+    "set_lazy_models",
+    "set_trusted_models",
+    "set_offline_moon",
+    "set_pool_size",
+    "set_transport",
+    "close_transport",
+    # Retries, rate limiting and circuit breaking
+    "RetryPolicy",
+    "Backoff",
+    "RateLimiter",
+    "TokenBucket",
+    "FileTokenBucket",
+    "CircuitBreaker",
+    # Metrics
+    "Metrics",
+    "InMemoryMetrics",
+    # Cache backends
+    "CacheBackend",
+    "LRUCache",
+    "SQLiteCache",
+    # Clients and transport
+    "WeatherClient",
+    "AsyncWeatherClient",
+    "WeatherTransport",
     # Models
     "WeatherResponse",
     "CurrentCondition",
@@ -42,5 +210,40 @@ __all__ = [
     "HourlyForecast",
     "Astronomy",
     "ResponseMetadata",
+    "ResponseTimings",
     "ResponseWrapper",
+    "WeatherFields",
+    # Typed models
+    "TypedWeatherResponse",
+    "TypedCurrentCondition",
+    "TypedNearestArea",
+    "TypedDailyForecast",
+    "TypedHourlyForecast",
+    "TypedAstronomy",
+    # Lazy models
+    "LazyWeatherResponse",
+    "LazyDailyForecast",
+    "LazyTypedWeatherResponse",
+    "LazyTypedDailyForecast",
+    # Columnar forecasts
+    "ForecastFrame",
+    # Offline astronomy
+    "get_astronomy",
+    "moon_phase",
+    "MoonPhase",
+    # Offline development
+    "FakeWttrServer",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups don't go through __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,464 @@
+"""
+Offline astronomy for fetch_my_weather.
+
+The moon phase, sunrise, sunset, moonrise and moonset are deterministic
+functions of the date and the observer's position, so they can be computed
+locally instead of being fetched from wttr.in::
+
+    moon_phase(date(2025, 4, 13))          # MoonPhase(name="Full Moon", ...)
+    get_astronomy(51.5, -0.13, days=7)     # a week of Astronomy models
+
+The moon phase uses the truncated series of Meeus' *Astronomical Algorithms*
+(chapter 48), accurate to about 1% of illumination. Sunrise and sunset use the
+NOAA sunrise equation (about a minute), and moonrise and moonset use the low
+precision lunar position of the Astronomical Almanac (a few minutes).
+
+``moon_illumination``, ``moon_age`` and ``sun_times`` take a sequence of
+dates and return one ``array.array("d")`` per quantity, computed with NumPy
+when it is installed (``pip install "fetch-my-weather[numpy]"``) and plain
+Python loops otherwise.
+"""
+
+import functools
+import math
+from array import array
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from types import ModuleType
+from typing import Any
+
+from .models import Astronomy, MoonPhase
+
+
+@functools.cache
+def _load_numpy() -> Any:
+    """Imports NumPy on first use, so importing this module stays cheap."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return numpy
+
+
+# Mean length of a lunation, in days
+SYNODIC_MONTH = 29.530588853
+
+# Phase names as wttr.in reports them, from the new moon onwards
+PHASE_NAMES = (
+    "New Moon",
+    "Waxing Crescent",
+    "First Quarter",
+    "Waxing Gibbous",
+    "Full Moon",
+    "Waning Gibbous",
+    "Last Quarter",
+    "Waning Crescent",
+)
+PHASE_EMOJI = ("🌑", "🌒", "🌓", "🌔", "🌕", "🌖", "🌗", "🌘")
+
+_J2000 = 2451545.0  # Julian day of 2000-01-01 12:00 UTC
+_JD_ORDINAL = 1721424.5  # Julian day of 00:00 UTC on date.fromordinal(0)
+_SUN_ALTITUDE = math.sin(math.radians(-0.833))  # Refraction and solar radius
+_OBLIQUITY = math.radians(23.4397)
+_PRINCIPAL_PHASE = 360 / SYNODIC_MONTH / 2  # Half a day of the moon's motion
+_TIME_FORMAT = "%I:%M %p"  # wttr.in's astronomy times, e.g. "06:12 AM"
+
+
+def _julian_day(moment: date | datetime) -> float:
+    """Returns the Julian day of a moment; dates are taken at 12:00 UTC."""
+    if not isinstance(moment, datetime):
+        return moment.toordinal() + _JD_ORDINAL + 0.5
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    seconds = (
+        moment.hour * 3600 + moment.minute * 60 + moment.second
+    ) + moment.microsecond / 1e6
+    return moment.toordinal() + _JD_ORDINAL + seconds / 86400
+
+
+def _from_julian_day(jd: float, tz: tzinfo) -> datetime:
+    """Returns the moment of a Julian day as an aware datetime in tz."""
+    j2000 = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+    return (j2000 + timedelta(days=jd - _J2000)).astimezone(tz)
+
+
+def _moon_elongation(jd: Any, xp: ModuleType = math) -> Any:
+    """
+    Returns how far the moon is ahead of the sun, in degrees from 0 to 360.
+
+    0 is the new moon, 180 the full moon. Works on floats (xp=math) and on
+    NumPy arrays (xp=numpy).
+    """
+    t = (jd - _J2000) / 36525
+    d = xp.radians(297.8501921 + 445267.1114034 * t)  # Mean elongation
+    m = xp.radians(357.5291092 + 35999.0502909 * t)  # Sun's mean anomaly
+    mp = xp.radians(134.9633964 + 477198.8675055 * t)  # Moon's mean anomaly
+    elongation = xp.degrees(d) + (
+        6.289 * xp.sin(mp)
+        - 2.100 * xp.sin(m)
+        + 1.274 * xp.sin(2 * d - mp)
+        + 0.658 * xp.sin(2 * d)
+        + 0.214 * xp.sin(2 * mp)
+        + 0.110 * xp.sin(d)
+    )
+    return elongation % 360
+
+
+def _elongations(days: Iterable[date | datetime]) -> array:
+    """Returns the moon's elongation for every day."""
+    jds = array("d", (_julian_day(day) for day in days))
+    numpy = _load_numpy()
+    if numpy is not None:
+        values = _moon_elongation(numpy.frombuffer(jds, dtype=numpy.float64), numpy)
+        return array("d", values.tobytes())
+    return array("d", (_moon_elongation(jd) for jd in jds))
+
+
+def _illumination(elongation: float) -> float:
+    return (1 - math.cos(math.radians(elongation))) / 2 * 100
+
+
+def _phase_index(elongation: float) -> int:
+    # New moon, the quarters and full moon name the day they happen on (the
+    # moon moves about 12 degrees a day); the other names cover the rest
+    quarter = round(elongation / 90)
+    if abs(elongation - quarter * 90) <= _PRINCIPAL_PHASE:
+        return quarter % 4 * 2
+    return int(elongation // 90) * 2 + 1
+
+
+def moon_phase(moment: date | datetime | None = None) -> MoonPhase:
+    """
+    Computes the moon phase at a moment.
+
+    Args:
+        moment: A datetime (naive ones are taken as UTC) or a date, which is
+                taken at 12:00 UTC. Defaults to now.
+
+    Returns:
+        The phase name, emoji, illuminated percentage and age of the moon.
+    """
+    if moment is None:
+        moment = datetime.now(timezone.utc)
+    elongation = _moon_elongation(_julian_day(moment))
+    index = _phase_index(elongation)
+    return MoonPhase(
+        name=PHASE_NAMES[index],
+        emoji=PHASE_EMOJI[index],
+        illumination=_illumination(elongation),
+        age=elongation / 360 * SYNODIC_MONTH,
+        waxing=elongation < 180,
+    )
+
+
+def moon_illumination(days: Iterable[date | datetime]) -> array:
+    """
+    Computes the illuminated percentage of the moon for many days at once.
+
+    Args:
+        days: Dates (taken at 12:00 UTC) or datetimes.
+
+    Returns:
+        An array("d") with one percentage per day.
+    """
+    elongations = _elongations(days)
+    numpy = _load_numpy()
+    if numpy is not None:
+        values = numpy.frombuffer(elongations, dtype=numpy.float64)
+        return array("d", ((1 - numpy.cos(numpy.radians(values))) * 50).tobytes())
+    return array("d", map(_illumination, elongations))
+
+
+def moon_age(days: Iterable[date | datetime]) -> array:
+    """
+    Computes the age of the moon (days since the new moon) for many days at once.
+
+    Args:
+        days: Dates (taken at 12:00 UTC) or datetimes.
+
+    Returns:
+        An array("d") with one age per day.
+    """
+    return array(
+        "d", (elongation / 360 * SYNODIC_MONTH for elongation in _elongations(days))
+    )
+
+
+def _solar_events(
+    day_number: Any, latitude: float, longitude: float, xp: ModuleType
+) -> tuple[Any, Any]:
+    """
+    Runs the sunrise equation for days counted from 2000-01-01.
+
+    Returns:
+        The Julian day of solar noon and the cosine of the sunrise hour angle,
+        which is outside [-1, 1] when the sun doesn't rise or doesn't set.
+    """
+    j = day_number - longitude / 360  # Mean solar noon
+    m = xp.radians((357.5291 + 0.98560028 * j) % 360)
+    center = 1.9148 * xp.sin(m) + 0.0200 * xp.sin(2 * m) + 0.0003 * xp.sin(3 * m)
+    ecliptic = m + xp.radians(center + 180 + 102.9372)
+    transit = _J2000 + j + 0.0053 * xp.sin(m) - 0.0069 * xp.sin(2 * ecliptic)
+    sin_declination = xp.sin(ecliptic) * math.sin(_OBLIQUITY)
+    cos_declination = xp.sqrt(1 - sin_declination**2)
+    lat = math.radians(latitude)
+    cos_hour_angle = (_SUN_ALTITUDE - math.sin(lat) * sin_declination) / (
+        math.cos(lat) * cos_declination
+    )
+    return transit, cos_hour_angle
+
+
+def sun_times(
+    latitude: float, longitude: float, days: Iterable[date]
+) -> tuple[array, array]:
+    """
+    Computes sunrise and sunset for many days at once.
+
+    Args:
+        latitude: Latitude in degrees, north positive.
+        longitude: Longitude in degrees, east positive.
+        days: The dates.
+
+    Returns:
+        Two array("d"), sunrise and sunset, in hours after 00:00 UTC of each
+        date (so they can be negative or above 24 far from Greenwich). NaN
+        when the sun doesn't rise or doesn't set that day.
+    """
+    ordinals = array("d", (day.toordinal() for day in days))
+    offset = date(2000, 1, 1).toordinal()
+    numpy = _load_numpy()
+    if numpy is not None:
+        values = numpy.frombuffer(ordinals, dtype=numpy.float64)
+        transit, cos_hour_angle = _solar_events(
+            values - offset, latitude, longitude, numpy
+        )
+        cos_hour_angle[numpy.abs(cos_hour_angle) > 1] = numpy.nan
+        half_day = numpy.arccos(cos_hour_angle) / (2 * math.pi)
+        midnight = values + _JD_ORDINAL
+        return (
+            array("d", ((transit - half_day - midnight) * 24).tobytes()),
+            array("d", ((transit + half_day - midnight) * 24).tobytes()),
+        )
+
+    sunrise, sunset = array("d"), array("d")
+    for ordinal in ordinals:
+        transit, cos_hour_angle = _solar_events(
+            ordinal - offset, latitude, longitude, math
+        )
+        if abs(cos_hour_angle) > 1:
+            sunrise.append(math.nan)
+            sunset.append(math.nan)
+            continue
+        half_day = math.acos(cos_hour_angle) / (2 * math.pi)
+        midnight = ordinal + _JD_ORDINAL
+        sunrise.append((transit - half_day - midnight) * 24)
+        sunset.append((transit + half_day - midnight) * 24)
+    return sunrise, sunset
+
+
+def _sun_events(
+    latitude: float, longitude: float, day: date, tz: tzinfo
+) -> tuple[datetime | None, datetime | None]:
+    """Returns the sunrise and sunset that fall on a local date."""
+    sunrise = sunset = None
+    offset = date(2000, 1, 1).toordinal()
+    # Far from the time zone's meridian, the events of the local date can
+    # belong to the neighbouring solar days
+    for day_number in range(day.toordinal() - offset - 1, day.toordinal() - offset + 2):
+        transit, cos_hour_angle = _solar_events(day_number, latitude, longitude, math)
+        if abs(cos_hour_angle) > 1:
+            continue
+        half_day = math.acos(cos_hour_angle) / (2 * math.pi)
+        rise = _from_julian_day(transit - half_day, tz)
+        if rise.date() == day:
+            sunrise = rise
+        set_ = _from_julian_day(transit + half_day, tz)
+        if set_.date() == day:
+            sunset = set_
+    return sunrise, sunset
+
+
+def _moon_altitude(jd: float, latitude: float, longitude: float) -> float:
+    """
+    Returns the moon's altitude above the rising altitude, in degrees.
+
+    Uses the low precision formulae of the Astronomical Almanac; the rising
+    altitude accounts for refraction, the moon's radius and its parallax.
+    """
+    t = (jd - _J2000) / 36525
+    sin, cos, r = math.sin, math.cos, math.radians
+    longitude_ecl = r(
+        218.32
+        + 481267.881 * t
+        + 6.29 * sin(r(135.0 + 477198.87 * t))
+        - 1.27 * sin(r(259.3 - 413335.36 * t))
+        + 0.66 * sin(r(235.7 + 890534.22 * t))
+        + 0.21 * sin(r(269.9 + 954397.74 * t))
+        - 0.19 * sin(r(357.5 + 35999.05 * t))
+        - 0.11 * sin(r(186.5 + 966404.03 * t))
+    )
+    latitude_ecl = r(
+        5.13 * sin(r(93.3 + 483202.02 * t))
+        + 0.28 * sin(r(228.2 + 960400.89 * t))
+        - 0.28 * sin(r(318.3 + 6003.15 * t))
+        - 0.17 * sin(r(217.6 - 407332.21 * t))
+    )
+    parallax = (
+        0.9508
+        + 0.0518 * cos(r(135.0 + 477198.87 * t))
+        + 0.0095 * cos(r(259.3 - 413335.36 * t))
+        + 0.0078 * cos(r(235.7 + 890534.22 * t))
+        + 0.0028 * cos(r(269.9 + 954397.74 * t))
+    )
+
+    right_ascension = math.atan2(
+        sin(longitude_ecl) * cos(_OBLIQUITY) - math.tan(latitude_ecl) * sin(_OBLIQUITY),
+        cos(longitude_ecl),
+    )
+    declination = math.asin(
+        sin(latitude_ecl) * cos(_OBLIQUITY)
+        + cos(latitude_ecl) * sin(_OBLIQUITY) * sin(longitude_ecl)
+    )
+    sidereal = r((280.46061837 + 360.98564736629 * (jd - _J2000)) % 360)
+    hour_angle = sidereal + r(longitude) - right_ascension
+    lat = r(latitude)
+    altitude = math.degrees(
+        math.asin(
+            sin(lat) * sin(declination) + cos(lat) * cos(declination) * cos(hour_angle)
+        )
+    )
+    return altitude - (0.7275 * parallax - 0.5667)
+
+
+def _crossings(
+    altitude: Callable[[float], float], start: float, end: float
+) -> tuple[float | None, float | None]:
+    """
+    Finds the first rise and set of a body between two Julian days.
+
+    The altitude is sampled hourly, which is shorter than the time the moon
+    spends above or below the horizon, and each crossing is then bisected
+    to within a few seconds.
+    """
+    rise = set_ = None
+    steps = round((end - start) * 24)
+    before = altitude(start)
+    for step in range(1, steps + 1):
+        low, high = start + (step - 1) / 24, start + step / 24
+        after = altitude(high)
+        if (before < 0) != (after < 0):
+            rising = before < 0
+            for _ in range(10):
+                middle = (low + high) / 2
+                if (altitude(middle) < 0) == rising:
+                    low = middle
+                else:
+                    high = middle
+            if rising and rise is None:
+                rise = (low + high) / 2
+            elif not rising and set_ is None:
+                set_ = (low + high) / 2
+        before = after
+    return rise, set_
+
+
+def moon_times(
+    latitude: float, longitude: float, day: date, tz: tzinfo | None = None
+) -> tuple[datetime | None, datetime | None]:
+    """
+    Computes moonrise and moonset on a local date.
+
+    Args:
+        latitude: Latitude in degrees, north positive.
+        longitude: Longitude in degrees, east positive.
+        day: The local date.
+        tz: Time zone of the date and the results. Defaults to UTC.
+
+    Returns:
+        Moonrise and moonset as aware datetimes in tz. Either is None on days
+        without one, which happens about once a month.
+    """
+    tz = tz or timezone.utc
+    start = _julian_day(datetime.combine(day, time(), tz))
+    end = _julian_day(datetime.combine(day + timedelta(days=1), time(), tz))
+    rise, set_ = _crossings(
+        lambda jd: _moon_altitude(jd, latitude, longitude), start, end
+    )
+    return (
+        None if rise is None else _from_julian_day(rise, tz),
+        None if set_ is None else _from_julian_day(set_, tz),
+    )
+
+
+def _format_time(moment: datetime | None, missing: str) -> str:
+    if moment is None:
+        return missing
+    # Round to the nearest minute, as wttr.in does
+    return (moment + timedelta(seconds=30)).strftime(_TIME_FORMAT)
+
+
+def get_astronomy(
+    latitude: float,
+    longitude: float,
+    day: date | None = None,
+    days: int = 1,
+    tz: tzinfo | None = None,
+) -> list[Astronomy]:
+    """
+    Computes the astronomy section of a forecast without a network request.
+
+    The results have the same format as ``DailyForecast.astronomy`` in a j1
+    response: times like "06:12 AM" in the local time zone, and "No moonrise"
+    (or "No sunset", ...) on days without that event.
+
+    Args:
+        latitude: Latitude in degrees, north positive.
+        longitude: Longitude in degrees, east positive.
+        day: The first local date. Defaults to today in tz.
+        days: How many consecutive days to compute.
+        tz: Time zone for dates and times, e.g. ``ZoneInfo("Europe/London")``.
+            Defaults to UTC.
+
+    Returns:
+        One Astronomy model per day.
+    """
+    tz = tz or timezone.utc
+    first = day or datetime.now(tz).date()
+    dates = [first + timedelta(days=n) for n in range(days)]
+    # The moon phase of each day is taken at local noon
+    elongations = _elongations(datetime.combine(d, time(12), tz) for d in dates)
+
+    results = []
+    for current, elongation in zip(dates, elongations, strict=True):
+        sunrise, sunset = _sun_events(latitude, longitude, current, tz)
+        moonrise, moonset = moon_times(latitude, longitude, current, tz)
+        results.append(
+            Astronomy(
+                moon_illumination=str(round(_illumination(elongation))),
+                moon_phase=PHASE_NAMES[_phase_index(elongation)],
+                sunrise=_format_time(sunrise, "No sunrise"),
+                sunset=_format_time(sunset, "No sunset"),
+                moonrise=_format_time(moonrise, "No moonrise"),
+                moonset=_format_time(moonset, "No moonset"),
+            )
+        )
+    return results
+
+
+def moon_report(day: date | None = None) -> str:
+    """
+    Describes the moon phase of a date, for offline moon requests.
+
+    Args:
+        day: The date. Defaults to today (UTC).
+
+    Returns:
+        A short text report of the phase, illumination and age of the moon.
+    """
+    day = day or datetime.now(timezone.utc).date()
+    phase = moon_phase(day)
+    return (
+        f"Moon phase for {day.isoformat()}: {phase.name} {phase.emoji}\n"
+        f"Illumination: {phase.illumination:.0f}%\n"
+        f"Age: {phase.age:.1f} days since the new moon\n"
+    )
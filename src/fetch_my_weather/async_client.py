@@ -0,0 +1,521 @@
+"""
+Asyncio support for fetch_my_weather.
+
+This module provides ``async_get_weather`` and ``AsyncWeatherClient``, which
+accept the same parameters and return the same types as ``get_weather``. They
+use the cache and configuration of a ``WeatherClient`` (by default the one
+behind the synchronous API), so one event loop can drive thousands of lookups
+without blocking.
+
+Hits in the in-memory cache and mock data are served directly on the event
+loop. Other cache backends, such as ``SQLiteCache``, are read on the worker
+threads so disk I/O never blocks the loop. Network requests run on a bounded
+thread pool over a single pooled transport, with at most ``max_concurrency``
+requests in flight at once.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Literal
+
+from . import core, deadlines, timings
+from .cache import CachedJSON, LRUCache
+from .models import ResponseWrapper, WeatherFields, WeatherResponse
+from .singleflight import AsyncSingleFlight
+from .transport import WeatherTransport
+
+DEFAULT_MAX_CONCURRENCY = 32  # Requests allowed in flight at once
+
+
+class AsyncWeatherClient:
+    """
+    An asyncio client for wttr.in with bounded concurrency.
+
+    Use it as an async context manager so its transport and worker threads are
+    released when you are done::
+
+        async with AsyncWeatherClient(max_concurrency=50) as client:
+            weather = await client.get_weather("London")
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport: WeatherTransport | None = None,
+        client: core.WeatherClient | None = None,
+    ) -> None:
+        """
+        Create a new async client.
+
+        Args:
+            max_concurrency: Maximum number of network requests in flight.
+            transport: Transport to send requests over. If None, the client
+                       creates and owns a transport with one pooled
+                       connection per concurrent request.
+            client: WeatherClient whose cache and configuration are used.
+                    If None, the default client behind ``get_weather`` is used.
+        """
+        self._client = client if client is not None else core._default_client
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._owns_transport = transport is None
+        self._transport = transport or WeatherTransport(pool_size=self.max_concurrency)
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: AsyncSingleFlight[Any] = AsyncSingleFlight()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether ``aclose()`` has been called on this client."""
+        return self._closed
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the concurrency semaphore for the running event loop.
+
+        Returns:
+            An asyncio.Semaphore bound to the current loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the worker pool used for network requests, creating it on first use.
+
+        Returns:
+            The client's ThreadPoolExecutor.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="fetch-my-weather",
+            )
+        return self._executor
+
+    async def get_weather(
+        self,
+        location: str = "",
+        units: str = "",
+        view_options: str = "",
+        lang: str | None = None,
+        is_png: bool = False,
+        png_options: str = "",
+        is_moon: bool = False,
+        moon_date: str | None = None,
+        moon_location_hint: str | None = None,
+        format: Literal["text", "json", "raw_json", "png"] = "json",
+        use_mock: bool | None = None,
+        with_metadata: bool = False,
+        typed: bool | None = None,
+        lazy: bool | None = None,
+        fields: Iterable[str] | None = None,
+        offline_moon: bool | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> (
+        str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper
+    ):
+        """
+        Fetches weather or moon phase information from wttr.in without blocking.
+
+        Takes the same arguments and returns the same types as
+        ``fetch_my_weather.get_weather``. No exceptions are raised.
+
+        Raises:
+            RuntimeError: If the client has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncWeatherClient is closed")
+
+        args = (
+            location,
+            units,
+            view_options,
+            lang,
+            is_png,
+            png_options,
+            is_moon,
+            moon_date,
+            moon_location_hint,
+            format,
+            use_mock,
+            with_metadata,
+            typed,
+            lazy,
+            fields,
+            offline_moon,
+        )
+        start = time.perf_counter()
+        result: (
+            str
+            | bytes
+            | dict[str, Any]
+            | WeatherResponse
+            | WeatherFields
+            | ResponseWrapper
+        )
+        try:
+            budget = self._client._budget(timeout, deadline)
+        except ValueError as e:
+            result = core._invalid_param_result(
+                f"Error: {e}", format, with_metadata, self._client._model(typed, lazy)
+            )
+        else:
+            with budget:
+                if not with_metadata:
+                    result = await self._get_weather(*args)
+                else:
+                    # Metadata includes where the time went
+                    with timings.recording() as timer:
+                        result = core._attach_timings(
+                            await self._get_weather(*args), timer
+                        )
+        self._client._observe_call(
+            format, time.perf_counter() - start, result, fields is not None
+        )
+        return result
+
+    async def _get_weather(
+        self,
+        location: str,
+        units: str,
+        view_options: str,
+        lang: str | None,
+        is_png: bool,
+        png_options: str,
+        is_moon: bool,
+        moon_date: str | None,
+        moon_location_hint: str | None,
+        format: Literal["text", "json", "raw_json", "png"],
+        use_mock: bool | None,
+        with_metadata: bool,
+        typed: bool | None,
+        lazy: bool | None,
+        fields: Iterable[str] | None,
+        offline_moon: bool | None,
+    ) -> (
+        str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper
+    ):
+        """Implements get_weather; see there."""
+        if fields is not None:
+            return await self._get_fields(
+                location, units, lang, fields, use_mock, with_metadata
+            )
+
+        model = self._client._model(typed, lazy)
+
+        validation_result = core._validate_params(units, format, with_metadata, model)
+        if validation_result is not None:
+            return validation_result
+
+        with timings.phase("url_build"):
+            url = core._build_url(
+                location=location,
+                units=units,
+                view_options=view_options,
+                lang=lang,
+                is_png=is_png,
+                png_options=png_options,
+                is_moon=is_moon,
+                moon_date=moon_date,
+                moon_location_hint=moon_location_hint,
+                format=format,
+                base_url=self._client._base_url,
+            )
+
+        if self._client._use_offline_moon(is_moon, format, is_png, offline_moon):
+            return core._offline_moon_result(
+                url, moon_date, format, with_metadata, model
+            )
+
+        should_use_mock = self._client._use_mock if use_mock is None else use_mock
+        if should_use_mock:
+            return core._mock_result(
+                url, format, is_png, with_metadata, model, self._client._trusted
+            )
+
+        cached_result, stale_data = await self._check_cache(
+            url, format, is_png, with_metadata, model
+        )
+        if cached_result is not None:
+            return cached_result
+
+        if not self._client._coalesce_requests:
+            return await self._fetch(
+                url, format, is_png, with_metadata, stale_data, model
+            )
+
+        # Identical lookups on this loop wait here without using a worker
+        # thread; the fetch itself also coalesces with synchronous callers
+        budget = deadlines.current()
+        try:
+            result, shared = await self._inflight.do(
+                (url, format, is_png, with_metadata, model),
+                self._fetch,
+                url,
+                format,
+                is_png,
+                with_metadata,
+                stale_data,
+                model,
+                timeout=None if budget is None else budget.remaining(),
+            )
+        except TimeoutError as e:
+            # Waited for another caller's fetch until the deadline passed
+            error = e if budget is None else budget.exceeded()
+            return self._client._failed_result(
+                error, url, format, with_metadata, stale_data, model
+            )
+        if not shared:
+            return result  # type: ignore[no-any-return]
+        return self._client._shared_result(url, format, with_metadata, result, model)
+
+    async def _get_fields(
+        self,
+        location: str,
+        units: str,
+        lang: str | None,
+        fields: Iterable[str],
+        use_mock: bool | None,
+        with_metadata: bool,
+    ) -> str | WeatherFields | ResponseWrapper:
+        """
+        Fetches only the requested fields (see ``get_weather``'s ``fields``).
+
+        Args:
+            location: Location to get weather for.
+            units: Units for the values ("m", "u" or "M").
+            lang: Language code for text values such as the condition.
+            fields: The field names to fetch.
+            use_mock: Whether to return mock values; None for the client's
+                      setting.
+            with_metadata: Whether to include metadata.
+
+        Returns:
+            A WeatherFields record, or an error as get_weather would return it.
+        """
+        prepared = self._client._prepare_fields(
+            location, units, lang, fields, use_mock, with_metadata
+        )
+        if not isinstance(prepared, tuple):
+            return prepared
+        url, names = prepared
+
+        result, stale_data = await self._check_cache(url, "text", False, True)
+        if result is None:
+            result = await self._fetch(
+                url, "text", False, True, stale_data, WeatherResponse
+            )
+        return core._fields_result(result, names, with_metadata)
+
+    async def _check_cache(
+        self,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        is_png: bool,
+        with_metadata: bool,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> tuple[
+        str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper | None,
+        str | bytes | dict[str, Any] | WeatherResponse | CachedJSON | None,
+    ]:
+        """
+        Serves a request from the client's cache if possible.
+
+        The in-memory LRU cache is read on the event loop. Any other backend
+        may block on disk I/O or a lock, so it is read on a worker thread.
+
+        Args:
+            url: URL to look up.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            with_metadata: Whether to include metadata.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The (result, stale_data) tuple from ``WeatherClient._check_cache``.
+        """
+        check = functools.partial(
+            self._client._check_cache, url, format, is_png, with_metadata, model
+        )
+        if type(self._client.cache) is LRUCache:
+            return check()
+        loop = asyncio.get_running_loop()
+        # In a copy of this task's context, so hits record into its timer
+        return await loop.run_in_executor(
+            self._get_executor(), contextvars.copy_context().run, check
+        )
+
+    async def _fetch(
+        self,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        is_png: bool,
+        with_metadata: bool,
+        stale_data: Any,
+        model: type[WeatherResponse],
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Runs the request on the worker pool, bounded by max_concurrency.
+
+        When the client's rate limiter would make the request wait, it waits
+        on the event loop first, without holding a worker or a concurrency slot.
+
+        Args:
+            url: URL to request.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            with_metadata: Whether to include metadata.
+            stale_data: Stale cache entry to serve if the request fails.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The same result get_weather would return for this request.
+        """
+        breaker = self._client._circuit_breaker
+        if breaker is not None and breaker.rejects():
+            # Fail fast on the event loop while the circuit is open
+            return self._client._circuit_open_result(
+                breaker, url, format, with_metadata, stale_data, model
+            )
+
+        limiter = self._client._rate_limiter
+        mode = self._client._on_rate_limit
+        if limiter is not None and (
+            mode == "block" or (mode == "cache" and stale_data is None)
+        ):
+            # Wait for a token here rather than in a worker thread; the
+            # worker takes it, or fails if the deadline comes first
+            budget = deadlines.current()
+            delay = limiter.wait_time()
+            while delay > 0.0:
+                remaining = None if budget is None else budget.remaining()
+                if remaining is not None and delay > remaining:
+                    break
+                await asyncio.sleep(delay)
+                delay = limiter.wait_time()
+
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            # Run in a copy of this task's context, so the worker records
+            # into this request's timer
+            return await loop.run_in_executor(
+                self._get_executor(),
+                contextvars.copy_context().run,
+                functools.partial(
+                    self._client._fetch_once,
+                    url,
+                    format,
+                    is_png,
+                    with_metadata,
+                    stale_data=stale_data,
+                    transport=self._transport,
+                    model=model,
+                ),
+            )
+
+    async def aclose(self) -> None:
+        """Shut down the worker threads and close an owned transport."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown)
+            self._executor = None
+        if self._owns_transport:
+            self._transport.close()
+
+    async def __aenter__(self) -> "AsyncWeatherClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+
+# --- Module-level client ---
+# Shared client used by async_get_weather, created lazily on first use
+_default_client: AsyncWeatherClient | None = None
+
+
+def _get_default_client() -> AsyncWeatherClient:
+    """
+    Returns the shared async client, creating it on first use.
+
+    Returns:
+        The module-level AsyncWeatherClient.
+    """
+    global _default_client
+    if _default_client is None or _default_client.closed:
+        _default_client = AsyncWeatherClient()
+    return _default_client
+
+
+async def async_get_weather(
+    location: str = "",
+    units: str = "",
+    view_options: str = "",
+    lang: str | None = None,
+    is_png: bool = False,
+    png_options: str = "",
+    is_moon: bool = False,
+    moon_date: str | None = None,
+    moon_location_hint: str | None = None,
+    format: Literal["text", "json", "raw_json", "png"] = "json",
+    use_mock: bool | None = None,
+    with_metadata: bool = False,
+    typed: bool | None = None,
+    lazy: bool | None = None,
+    fields: Iterable[str] | None = None,
+    offline_moon: bool | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
+) -> str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper:
+    """
+    Asyncio version of get_weather, backed by a shared AsyncWeatherClient.
+
+    Takes the same arguments and returns the same types as
+    ``fetch_my_weather.get_weather``. No exceptions are raised.
+    """
+    return await _get_default_client().get_weather(
+        location=location,
+        units=units,
+        view_options=view_options,
+        lang=lang,
+        is_png=is_png,
+        png_options=png_options,
+        is_moon=is_moon,
+        moon_date=moon_date,
+        moon_location_hint=moon_location_hint,
+        format=format,
+        use_mock=use_mock,
+        with_metadata=with_metadata,
+        typed=typed,
+        lazy=lazy,
+        fields=fields,
+        offline_moon=offline_moon,
+        timeout=timeout,
+        deadline=deadline,
+    )
+
+
+async def close_async_client() -> None:
+    """Close the shared client used by async_get_weather."""
+    global _default_client
+    if _default_client is not None:
+        await _default_client.aclose()
+        _default_client = None
@@ -0,0 +1,257 @@
+"""
+Batch API for fetch_my_weather.
+
+This module fetches weather for many locations at once. Requests that resolve
+to the same URL are only made once, and the remaining requests are fanned out
+over a bounded thread pool that shares the cache and transport of a
+``WeatherClient`` (by default the one behind ``get_weather``).
+"""
+
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any
+
+from . import core
+from .models import ResponseWrapper, WeatherResponse
+
+DEFAULT_MAX_WORKERS = 8  # Requests allowed in flight at once
+
+# Parameters of get_weather that affect the URL that is requested
+_URL_PARAMS = (
+    "location",
+    "units",
+    "view_options",
+    "lang",
+    "is_png",
+    "png_options",
+    "is_moon",
+    "moon_date",
+    "moon_location_hint",
+    "format",
+    "fields",
+)
+
+# (url, format, use_mock, offline moon, model class) identifying duplicate batch
+# items
+_RequestKey = tuple[str, str, bool, bool, type[WeatherResponse]]
+
+
+def _item_params(item: str | dict[str, Any], common: dict[str, Any]) -> dict[str, Any]:
+    """
+    Merges one batch item with the parameters shared by the whole batch.
+
+    Args:
+        item: A location string, or a dict of get_weather parameters.
+        common: Parameters applied to every item.
+
+    Returns:
+        The get_weather keyword arguments for this item.
+    """
+    params = dict(common)
+    if isinstance(item, dict):
+        params.update(item)
+    else:
+        params["location"] = item
+    params["with_metadata"] = True  # Errors are always reported per item
+    return params
+
+
+def _request_key(params: dict[str, Any], client: core.WeatherClient) -> _RequestKey:
+    """
+    Builds the key used to deduplicate identical requests in a batch.
+
+    Args:
+        params: The get_weather keyword arguments for one item.
+        client: The client the batch runs on.
+
+    Returns:
+        A (url, format, use_mock, offline moon, model class) tuple.
+    """
+    url_params = {k: params[k] for k in _URL_PARAMS if k in params}
+    url_params.setdefault("format", "json")
+    url = core._build_url(**url_params, base_url=client._base_url)
+    use_mock = params.get("use_mock")
+    should_use_mock = client._use_mock if use_mock is None else bool(use_mock)
+    offline_moon = client._use_offline_moon(
+        bool(params.get("is_moon")),
+        url_params["format"],
+        bool(params.get("is_png")),
+        params.get("offline_moon"),
+    )
+    model = client._model(params.get("typed"), params.get("lazy"))
+    return url, url_params["format"], should_use_mock, offline_moon, model
+
+
+def _error_result(
+    params: dict[str, Any], error_type: str, message: str
+) -> ResponseWrapper:
+    """
+    Builds the fallback result for a batch item that failed.
+
+    Args:
+        params: The get_weather keyword arguments for this item.
+        error_type: Type of error that occurred.
+        message: Detailed error message.
+
+    Returns:
+        A ResponseWrapper with fallback data and error metadata.
+    """
+    fmt = params.get("format", "json")
+    result = core._create_mock_data(
+        format=fmt if fmt in ("text", "json", "raw_json", "png") else "text",
+        error_type=error_type,
+        error_message=message,
+        with_metadata=True,
+    )
+    if isinstance(result, ResponseWrapper):
+        return result
+    return ResponseWrapper(data=result, metadata=core._create_metadata())
+
+
+def _fetch_one(
+    params: dict[str, Any], client: core.WeatherClient, started: float
+) -> ResponseWrapper:
+    """
+    Fetches a single batch item, turning any failure into error metadata.
+
+    Args:
+        params: The get_weather keyword arguments for this item.
+        client: The client to fetch with.
+        started: When the batch started, as a time.monotonic() value.
+
+    Returns:
+        A ResponseWrapper with the data and its metadata.
+    """
+    if params.get("deadline") is not None:
+        # The deadline covers the whole batch, so items that waited for a
+        # worker get what is left of it
+        params = dict(params)
+        if isinstance(params["deadline"], int | float):
+            # Items that waited too long get 0, not a negative deadline
+            params["deadline"] = max(
+                0.0, params["deadline"] - (time.monotonic() - started)
+            )
+    try:
+        result = client.get_weather(**params)
+    except Exception as e:
+        return _error_result(
+            params, e.__class__.__name__, f"Error: An unexpected error occurred: {e}"
+        )
+    if isinstance(result, ResponseWrapper):
+        return result
+    # get_weather always wraps when with_metadata is True; guard just in case
+    return ResponseWrapper(data=result, metadata=core._create_metadata())
+
+
+def iter_weather_many(
+    locations: Iterable[str | dict[str, Any]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    client: core.WeatherClient | None = None,
+    **common: Any,
+) -> Iterator[tuple[int, ResponseWrapper]]:
+    """
+    Fetches weather for many locations, yielding results as they complete.
+
+    Args:
+        locations: Location strings, or dicts of get_weather parameters
+                   (e.g. {"location": "Paris", "lang": "fr"}).
+        max_workers: Maximum number of requests in flight at once.
+        client: WeatherClient to fetch with. If None, the default client
+                behind ``get_weather`` is used.
+        **common: get_weather parameters applied to every item
+                  (e.g. format="raw_json", units="m"). Per-item dicts override them.
+                  A ``deadline`` counts from the start of the batch: items
+                  that can't be fetched in time get stale cache data or an
+                  error with error_type "DeadlineExceeded".
+
+    Yields:
+        (index, ResponseWrapper) pairs in completion order, where index is the
+        position of the item in ``locations``. Errors are reported in each
+        wrapper's metadata rather than raised. Duplicate items share the same
+        result object.
+    """
+    started = time.monotonic()
+    items = list(locations)
+    if not items:
+        return
+    if client is None:
+        client = core._default_client
+
+    # Group items by request key so identical requests are only made once
+    groups: dict[_RequestKey, list[int]] = {}
+    group_params: dict[_RequestKey, dict[str, Any]] = {}
+    failed: list[tuple[int, ResponseWrapper]] = []
+    for index, item in enumerate(items):
+        params = _item_params(item, common)
+        try:
+            key = _request_key(params, client)
+        except Exception as e:
+            # Bad per-item parameters only fail that item
+            failed.append(
+                (
+                    index,
+                    _error_result(
+                        params,
+                        e.__class__.__name__,
+                        f"Error: Invalid batch item parameters: {e}",
+                    ),
+                )
+            )
+            continue
+        if key not in groups:
+            groups[key] = []
+            group_params[key] = params
+        groups[key].append(index)
+
+    yield from failed
+    if not groups:
+        return
+
+    workers = max(1, min(int(max_workers), len(groups)))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="fetch-my-weather"
+    ) as executor:
+        futures = {
+            executor.submit(_fetch_one, group_params[key], client, started): key
+            for key in groups
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            for index in groups[futures[future]]:
+                yield index, result
+
+
+def get_weather_many(
+    locations: Iterable[str | dict[str, Any]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    client: core.WeatherClient | None = None,
+    **common: Any,
+) -> list[ResponseWrapper]:
+    """
+    Fetches weather for many locations in parallel.
+
+    Identical requests are only made once, and each unique request consults the
+    cache before going to the network.
+
+    Args:
+        locations: Location strings, or dicts of get_weather parameters
+                   (e.g. {"location": "Paris", "lang": "fr"}).
+        max_workers: Maximum number of requests in flight at once.
+        client: WeatherClient to fetch with. If None, the default client
+                behind ``get_weather`` is used.
+        **common: get_weather parameters applied to every item
+                  (e.g. format="raw_json", units="m"). Per-item dicts override them.
+                  A ``deadline`` counts from the start of the batch.
+
+    Returns:
+        A list of ResponseWrapper objects in the same order as ``locations``.
+        Errors are reported in each wrapper's metadata rather than raised.
+    """
+    items = list(locations)
+    results: list[ResponseWrapper | None] = [None] * len(items)
+    for index, result in iter_weather_many(
+        items, max_workers=max_workers, client=client, **common
+    ):
+        results[index] = result
+    return [result for result in results if result is not None]
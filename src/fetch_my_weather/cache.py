@@ -0,0 +1,470 @@
+"""
+Caching for fetch_my_weather.
+
+This module provides the bounded in-memory LRU cache that sits behind
+``core._get_from_cache`` and ``core._add_to_cache``. Entries are evicted in
+least-recently-used order once either the entry limit or the byte budget is
+exceeded, so a long-running process cannot grow the cache without bound.
+
+Storage is pluggable: any ``CacheBackend`` can be installed with
+``core.set_cache_backend``, such as the SQLite backend in ``sqlite_cache``.
+
+JSON responses are cached as ``CachedJSON`` entries, which keep the decoded
+dictionary next to the raw text and remember which model classes it has been
+validated against, so cache hits do not have to decode the payload again and
+can build their models from trusted data.
+"""
+
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any
+
+from . import codec
+from .models import WeatherResponse, construct_trusted
+
+DEFAULT_MAX_ENTRIES = 1000  # Maximum number of cached responses
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # Maximum approximate size of cached data
+
+CacheEntry = tuple[float, Any]  # (timestamp, data)
+
+
+def copy_json(value: Any) -> Any:
+    """
+    Makes an independent copy of decoded JSON data.
+
+    Only dicts and lists are copied; strings, numbers, booleans and None are
+    immutable and can be shared. This is several times faster than
+    ``copy.deepcopy`` on wttr.in payloads.
+
+    Args:
+        value: Decoded JSON data.
+
+    Returns:
+        A copy that shares no mutable containers with ``value``.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: v if type(v) is str else copy_json(v) for k, v in value.items()}
+    if value_type is list:
+        return [v if type(v) is str else copy_json(v) for v in value]
+    return value
+
+
+class CachedJSON:
+    """
+    A cached JSON response kept in raw and decoded form.
+
+    The decoded data is never handed out directly: ``as_dict()`` returns a
+    fresh dictionary, and ``as_model()`` builds a new model on every call, so
+    callers are free to modify what they get without changing later hits.
+    Deep-copying a model costs several times more than building it again from
+    data that is known to be valid.
+    """
+
+    __slots__ = ("text", "size", "_data", "_validated")
+
+    def __init__(
+        self,
+        text: str,
+        data: dict[str, Any],
+        model_type: type[WeatherResponse] | None = None,
+    ) -> None:
+        """
+        Create a new cache entry.
+
+        Args:
+            text: The raw JSON text as returned by wttr.in.
+            data: The decoded JSON. The entry takes ownership of it and must
+                  not be modified afterwards.
+            model_type: The model class the data has already been validated
+                        against, if any.
+        """
+        self.text = text
+        self.size = len(text.encode("utf-8"))
+        self._data = data
+        # Model classes the data is known to be valid for, e.g. WeatherResponse
+        # and TypedWeatherResponse
+        self._validated: set[type[WeatherResponse]] = (
+            set() if model_type is None else {model_type}
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Returns a private copy of the decoded JSON.
+
+        With orjson or msgspec, decoding the raw text again is faster than
+        copying the decoded data; the standard library is slower.
+
+        Returns:
+            A dictionary the caller is free to modify.
+        """
+        if codec.get_json_backend() == "json":
+            data: dict[str, Any] = copy_json(self._data)
+        else:
+            data = codec.loads(self.text)
+        return data
+
+    def as_model(
+        self, model_type: type[WeatherResponse] = WeatherResponse, trusted: bool = False
+    ) -> WeatherResponse:
+        """
+        Returns a new model of the data, validating it on first use.
+
+        Args:
+            model_type: The model class to validate with, such as
+                        WeatherResponse or TypedWeatherResponse.
+            trusted: Whether to build the model on first use without
+                     validation (see ``construct_trusted``).
+
+        Returns:
+            A model that shares no mutable objects with the entry.
+
+        Raises:
+            ValidationError: If the data doesn't match the model.
+        """
+        if trusted or model_type in self._validated:
+            return construct_trusted(model_type, self._data)
+        model = model_type.parse_obj(self._data)
+        self._validated.add(model_type)
+        return model
+
+
+def _estimate_size(data: Any) -> int:
+    """
+    Estimates how many bytes a cached value takes up.
+
+    Args:
+        data: The value to measure.
+
+    Returns:
+        Approximate size of the value in bytes.
+    """
+    if isinstance(data, CachedJSON):
+        return data.size
+    if isinstance(data, bytes | bytearray):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, dict | list):
+        try:
+            return len(codec.dumps(data, default=str))
+        except (TypeError, ValueError):
+            pass
+    return sys.getsizeof(data)
+
+
+class CacheBackend(ABC):
+    """
+    Interface for the storage behind ``core._get_from_cache`` and ``core._add_to_cache``.
+
+    Backends store ``(timestamp, data)`` entries by key, where data is a str,
+    bytes, dict, WeatherResponse or CachedJSON, and must return the data with
+    the same type it was stored with. Implementations must be thread-safe.
+    """
+
+    @abstractmethod
+    def get(self, key: str, max_age: float | None = None) -> CacheEntry | None:
+        """
+        Look up an entry.
+
+        Args:
+            key: The cache key (usually a URL).
+            max_age: If given, entries older than this many seconds are
+                     treated as a miss and may be removed.
+
+        Returns:
+            A (timestamp, data) tuple, or None if the key is missing or expired.
+        """
+
+    @abstractmethod
+    def put(
+        self,
+        key: str,
+        data: Any,
+        timestamp: float | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Add or replace an entry.
+
+        Args:
+            key: The cache key (usually a URL).
+            data: The data to cache.
+            timestamp: When the data was fetched (defaults to now).
+            ttl: How long the entry should be kept, in seconds. Backends may
+                 use this to purge expired entries; None means no expiry.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: The cache key to remove.
+
+        Returns:
+            True if an entry was removed.
+        """
+
+    @abstractmethod
+    def clear(self) -> int:
+        """
+        Remove all entries.
+
+        Returns:
+            Number of entries removed.
+        """
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def set_limits(
+        self, max_entries: int | None = None, max_bytes: int | None = None
+    ) -> tuple[int | None, int | None]:
+        """
+        Change the size limits of the backend.
+
+        Args:
+            max_entries: Maximum number of entries, or None for no limit.
+            max_bytes: Maximum approximate total size in bytes, or None for no limit.
+
+        Returns:
+            The new (max_entries, max_bytes) limits.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support size limits"
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns a snapshot of the cache size and counters.
+
+        Returns:
+            A dictionary of cache statistics.
+        """
+        return {"entries": len(self)}
+
+    def close(self) -> None:  # noqa: B027 - optional hook, no-op by default
+        """Release any resources held by the backend."""
+
+    # --- Mapping-style access ---
+
+    def __getitem__(self, key: str) -> CacheEntry:
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __setitem__(self, key: str, entry: CacheEntry) -> None:
+        timestamp, data = entry
+        self.put(key, data, timestamp=timestamp)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+
+class LRUCache(CacheBackend):
+    """
+    A thread-safe in-memory LRU cache bounded by entry count and total size.
+
+    Lookups and insertions are O(1). The cache also supports the mapping
+    operations used on the old dict cache (``cache[url] = (timestamp, data)``,
+    ``url in cache``, ``len(cache)``).
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """
+        Create a new cache.
+
+        Args:
+            max_entries: Maximum number of entries, or None for no limit.
+            max_bytes: Maximum approximate total size in bytes, or None for no limit.
+        """
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.max_entries: int | None = None
+        self.max_bytes: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.set_limits(max_entries, max_bytes)
+
+    def set_limits(
+        self, max_entries: int | None = None, max_bytes: int | None = None
+    ) -> tuple[int | None, int | None]:
+        """
+        Change the size limits, evicting entries if the cache is now too big.
+
+        Args:
+            max_entries: Maximum number of entries, or None for no limit.
+            max_bytes: Maximum approximate total size in bytes, or None for no limit.
+
+        Returns:
+            The new (max_entries, max_bytes) limits.
+        """
+        with self._lock:
+            self.max_entries = None if max_entries is None else max(0, int(max_entries))
+            self.max_bytes = None if max_bytes is None else max(0, int(max_bytes))
+            self._evict()
+            return self.max_entries, self.max_bytes
+
+    def get(self, key: str, max_age: float | None = None) -> CacheEntry | None:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: The cache key (usually a URL).
+            max_age: If given, entries older than this many seconds are
+                     removed and treated as a miss.
+
+        Returns:
+            A (timestamp, data) tuple, or None if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            timestamp, data, _ = entry
+            if max_age is not None and time.time() - timestamp >= max_age:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return timestamp, data
+
+    def put(
+        self,
+        key: str,
+        data: Any,
+        timestamp: float | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Add or replace an entry, evicting least-recently-used entries as needed.
+
+        Values larger than the whole byte budget are not cached. Expiry is
+        checked on read with ``max_age``, so ``ttl`` is not needed here.
+
+        Args:
+            key: The cache key (usually a URL).
+            data: The data to cache.
+            timestamp: When the data was fetched (defaults to now).
+            ttl: Ignored by the in-memory cache.
+        """
+        size = _estimate_size(data)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self.evictions += 1
+                return
+            self._entries[key] = (
+                time.time() if timestamp is None else timestamp,
+                data,
+                size,
+            )
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: The cache key to remove.
+
+        Returns:
+            True if an entry was removed.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self) -> int:
+        """
+        Remove all entries.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns a snapshot of the cache size, limits and counters.
+
+        Returns:
+            A dictionary of cache statistics.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: str) -> None:
+        """Removes an entry and updates the byte count. Caller holds the lock."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Evicts least-recently-used entries until within limits. Caller holds the lock."""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    # --- Mapping-style access ---
+
+    def __getitem__(self, key: str) -> CacheEntry:
+        with self._lock:
+            timestamp, data, _ = self._entries[key]
+            self._entries.move_to_end(key)
+            return timestamp, data
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
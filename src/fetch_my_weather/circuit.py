@@ -0,0 +1,224 @@
+"""
+Circuit breaker for requests to wttr.in.
+
+When wttr.in is down, every request would otherwise wait for its timeout
+before falling back. A ``CircuitBreaker`` counts consecutive failures
+(timeouts, connection errors, 5xx and rate-limited responses). After
+``failure_threshold`` of them it opens, and requests fail at once with
+error_type "CircuitOpen", which is answered with stale cache data, an error
+message or mock data like any other failed request. After
+``recovery_timeout`` seconds it half-opens and lets ``half_open_requests``
+probe requests through: if they succeed it closes again, and a failed probe
+opens it for another ``recovery_timeout``::
+
+    from fetch_my_weather import CircuitBreaker, set_circuit_breaker
+
+    set_circuit_breaker(CircuitBreaker(failure_threshold=5, recovery_timeout=30))
+"""
+
+import threading
+import time
+from typing import Any
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, OPEN, HALF_OPEN)
+
+
+class CircuitOpen(Exception):  # noqa: N818 - the name is the error_type callers see
+    """Raised instead of sending a request while the circuit is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            f"wttr.in is failing; requests are paused for {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after  # Seconds until the circuit half-opens
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a failing upstream for a while.
+
+    Thread-safe; one breaker can be shared by several clients that talk to the
+    same server.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_requests: int = 1,
+    ) -> None:
+        """
+        Create a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_timeout: Seconds the circuit stays open before probing.
+            half_open_requests: Probe requests allowed at once while half-open;
+                                this many must succeed to close the circuit.
+
+        Raises:
+            ValueError: If a count is below 1 or the timeout is negative.
+        """
+        if failure_threshold < 1 or half_open_requests < 1:
+            raise ValueError("failure_threshold and half_open_requests must be >= 1")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must not be negative")
+        self.failure_threshold = int(failure_threshold)
+        self.recovery_timeout = float(recovery_timeout)
+        self.half_open_requests = int(half_open_requests)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0  # Consecutive failures while closed
+        self._opened_at = 0.0
+        self._probes = 0  # Probe requests in flight while half-open
+        self._probe_successes = 0
+        self._probe_started_at = 0.0
+        self._rejected = 0
+        self._transitions = dict.fromkeys(STATES, 0)
+
+    @property
+    def state(self) -> str:
+        """The current state: "closed", "open" or "half_open"."""
+        return self._state
+
+    def _set_state(self, state: str, now: float) -> None:
+        """Moves to a new state; the caller holds the lock."""
+        self._state = state
+        self._transitions[state] += 1
+        if state == OPEN:
+            self._opened_at = now
+        elif state == HALF_OPEN:
+            self._probes = 0
+            self._probe_successes = 0
+        else:
+            self._failures = 0
+
+    def retry_after(self) -> float:
+        """
+        Returns how long requests will still be rejected.
+
+        Returns:
+            Seconds until the circuit half-opens, 0.0 unless it is open.
+        """
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def rejects(self) -> bool:
+        """
+        Checks whether the circuit is open, without probing.
+
+        Returns:
+            True (and counts the rejection) if the circuit is open and its
+            recovery timeout hasn't passed yet.
+        """
+        with self._lock:
+            if (
+                self._state == OPEN
+                and time.monotonic() - self._opened_at < self.recovery_timeout
+            ):
+                self._rejected += 1
+                return True
+            return False
+
+    def allow(self) -> bool:
+        """
+        Decides whether a request may be sent, and counts it if not.
+
+        Returns:
+            True if the circuit is closed, or if a probe slot is free while
+            half-open (an open circuit half-opens once its timeout passes).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == OPEN:
+                if now - self._opened_at < self.recovery_timeout:
+                    self._rejected += 1
+                    return False
+                self._set_state(HALF_OPEN, now)
+            if self._state == HALF_OPEN:
+                # Probes that never reported back free their slot after a
+                # recovery timeout
+                if (
+                    self._probes >= self.half_open_requests
+                    and now - self._probe_started_at < self.recovery_timeout
+                ):
+                    self._rejected += 1
+                    return False
+                if self._probes >= self.half_open_requests:
+                    self._probes = 0
+                self._probes += 1
+                self._probe_started_at = now
+            return True
+
+    def record(self, success: bool) -> None:
+        """
+        Reports the outcome of a request that ``allow`` let through.
+
+        Args:
+            success: False if the upstream failed (timeout, connection error,
+                     5xx or rate limited), True otherwise.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if not success:
+                    self._set_state(OPEN, now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_requests:
+                    self._set_state(CLOSED, now)
+            elif self._state == CLOSED:
+                if success:
+                    self._failures = 0
+                else:
+                    self._failures += 1
+                    if self._failures >= self.failure_threshold:
+                        self._set_state(OPEN, now)
+            # Results of requests sent before the circuit opened are ignored
+
+    def release(self) -> None:
+        """
+        Gives back a request that ``allow`` let through but that never got an
+        outcome, e.g. because the rate limiter or the caller's deadline
+        stopped it. A half-open probe slot is freed without counting it.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def reset(self) -> None:
+        """Closes the circuit and forgets past failures."""
+        with self._lock:
+            if self._state != CLOSED:
+                self._set_state(CLOSED, time.monotonic())
+            self._failures = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the breaker's state and counters.
+
+        Returns:
+            A dictionary with "state", "failures" (consecutive, while closed),
+            "retry_after" (seconds until half-open), "rejected" (requests
+            failed fast) and "transitions" (times each state was entered).
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "failures": self._failures,
+                "retry_after": self.retry_after(),
+                "rejected": self._rejected,
+                "transitions": dict(self._transitions),
+            }
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreaker(failure_threshold={self.failure_threshold}, "
+            f"recovery_timeout={self.recovery_timeout}, "
+            f"half_open_requests={self.half_open_requests}, state={self._state!r})"
+        )
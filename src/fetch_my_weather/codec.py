@@ -0,0 +1,163 @@
+"""
+JSON encoding and decoding for fetch_my_weather.
+
+Every JSON payload the package decodes or encodes goes through ``loads`` and
+``dumps`` in this module. They use orjson or msgspec when one of them is
+installed, which decode wttr.in's j1 payloads several times faster than the
+standard library, and fall back to the ``json`` module otherwise::
+
+    pip install "fetch-my-weather[fast]"
+
+The backend is picked automatically on import and can be changed with
+``set_json_backend``. All backends raise ``json.JSONDecodeError`` for invalid
+input, so callers don't need to know which one is active.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore[assignment]
+
+# Fastest first; the first installed backend is used by default
+BACKEND_PREFERENCE = ("orjson", "msgspec", "json")
+
+Default = Callable[[Any], Any] | None  # Converts values the encoder can't handle
+
+
+def _json_loads(data: str | bytes) -> Any:
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, default: Default = None) -> str:
+    return json.dumps(obj, default=default)
+
+
+def _orjson_loads(data: str | bytes) -> Any:
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    return orjson.loads(data)
+
+
+def _orjson_dumps(obj: Any, default: Default = None) -> str:
+    return orjson.dumps(obj, default=default).decode("utf-8")
+
+
+def _msgspec_loads(data: str | bytes) -> Any:
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError as e:
+        text = data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+        raise json.JSONDecodeError(str(e), text, 0) from e
+
+
+def _msgspec_dumps(obj: Any, default: Default = None) -> str:
+    result: bytes = msgspec.json.encode(obj, enc_hook=default)
+    return result.decode("utf-8")
+
+
+def available_backends() -> list[str]:
+    """
+    Lists the JSON backends that can be used in this environment.
+
+    Returns:
+        Backend names, fastest first. "json" is always available.
+    """
+    installed = {"orjson": orjson is not None, "msgspec": msgspec is not None}
+    return [name for name in BACKEND_PREFERENCE if installed.get(name, True)]
+
+
+_BACKENDS: dict[
+    str,
+    tuple[Callable[[str | bytes], Any], Callable[[Any, Default], str]],
+] = {
+    "orjson": (_orjson_loads, _orjson_dumps),
+    "msgspec": (_msgspec_loads, _msgspec_dumps),
+    "json": (_json_loads, _json_dumps),
+}
+
+_backend = "json"
+_loads, _dumps = _BACKENDS["json"]
+
+
+def set_json_backend(name: str | None = None) -> str:
+    """
+    Choose the library used to decode and encode JSON.
+
+    Args:
+        name: "orjson", "msgspec" or "json" (the standard library), or None to
+              use the fastest one that is installed.
+
+    Returns:
+        The name of the backend now in use.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    global _backend, _loads, _dumps
+    available = available_backends()
+    if name is None:
+        name = available[0]
+    if name not in available:
+        raise ValueError(
+            f"JSON backend {name!r} is not available; choose from {available}"
+        )
+    _loads, _dumps = _BACKENDS[name]
+    _backend = name
+    return _backend
+
+
+def get_json_backend() -> str:
+    """
+    Returns the name of the JSON backend in use.
+
+    Returns:
+        "orjson", "msgspec" or "json".
+    """
+    return _backend
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Decodes a JSON document.
+
+    Args:
+        data: The JSON text, as str or UTF-8 bytes.
+
+    Returns:
+        The decoded Python object.
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON.
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any, default: Default = None) -> str:
+    """
+    Encodes an object as JSON text.
+
+    Args:
+        obj: The object to encode.
+        default: Called for objects the encoder can't handle; should return
+                 something it can.
+
+    Returns:
+        The JSON text.
+
+    Raises:
+        TypeError: If the object (or something inside it) can't be encoded.
+        ValueError: If the object can't be represented as JSON, such as
+                    circular references.
+    """
+    return _dumps(obj, default)
+
+
+set_json_backend()
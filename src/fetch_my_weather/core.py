@@ -6,24 +6,60 @@ with built-in caching and error handling to make it suitable for educational use
 """
 
 import json
+import threading
 import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from datetime import date, datetime, timezone
+from types import TracebackType
 from typing import Any, Literal
+from urllib.parse import urlsplit
 
-import requests
 from pydantic import ValidationError
 
-from .models import ResponseMetadata, ResponseWrapper, WeatherResponse
+from . import codec, deadlines, timings
+from .astronomy import moon_phase, moon_report
+from .cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    CacheBackend,
+    CachedJSON,
+    LRUCache,
+    copy_json,
+)
+from .circuit import OPEN, CircuitBreaker, CircuitOpen
+from .deadlines import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    check_deadline,
+    split_timeout,
+)
+from .fields import format_string, mock_fields, parse_fields, resolve_fields
+from .metrics import Metrics
+from .models import (
+    LazyTypedWeatherResponse,
+    LazyWeatherResponse,
+    ResponseMetadata,
+    ResponseTimings,
+    ResponseWrapper,
+    TypedWeatherResponse,
+    WeatherFields,
+    WeatherResponse,
+    construct_trusted,
+)
+from .ratelimit import ON_LIMIT_MODES, RateLimiter, RateLimitError
+from .retry import RetryPolicy, parse_retry_after, retry_reason
+from .singleflight import SingleFlight
+from .transport import DEFAULT_POOL_SIZE, WeatherTransport
 
 # --- Configuration ---
 BASE_URL = "http://wttr.in/"
-_CACHE_DURATION_SECONDS = 600  # Cache data for 10 minutes
-_USER_AGENT = "fetch-my-weather/0.4.0"  # Be polite and identify our package
-_USE_MOCK_DATA = False  # Flag to use mock data instead of real API
-
-# --- In-memory Cache ---
-# Simple dictionary to store cached responses
-# Format: { "url": (timestamp, data) }
-_cache: dict[str, tuple[float, str | bytes | dict[str, Any] | WeatherResponse]] = {}
+DEFAULT_CACHE_DURATION = 600  # Cache data for 10 minutes
+DEFAULT_USER_AGENT = "fetch-my-weather/0.4.0"  # Be polite and identify our package
+_REFRESH_WORKERS = 4  # Background refreshes of stale entries per client
+_NO_METRICS = Metrics()  # Shared by clients that collect no metrics
+_NO_BUDGET = nullcontext()  # Stands in for a Budget when a call has none
 
 # --- Mock Data ---
 # Sample responses for different request types
@@ -136,6 +172,7 @@ _MOCK_DATA = {
 }
 
 # --- Configuration Functions ---
+# These configure the default client used by the module-level get_weather
 
 
 def set_cache_duration(seconds: int) -> int:
@@ -148,9 +185,7 @@ def set_cache_duration(seconds: int) -> int:
     Returns:
         The new cache duration in seconds.
     """
-    global _CACHE_DURATION_SECONDS
-    _CACHE_DURATION_SECONDS = max(0, int(seconds))
-    return _CACHE_DURATION_SECONDS
+    return _default_client.set_cache_duration(seconds)
 
 
 def set_user_agent(user_agent: str) -> str:
@@ -163,9 +198,7 @@ def set_user_agent(user_agent: str) -> str:
     Returns:
         The new User-Agent string.
     """
-    global _USER_AGENT
-    _USER_AGENT = str(user_agent)
-    return _USER_AGENT
+    return _default_client.set_user_agent(user_agent)
 
 
 def clear_cache() -> int:
@@ -175,10 +208,245 @@ def clear_cache() -> int:
     Returns:
         Number of entries cleared from cache.
     """
-    global _cache
-    count = len(_cache)
-    _cache.clear()
-    return count
+    return _default_client.clear_cache()
+
+
+def set_base_url(base_url: str | None) -> str:
+    """
+    Send requests to another server instead of wttr.in.
+
+    Useful for pointing the package at a local fake wttr.in (see
+    ``fetch_my_weather.fake_server``) or at a self-hosted instance. Cached
+    responses are keyed by full URL, so they are never shared between servers.
+
+    Args:
+        base_url: The server's URL, e.g. "http://127.0.0.1:8002/". None goes
+                  back to BASE_URL.
+
+    Returns:
+        The new base URL.
+
+    Raises:
+        ValueError: If base_url is not an http or https URL.
+    """
+    return _default_client.set_base_url(base_url)
+
+
+def set_cache_limits(
+    max_entries: int | None = DEFAULT_MAX_ENTRIES,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+) -> tuple[int | None, int | None]:
+    """
+    Set how many entries and how many bytes the cache may hold.
+
+    When either limit is exceeded, the least recently used entries are evicted.
+
+    Args:
+        max_entries: Maximum number of cached responses, or None for no limit.
+        max_bytes: Maximum approximate size of cached data in bytes,
+                   or None for no limit.
+
+    Returns:
+        The new (max_entries, max_bytes) limits.
+    """
+    return _default_client.set_cache_limits(max_entries, max_bytes)
+
+
+def set_cache_backend(backend: CacheBackend | None) -> CacheBackend:
+    """
+    Replace the storage used for cached responses.
+
+    For example, use a SQLiteCache to keep the cache across restarts and share
+    it between processes. The previous backend is returned but not closed.
+
+    Args:
+        backend: The CacheBackend to use, or None to go back to a new
+                 in-memory LRU cache.
+
+    Returns:
+        The previous cache backend.
+    """
+    return _default_client.set_cache_backend(backend)
+
+
+def set_stale_window(
+    seconds: int, while_revalidate: bool = True, if_error: bool = True
+) -> int:
+    """
+    Set how long expired cache entries may still be served as stale data.
+
+    Within the window after an entry's cache duration ends:
+
+    - with while_revalidate, the stale data is returned immediately and a
+      fresh copy is fetched in the background;
+    - with if_error, the stale data is returned when the upstream request
+      fails, instead of an error message or mock data.
+
+    Stale responses have ``metadata.is_stale`` set to True.
+
+    Args:
+        seconds: Length of the grace window in seconds. Set to 0 to disable.
+        while_revalidate: Whether to serve stale data while refreshing.
+        if_error: Whether to serve stale data when the upstream fails.
+
+    Returns:
+        The new stale window in seconds.
+    """
+    return _default_client.set_stale_window(seconds, while_revalidate, if_error)
+
+
+def set_request_coalescing(enabled: bool) -> bool:
+    """
+    Enable or disable coalescing of identical concurrent requests.
+
+    When enabled (the default), if several threads request the same URL while
+    a fetch for it is already running, only the first one goes to the network
+    and the others wait for its result.
+
+    Args:
+        enabled: True to coalesce identical requests, False to disable.
+
+    Returns:
+        The new coalescing setting.
+    """
+    return _default_client.set_request_coalescing(enabled)
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """
+    Get the current size, limits and hit/miss/eviction counters of the cache.
+
+    Returns:
+        A dictionary of cache statistics.
+    """
+    return _default_client.get_cache_stats()
+
+
+def set_metrics(metrics: Metrics | None) -> Metrics:
+    """
+    Report cache, upstream and latency metrics to a Metrics object.
+
+    By default nothing is collected. Install an ``InMemoryMetrics`` to count
+    cache hits and misses, upstream responses by status code, errors and mock
+    fallbacks by type, and to keep latency histograms per format; read them
+    with ``get_stats()``.
+
+    Args:
+        metrics: The Metrics to report to, or None to stop collecting.
+
+    Returns:
+        The previous Metrics object.
+    """
+    return _default_client.set_metrics(metrics)
+
+
+def get_stats() -> dict[str, Any]:
+    """
+    Get a snapshot of the cache statistics and the collected metrics.
+
+    The snapshot can be rendered for Prometheus with
+    ``fetch_my_weather.metrics.to_prometheus``.
+
+    Returns:
+        A dictionary with the cache statistics under "cache", and the metrics'
+        "counters" and "histograms".
+    """
+    return _default_client.get_stats()
+
+
+def set_retry_policy(policy: RetryPolicy | None) -> RetryPolicy | None:
+    """
+    Retry failed requests before falling back to stale data, errors or mock data.
+
+    Retries are off by default. ``set_retry_policy(RetryPolicy())`` retries
+    timeouts, connection errors, 5xx and rate-limited responses with
+    exponential backoff and full jitter, honors Retry-After, and gives up once
+    the policy's deadline would be exceeded.
+
+    Args:
+        policy: The RetryPolicy to use, or None to send every request once.
+
+    Returns:
+        The previous policy.
+    """
+    return _default_client.set_retry_policy(policy)
+
+
+def set_rate_limiter(
+    limiter: RateLimiter | None, on_limit: str = "block"
+) -> RateLimiter | None:
+    """
+    Limit how often requests are sent to wttr.in.
+
+    Every request, including retries, takes a token from the limiter first.
+    When none is available, ``on_limit`` decides what happens:
+
+    - "block": wait for a token.
+    - "fail": fail at once with error_type "RateLimitError", handled like
+      any other failed request (stale-if-error still applies).
+    - "cache": serve the stale cache entry if there is one, otherwise wait.
+
+    Args:
+        limiter: A TokenBucket, FileTokenBucket or other RateLimiter, or None
+                 to send requests without limit.
+        on_limit: "block", "fail" or "cache".
+
+    Returns:
+        The previous limiter.
+
+    Raises:
+        ValueError: If on_limit is not one of the modes above.
+    """
+    return _default_client.set_rate_limiter(limiter, on_limit)
+
+
+def set_circuit_breaker(breaker: CircuitBreaker | None) -> CircuitBreaker | None:
+    """
+    Stop sending requests for a while when wttr.in keeps failing.
+
+    While the breaker is open, requests fail at once with error_type
+    "CircuitOpen" instead of waiting for a timeout, and are answered with
+    stale cache data, an error message or mock data like any other failure.
+    The breaker's state is included in ``get_stats()`` and in
+    ``ResponseMetadata.circuit_state``.
+
+    Args:
+        breaker: The CircuitBreaker to use, or None to always send requests.
+
+    Returns:
+        The previous breaker.
+    """
+    return _default_client.set_circuit_breaker(breaker)
+
+
+def set_timeouts(
+    connect: float = DEFAULT_CONNECT_TIMEOUT,
+    read: float = DEFAULT_READ_TIMEOUT,
+    deadline: float | None = None,
+) -> tuple[float, float, float | None]:
+    """
+    Set how long requests may take.
+
+    The connect timeout bounds the wait for a connection to wttr.in, and the
+    read timeout each wait for data from it. The deadline bounds a whole
+    ``get_weather`` call, including retries, backoff and rate-limit waits;
+    each request's timeouts are cut to the time left. A call that runs out
+    of time gets error_type "DeadlineExceeded" and is answered with stale
+    cache data if there is some, otherwise an error message or mock data.
+    ``get_weather``'s ``timeout`` and ``deadline`` override these per call.
+
+    Args:
+        connect: Connect timeout in seconds.
+        read: Read timeout in seconds.
+        deadline: Seconds a get_weather call may take, or None for no limit.
+
+    Returns:
+        The new (connect, read, deadline) settings.
+
+    Raises:
+        ValueError: If a timeout isn't positive or the deadline is negative.
+    """
+    return _default_client.set_timeouts(connect, read, deadline)
 
 
 def set_mock_mode(use_mock: bool) -> bool:
@@ -194,9 +462,167 @@ def set_mock_mode(use_mock: bool) -> bool:
     Returns:
         The new mock mode setting.
     """
-    global _USE_MOCK_DATA
-    _USE_MOCK_DATA = bool(use_mock)
-    return _USE_MOCK_DATA
+    return _default_client.set_mock_mode(use_mock)
+
+
+def set_typed_models(typed: bool) -> bool:
+    """
+    Choose whether ``format="json"`` returns typed models by default.
+
+    Typed models (TypedWeatherResponse) hold numbers as int or float, dates as
+    datetime.date and times as datetime.time, parsed once when the response
+    is decoded. The default string models keep every value exactly as wttr.in
+    sends it. A single call can override this with ``get_weather(typed=...)``.
+
+    Args:
+        typed: True to return TypedWeatherResponse, False for WeatherResponse.
+
+    Returns:
+        The new setting.
+    """
+    return _default_client.set_typed_models(typed)
+
+
+def set_lazy_models(lazy: bool) -> bool:
+    """
+    Choose whether ``format="json"`` returns lazily validated models by default.
+
+    Lazy models (LazyWeatherResponse) validate ``current_condition`` and
+    ``request`` straight away, but keep the forecast days, their hourly and
+    astronomy lists, and ``nearest_area`` as decoded JSON until they are first
+    read. Callers that only look at the current conditions never pay for
+    building the hourly models. A single call can override this with
+    ``get_weather(lazy=...)``.
+
+    Args:
+        lazy: True to return lazy models, False to validate everything up front.
+
+    Returns:
+        The new setting.
+    """
+    return _default_client.set_lazy_models(lazy)
+
+
+def set_offline_moon(offline: bool) -> bool:
+    """
+    Choose whether moon phase requests are computed locally by default.
+
+    With offline moon mode, ``get_weather(is_moon=True)`` computes the phase of
+    ``moon_date`` with the astronomy module instead of asking wttr.in, so it
+    needs no network and takes microseconds. Text requests return a short
+    report instead of wttr.in's moon drawing, and JSON requests return a
+    response whose only forecast day holds the moon phase and illumination.
+    PNG requests always go to wttr.in. A single call can override this with
+    ``get_weather(offline_moon=...)``.
+
+    Args:
+        offline: True to compute moon phases locally, False to fetch them.
+
+    Returns:
+        The new setting.
+    """
+    return _default_client.set_offline_moon(offline)
+
+
+def set_trusted_models(trusted: bool) -> bool:
+    """
+    Choose whether cache hits and mock data skip model validation.
+
+    Cached responses were validated when they were fetched and the mock data
+    ships with the package, so validating them again on every hit is wasted
+    work. With trusted models enabled they are built without validation where
+    the installed pydantic makes that faster, and mock models are validated
+    once and then copied. Responses fetched from wttr.in are always validated.
+
+    Trusted mock models share their nested forecast objects between calls, as
+    cache hits already do, so treat them as read-only.
+
+    Args:
+        trusted: True to skip validation for cache hits and mock data.
+
+    Returns:
+        The new setting.
+    """
+    return _default_client.set_trusted_models(trusted)
+
+
+def set_pool_size(pool_size: int) -> int:
+    """
+    Set how many keep-alive connections are kept open per host.
+
+    The current transport is closed and a new one with the requested pool
+    size is created on the next request.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host (minimum 1).
+
+    Returns:
+        The new pool size.
+    """
+    return _default_client.set_pool_size(pool_size)
+
+
+def set_transport(transport: WeatherTransport | None) -> WeatherTransport | None:
+    """
+    Use a specific transport for all requests made by get_weather.
+
+    The previous transport is returned but not closed, so the caller stays in
+    charge of its lifecycle. Pass None to go back to a module-owned transport.
+
+    Args:
+        transport: The WeatherTransport to use, or None.
+
+    Returns:
+        The previously active transport, if any.
+    """
+    return _default_client.set_transport(transport)
+
+
+def close_transport() -> None:
+    """
+    Close the shared transport and release its pooled connections.
+
+    A fresh transport is created automatically on the next request.
+    """
+    _default_client.close_transport()
+
+
+def _get_transport() -> WeatherTransport:
+    """
+    Returns the shared transport, creating it on first use.
+
+    Returns:
+        The active WeatherTransport.
+    """
+    return _default_client._get_transport()
+
+
+def _get_from_cache(
+    url: str,
+) -> str | bytes | dict[str, Any] | WeatherResponse | CachedJSON | None:
+    """
+    Checks the default client's cache for non-expired data.
+
+    Args:
+        url: URL to check in cache
+
+    Returns:
+        Cached data if available and not expired, None otherwise
+    """
+    return _default_client._get_from_cache(url)
+
+
+def _add_to_cache(
+    url: str, data: str | bytes | dict[str, Any] | WeatherResponse | CachedJSON
+) -> None:
+    """
+    Adds data to the default client's cache with current timestamp.
+
+    Args:
+        url: URL to cache
+        data: Data to cache
+    """
+    _default_client._add_to_cache(url, data)
 
 
 # --- Helper Functions ---
@@ -210,6 +636,7 @@ def _create_metadata(
     error_type: str | None = None,
     error_message: str | None = None,
     url: str | None = None,
+    is_stale: bool = False,
 ) -> ResponseMetadata:
     """
     Creates a ResponseMetadata object with the given parameters.
@@ -222,6 +649,7 @@ def _create_metadata(
         error_type: Type of error if any.
         error_message: Detailed error message if any.
         url: URL that was requested.
+        is_stale: Whether this is cached data past its cache duration.
 
     Returns:
         A ResponseMetadata object.
@@ -230,6 +658,7 @@ def _create_metadata(
         is_real_data=is_real_data,
         is_cached=is_cached,
         is_mock=is_mock,
+        is_stale=is_stale,
         status_code=status_code,
         error_type=error_type,
         error_message=error_message,
@@ -238,6 +667,29 @@ def _create_metadata(
     )
 
 
+def _attach_timings(
+    result: Any, timer: timings.PhaseTimer
+) -> str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper:
+    """
+    Adds the recorded phase timings, retries and circuit state to a result's metadata.
+
+    Args:
+        result: The result of a get_weather call with metadata.
+        timer: The timer the call's phases were recorded in.
+
+    Returns:
+        The result, with ``metadata.timings``, ``attempts``, ``backoff_ms``
+        and ``circuit_state`` set if it has metadata.
+    """
+    if isinstance(result, ResponseWrapper) and result.metadata is not None:
+        metadata = result.metadata
+        metadata.timings = ResponseTimings(**timer.as_dict())
+        metadata.attempts = timer.attempts
+        metadata.backoff_ms = timer.backoff * 1000
+        metadata.circuit_state = timer.circuit_state
+    return result  # type: ignore[no-any-return]
+
+
 def _wrap_response(
     data: Any, metadata: ResponseMetadata, with_metadata: bool
 ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
@@ -277,6 +729,7 @@ def _create_mock_data(
     with_metadata: bool,
     url: str | None = None,
     status_code: int | None = None,
+    model: type[WeatherResponse] = WeatherResponse,
 ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
     """
     Creates appropriate mock data with metadata for any error situation.
@@ -288,6 +741,7 @@ def _create_mock_data(
         with_metadata: Whether to include metadata.
         url: URL that was requested.
         status_code: HTTP status code if available.
+        model: Model class used to parse JSON responses.
 
     Returns:
         Appropriate mock data with metadata.
@@ -308,8 +762,8 @@ def _create_mock_data(
         mock_data = _MOCK_DATA["png"]
         return _wrap_response(mock_data, metadata, with_metadata)
     elif format == "raw_json":
-        # Create a deep copy and add a note about it being mock data
-        mock_data = json.loads(json.dumps(_MOCK_DATA["json"]))
+        # Copy the mock data and add a note about it being mock data
+        mock_data = copy_json(_MOCK_DATA["json"])
         # Since we know the mock data is a dictionary, safely cast and add note
         if isinstance(mock_data, dict):
             mock_data["note"] = f"Mock data provided due to error: {error_type}"
@@ -322,8 +776,8 @@ def _create_mock_data(
     elif format == "json":
         # Convert to Pydantic model
         try:
-            mock_data = json.loads(json.dumps(_MOCK_DATA["json"]))
-            mock_response = WeatherResponse.parse_obj(mock_data)
+            mock_data = copy_json(_MOCK_DATA["json"])
+            mock_response = model.parse_obj(mock_data)
             return _wrap_response(mock_response, metadata, with_metadata)
         except ValidationError:
             # If model conversion fails, use text format as fallback
@@ -334,6 +788,25 @@ def _create_mock_data(
         return _wrap_response(mock_data, metadata, with_metadata)
 
 
+def _normalize_base_url(base_url: str) -> str:
+    """
+    Checks a base URL and makes sure it ends with a slash.
+
+    Args:
+        base_url: An http or https URL.
+
+    Returns:
+        The URL, ending in "/".
+
+    Raises:
+        ValueError: If base_url is not an http or https URL.
+    """
+    parts = urlsplit(base_url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"Invalid base URL {base_url!r}: expected http(s)://host/")
+    return base_url if base_url.endswith("/") else base_url + "/"
+
+
 def _build_url(
     location: str = "",
     units: str = "",
@@ -345,6 +818,8 @@ def _build_url(
     moon_date: str | None = None,
     moon_location_hint: str | None = None,
     format: Literal["text", "json", "raw_json", "png"] = "text",
+    fields: Iterable[str] | None = None,
+    base_url: str | None = None,
 ) -> str:
     """
     Constructs the full URL for the wttr.in request.
@@ -360,11 +835,18 @@ def _build_url(
         moon_date: Specific date for moon phase in 'YYYY-MM-DD' format
         moon_location_hint: Location hint for moon phase (e.g., ',+US', ',+Paris')
         format: Output format - "text", "json", "raw_json", or "png" (default: "text")
+        fields: Names of the only values to request (see fields.FIELDS). Takes
+                precedence over format, except for PNG requests.
+        base_url: Server to send the request to, ending in "/". Defaults to
+                  BASE_URL.
 
     Returns:
         Full URL for the wttr.in request
+
+    Raises:
+        ValueError: If fields is empty or contains an unknown field name.
     """
-    url = BASE_URL
+    url = BASE_URL if base_url is None else base_url
     query_params: dict[str, str] = {}
     path_parts = []
 
@@ -420,8 +902,11 @@ def _build_url(
         # Text or JSON format uses query parameters
         url += location_part.lstrip("/")  # Add location to path
 
-        # Add format specification for JSON formats
-        if format == "json" or format == "raw_json":
+        # Add format specification for projected fields and JSON formats
+        if fields is not None:
+            # Just the requested values, in wttr.in's one-line custom format
+            query_params["format"] = format_string(resolve_fields(fields))
+        elif format == "json" or format == "raw_json":
             query_params["format"] = "j1"  # j1 is the compact JSON format from wttr.in
 
         # Add options as query parameter string if any exist
@@ -449,278 +934,1805 @@ def _build_url(
     return url
 
 
-def _get_from_cache(url: str) -> str | bytes | dict[str, Any] | WeatherResponse | None:
+# --- Response Handling ---
+
+
+def _validate_params(
+    units: str,
+    format: Literal["text", "json", "raw_json", "png"],
+    with_metadata: bool,
+    model: type[WeatherResponse] = WeatherResponse,
+) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper | None:
     """
-    Checks cache for non-expired data.
+    Validates request parameters before any URL is built.
 
     Args:
-        url: URL to check in cache
+        units: Units requested by the caller.
+        format: The requested format.
+        with_metadata: Whether to include metadata.
+        model: Model class used to parse JSON responses.
 
     Returns:
-        Cached data if available and not expired, None otherwise
+        An error result if validation fails, None otherwise.
     """
-    if _CACHE_DURATION_SECONDS <= 0:
-        return None  # Caching disabled
-
-    if url in _cache:
-        timestamp, data = _cache[url]
-        if time.time() - timestamp < _CACHE_DURATION_SECONDS:
-            # Cache hit
-            return data
-        else:
-            # Cache expired
-            del _cache[url]  # Remove expired entry
+    if units not in ["", "m", "u", "M"]:
+        return _invalid_param_result(
+            "Error: Invalid 'units' parameter. Use 'm', 'u', or 'M'.",
+            format,
+            with_metadata,
+            model,
+        )
+    # Add more validation as needed...
     return None
 
 
-def _add_to_cache(
-    url: str, data: str | bytes | dict[str, Any] | WeatherResponse
-) -> None:
+def _invalid_param_result(
+    error_msg: str,
+    format: Literal["text", "json", "raw_json", "png"],
+    with_metadata: bool,
+    model: type[WeatherResponse] = WeatherResponse,
+) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
     """
-    Adds data to the cache with current timestamp.
+    Builds the result returned for an invalid parameter.
 
     Args:
-        url: URL to cache
-        data: Data to cache
+        error_msg: The error message.
+        format: The requested format.
+        with_metadata: Whether to include metadata.
+        model: Model class used to parse JSON responses.
+
+    Returns:
+        Mock data with error metadata if metadata was requested, otherwise
+        the error message.
     """
-    if _CACHE_DURATION_SECONDS > 0:  # Only cache if enabled
-        _cache[url] = (time.time(), data)
+    if with_metadata:
+        return _create_mock_data(
+            format=format,
+            model=model,
+            error_type="ValidationError",
+            error_message=error_msg,
+            with_metadata=with_metadata,
+        )
+    return error_msg
 
 
-# --- Public API Function ---
+def _parse_model(
+    model: type[WeatherResponse], data: dict[str, Any], trusted: bool
+) -> WeatherResponse:
+    """
+    Builds a model from decoded JSON, validating it unless it is trusted.
 
+    Args:
+        model: Model class to build.
+        data: The decoded JSON.
+        trusted: Whether the data is known to be valid (cache hits and mock
+                 data in trusted mode).
 
-def get_weather(
-    location: str = "",
-    units: str = "",
-    view_options: str = "",
-    lang: str | None = None,
-    is_png: bool = False,
-    png_options: str = "",
-    is_moon: bool = False,
-    moon_date: str | None = None,
-    moon_location_hint: str | None = None,
-    format: Literal["text", "json", "raw_json", "png"] = "json",
-    use_mock: bool | None = None,
-    with_metadata: bool = False,
+    Returns:
+        The model.
+
+    Raises:
+        ValidationError: If the data is validated and doesn't match the model.
+    """
+    with timings.phase("validate"):
+        if trusted:
+            return construct_trusted(model, data)
+        return model.parse_obj(data)
+
+
+def _mock_model(model: type[WeatherResponse], trusted: bool) -> WeatherResponse:
+    """
+    Returns the mock data as a model.
+
+    Args:
+        model: Model class to build.
+        trusted: Whether to build the model from the bundled mock data with
+                 ``construct_trusted``, instead of validating a copy of it.
+
+    Returns:
+        A new model the caller may modify.
+
+    Raises:
+        ValidationError: If the mock data doesn't match the model.
+    """
+    if not trusted:
+        return model.parse_obj(copy_json(_MOCK_DATA["json"]))
+    # A new model every time: a shared one could be changed by any caller
+    mock_json: dict[str, Any] = _MOCK_DATA["json"]  # type: ignore[assignment]
+    return construct_trusted(model, mock_json)
+
+
+def _mock_result(
+    url: str,
+    format: Literal["text", "json", "raw_json", "png"],
+    is_png: bool,
+    with_metadata: bool,
+    model: type[WeatherResponse] = WeatherResponse,
+    trusted: bool = False,
 ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
     """
-    Fetches weather or moon phase information from wttr.in.
+    Builds the response returned when mock mode is enabled.
 
     Args:
-        location: The location identifier (city, airport code, coordinates,
-                 domain, area code, ~special name, or empty for current).
-                 Ignored if is_moon is True.
-        units: Units for output ('m' for metric, 'u' for USCS, 'M' for wind m/s).
-        view_options: Combined view options (e.g., '0', '1', 'n', 'q', 'F', '0q').
-        lang: Language code (e.g., 'fr', 'de', 'zh-cn').
-        is_png: If True, request a PNG image instead of text (deprecated, use format="png").
-        png_options: PNG specific options (e.g., 'p', 't', 'transparency=100').
-                    Only used for PNG format.
-        is_moon: If True, fetch moon phase instead of weather.
-        moon_date: Specific date for moon phase in 'YYYY-MM-DD' format.
-                  Only used if is_moon is True.
-        moon_location_hint: Location hint for moon phase (e.g., ',+US', ',+Paris').
-                           Only used if is_moon is True.
-        format: Output format - "text", "json", "raw_json", or "png" (default: "json").
-                When "json" is used, returns a WeatherResponse Pydantic model.
-                When "raw_json" is used, returns the raw JSON as a Python dictionary.
-        use_mock: If True, use mock data instead of making a real API request.
-                 If None, use the global setting (_USE_MOCK_DATA).
-        with_metadata: If True, include metadata about the response (real vs mock,
-                      cache status, errors). Returns a ResponseWrapper instead of direct data.
+        url: URL that would have been requested.
+        format: The requested format.
+        is_png: Whether a PNG was requested via the deprecated flag.
+        with_metadata: Whether to include metadata.
+        model: Model class used to parse JSON responses.
+        trusted: Whether to build the model without validating it each time.
 
     Returns:
-        If with_metadata is True: Returns a ResponseWrapper containing both data and metadata.
-        If format is "text": Returns the weather report as a string.
-        If format is "json": Returns the weather data as a WeatherResponse Pydantic model.
-        If format is "raw_json": Returns the raw JSON data as a Python dictionary.
-        If format is "png": Returns the PNG image data as bytes.
-        If an error occurs and with_metadata is False: Returns an error message string.
-        If an error occurs and with_metadata is True: Returns fallback data with error details in metadata.
-        No exceptions are raised.
+        Mock data in the requested format.
     """
-    # Input validation (optional but good practice)
-    if units not in ["", "m", "u", "M"]:
-        error_msg = "Error: Invalid 'units' parameter. Use 'm', 'u', or 'M'."
+    # Create metadata for mock data
+    metadata = _create_metadata(
+        is_real_data=False,
+        is_cached=False,
+        is_mock=True,
+        url=url,
+    )
+
+    if format == "png" or is_png:
+        # Cast to bytes using a type assertion for the type checker
+        mock_png: bytes = _MOCK_DATA["png"]  # type: ignore
+        return _wrap_response(mock_png, metadata, with_metadata)
+    elif format == "json":
+        try:
+            # Convert to Pydantic model
+            model_data = _mock_model(model, trusted)
+            return _wrap_response(model_data, metadata, with_metadata)
+        except ValidationError:
+            validation_error_msg: str = (
+                "Error: Mock data doesn't match the expected model structure"
+            )
+            if with_metadata:
+                return _create_mock_data(
+                    format="text",  # Fall back to text format
+                    error_type="ValidationError",
+                    error_message=validation_error_msg,
+                    with_metadata=with_metadata,
+                    url=url,
+                )
+            return validation_error_msg
+    elif format == "raw_json":
+        # Return the raw JSON as a dictionary without Pydantic conversion
+        # Copy to avoid modifying the original mock data
+        dict_data: dict[str, Any] = copy_json(_MOCK_DATA["json"])
+        return _wrap_response(dict_data, metadata, with_metadata)
+    else:
+        # Explicit cast to str for type checker
+        text_data: str = str(_MOCK_DATA["text"])
+        return _wrap_response(text_data, metadata, with_metadata)
+
+
+def _offline_moon_result(
+    url: str,
+    moon_date: str | None,
+    format: Literal["text", "json", "raw_json", "png"],
+    with_metadata: bool,
+    model: type[WeatherResponse] = WeatherResponse,
+) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+    """
+    Computes a moon phase request locally, for offline moon mode.
+
+    Args:
+        url: URL that would have been requested.
+        moon_date: Date in 'YYYY-MM-DD' format, or None for today.
+        format: The requested format ("text", "json" or "raw_json").
+        with_metadata: Whether to include metadata.
+        model: Model class used for format="json".
+
+    Returns:
+        A text report, or JSON whose only forecast day holds the moon phase.
+    """
+    try:
+        day = (
+            date.fromisoformat(moon_date)
+            if moon_date
+            else datetime.now(timezone.utc).date()
+        )
+    except ValueError:
+        error_msg = f"Error: Invalid 'moon_date' {moon_date!r}. Use 'YYYY-MM-DD'."
         if with_metadata:
             return _create_mock_data(
                 format=format,
+                model=model,
                 error_type="ValidationError",
                 error_message=error_msg,
                 with_metadata=with_metadata,
+                url=url,
             )
         return error_msg
-    # Add more validation as needed...
 
-    # Build the request URL
-    url = _build_url(
-        location=location,
-        units=units,
-        view_options=view_options,
-        lang=lang,
-        is_png=is_png,
-        png_options=png_options,
-        is_moon=is_moon,
-        moon_date=moon_date,
-        moon_location_hint=moon_location_hint,
-        format=format,
-    )
+    # Computed, so neither fetched from wttr.in nor mock data
+    metadata = _create_metadata(is_real_data=False, url=url)
+    if format == "text":
+        return _wrap_response(moon_report(day), metadata, with_metadata)
 
-    # Determine whether to use mock data
-    should_use_mock = _USE_MOCK_DATA if use_mock is None else use_mock
+    phase = moon_phase(day)
+    data: dict[str, Any] = {
+        "weather": [
+            {
+                "date": day.isoformat(),
+                "astronomy": [
+                    {
+                        "moon_phase": phase.name,
+                        "moon_illumination": str(round(phase.illumination)),
+                    }
+                ],
+            }
+        ]
+    }
+    if format == "raw_json":
+        return _wrap_response(data, metadata, with_metadata)
+    return _wrap_response(model.parse_obj(data), metadata, with_metadata)
 
-    # If mock mode is enabled, return mock data
-    if should_use_mock:
-        # Create metadata for mock data
-        metadata = _create_metadata(
-            is_real_data=False,
-            is_cached=False,
-            is_mock=True,
-            url=url,
-        )
 
-        if format == "png" or is_png:
-            # Cast to bytes using a type assertion for the type checker
-            mock_png: bytes = _MOCK_DATA["png"]  # type: ignore
-            return _wrap_response(mock_png, metadata, with_metadata)
-        elif format == "json":
-            # Make a deep copy to avoid modifying the original mock data
-            json_data = json.loads(json.dumps(_MOCK_DATA["json"]))
+def _cached_result(
+    url: str,
+    cached_data: str | bytes | dict[str, Any] | WeatherResponse | CachedJSON,
+    format: Literal["text", "json", "raw_json", "png"],
+    with_metadata: bool,
+    is_stale: bool = False,
+    status_code: int | None = None,
+    error_type: str | None = None,
+    error_message: str | None = None,
+    model: type[WeatherResponse] = WeatherResponse,
+    trusted: bool = False,
+) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+    """
+    Converts a cache hit into the requested format.
+
+    Args:
+        url: URL the data was cached under.
+        cached_data: The data found in the cache.
+        format: The requested format.
+        with_metadata: Whether to include metadata.
+        is_stale: Whether the data is past its cache duration.
+        status_code: HTTP status code of a failed refresh, if any.
+        error_type: Type of the error that made us serve stale data, if any.
+        error_message: Detailed message of that error, if any.
+        model: Model class used to parse JSON responses.
+        trusted: Whether to build models without validating the cached data.
+
+    Returns:
+        The cached data in the requested format.
+    """
+    # Create metadata for cached data
+    cache_metadata = _create_metadata(
+        is_real_data=True,  # It was real when cached
+        is_cached=True,
+        is_mock=False,
+        status_code=status_code,
+        error_type=error_type,
+        error_message=error_message,
+        url=url,
+        is_stale=is_stale,
+    )
+    # If it's JSON format and we have a cached string or dict
+    if format == "json" or format == "raw_json":
+        if isinstance(cached_data, CachedJSON):
+            # The entry keeps the decoded form and knows it is valid, so a hit
+            # builds its model from trusted data without decoding again
+            if format == "raw_json":
+                return _wrap_response(
+                    cached_data.as_dict(), cache_metadata, with_metadata
+                )
             try:
-                # Convert to Pydantic model
-                model_data: WeatherResponse = WeatherResponse.parse_obj(json_data)
-                return _wrap_response(model_data, metadata, with_metadata)
-            except ValidationError:
-                validation_error_msg: str = (
-                    "Error: Mock data doesn't match the expected model structure"
+                return _wrap_response(
+                    cached_data.as_model(model, trusted), cache_metadata, with_metadata
                 )
+            except ValidationError as e:
+                cached_error: str = f"Error: Cached data doesn't match the expected model structure: {str(e)}"
+
                 if with_metadata:
+                    # Return mock data with error metadata
                     return _create_mock_data(
-                        format="text",  # Fall back to text format
+                        format=format,
+                        model=model,
                         error_type="ValidationError",
-                        error_message=validation_error_msg,
+                        error_message=cached_error,
                         with_metadata=with_metadata,
                         url=url,
                     )
-                return validation_error_msg
-        elif format == "raw_json":
-            # Return the raw JSON as a dictionary without Pydantic conversion
-            # Make a deep copy to avoid modifying the original mock data
-            dict_data: dict[str, Any] = json.loads(json.dumps(_MOCK_DATA["json"]))
-            return _wrap_response(dict_data, metadata, with_metadata)
-        else:
-            # Explicit cast to str for type checker
-            text_data: str = str(_MOCK_DATA["text"])
-            return _wrap_response(text_data, metadata, with_metadata)
-
-    # Check cache first
-    cached_data = _get_from_cache(url)
-    if cached_data is not None:
-        # Create metadata for cached data
-        cache_metadata = _create_metadata(
-            is_real_data=True,  # It was real when cached
-            is_cached=True,
-            is_mock=False,
-            url=url,
-        )
-        # If it's JSON format and we have a cached string or dict
-        if format == "json" or format == "raw_json":
-            if isinstance(cached_data, str):
-                try:
-                    json_data = json.loads(cached_data)
-                    # For raw_json, just return the parsed dictionary
-                    if format == "raw_json":
-                        parsed_dict: dict[str, Any] = json_data
-                        return _wrap_response(
-                            parsed_dict, cache_metadata, with_metadata
-                        )
-                    # For json, convert to Pydantic model
-                    parsed_model: WeatherResponse = WeatherResponse.parse_obj(json_data)
-                    return _wrap_response(parsed_model, cache_metadata, with_metadata)
-                except (json.JSONDecodeError, ValidationError) as e:
-                    # If JSON parsing fails and metadata is requested, create error metadata
-                    if with_metadata:
-                        metadata = _create_metadata(
-                            is_real_data=False,
-                            is_cached=True,
-                            is_mock=False,
-                            error_type=e.__class__.__name__,
-                            error_message=str(e),
-                            url=url,
-                        )
-                        # Return mock data with error metadata
-                        return _create_mock_data(
-                            format=format,
-                            error_type=e.__class__.__name__,
-                            error_message=str(e),
-                            with_metadata=with_metadata,
-                            url=url,
-                        )
 
-                    # If not with_metadata, fall back to original behavior
-                    if isinstance(cached_data, str):
-                        error_text: str = cached_data
-                        return error_text
-                    # Fallback for other types
-                    return str(cached_data)
-            elif isinstance(cached_data, WeatherResponse):
-                # If it's already a WeatherResponse object and format is json
-                if format == "json":
-                    weather_model: WeatherResponse = cached_data
-                    return _wrap_response(weather_model, cache_metadata, with_metadata)
-                # If format is raw_json, convert WeatherResponse to dict
-                elif format == "raw_json":
-                    # Convert Pydantic model to dict
-                    model_dict: dict[str, Any] = json.loads(cached_data.json())
-                    return _wrap_response(model_dict, cache_metadata, with_metadata)
-            elif isinstance(cached_data, dict):
-                # If it's a dict and format is raw_json, return as is
+                return cached_error
+        elif isinstance(cached_data, str):
+            try:
+                json_data = codec.loads(cached_data)
+                # For raw_json, just return the parsed dictionary
                 if format == "raw_json":
-                    raw_dict: dict[str, Any] = cached_data
-                    return _wrap_response(raw_dict, cache_metadata, with_metadata)
-                # If format is json, convert to WeatherResponse
-                try:
-                    cached_model: WeatherResponse = WeatherResponse.parse_obj(
-                        cached_data
+                    parsed_dict: dict[str, Any] = json_data
+                    return _wrap_response(parsed_dict, cache_metadata, with_metadata)
+                # For json, convert to Pydantic model
+                parsed_model = _parse_model(model, json_data, trusted)
+                return _wrap_response(parsed_model, cache_metadata, with_metadata)
+            except (json.JSONDecodeError, ValidationError) as e:
+                # If JSON parsing fails and metadata is requested, return mock data
+                if with_metadata:
+                    # Return mock data with error metadata
+                    return _create_mock_data(
+                        format=format,
+                        model=model,
+                        error_type=e.__class__.__name__,
+                        error_message=str(e),
+                        with_metadata=with_metadata,
+                        url=url,
                     )
-                    return _wrap_response(cached_model, cache_metadata, with_metadata)
-                except ValidationError as e:
-                    struct_error: str = f"Error: Cached data doesn't match the expected model structure: {str(e)}"
 
-                    if with_metadata:
-                        # Return mock data with error metadata
-                        return _create_mock_data(
-                            format=format,
-                            error_type="ValidationError",
-                            error_message=struct_error,
-                            with_metadata=with_metadata,
-                            url=url,
-                        )
+                # If not with_metadata, fall back to original behavior
+                if isinstance(cached_data, str):
+                    error_text: str = cached_data
+                    return error_text
+                # Fallback for other types
+                return str(cached_data)
+        elif isinstance(cached_data, WeatherResponse):
+            # If it's already a WeatherResponse object and format is json
+            if format == "json":
+                # A copy, so the metadata set on it isn't seen by later hits
+                weather_model: WeatherResponse = (
+                    cached_data.copy()
+                    if type(cached_data) is model
+                    else _parse_model(model, cached_data.dict(), trusted)
+                )
+                return _wrap_response(weather_model, cache_metadata, with_metadata)
+            # If format is raw_json, convert WeatherResponse to dict
+            elif format == "raw_json":
+                # Convert Pydantic model to dict
+                model_dict: dict[str, Any] = codec.loads(cached_data.json())
+                return _wrap_response(model_dict, cache_metadata, with_metadata)
+        elif isinstance(cached_data, dict):
+            # If it's a dict and format is raw_json, return as is
+            if format == "raw_json":
+                raw_dict: dict[str, Any] = cached_data
+                return _wrap_response(raw_dict, cache_metadata, with_metadata)
+            # If format is json, convert to WeatherResponse
+            try:
+                cached_model = _parse_model(model, cached_data, trusted)
+                return _wrap_response(cached_model, cache_metadata, with_metadata)
+            except ValidationError as e:
+                struct_error: str = f"Error: Cached data doesn't match the expected model structure: {str(e)}"
+
+                if with_metadata:
+                    # Return mock data with error metadata
+                    return _create_mock_data(
+                        format=format,
+                        model=model,
+                        error_type="ValidationError",
+                        error_message=struct_error,
+                        with_metadata=with_metadata,
+                        url=url,
+                    )
+
+                return struct_error
+    # Handle other formats or types
+    if isinstance(cached_data, str):
+        cached_text: str = cached_data
+        return _wrap_response(cached_text, cache_metadata, with_metadata)
+    elif isinstance(cached_data, bytes):
+        binary_data: bytes = cached_data
+        return _wrap_response(binary_data, cache_metadata, with_metadata)
+    else:
+        # For any other type, convert to string
+        fallback: str = str(cached_data)
+        return _wrap_response(fallback, cache_metadata, with_metadata)
+
+
+def _handle_request_error(
+    e: Exception,
+    url: str,
+    format: Literal["text", "json", "raw_json", "png"],
+    with_metadata: bool,
+    model: type[WeatherResponse] = WeatherResponse,
+) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+    """
+    Converts an exception raised while fetching into an error result.
+
+    Args:
+        e: The exception that was raised.
+        url: URL that was requested.
+        format: The requested format.
+        with_metadata: Whether to include metadata.
+        model: Model class used to parse JSON responses.
+
+    Returns:
+        An error message, or mock data with error metadata.
+    """
+    error_type = e.__class__.__name__
+    if error_type == "Timeout":
+        error_message = f"Error: Request timed out while connecting to {url}"
+    elif error_type == "ConnectionError":
+        error_message = f"Error: Could not connect to {url}. Check network connection."
+    elif error_type == "CircuitOpen":
+        error_message = f"Error: {e} ({url} was not requested)"
+    elif error_type == "DeadlineExceeded":
+        error_message = f"Error: {e} while fetching {url}"
+    elif error_type == "RateLimitError":
+        error_message = (
+            f"Error: Client-side rate limit reached, {url} was not requested"
+        )
+    elif "requests" in str(e.__class__.__module__):
+        # Catch any other requests-related error
+        error_message = f"Error: An unexpected network error occurred: {e}"
+    else:
+        # Catch any other unexpected error during processing
+        # This shouldn't normally happen with the above catches, but belt-and-suspenders
+        error_message = f"Error: An unexpected error occurred: {e}"
+
+    # If with_metadata is enabled, return mock data with error information
+    if with_metadata:
+        return _create_mock_data(
+            format=format,
+            model=model,
+            error_type=error_type,
+            error_message=error_message,
+            with_metadata=with_metadata,
+            url=url,
+        )
+
+    # Otherwise return the error message
+    return error_message
 
-                    return struct_error
-        # Handle other formats or types
-        if isinstance(cached_data, str):
-            cached_text: str = cached_data
-            return _wrap_response(cached_text, cache_metadata, with_metadata)
-        elif isinstance(cached_data, bytes):
-            binary_data: bytes = cached_data
-            return _wrap_response(binary_data, cache_metadata, with_metadata)
+
+def _copy_result(
+    result: str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper,
+) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+    """
+    Copies a result so callers sharing one fetch can't affect each other.
+
+    Args:
+        result: A result returned by _fetch.
+
+    Returns:
+        A copy with its own containers and metadata.
+    """
+    if isinstance(result, ResponseWrapper):
+        return ResponseWrapper(
+            data=_copy_result(result.data), metadata=result.metadata.copy()
+        )
+    if isinstance(result, WeatherResponse):
+        return result.copy()
+    if isinstance(result, dict):
+        data: dict[str, Any] = copy_json(result)
+        return data
+    return result
+
+
+def _fields_result(
+    result: str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper,
+    names: tuple[str, ...],
+    with_metadata: bool,
+) -> str | WeatherFields | ResponseWrapper:
+    """
+    Converts the text result of a projected request into a WeatherFields record.
+
+    Args:
+        result: The result of requesting the projection URL as text, with
+                metadata.
+        names: The requested field names.
+        with_metadata: Whether to include metadata.
+
+    Returns:
+        The record, or on errors an error message (without metadata) or a
+        record of mock values with error metadata.
+    """
+    if isinstance(result, ResponseWrapper):
+        metadata = result.metadata
+        data: Any = result.data
+    else:
+        metadata, data = _create_metadata(), result
+
+    if metadata.error_type is not None and not metadata.is_stale:
+        # The request failed and there was no stale data to fall back on
+        if not with_metadata:
+            return metadata.error_message or str(data)
+        record = mock_fields(names)
+    elif isinstance(data, WeatherFields):
+        record = data
+    elif isinstance(data, str):
+        record = parse_fields(data, names)
+    else:
+        record = WeatherFields(requested=list(names))
+
+    record.metadata = metadata
+    if with_metadata:
+        return ResponseWrapper(data=record, metadata=metadata)
+    return record
+
+
+def _fields_error(
+    error_message: str, with_metadata: bool
+) -> str | WeatherFields | ResponseWrapper:
+    """
+    Builds the result for a projected request with invalid parameters.
+
+    Args:
+        error_message: What was wrong.
+        with_metadata: Whether to include metadata.
+
+    Returns:
+        The error message, or an empty record with error metadata.
+    """
+    if not with_metadata:
+        return error_message
+    metadata = _create_metadata(
+        is_real_data=False,
+        is_mock=True,
+        error_type="ValidationError",
+        error_message=error_message,
+    )
+    return ResponseWrapper(data=WeatherFields(metadata=metadata), metadata=metadata)
+
+
+# --- Client ---
+
+
+class WeatherClient:
+    """
+    A wttr.in client with its own configuration, cache, transport and stats.
+
+    Clients are independent of each other: changing the cache duration, mock
+    mode or cache backend of one client does not affect any other, so several
+    differently tuned clients can run in one process. A client can be shared
+    between threads. The module-level functions such as ``get_weather`` and
+    ``set_cache_duration`` use a default client::
+
+        client = WeatherClient(cache_duration=60, user_agent="my-app/1.0")
+        weather = client.get_weather("London")
+    """
+
+    def __init__(
+        self,
+        cache_duration: int = DEFAULT_CACHE_DURATION,
+        user_agent: str = DEFAULT_USER_AGENT,
+        use_mock: bool = False,
+        typed: bool = False,
+        lazy: bool = False,
+        trusted: bool = False,
+        offline_moon: bool = False,
+        cache: CacheBackend | None = None,
+        transport: WeatherTransport | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        base_url: str | None = None,
+        metrics: Metrics | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        on_rate_limit: str = "block",
+        circuit_breaker: CircuitBreaker | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        deadline: float | None = None,
+    ) -> None:
+        """
+        Create a new client.
+
+        Args:
+            cache_duration: How long to cache responses, in seconds (0 disables).
+            user_agent: The User-Agent string sent with requests.
+            use_mock: Whether to return mock data instead of calling wttr.in.
+            typed: Whether ``format="json"`` returns TypedWeatherResponse
+                   models instead of WeatherResponse.
+            lazy: Whether ``format="json"`` returns models whose forecast
+                  sections are validated on first access.
+            trusted: Whether cache hits and mock data skip model validation
+                     (see ``set_trusted_models``).
+            offline_moon: Whether moon phase requests are computed locally
+                          (see ``set_offline_moon``).
+            cache: Cache backend to use. If None, the client gets its own
+                   in-memory LRU cache.
+            transport: Transport to send requests over. If None, the client
+                       creates a pooled transport on the first request.
+            pool_size: Keep-alive connections per host for a transport the
+                       client creates.
+            base_url: Server to send requests to instead of wttr.in (see
+                      ``set_base_url``). None uses BASE_URL.
+            metrics: Metrics object to report to (see ``set_metrics``). None
+                     collects nothing.
+            retry: RetryPolicy for failed requests (see ``set_retry_policy``).
+                   None sends every request once.
+            rate_limiter: RateLimiter every request takes a token from (see
+                          ``set_rate_limiter``). None sends without limit.
+            on_rate_limit: What to do when no token is available: "block",
+                           "fail" or "cache".
+            circuit_breaker: CircuitBreaker that stops requests while the
+                             upstream is failing (see
+                             ``set_circuit_breaker``). None always sends.
+            connect_timeout: Seconds to wait for a connection (see
+                             ``set_timeouts``).
+            read_timeout: Seconds to wait for each read from the server.
+            deadline: Seconds a get_weather call may take, or None for no
+                      limit.
+
+        Raises:
+            ValueError: If base_url, on_rate_limit or a timeout is invalid.
+        """
+        self._cache_duration = max(0, int(cache_duration))
+        self._user_agent = str(user_agent)
+        self._use_mock = bool(use_mock)
+        self._typed = bool(typed)
+        self._lazy = bool(lazy)
+        self._trusted = bool(trusted)
+        self._offline_moon = bool(offline_moon)
+        self._pool_size = max(1, int(pool_size))
+        self._base_url = None if base_url is None else _normalize_base_url(base_url)
+        self._metrics = metrics if metrics is not None else _NO_METRICS
+        self._retry = retry
+        self._rate_limiter: RateLimiter | None = None
+        self._on_rate_limit = "block"
+        self.set_rate_limiter(rate_limiter, on_rate_limit)
+        self._circuit_breaker = circuit_breaker
+        self._connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self._read_timeout = DEFAULT_READ_TIMEOUT
+        self._deadline: float | None = None
+        self.set_timeouts(connect_timeout, read_timeout, deadline)
+        self._stale_window = 0  # Grace period after expiry where stale data may be used
+        self._stale_while_revalidate = True  # Serve stale data while refreshing
+        self._stale_if_error = True  # Serve stale data when the upstream request fails
+        self._coalesce_requests = True  # Share one request between identical callers
+
+        # Guards replacing the transport and cache backend
+        self._lock = threading.Lock()
+        self._transport = transport
+        # Format: { "url": (timestamp, data) }
+        self._cache: CacheBackend = (
+            cache
+            if cache is not None
+            else LRUCache(max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES)
+        )
+
+        # Identical requests in flight at the same time share one upstream fetch
+        self._inflight: SingleFlight[Any] = SingleFlight()
+
+        # Refreshes of stale entries run here; one refresh per URL at a time
+        self._refresh_executor: ThreadPoolExecutor | None = None
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+
+    # --- Configuration ---
+
+    def set_cache_duration(self, seconds: int) -> int:
+        """
+        Set how long to cache weather data in seconds.
+
+        Args:
+            seconds: Duration in seconds. Set to 0 to disable caching.
+
+        Returns:
+            The new cache duration in seconds.
+        """
+        self._cache_duration = max(0, int(seconds))
+        return self._cache_duration
+
+    def set_user_agent(self, user_agent: str) -> str:
+        """
+        Set the User-Agent string sent with requests.
+
+        Args:
+            user_agent: The User-Agent string to use.
+
+        Returns:
+            The new User-Agent string.
+        """
+        self._user_agent = str(user_agent)
+        return self._user_agent
+
+    def set_base_url(self, base_url: str | None) -> str:
+        """
+        Send this client's requests to another server instead of wttr.in.
+
+        Args:
+            base_url: The server's URL. None goes back to BASE_URL.
+
+        Returns:
+            The new base URL.
+
+        Raises:
+            ValueError: If base_url is not an http or https URL.
+        """
+        self._base_url = None if base_url is None else _normalize_base_url(base_url)
+        return BASE_URL if self._base_url is None else self._base_url
+
+    def set_mock_mode(self, use_mock: bool) -> bool:
+        """
+        Enable or disable the use of mock data instead of real API calls.
+
+        Args:
+            use_mock: True to use mock data, False to use real API.
+
+        Returns:
+            The new mock mode setting.
+        """
+        self._use_mock = bool(use_mock)
+        return self._use_mock
+
+    def set_typed_models(self, typed: bool) -> bool:
+        """
+        Choose whether ``format="json"`` returns typed models by default.
+
+        Args:
+            typed: True to return TypedWeatherResponse, False for the string
+                   WeatherResponse models.
+
+        Returns:
+            The new setting.
+        """
+        self._typed = bool(typed)
+        return self._typed
+
+    def set_lazy_models(self, lazy: bool) -> bool:
+        """
+        Choose whether ``format="json"`` returns lazily validated models by default.
+
+        Args:
+            lazy: True to return models whose forecast sections are validated
+                  on first access, False to validate everything up front.
+
+        Returns:
+            The new setting.
+        """
+        self._lazy = bool(lazy)
+        return self._lazy
+
+    def set_offline_moon(self, offline: bool) -> bool:
+        """
+        Choose whether moon phase requests are computed locally by default.
+
+        Args:
+            offline: True to compute moon phases locally, False to fetch them.
+
+        Returns:
+            The new setting.
+        """
+        self._offline_moon = bool(offline)
+        return self._offline_moon
+
+    def _use_offline_moon(
+        self,
+        is_moon: bool,
+        format: str,
+        is_png: bool,
+        offline_moon: bool | None = None,
+    ) -> bool:
+        """
+        Decides whether a request is answered by the astronomy module.
+
+        Args:
+            is_moon: Whether the moon phase was requested.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            offline_moon: Per-call setting, or None for the client's.
+
+        Returns:
+            True for moon phase requests in offline moon mode, except PNGs.
+        """
+        if not is_moon or is_png or format == "png":
+            return False
+        return self._offline_moon if offline_moon is None else bool(offline_moon)
+
+    def _model(
+        self, typed: bool | None = None, lazy: bool | None = None
+    ) -> type[WeatherResponse]:
+        """
+        Picks the model class for a JSON request.
+
+        Args:
+            typed: Per-call typed setting, or None for the client's.
+            lazy: Per-call lazy setting, or None for the client's.
+
+        Returns:
+            WeatherResponse, TypedWeatherResponse or one of their lazy variants.
+        """
+        use_typed = self._typed if typed is None else bool(typed)
+        use_lazy = self._lazy if lazy is None else bool(lazy)
+        if use_lazy:
+            return LazyTypedWeatherResponse if use_typed else LazyWeatherResponse
+        return TypedWeatherResponse if use_typed else WeatherResponse
+
+    def set_trusted_models(self, trusted: bool) -> bool:
+        """
+        Choose whether cache hits and mock data skip model validation.
+
+        Args:
+            trusted: True to skip validation for cache hits and mock data.
+                     Responses fetched from wttr.in are always validated.
+
+        Returns:
+            The new setting.
+        """
+        self._trusted = bool(trusted)
+        return self._trusted
+
+    def set_stale_window(
+        self, seconds: int, while_revalidate: bool = True, if_error: bool = True
+    ) -> int:
+        """
+        Set how long expired cache entries may still be served as stale data.
+
+        See ``fetch_my_weather.set_stale_window`` for details.
+
+        Args:
+            seconds: Length of the grace window in seconds. Set to 0 to disable.
+            while_revalidate: Whether to serve stale data while refreshing.
+            if_error: Whether to serve stale data when the upstream fails.
+
+        Returns:
+            The new stale window in seconds.
+        """
+        self._stale_window = max(0, int(seconds))
+        self._stale_while_revalidate = bool(while_revalidate)
+        self._stale_if_error = bool(if_error)
+        return self._stale_window
+
+    def set_request_coalescing(self, enabled: bool) -> bool:
+        """
+        Enable or disable coalescing of identical concurrent requests.
+
+        Args:
+            enabled: True to coalesce identical requests, False to disable.
+
+        Returns:
+            The new coalescing setting.
+        """
+        self._coalesce_requests = bool(enabled)
+        return self._coalesce_requests
+
+    # --- Cache ---
+
+    @property
+    def cache(self) -> CacheBackend:
+        """The cache backend used by this client."""
+        return self._cache
+
+    def clear_cache(self) -> int:
+        """
+        Clear all cached weather data.
+
+        Returns:
+            Number of entries cleared from cache.
+        """
+        return self._cache.clear()
+
+    def set_cache_limits(
+        self,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+    ) -> tuple[int | None, int | None]:
+        """
+        Set how many entries and how many bytes the cache may hold.
+
+        Args:
+            max_entries: Maximum number of cached responses, or None for no limit.
+            max_bytes: Maximum approximate size of cached data in bytes,
+                       or None for no limit.
+
+        Returns:
+            The new (max_entries, max_bytes) limits.
+        """
+        return self._cache.set_limits(max_entries, max_bytes)
+
+    def set_cache_backend(self, backend: CacheBackend | None) -> CacheBackend:
+        """
+        Replace the storage used for cached responses.
+
+        Args:
+            backend: The CacheBackend to use, or None to go back to a new
+                     in-memory LRU cache.
+
+        Returns:
+            The previous cache backend, which is not closed.
+        """
+        with self._lock:
+            previous = self._cache
+            self._cache = (
+                backend
+                if backend is not None
+                else LRUCache(
+                    max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES
+                )
+            )
+            return previous
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """
+        Get the current size, limits and hit/miss/eviction counters of the cache.
+
+        Returns:
+            A dictionary of cache statistics.
+        """
+        return self._cache.stats()
+
+    # --- Metrics ---
+
+    def set_metrics(self, metrics: Metrics | None) -> Metrics:
+        """
+        Report this client's metrics to a Metrics object.
+
+        Args:
+            metrics: The Metrics to report to, or None to stop collecting.
+
+        Returns:
+            The previous Metrics object.
+        """
+        previous = self._metrics
+        self._metrics = metrics if metrics is not None else _NO_METRICS
+        return previous
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get a snapshot of the cache statistics and the collected metrics.
+
+        Returns:
+            A dictionary with the cache statistics under "cache", and the
+            metrics' "counters" and "histograms".
+        """
+        stats = {"cache": self._cache.stats(), **self._metrics.snapshot()}
+        if self._circuit_breaker is not None:
+            stats["circuit"] = self._circuit_breaker.stats()
+        return stats
+
+    def _observe_call(
+        self, format: str, seconds: float, result: Any, projected: bool = False
+    ) -> None:
+        """
+        Reports a finished get_weather call to the metrics.
+
+        Args:
+            format: The requested format.
+            seconds: How long the call took.
+            result: What the call returned.
+            projected: Whether only some fields were requested.
+        """
+        metrics = self._metrics
+        metrics.request("fields" if projected else format, seconds)
+        metadata = getattr(result, "metadata", None)
+        if (
+            isinstance(metadata, ResponseMetadata)
+            and metadata.is_mock
+            and metadata.error_type
+        ):
+            metrics.fallback(metadata.error_type)
+
+    # --- Timeouts ---
+
+    def set_timeouts(
+        self,
+        connect: float = DEFAULT_CONNECT_TIMEOUT,
+        read: float = DEFAULT_READ_TIMEOUT,
+        deadline: float | None = None,
+    ) -> tuple[float, float, float | None]:
+        """
+        Set how long this client's requests may take.
+
+        Args:
+            connect: Connect timeout in seconds.
+            read: Read timeout in seconds.
+            deadline: Seconds a get_weather call may take, or None for no limit.
+
+        Returns:
+            The new (connect, read, deadline) settings.
+
+        Raises:
+            ValueError: If a timeout isn't positive or the deadline is negative.
+        """
+        connect, read = split_timeout((connect, read))
+        self._deadline = None if deadline is None else check_deadline(deadline)
+        self._connect_timeout, self._read_timeout = connect, read
+        return self._connect_timeout, self._read_timeout, self._deadline
+
+    def _budget(
+        self, timeout: float | tuple[float, float] | None, deadline: float | None
+    ) -> AbstractContextManager[Any]:
+        """
+        Starts the clock on one get_weather call.
+
+        Args:
+            timeout: The call's timeout in seconds or (connect, read) tuple, or
+                     None for the client's timeouts.
+            deadline: The call's deadline in seconds, or None for the client's.
+
+        Returns:
+            A Budget to enter for the duration of the call, or a context
+            manager that does nothing if the client's timeouts apply and there
+            is no deadline.
+
+        Raises:
+            ValueError: If the timeout or deadline is invalid.
+        """
+        if deadline is not None:
+            deadline = check_deadline(deadline)
         else:
-            # For any other type, convert to string
-            fallback: str = str(cached_data)
-            return _wrap_response(fallback, cache_metadata, with_metadata)
+            deadline = self._deadline
+        if timeout is None and deadline is None:
+            return _NO_BUDGET
+        if timeout is None:
+            connect, read = self._connect_timeout, self._read_timeout
+        else:
+            connect, read = split_timeout(timeout)
+        return deadlines.Budget(connect, read, deadline)
+
+    # --- Retries ---
+
+    def set_retry_policy(self, policy: RetryPolicy | None) -> RetryPolicy | None:
+        """
+        Set the policy for retrying failed requests.
+
+        Args:
+            policy: The RetryPolicy to use, or None to send every request once.
+
+        Returns:
+            The previous policy.
+        """
+        previous = self._retry
+        self._retry = policy
+        return previous
+
+    # --- Circuit Breaker ---
+
+    def set_circuit_breaker(
+        self, breaker: CircuitBreaker | None
+    ) -> CircuitBreaker | None:
+        """
+        Set the circuit breaker this client's requests go through.
+
+        Args:
+            breaker: The CircuitBreaker to use, or None to always send requests.
+
+        Returns:
+            The previous breaker.
+        """
+        previous = self._circuit_breaker
+        self._circuit_breaker = breaker
+        return previous
+
+    def _circuit_observed(self, breaker: CircuitBreaker, before: str) -> None:
+        """
+        Reports the breaker's state to the request's timer and the metrics.
+
+        Args:
+            breaker: The client's circuit breaker.
+            before: Its state before the last call to it.
+        """
+        state = breaker.state
+        timer = timings.current()
+        if timer is not None:
+            timer.circuit_state = state
+        if state != before:
+            self._metrics.circuit_changed(state)
+
+    def _circuit_record(self, breaker: CircuitBreaker, success: bool) -> None:
+        """
+        Reports the outcome of a request to the circuit breaker.
+
+        Args:
+            breaker: The client's circuit breaker.
+            success: False if the upstream failed.
+        """
+        before = breaker.state
+        breaker.record(success)
+        self._circuit_observed(breaker, before)
+
+    def _circuit_open_result(
+        self,
+        breaker: CircuitBreaker,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        with_metadata: bool,
+        stale_data: Any,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Builds the result for a request rejected by an open circuit.
+
+        Args:
+            breaker: The client's circuit breaker.
+            url: URL that would have been requested.
+            format: The requested format.
+            with_metadata: Whether to include metadata.
+            stale_data: Stale cache entry to serve, if any.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            Stale data, an error message or mock data with error_type
+            "CircuitOpen".
+        """
+        self._circuit_observed(breaker, breaker.state)
+        return self._failed_result(
+            CircuitOpen(breaker.retry_after()),
+            url,
+            format,
+            with_metadata,
+            stale_data,
+            model,
+        )
 
-    # --- Perform the actual request ---
-    headers = {"User-Agent": _USER_AGENT}
-    # Add Accept-Language header if language is specified (alternative to ?lang=)
-    # Note: ?lang= or subdomain is generally preferred by wttr.in documentation
-    # if lang:
-    #     headers['Accept-Language'] = lang
+    # --- Rate Limiting ---
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)  # 15 second timeout
+    def set_rate_limiter(
+        self, limiter: RateLimiter | None, on_limit: str = "block"
+    ) -> RateLimiter | None:
+        """
+        Set the rate limiter this client's requests take tokens from.
+
+        Args:
+            limiter: The RateLimiter to use, or None to send without limit.
+            on_limit: "block", "fail" or "cache" (see ``set_rate_limiter``).
+
+        Returns:
+            The previous limiter.
+
+        Raises:
+            ValueError: If on_limit is not one of the modes above.
+        """
+        if on_limit not in ON_LIMIT_MODES:
+            raise ValueError(
+                f"on_limit must be one of {', '.join(ON_LIMIT_MODES)}, got {on_limit!r}"
+            )
+        previous = self._rate_limiter
+        self._rate_limiter = limiter
+        self._on_rate_limit = on_limit
+        return previous
+
+    def _throttle(
+        self,
+        limiter: RateLimiter,
+        format: str,
+        wait: bool,
+        budget: deadlines.Budget | None = None,
+    ) -> None:
+        """
+        Takes a token from the rate limiter before a request.
+
+        Args:
+            limiter: The client's rate limiter.
+            format: The requested format.
+            wait: Whether to wait for a token if none is available.
+            budget: The call's budget; no token is waited for past its deadline.
+
+        Raises:
+            RateLimitError: If no token is available and wait is False.
+            DeadlineExceeded: If no token will be available before the deadline.
+        """
+        with timings.phase("throttle"):
+            delay = limiter.try_acquire()
+            if delay == 0.0:
+                return
+            if not wait:
+                self._metrics.rate_limited(format, 0.0, rejected=True)
+                raise RateLimitError(delay)
+            start = time.perf_counter()
+            acquired = limiter.acquire(None if budget is None else budget.remaining())
+            self._metrics.rate_limited(
+                format, time.perf_counter() - start, rejected=not acquired
+            )
+            if not acquired and budget is not None:
+                raise budget.exceeded()
+
+    def _upstream_get(
+        self,
+        url: str,
+        format: str,
+        transport: WeatherTransport | None = None,
+        has_stale: bool = False,
+    ) -> Any:
+        """
+        Sends a request to wttr.in, retrying failures as the retry policy allows.
+
+        Args:
+            url: URL to request.
+            format: The requested format.
+            transport: Transport to use (defaults to the client's transport).
+            has_stale: Whether a stale cache entry can answer the request if
+                       this one fails; "cache" rate limiting then fails
+                       instead of waiting.
+
+        Returns:
+            The HTTP response to the last attempt.
+
+        Raises:
+            Exception: Whatever the transport raised on the last attempt.
+            RateLimitError: If the rate limiter has no token for a request
+                               and isn't allowed to wait.
+            DeadlineExceeded: If the call's deadline passed before a response.
+        """
+        transport = transport or self._get_transport()
+        mode = self._on_rate_limit
+        wait = mode == "block" or (mode == "cache" and not has_stale)
+        policy = self._retry
+        if policy is None:
+            return self._send(url, format, transport, wait)
+
+        start = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            response = error = None
+            try:
+                response = self._send(url, format, transport, wait)
+            except Exception as e:
+                error = e
+            reason = retry_reason(response, error)
+            delay = None
+            if reason is not None:
+                retry_after = None
+                if response is not None:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = policy.next_delay(
+                    reason, attempts, time.monotonic() - start, retry_after
+                )
+            breaker = self._circuit_breaker
+            if delay is not None and breaker is not None and breaker.state == OPEN:
+                delay = None  # The circuit opened; report this failure instead
+            budget = deadlines.current()
+            if delay is not None and budget is not None:
+                remaining = budget.remaining()
+                if remaining is not None and delay >= remaining:
+                    delay = None  # No time left for another attempt
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()  # Hand the connection back to the pool
+            self._metrics.retry(format, reason, delay)  # type: ignore[arg-type]
+            timer = timings.current()
+            if timer is not None:
+                timer.backoff += delay
+            time.sleep(delay)
+
+    def _send(
+        self, url: str, format: str, transport: WeatherTransport, wait: bool = True
+    ) -> Any:
+        """
+        Sends one request to wttr.in and reports it to the metrics.
+
+        Args:
+            url: URL to request.
+            format: The requested format.
+            transport: Transport to use.
+            wait: Whether to wait for a rate limiter token.
+
+        Returns:
+            The HTTP response.
+
+        Raises:
+            Exception: Whatever the transport raises.
+            RateLimitError: If no token is available and wait is False.
+            CircuitOpen: If the circuit breaker is open.
+            DeadlineExceeded: If the call's deadline has passed, or cut the
+                              request short.
+        """
+        budget = deadlines.current()
+        if budget is not None and budget.expired():
+            raise budget.exceeded()
+        breaker = self._circuit_breaker
+        if breaker is not None:
+            before = breaker.state
+            allowed = breaker.allow()
+            self._circuit_observed(breaker, before)
+            if not allowed:
+                raise CircuitOpen(breaker.retry_after())
+        try:
+            limiter = self._rate_limiter
+            if limiter is not None:
+                self._throttle(limiter, format, wait, budget)
+            if budget is None:
+                timeout = (self._connect_timeout, self._read_timeout)
+            else:
+                timeout = budget.timeout()
+        except BaseException:
+            if breaker is not None:
+                breaker.release()  # Not sent; free a half-open probe slot
+            raise
+        timer = timings.current()
+        if timer is not None:
+            timer.attempts += 1
+        start = time.perf_counter()
+        try:
+            response = transport.get(
+                url, headers=self._request_headers(), timeout=timeout
+            )
+        except Exception as e:
+            self._metrics.upstream_error(
+                format, e.__class__.__name__, time.perf_counter() - start
+            )
+            if budget is not None and budget.expired():
+                # Cut short by the caller's deadline; not the server's fault,
+                # so the circuit breaker isn't told
+                if breaker is not None:
+                    breaker.release()
+                raise budget.exceeded() from e
+            if breaker is not None:
+                self._circuit_record(breaker, retry_reason(error=e) is None)
+            raise
+        self._metrics.upstream_response(
+            format, response.status_code, time.perf_counter() - start
+        )
+        if breaker is not None:
+            self._circuit_record(breaker, retry_reason(response) is None)
+        return response
+
+    # --- Transport ---
+
+    def set_pool_size(self, pool_size: int) -> int:
+        """
+        Set how many keep-alive connections are kept open per host.
+
+        The current transport is closed and a new one with the requested pool
+        size is created on the next request.
+
+        Args:
+            pool_size: Maximum number of pooled connections per host (minimum 1).
+
+        Returns:
+            The new pool size.
+        """
+        self._pool_size = max(1, int(pool_size))
+        self.close_transport()
+        return self._pool_size
+
+    def set_transport(
+        self, transport: WeatherTransport | None
+    ) -> WeatherTransport | None:
+        """
+        Use a specific transport for all requests made by this client.
+
+        Args:
+            transport: The WeatherTransport to use, or None to go back to a
+                       transport created by the client.
+
+        Returns:
+            The previously active transport, if any. It is not closed.
+        """
+        with self._lock:
+            previous = self._transport
+            self._transport = transport
+            return previous
+
+    def close_transport(self) -> None:
+        """
+        Close the client's transport and release its pooled connections.
+
+        A fresh transport is created automatically on the next request.
+        """
+        with self._lock:
+            transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+
+    def _get_transport(self) -> WeatherTransport:
+        """
+        Returns the client's transport, creating it on first use.
+
+        Returns:
+            The active WeatherTransport.
+        """
+        transport = self._transport
+        if transport is not None and not transport.closed:
+            return transport
+        with self._lock:
+            # Another thread may have created it while we waited
+            if self._transport is None or self._transport.closed:
+                self._transport = WeatherTransport(pool_size=self._pool_size)
+            return self._transport
+
+    def close(self) -> None:
+        """
+        Close the transport and stop background refreshes.
+
+        The cache backend is left open, since it may be shared with other
+        clients. The client can still be used afterwards; a new transport is
+        created on the next request.
+        """
+        self.close_transport()
+        with self._refresh_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __enter__(self) -> "WeatherClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    # --- Requests ---
+
+    def get_weather(
+        self,
+        location: str = "",
+        units: str = "",
+        view_options: str = "",
+        lang: str | None = None,
+        is_png: bool = False,
+        png_options: str = "",
+        is_moon: bool = False,
+        moon_date: str | None = None,
+        moon_location_hint: str | None = None,
+        format: Literal["text", "json", "raw_json", "png"] = "json",
+        use_mock: bool | None = None,
+        with_metadata: bool = False,
+        typed: bool | None = None,
+        lazy: bool | None = None,
+        fields: Iterable[str] | None = None,
+        offline_moon: bool | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | None = None,
+    ) -> (
+        str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper
+    ):
+        """
+        Fetches weather or moon phase information from wttr.in.
+
+        Takes the same arguments and returns the same types as
+        ``fetch_my_weather.get_weather``, using this client's configuration,
+        cache and transport. No exceptions are raised.
+        """
+        args = (
+            location,
+            units,
+            view_options,
+            lang,
+            is_png,
+            png_options,
+            is_moon,
+            moon_date,
+            moon_location_hint,
+            format,
+            use_mock,
+            with_metadata,
+            typed,
+            lazy,
+            fields,
+            offline_moon,
+        )
+        start = time.perf_counter()
+        result: (
+            str
+            | bytes
+            | dict[str, Any]
+            | WeatherResponse
+            | WeatherFields
+            | ResponseWrapper
+        )
+        try:
+            budget = self._budget(timeout, deadline)
+        except ValueError as e:
+            result = _invalid_param_result(
+                f"Error: {e}", format, with_metadata, self._model(typed, lazy)
+            )
+        else:
+            with budget:
+                if not with_metadata:
+                    result = self._get_weather(*args)
+                else:
+                    # Metadata includes where the time went
+                    with timings.recording() as timer:
+                        result = _attach_timings(self._get_weather(*args), timer)
+        self._observe_call(
+            format, time.perf_counter() - start, result, fields is not None
+        )
+        return result
+
+    def _get_weather(
+        self,
+        location: str,
+        units: str,
+        view_options: str,
+        lang: str | None,
+        is_png: bool,
+        png_options: str,
+        is_moon: bool,
+        moon_date: str | None,
+        moon_location_hint: str | None,
+        format: Literal["text", "json", "raw_json", "png"],
+        use_mock: bool | None,
+        with_metadata: bool,
+        typed: bool | None,
+        lazy: bool | None,
+        fields: Iterable[str] | None,
+        offline_moon: bool | None,
+    ) -> (
+        str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper
+    ):
+        """Implements get_weather; see there."""
+        if fields is not None:
+            return self._get_fields(
+                location, units, lang, fields, use_mock, with_metadata
+            )
+
+        # Typed models parse numbers, dates and times up front; lazy models
+        # validate the forecast sections on first access
+        model = self._model(typed, lazy)
+
+        # Input validation (optional but good practice)
+        validation_result = _validate_params(units, format, with_metadata, model)
+        if validation_result is not None:
+            return validation_result
+
+        # Build the request URL
+        with timings.phase("url_build"):
+            url = _build_url(
+                location=location,
+                units=units,
+                view_options=view_options,
+                lang=lang,
+                is_png=is_png,
+                png_options=png_options,
+                is_moon=is_moon,
+                moon_date=moon_date,
+                moon_location_hint=moon_location_hint,
+                format=format,
+                base_url=self._base_url,
+            )
+
+        # Moon phases can be computed without a request
+        if self._use_offline_moon(is_moon, format, is_png, offline_moon):
+            return _offline_moon_result(url, moon_date, format, with_metadata, model)
+
+        # Determine whether to use mock data
+        should_use_mock = self._use_mock if use_mock is None else use_mock
 
+        # If mock mode is enabled, return mock data
+        if should_use_mock:
+            return _mock_result(
+                url, format, is_png, with_metadata, model, self._trusted
+            )
+
+        # Check cache first
+        cached_result, stale_data = self._check_cache(
+            url, format, is_png, with_metadata, model
+        )
+        if cached_result is not None:
+            return cached_result
+
+        # --- Perform the actual request ---
+        return self._fetch_once(
+            url, format, is_png, with_metadata, stale_data=stale_data, model=model
+        )
+
+    def _prepare_fields(
+        self,
+        location: str,
+        units: str,
+        lang: str | None,
+        fields: Iterable[str],
+        use_mock: bool | None,
+        with_metadata: bool,
+    ) -> tuple[str, tuple[str, ...]] | str | WeatherFields | ResponseWrapper:
+        """
+        Checks a projected request and answers it if no request is needed.
+
+        Args:
+            location: Location to get weather for.
+            units: Units for the values ("m", "u" or "M").
+            lang: Language code for text values such as the condition.
+            fields: The field names to fetch.
+            use_mock: Whether to return mock values; None for the client's
+                      setting.
+            with_metadata: Whether to include metadata.
+
+        Returns:
+            A (url, field names) tuple if the projection must be looked up,
+            otherwise the final result (an error, or mock values).
+        """
+        error = _validate_params(units, "text", False)
+        if isinstance(error, str):
+            return _fields_error(error, with_metadata)
+        try:
+            names = resolve_fields(fields)
+        except ValueError as e:
+            return _fields_error(f"Error: {e}", with_metadata)
+        with timings.phase("url_build"):
+            url = _build_url(
+                location=location,
+                units=units,
+                lang=lang,
+                fields=names,
+                base_url=self._base_url,
+            )
+
+        should_use_mock = self._use_mock if use_mock is None else use_mock
+        if should_use_mock:
+            metadata = _create_metadata(is_real_data=False, is_mock=True, url=url)
+            return _fields_result(
+                ResponseWrapper(data=mock_fields(names), metadata=metadata),
+                names,
+                with_metadata,
+            )
+        return url, names
+
+    def _get_fields(
+        self,
+        location: str,
+        units: str,
+        lang: str | None,
+        fields: Iterable[str],
+        use_mock: bool | None,
+        with_metadata: bool,
+    ) -> str | WeatherFields | ResponseWrapper:
+        """
+        Fetches only the requested fields, using wttr.in's one-line format.
+
+        The compact response is cached as text under its own URL, so it never
+        mixes with full responses for the same location.
+
+        Args:
+            location: Location to get weather for.
+            units: Units for the values ("m", "u" or "M").
+            lang: Language code for text values such as the condition.
+            fields: The field names to fetch.
+            use_mock: Whether to return mock values; None for the client's
+                      setting.
+            with_metadata: Whether to include metadata.
+
+        Returns:
+            A WeatherFields record, or an error as get_weather would return it.
+        """
+        prepared = self._prepare_fields(
+            location, units, lang, fields, use_mock, with_metadata
+        )
+        if not isinstance(prepared, tuple):
+            return prepared
+        url, names = prepared
+
+        result, stale_data = self._check_cache(url, "text", False, True)
+        if result is None:
+            result = self._fetch_once(url, "text", False, True, stale_data=stale_data)
+        return _fields_result(result, names, with_metadata)
+
+    def _lookup_cache(
+        self,
+        url: str,
+    ) -> (
+        tuple[str | bytes | dict[str, Any] | WeatherResponse | CachedJSON, bool] | None
+    ):
+        """
+        Checks cache for fresh or stale data.
+
+        Args:
+            url: URL to check in cache
+
+        Returns:
+            A (data, is_stale) tuple if the entry is fresh or within the stale
+            window, None otherwise
+        """
+        if self._cache_duration <= 0:
+            return None  # Caching disabled
+
+        # Entries past the stale window are removed by the cache itself
+        with timings.phase("cache_lookup"):
+            entry = self._cache.get(
+                url, max_age=self._cache_duration + self._stale_window
+            )
+        if entry is None:
+            return None
+        timestamp, data = entry
+        is_stale = time.time() - timestamp >= self._cache_duration
+        return data, is_stale
+
+    def _get_from_cache(
+        self,
+        url: str,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | CachedJSON | None:
+        """
+        Checks cache for non-expired data.
+
+        Args:
+            url: URL to check in cache
+
+        Returns:
+            Cached data if available and not expired, None otherwise
+        """
+        result = self._lookup_cache(url)
+        if result is None or result[1]:
+            return None
+        return result[0]
+
+    def _add_to_cache(
+        self,
+        url: str,
+        data: str | bytes | dict[str, Any] | WeatherResponse | CachedJSON,
+    ) -> None:
+        """
+        Adds data to the cache with current timestamp.
+
+        Args:
+            url: URL to cache
+            data: Data to cache
+        """
+        if self._cache_duration > 0:  # Only cache if enabled
+            self._cache.put(url, data, ttl=self._cache_duration + self._stale_window)
+
+    def _refresh(
+        self, url: str, format: Literal["text", "json", "raw_json", "png"], is_png: bool
+    ) -> None:
+        """
+        Fetches a fresh copy of a stale entry; runs on the refresh executor.
+
+        On success the new data replaces the stale entry. On failure the stale
+        entry is left in place.
+
+        Args:
+            url: URL to refresh.
+            format: Format the entry was requested in.
+            is_png: Whether a PNG was requested via the deprecated flag.
+        """
+        response = None
+        try:
+            response = self._upstream_get(url, format, has_stale=True)
+            if 200 <= response.status_code < 300:
+                self._process_response(response, url, format, is_png, False)
+        except Exception:
+            pass  # Keep serving the stale entry
+        finally:
+            if response is not None:
+                response.close()  # Hand the connection back to the pool
+            with self._refresh_lock:
+                self._refreshing.discard(url)
+
+    def _schedule_refresh(
+        self, url: str, format: Literal["text", "json", "raw_json", "png"], is_png: bool
+    ) -> None:
+        """
+        Starts a background refresh of a stale entry unless one is already running.
+
+        Args:
+            url: URL to refresh.
+            format: Format the entry was requested in.
+            is_png: Whether a PNG was requested via the deprecated flag.
+        """
+        with self._refresh_lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=_REFRESH_WORKERS,
+                    thread_name_prefix="fetch-my-weather-refresh",
+                )
+            executor = self._refresh_executor
+        executor.submit(self._refresh, url, format, is_png)
+
+    def _request_headers(self) -> dict[str, str]:
+        """
+        Builds the HTTP headers sent with every request.
+
+        Returns:
+            A dictionary of request headers.
+        """
+        # Language is passed with ?lang= in the URL rather than Accept-Language,
+        # as ?lang= or subdomain is generally preferred by wttr.in documentation
+        return {"User-Agent": self._user_agent}
+
+    def _process_response(
+        self,
+        response: Any,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        is_png: bool,
+        with_metadata: bool,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Converts an HTTP response into the requested format and caches it.
+
+        Args:
+            response: The HTTP response returned by the transport.
+            url: URL that was requested.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            with_metadata: Whether to include metadata.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The response data, an error message, or fallback mock data.
+        """
         # Create metadata for the real API response
         real_metadata = _create_metadata(
             is_real_data=True,
@@ -736,28 +2748,35 @@ def get_weather(
             if format == "png" or is_png:
                 data = response.content  # Return raw bytes for images
                 # Add successful response to cache
-                _add_to_cache(url, data)
+                self._add_to_cache(url, data)
                 return _wrap_response(data, real_metadata, with_metadata)
             elif format == "json" or format == "raw_json":
                 # For JSON formats, parse the response
                 try:
-                    data = response.text
-                    # Add raw text to cache
-                    _add_to_cache(url, data)
-                    json_data = json.loads(data)
+                    with timings.phase("decode"):
+                        data = response.text
+                        json_data = codec.loads(data)
 
                     # For raw_json, return the dictionary without Pydantic conversion
                     if format == "raw_json":
                         json_dict_data: dict[str, Any] = json_data
+                        # Cache a private copy so the caller can modify theirs
+                        self._add_to_cache(
+                            url, CachedJSON(data, copy_json(json_dict_data))
+                        )
                         return _wrap_response(
                             json_dict_data, real_metadata, with_metadata
                         )
 
                     # For standard json, convert to Pydantic model
                     try:
-                        weather_response: WeatherResponse = WeatherResponse.parse_obj(
-                            json_data
-                        )
+                        with timings.phase("validate"):
+                            weather_response: WeatherResponse = model.parse_obj(
+                                json_data
+                            )
+                        # Cache the decoded form next to the raw text; the entry
+                        # keeps no model, so this one is the caller's own
+                        self._add_to_cache(url, CachedJSON(data, json_data, model))
                         return _wrap_response(
                             weather_response, real_metadata, with_metadata
                         )
@@ -768,6 +2787,7 @@ def get_weather(
                             # Return mock data with error details
                             return _create_mock_data(
                                 format=format,
+                                model=model,
                                 error_type="ValidationError",
                                 error_message=validation_error,
                                 with_metadata=with_metadata,
@@ -791,6 +2811,7 @@ def get_weather(
                         )
                         mock_data = _create_mock_data(
                             format=format,
+                            model=model,
                             error_type="JSONDecodeError",
                             error_message=f"Unable to parse JSON response from {url}",
                             with_metadata=with_metadata,
@@ -802,6 +2823,7 @@ def get_weather(
                     # JSON decode failed - for educational use, provide mock data instead of error
                     return _create_mock_data(
                         format=format,
+                        model=model,
                         error_type="JSONDecodeError",
                         error_message=f"Unable to parse JSON response from {url}",
                         with_metadata=with_metadata,
@@ -810,9 +2832,10 @@ def get_weather(
                     )
             else:
                 # Text format - return as is
-                data = response.text
+                with timings.phase("decode"):
+                    data = response.text
                 # Add successful response to cache
-                _add_to_cache(url, data)
+                self._add_to_cache(url, data)
                 return _wrap_response(data, real_metadata, with_metadata)
         else:
             # Handle non-successful status codes gracefully
@@ -841,6 +2864,7 @@ def get_weather(
                 )
                 mock_data = _create_mock_data(
                     format=format,
+                    model=model,
                     error_type="HTTPError",
                     error_message=error_message,
                     with_metadata=with_metadata,
@@ -853,6 +2877,7 @@ def get_weather(
             if with_metadata:
                 return _create_mock_data(
                     format=format,
+                    model=model,
                     error_type="HTTPError",
                     error_message=error_message,
                     with_metadata=with_metadata,
@@ -866,8 +2891,8 @@ def get_weather(
             ):
                 # Provide a mock response with a note about rate limiting
                 if format == "raw_json":
-                    # Make a deep copy and add a note about it being mock data
-                    mock_data = json.loads(json.dumps(_MOCK_DATA["json"]))
+                    # Copy the mock data and add a note about it being mock data
+                    mock_data = copy_json(_MOCK_DATA["json"])
                     if isinstance(mock_data, dict):
                         mock_data["note"] = "Mock data provided due to rate limiting"
                         raw_json_data: dict[str, Any] = mock_data
@@ -878,9 +2903,9 @@ def get_weather(
                 else:
                     # Convert mock data to Pydantic model
                     try:
-                        mock_data = json.loads(json.dumps(_MOCK_DATA["json"]))
-                        mock_weather_response: WeatherResponse = (
-                            WeatherResponse.parse_obj(mock_data)
+                        mock_data = copy_json(_MOCK_DATA["json"])
+                        mock_weather_response: WeatherResponse = model.parse_obj(
+                            mock_data
                         )
                         return mock_weather_response
                     except ValidationError:
@@ -890,31 +2915,393 @@ def get_weather(
             # Otherwise return the error message
             return error_message
 
-    except Exception as e:
-        error_type = e.__class__.__name__
-        if error_type == "Timeout":
-            error_message = f"Error: Request timed out while connecting to {url}"
-        elif error_type == "ConnectionError":
-            error_message = (
-                f"Error: Could not connect to {url}. Check network connection."
+    def _check_cache(
+        self,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        is_png: bool,
+        with_metadata: bool,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> tuple[
+        str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper | None,
+        str | bytes | dict[str, Any] | WeatherResponse | CachedJSON | None,
+    ]:
+        """
+        Serves a request from the cache if possible.
+
+        Fresh entries are returned directly. Stale entries are returned at once
+        and refreshed in the background when stale-while-revalidate is enabled,
+        or handed back for use as a fallback when only stale-if-error is enabled.
+
+        Args:
+            url: URL to look up.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            with_metadata: Whether to include metadata.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            A (result, stale_data) tuple. result is the response to return, or
+            None if the request must go to the network; stale_data is the stale
+            entry to fall back on if that request fails.
+        """
+        cached = self._lookup_cache(url)
+        if cached is None:
+            self._metrics.cache_miss(format)
+            return None, None
+        cached_data, is_stale = cached
+        if not is_stale:
+            self._metrics.cache_hit(format, stale=False)
+            return (
+                _cached_result(
+                    url,
+                    cached_data,
+                    format,
+                    with_metadata,
+                    model=model,
+                    trusted=self._trusted,
+                ),
+                None,
+            )
+        if self._stale_while_revalidate:
+            self._metrics.cache_hit(format, stale=True)
+            self._schedule_refresh(url, format, is_png)
+            return (
+                _cached_result(
+                    url,
+                    cached_data,
+                    format,
+                    with_metadata,
+                    is_stale=True,
+                    model=model,
+                    trusted=self._trusted,
+                ),
+                None,
+            )
+        self._metrics.cache_miss(format)
+        return None, cached_data if self._stale_if_error else None
+
+    def _fetch(
+        self,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        is_png: bool,
+        with_metadata: bool,
+        stale_data: str
+        | bytes
+        | dict[str, Any]
+        | WeatherResponse
+        | CachedJSON
+        | None = None,
+        transport: WeatherTransport | None = None,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Requests a URL and converts the response, falling back to stale data on failure.
+
+        Args:
+            url: URL to request.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            with_metadata: Whether to include metadata.
+            stale_data: Stale cache entry to serve if the request fails.
+            transport: Transport to use (defaults to the client's transport).
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The response data, stale data, an error message, or fallback mock data.
+        """
+        try:
+            response = self._upstream_get(
+                url, format, transport, has_stale=stale_data is not None
+            )
+            if stale_data is not None and not 200 <= response.status_code < 300:
+                return _cached_result(
+                    url,
+                    stale_data,
+                    format,
+                    with_metadata,
+                    is_stale=True,
+                    model=model,
+                    trusted=self._trusted,
+                    status_code=response.status_code,
+                    error_type="HTTPError",
+                    error_message=(
+                        f"Error fetching data from wttr.in: "
+                        f"Status code {response.status_code} for URL {url}"
+                    ),
+                )
+            return self._process_response(
+                response, url, format, is_png, with_metadata, model
+            )
+        except Exception as e:
+            return self._failed_result(e, url, format, with_metadata, stale_data, model)
+
+    def _failed_result(
+        self,
+        error: Exception,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        with_metadata: bool,
+        stale_data: Any,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Builds the result for a request that raised instead of getting a response.
+
+        Args:
+            error: The exception that was raised.
+            url: URL that was requested.
+            format: The requested format.
+            with_metadata: Whether to include metadata.
+            stale_data: Stale cache entry to serve, if any.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The stale data with error metadata, or what _handle_request_error
+            returns if there is none.
+        """
+        if stale_data is not None:
+            return _cached_result(
+                url,
+                stale_data,
+                format,
+                with_metadata,
+                is_stale=True,
+                model=model,
+                trusted=self._trusted,
+                error_type=error.__class__.__name__,
+                error_message=str(error),
+            )
+        return _handle_request_error(error, url, format, with_metadata, model)
+
+    def _fetch_once(
+        self,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        is_png: bool,
+        with_metadata: bool,
+        stale_data: str
+        | bytes
+        | dict[str, Any]
+        | WeatherResponse
+        | CachedJSON
+        | None = None,
+        transport: WeatherTransport | None = None,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Like _fetch, but identical concurrent requests share one upstream fetch.
+
+        The first caller for a key fetches. The others wait and are then served
+        from the cache the first caller filled, or get a copy of its result if
+        nothing was cached (for example on errors).
+
+        Args:
+            url: URL to request.
+            format: The requested format.
+            is_png: Whether a PNG was requested via the deprecated flag.
+            with_metadata: Whether to include metadata.
+            stale_data: Stale cache entry to serve if the request fails.
+            transport: Transport to use (defaults to the client's transport).
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The same result _fetch would return.
+        """
+        if not self._coalesce_requests:
+            return self._fetch(
+                url, format, is_png, with_metadata, stale_data, transport, model
             )
-        elif "requests" in str(e.__class__.__module__):
-            # Catch any other requests-related error
-            error_message = f"Error: An unexpected network error occurred: {e}"
-        else:
-            # Catch any other unexpected error during processing
-            # This shouldn't normally happen with the above catches, but belt-and-suspenders
-            error_message = f"Error: An unexpected error occurred: {e}"
 
-        # If with_metadata is enabled, return mock data with error information
-        if with_metadata:
-            return _create_mock_data(
-                format=format,
-                error_type=error_type,
-                error_message=error_message,
-                with_metadata=with_metadata,
-                url=url,
+        budget = deadlines.current()
+        try:
+            result, shared = self._inflight.do(
+                (url, format, is_png, with_metadata, model),
+                self._fetch,
+                url,
+                format,
+                is_png,
+                with_metadata,
+                stale_data,
+                transport,
+                model,
+                timeout=None if budget is None else budget.remaining(),
+            )
+        except TimeoutError as e:
+            # Waited for another caller's fetch until the deadline passed
+            error = e if budget is None else budget.exceeded()
+            return self._failed_result(
+                error, url, format, with_metadata, stale_data, model
             )
+        if not shared:
+            return result  # type: ignore[no-any-return]
+        return self._shared_result(url, format, with_metadata, result, model)
+
+    def _shared_result(
+        self,
+        url: str,
+        format: Literal["text", "json", "raw_json", "png"],
+        with_metadata: bool,
+        result: str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper,
+        model: type[WeatherResponse] = WeatherResponse,
+    ) -> str | bytes | dict[str, Any] | WeatherResponse | ResponseWrapper:
+        """
+        Builds the result for a caller that waited on another caller's fetch.
+
+        Args:
+            url: URL that was requested.
+            format: The requested format.
+            with_metadata: Whether to include metadata.
+            result: The result the fetching caller got.
+            model: Model class used to parse JSON responses.
+
+        Returns:
+            The cached response if the fetch filled the cache, otherwise a copy
+            of the fetching caller's result.
+        """
+        cached_data = self._get_from_cache(url)
+        if cached_data is not None:
+            return _cached_result(
+                url,
+                cached_data,
+                format,
+                with_metadata,
+                model=model,
+                trusted=self._trusted,
+            )
+        return _copy_result(result)
+
+
+# --- Default Client ---
+# Used by the module-level functions above
+_default_client = WeatherClient()
+
+# Configuration that used to live in module globals now lives on the default
+# client; these names stay readable for code that inspects them
+_CLIENT_ATTRIBUTES = {
+    "_CACHE_DURATION_SECONDS": "_cache_duration",
+    "_USER_AGENT": "_user_agent",
+    "_USE_MOCK_DATA": "_use_mock",
+    "_USE_TYPED_MODELS": "_typed",
+    "_POOL_SIZE": "_pool_size",
+    "_STALE_WINDOW_SECONDS": "_stale_window",
+    "_STALE_WHILE_REVALIDATE": "_stale_while_revalidate",
+    "_STALE_IF_ERROR": "_stale_if_error",
+    "_COALESCE_REQUESTS": "_coalesce_requests",
+    "_cache": "_cache",
+    "_transport": "_transport",
+    "_refreshing": "_refreshing",
+}
 
-        # Otherwise return the error message
-        return error_message
+
+def __getattr__(name: str) -> Any:
+    attribute = _CLIENT_ATTRIBUTES.get(name)
+    if attribute is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(_default_client, attribute)
+
+
+# --- Public API Function ---
+
+
+def get_weather(
+    location: str = "",
+    units: str = "",
+    view_options: str = "",
+    lang: str | None = None,
+    is_png: bool = False,
+    png_options: str = "",
+    is_moon: bool = False,
+    moon_date: str | None = None,
+    moon_location_hint: str | None = None,
+    format: Literal["text", "json", "raw_json", "png"] = "json",
+    use_mock: bool | None = None,
+    with_metadata: bool = False,
+    typed: bool | None = None,
+    lazy: bool | None = None,
+    fields: Iterable[str] | None = None,
+    offline_moon: bool | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    deadline: float | None = None,
+) -> str | bytes | dict[str, Any] | WeatherResponse | WeatherFields | ResponseWrapper:
+    """
+    Fetches weather or moon phase information from wttr.in.
+
+    Args:
+        location: The location identifier (city, airport code, coordinates,
+                 domain, area code, ~special name, or empty for current).
+                 Ignored if is_moon is True.
+        units: Units for output ('m' for metric, 'u' for USCS, 'M' for wind m/s).
+        view_options: Combined view options (e.g., '0', '1', 'n', 'q', 'F', '0q').
+        lang: Language code (e.g., 'fr', 'de', 'zh-cn').
+        is_png: If True, request a PNG image instead of text (deprecated, use format="png").
+        png_options: PNG specific options (e.g., 'p', 't', 'transparency=100').
+                    Only used for PNG format.
+        is_moon: If True, fetch moon phase instead of weather.
+        moon_date: Specific date for moon phase in 'YYYY-MM-DD' format.
+                  Only used if is_moon is True.
+        moon_location_hint: Location hint for moon phase (e.g., ',+US', ',+Paris').
+                           Only used if is_moon is True.
+        format: Output format - "text", "json", "raw_json", or "png" (default: "json").
+                When "json" is used, returns a WeatherResponse Pydantic model.
+                When "raw_json" is used, returns the raw JSON as a Python dictionary.
+        use_mock: If True, use mock data instead of making a real API request.
+                 If None, use the setting from set_mock_mode().
+        with_metadata: If True, include metadata about the response (real vs mock,
+                      cache status, errors, and per-phase timings in
+                      ``metadata.timings``). Returns a ResponseWrapper instead of direct data.
+        typed: If True, format="json" returns a TypedWeatherResponse with numbers,
+               dates and times already parsed. If None, use the setting from
+               set_typed_models().
+        lazy: If True, format="json" returns a LazyWeatherResponse whose forecast
+              sections are only validated when first read. If None, use the
+              setting from set_lazy_models().
+        fields: Names of the only values to fetch, e.g. ["temperature", "humidity",
+                "wind"] (see fetch_my_weather.fields.FIELDS). wttr.in then sends a
+                few bytes instead of the full forecast, and the result is a
+                WeatherFields record; format and the view and PNG options are
+                ignored. Numbers follow units.
+        offline_moon: If True, is_moon requests (except PNGs) are computed locally
+                      by the astronomy module instead of fetched. If None, use
+                      the setting from set_offline_moon().
+        timeout: Timeout for each request in seconds, or a (connect, read)
+                 tuple. If None, use the timeouts from set_timeouts().
+        deadline: Seconds this call may take in total, including retries and
+                  rate-limit waits. When it passes, stale cache data is
+                  returned if there is some, otherwise an error with
+                  error_type "DeadlineExceeded". If None, use the deadline
+                  from set_timeouts().
+
+    Returns:
+        If with_metadata is True: Returns a ResponseWrapper containing both data and metadata.
+        If format is "text": Returns the weather report as a string.
+        If format is "json": Returns the weather data as a WeatherResponse Pydantic model
+                             (a TypedWeatherResponse if typed is enabled).
+        If format is "raw_json": Returns the raw JSON data as a Python dictionary.
+        If format is "png": Returns the PNG image data as bytes.
+        If fields is given: Returns a WeatherFields record.
+        If an error occurs and with_metadata is False: Returns an error message string.
+        If an error occurs and with_metadata is True: Returns fallback data with error details in metadata.
+        No exceptions are raised.
+    """
+    return _default_client.get_weather(
+        location=location,
+        units=units,
+        view_options=view_options,
+        lang=lang,
+        is_png=is_png,
+        png_options=png_options,
+        is_moon=is_moon,
+        moon_date=moon_date,
+        moon_location_hint=moon_location_hint,
+        format=format,
+        use_mock=use_mock,
+        with_metadata=with_metadata,
+        typed=typed,
+        lazy=lazy,
+        fields=fields,
+        offline_moon=offline_moon,
+        timeout=timeout,
+        deadline=deadline,
+    )
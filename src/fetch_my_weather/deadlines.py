@@ -0,0 +1,191 @@
+"""
+Timeouts and deadlines for requests to wttr.in.
+
+Requests are sent with separate connect and read timeouts: how long to wait
+for a connection, and for each read from it. A call can also be given a
+deadline, in seconds, for everything it does: retries and their backoff,
+rate-limit waits and waiting for a coalesced request all count against it,
+and each request's timeouts are cut to the time that is left. The call's
+``Budget`` is held in a context variable, like the PhaseTimer in ``timings``,
+so it reaches the code that sends the request, including in a worker thread
+that runs a copy of the context.
+
+Once the deadline has passed, the call fails with error_type
+"DeadlineExceeded" and is answered with the stale cache entry if there is one
+(see ``set_stale_window``), otherwise with an error message or mock data like
+any other failed request::
+
+    get_weather("London", timeout=(0.1, 0.25), deadline=0.3)
+"""
+
+import math
+import time
+from contextvars import ContextVar, Token
+from types import TracebackType
+
+DEFAULT_CONNECT_TIMEOUT = 15.0  # Seconds to wait for a connection
+DEFAULT_READ_TIMEOUT = 15.0  # Seconds to wait for each read from the server
+
+
+class DeadlineExceeded(Exception):  # noqa: N818 - the name is the error_type callers see
+    """Raised instead of sending or waiting once a call's deadline has passed."""
+
+    def __init__(self, deadline: float) -> None:
+        super().__init__(f"Deadline of {deadline:.3f}s exceeded")
+        self.deadline = deadline  # The call's deadline, in seconds
+
+
+def _seconds(value: object) -> float | None:
+    """
+    Converts a number of seconds to a float.
+
+    Args:
+        value: The value given by the caller.
+
+    Returns:
+        The seconds, or None if the value isn't a finite int or float.
+    """
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    seconds = float(value)
+    return seconds if math.isfinite(seconds) else None
+
+
+def split_timeout(timeout: float | tuple[float, float]) -> tuple[float, float]:
+    """
+    Splits a timeout into its connect and read parts.
+
+    Args:
+        timeout: Seconds for both, or a (connect, read) tuple.
+
+    Returns:
+        The (connect, read) timeouts in seconds.
+
+    Raises:
+        ValueError: If a part isn't a positive number.
+    """
+    parts = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    if len(parts) == 2:
+        connect, read = _seconds(parts[0]), _seconds(parts[1])
+        if connect is not None and read is not None and connect > 0 and read > 0:
+            return connect, read
+    raise ValueError(
+        "Invalid 'timeout' parameter. Use a positive number of seconds or a"
+        " (connect, read) tuple of them."
+    )
+
+
+def check_deadline(deadline: float) -> float:
+    """
+    Checks a deadline given by the caller.
+
+    Args:
+        deadline: Seconds a call may take.
+
+    Returns:
+        The deadline in seconds.
+
+    Raises:
+        ValueError: If the deadline isn't a number or is negative.
+    """
+    seconds = _seconds(deadline)
+    if seconds is None or seconds < 0:
+        raise ValueError(
+            "Invalid 'deadline' parameter. Use a number of seconds that isn't negative."
+        )
+    return seconds
+
+
+class Budget:
+    """The timeouts and deadline of one call, from the moment it was created."""
+
+    __slots__ = ("connect", "read", "deadline", "_expires", "_token")
+
+    def __init__(
+        self, connect: float, read: float, deadline: float | None = None
+    ) -> None:
+        """
+        Start the clock on a call.
+
+        Args:
+            connect: Connect timeout for each request, in seconds.
+            read: Read timeout for each request, in seconds.
+            deadline: Seconds the whole call may take, or None for no limit.
+        """
+        self.connect = connect
+        self.read = read
+        self.deadline = deadline
+        self._expires = None if deadline is None else time.monotonic() + deadline
+        self._token: Token[Budget | None] | None = None
+
+    def __enter__(self) -> "Budget":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+    def remaining(self) -> float | None:
+        """
+        Returns the time left before the deadline.
+
+        Returns:
+            Seconds left (0.0 once it has passed), or None without a deadline.
+        """
+        if self._expires is None:
+            return None
+        return max(0.0, self._expires - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the call has a deadline and it has passed."""
+        return self._expires is not None and time.monotonic() >= self._expires
+
+    def exceeded(self) -> DeadlineExceeded:
+        """Returns the error to raise once the deadline has passed."""
+        return DeadlineExceeded(self.deadline or 0.0)
+
+    def timeout(self) -> tuple[float, float]:
+        """
+        Returns the timeouts for the next request.
+
+        Returns:
+            The (connect, read) timeouts, cut to the time left.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return self.connect, self.read
+        if remaining <= 0.0:
+            raise self.exceeded()
+        return min(self.connect, remaining), min(self.read, remaining)
+
+    def __repr__(self) -> str:
+        return (
+            f"Budget(connect={self.connect}, read={self.read}, "
+            f"deadline={self.deadline}, remaining={self.remaining()})"
+        )
+
+
+_current: ContextVar[Budget | None] = ContextVar(
+    "fetch_my_weather_budget", default=None
+)
+
+
+def current() -> Budget | None:
+    """
+    Returns the budget of the call running in this context.
+
+    Returns:
+        The Budget, or None if the call uses the client's timeouts and has no
+        deadline.
+    """
+    return _current.get()
@@ -0,0 +1,408 @@
+"""
+A local stand-in for wttr.in, for load testing and offline development.
+
+Mock mode answers before the network layer, so it never exercises the HTTP,
+cache and error handling code. FakeWttrServer is a real HTTP server that
+answers the URLs built by ``get_weather`` the way wttr.in does, with
+configurable latency, failures and payload sizes::
+
+    from fetch_my_weather import WeatherClient
+    from fetch_my_weather.fake_server import FakeWttrServer
+
+    with FakeWttrServer(latency=0.05, error_rate=0.1) as server:
+        client = WeatherClient(base_url=server.base_url)
+        weather = client.get_weather("London")
+
+It can also run on its own, e.g. to point another process at it::
+
+    python -m fetch_my_weather.fake_server --port 8002 --latency 0.2
+
+Only the standard library is used.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .astronomy import moon_report
+from .cache import copy_json
+from .core import _MOCK_DATA
+from .fields import MOCK_VALUES
+
+_DIRECTIONS = ("N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE", "S", "SW", "W", "NW")
+_FORMAT_CODE = re.compile(r"%[A-Za-z]")
+
+
+def _hourly(day: int, index: int, hours: int) -> dict[str, Any]:
+    """Builds one hourly forecast with every field wttr.in sends."""
+    n = day * hours + index
+    temp = 8 + (n * 7) % 12
+    wind = 5 + (n * 5) % 30
+    return {
+        "DewPointC": str(temp - 6),
+        "DewPointF": str((temp - 6) * 9 // 5 + 32),
+        "FeelsLikeC": str(temp - 2),
+        "FeelsLikeF": str((temp - 2) * 9 // 5 + 32),
+        "HeatIndexC": str(temp),
+        "HeatIndexF": str(temp * 9 // 5 + 32),
+        "WindChillC": str(temp - 3),
+        "WindChillF": str((temp - 3) * 9 // 5 + 32),
+        "WindGustKmph": str(wind + 8),
+        "WindGustMiles": str((wind + 8) * 5 // 8),
+        "chanceoffog": "0",
+        "chanceoffrost": "0",
+        "chanceofhightemp": str((n * 13) % 100),
+        "chanceofovercast": str((n * 29) % 100),
+        "chanceofrain": str((n * 17) % 100),
+        "chanceofremdry": str((n * 31) % 100),
+        "chanceofsnow": "0",
+        "chanceofsunshine": str((n * 23) % 100),
+        "chanceofthunder": "0",
+        "chanceofwindy": "0",
+        "cloudcover": str((n * 11) % 100),
+        "diffRad": f"{(n * 3.7) % 200:.1f}",
+        "humidity": str(50 + (n * 7) % 45),
+        "precipInches": f"{(n % 5) * 0.01:.1f}",
+        "precipMM": f"{(n % 5) * 0.2:.1f}",
+        "pressure": str(1005 + n % 20),
+        "pressureInches": "30",
+        "shortRad": f"{(n * 41.3) % 800:.1f}",
+        "tempC": str(temp),
+        "tempF": str(temp * 9 // 5 + 32),
+        "time": str(index * 2400 // hours),
+        "uvIndex": str(n % 8),
+        "visibility": "10",
+        "visibilityMiles": "6",
+        "weatherCode": "116",
+        "weatherDesc": [{"value": "Partly cloudy"}],
+        "weatherIconUrl": [{"value": ""}],
+        "winddir16Point": _DIRECTIONS[n % len(_DIRECTIONS)],
+        "winddirDegree": str((n * 30) % 360),
+        "windspeedKmph": str(wind),
+        "windspeedMiles": str(wind * 5 // 8),
+    }
+
+
+def j1_payload(days: int = 3, hours: int = 8) -> dict[str, Any]:
+    """
+    Builds a ``?format=j1`` response of realistic size.
+
+    The mock data has a single forecast day with a single hourly entry, which
+    is far smaller than what wttr.in sends. wttr.in sends three days of eight
+    3-hourly forecasts with every field filled in, about 50 KB as JSON.
+
+    Args:
+        days: Number of forecast days.
+        hours: Hourly forecasts per day.
+
+    Returns:
+        The decoded JSON, as wttr.in would send it.
+    """
+    data: dict[str, Any] = copy_json(_MOCK_DATA["json"])
+    data.pop("mock_data_notice", None)
+    template = data["weather"][0]
+    first = date(2025, 4, 13)
+    data["weather"] = [
+        dict(
+            template,
+            date=(first + timedelta(days=day)).isoformat(),
+            astronomy=copy_json(template["astronomy"]),
+            hourly=[_hourly(day, index, hours) for index in range(hours)],
+        )
+        for day in range(days)
+    ]
+    return data
+
+
+def _moon_text(path: str) -> str:
+    """Answers /moon, /moon@2025-04-13 and /moon@2025-04-13,Paris."""
+    moon_date = unquote(path)[len("/moon") :].partition(",")[0].lstrip("@")
+    try:
+        day = date.fromisoformat(moon_date) if moon_date else None
+    except ValueError:
+        day = None
+    return moon_report(day)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers every path like wttr.in would, from canned payloads."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like wttr.in
+    # Headers and body are written separately; without this, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every response
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def do_GET(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        fake = self.server.fake
+        status, retry_after = fake._admit()
+        if status != 200:
+            body = b"Service Unavailable" if status == 503 else b"Internal Error"
+            headers = {"Retry-After": str(retry_after)} if retry_after else {}
+            self._send(status, body, "text/plain; charset=utf-8", headers)
+            return
+
+        parts = urlsplit(self.path)
+        output = parse_qs(parts.query).get("format", [""])[0]
+        if parts.path.endswith(".png"):
+            body, content_type = fake._png, "image/png"
+        elif output == "j1":
+            body, content_type = fake._j1, "application/json"
+        elif output:
+            # One-line custom format, as used by field projection
+            line = _FORMAT_CODE.sub(lambda m: MOCK_VALUES.get(m[0], m[0]), output)
+            body, content_type = line.encode("utf-8"), "text/plain; charset=utf-8"
+        elif parts.path.startswith("/moon"):
+            body = _moon_text(parts.path).encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+        else:
+            body, content_type = fake._text, "text/plain; charset=utf-8"
+        self._send(200, body, content_type)
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.fake.verbose:
+            super().log_message(format, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Load tests open hundreds of connections
+    fake: "FakeWttrServer"
+
+
+class FakeWttrServer:
+    """
+    A local HTTP server that imitates wttr.in.
+
+    Text, ``?format=j1``, one-line custom formats (``fields=``), ``.png`` and
+    ``/moon@date`` URLs are answered from canned payloads. Every request first
+    waits ``latency`` (plus up to ``jitter``) seconds, then may be refused:
+    beyond ``rate_limit`` requests per second, or with probability
+    ``unavailable_rate``, it gets a 503 with a Retry-After header, and with
+    probability ``error_rate`` a 500. Requests are handled in parallel, one
+    thread each.
+
+    The server listens once it is started with ``start()`` or by entering a
+    ``with`` block, and ``base_url`` is the URL to pass to
+    ``set_base_url`` or ``WeatherClient(base_url=...)``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        unavailable_rate: float = 0.0,
+        rate_limit: float | None = None,
+        retry_after: int = 1,
+        days: int = 3,
+        hours: int = 8,
+        seed: int | None = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Create the server.
+
+        Args:
+            host: Interface to listen on.
+            port: Port to listen on. 0 picks a free port.
+            latency: Seconds to wait before answering each request.
+            jitter: Up to this many more seconds, chosen at random per request.
+            error_rate: Fraction of requests answered with a 500 error.
+            unavailable_rate: Fraction of requests answered with a 503.
+            rate_limit: Requests per second above which requests get a 503,
+                        like wttr.in's rate limiting. None for no limit.
+            retry_after: Retry-After value sent with 503 responses, in seconds.
+            days: Forecast days in the j1 payload.
+            hours: Hourly forecasts per day in the j1 payload. 3 days of 8
+                   hours is about 50 KB, like wttr.in.
+            seed: Seed for the latency and failure draws, for repeatable runs.
+            verbose: Log every request to stderr.
+
+        Raises:
+            ValueError: If a rate is outside [0, 1].
+        """
+        for name, rate in (
+            ("error_rate", error_rate),
+            ("unavailable_rate", unavailable_rate),
+        ):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {rate}")
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        self.error_rate = float(error_rate)
+        self.unavailable_rate = float(unavailable_rate)
+        self.rate_limit = rate_limit
+        self.retry_after = max(0, int(retry_after))
+        self.verbose = verbose
+
+        self._j1 = json.dumps(j1_payload(days, hours), indent=4).encode("utf-8")
+        self._text = str(_MOCK_DATA["text"]).encode("utf-8")
+        self._png = bytes(_MOCK_DATA["png"])  # type: ignore[arg-type]
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque()  # Admission times in the last second
+        self._stats = {"requests": 0, "ok": 0, "errors": 0, "unavailable": 0}
+
+        self._host = host
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL to use in place of ``http://wttr.in/``."""
+        return f"http://{self._host}:{self._server.server_address[1]}/"
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get how many requests were answered, and how.
+
+        Returns:
+            Counts of all requests, successful ones, 500 errors and 503s.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _admit(self) -> tuple[int, int]:
+        """
+        Waits out the latency and decides how to answer a request.
+
+        Returns:
+            The status code (200, 500 or 503) and the Retry-After value to
+            send, or 0 for none.
+        """
+        with self._lock:
+            delay = self.latency + self._random.uniform(0.0, self.jitter)
+            draw = self._random.random()
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self._stats["requests"] += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            limited = (
+                self.rate_limit is not None and len(self._recent) >= self.rate_limit
+            )
+            if limited or draw < self.unavailable_rate:
+                self._stats["unavailable"] += 1
+                return 503, self.retry_after
+            self._recent.append(now)
+            if draw < self.unavailable_rate + self.error_rate:
+                self._stats["errors"] += 1
+                return 500, 0
+            self._stats["ok"] += 1
+            return 200, 0
+
+    def start(self) -> "FakeWttrServer":
+        """
+        Start answering requests in a background thread.
+
+        Returns:
+            The server itself.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="fake-wttr", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Answer requests in the calling thread until the process stops."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeWttrServer":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point: serve until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="python -m fetch_my_weather.fake_server",
+        description="Serve wttr.in-like responses locally.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--unavailable-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, help="requests per second")
+    parser.add_argument("--retry-after", type=int, default=1, help="seconds")
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--hours", type=int, default=8)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true", help="log requests")
+    args = parser.parse_args(argv)
+
+    server = FakeWttrServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        unavailable_rate=args.unavailable_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        days=args.days,
+        hours=args.hours,
+        seed=args.seed,
+        verbose=args.verbose,
+    )
+    print(f"Serving fake wttr.in at {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Field projection for fetch_my_weather.
+
+Instead of the ~50 KB j1 document, wttr.in can answer with a one-line custom
+format: ``?format=%t|%h|%w`` returns something like ``+12°C|75%|↑11km/h``.
+``get_weather(fields=[...])`` uses this to download only the values a caller
+needs and parses them into a ``WeatherFields`` record::
+
+    record = get_weather(location="Oslo", fields=["temperature", "humidity", "wind"])
+    print(record.temperature, record.humidity, record.wind)
+
+Numbers are returned without their unit. Temperatures, wind speeds and
+precipitation follow the ``units`` argument of get_weather ("m" for °C and
+km/h, "u" for °F and mph, "M" for °C and m/s); without it wttr.in picks units
+based on the location.
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from datetime import time
+from typing import Any
+from urllib.parse import quote
+
+from .models import WeatherFields
+
+# Separates the values in the response; it never appears in them
+SEPARATOR = "|"
+
+_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?")
+_CLOCK = re.compile(r"(\d{1,2}):(\d{2})(?::(\d{2}))?")
+
+
+def _text(value: str) -> str | None:
+    return value.strip() or None
+
+
+def _number(value: str) -> float | None:
+    match = _NUMBER.search(value)
+    return float(match.group()) if match else None
+
+
+def _integer(value: str) -> int | None:
+    number = _number(value)
+    return None if number is None else int(number)
+
+
+def _clock(value: str) -> time | None:
+    match = _CLOCK.search(value)
+    if match is None:
+        return None
+    hour, minute, second = match.groups()
+    try:
+        return time(int(hour), int(minute), int(second or 0))
+    except ValueError:
+        return None
+
+
+def _wind_direction(value: str) -> str | None:
+    # The direction is the arrow in front of the speed, e.g. "↑" in "↑11km/h"
+    match = _NUMBER.search(value)
+    direction = value[: match.start()] if match else value
+    return direction.strip() or None
+
+
+# Field name -> (wttr.in format code, parser for its value)
+FIELDS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "condition": ("%C", _text),
+    "temperature": ("%t", _number),
+    "feels_like": ("%f", _number),
+    "humidity": ("%h", _integer),
+    "wind": ("%w", _number),
+    "wind_direction": ("%w", _wind_direction),
+    "precipitation": ("%p", _number),
+    "pressure": ("%P", _integer),
+    "uv_index": ("%u", _integer),
+    "location": ("%l", _text),
+    "moon_phase": ("%m", _text),
+    "moon_day": ("%M", _integer),
+    "dawn": ("%D", _clock),
+    "sunrise": ("%S", _clock),
+    "zenith": ("%z", _clock),
+    "sunset": ("%s", _clock),
+    "dusk": ("%d", _clock),
+    "local_time": ("%T", _clock),
+    "timezone": ("%Z", _text),
+}
+
+# What wttr.in would send for each code, used in mock mode and as fallback data
+MOCK_VALUES = {
+    "%C": "Partly cloudy",
+    "%t": "+17°C",
+    "%f": "+16°C",
+    "%h": "72%",
+    "%w": "↗15km/h",
+    "%p": "0.0mm",
+    "%P": "1015hPa",
+    "%u": "4",
+    "%l": "MockCity",
+    "%m": "🌔",
+    "%M": "11",
+    "%D": "05:40:12",
+    "%S": "06:12:34",
+    "%z": "13:05:47",
+    "%s": "19:59:01",
+    "%d": "20:31:22",
+    "%T": "12:00:00+0000",
+    "%Z": "Europe/London",
+}
+
+
+def resolve_fields(fields: Iterable[str]) -> tuple[str, ...]:
+    """
+    Checks a list of requested fields.
+
+    Args:
+        fields: Field names, e.g. ["temperature", "humidity", "wind"].
+
+    Returns:
+        The field names in order, without duplicates.
+
+    Raises:
+        ValueError: If no fields are given or a name is unknown.
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    names = tuple(dict.fromkeys(fields))
+    if not names:
+        raise ValueError("At least one field must be requested")
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s) {unknown}; choose from {sorted(FIELDS)}")
+    return names
+
+
+def _codes(names: Iterable[str]) -> list[str]:
+    """Returns the format codes for some fields, in order and without duplicates."""
+    return list(dict.fromkeys(FIELDS[name][0] for name in names))
+
+
+def format_string(names: Iterable[str]) -> str:
+    """
+    Builds the URL-encoded wttr.in format string for some fields.
+
+    Args:
+        names: Field names returned by resolve_fields.
+
+    Returns:
+        The value of the ``format`` query parameter, e.g. "%25t%7C%25h".
+    """
+    return quote(SEPARATOR.join(_codes(names)), safe="")
+
+
+def parse_fields(text: str, names: Iterable[str]) -> WeatherFields:
+    """
+    Parses a custom format response into a record.
+
+    Args:
+        text: The response body, e.g. "+12°C|75%|↑11km/h".
+        names: The field names the request was built for.
+
+    Returns:
+        A WeatherFields record. Fields that were not requested, or whose value
+        could not be parsed, are None.
+    """
+    names = tuple(names)
+    codes = _codes(names)
+    values = text.strip().split(SEPARATOR)
+    if len(values) != len(codes):
+        # Not an answer to our format, e.g. "Unknown location"
+        return WeatherFields(requested=list(names))
+    by_code = dict(zip(codes, values, strict=True))
+    record: dict[str, Any] = {
+        name: FIELDS[name][1](by_code[FIELDS[name][0]]) for name in names
+    }
+    return WeatherFields(requested=list(names), **record)
+
+
+def mock_fields(names: Iterable[str]) -> WeatherFields:
+    """
+    Builds a record from mock values.
+
+    Args:
+        names: The requested field names.
+
+    Returns:
+        A WeatherFields record with plausible values for every requested field.
+    """
+    names = tuple(names)
+    return parse_fields(
+        SEPARATOR.join(MOCK_VALUES[code] for code in _codes(names)), names
+    )
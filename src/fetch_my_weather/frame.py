@@ -0,0 +1,479 @@
+"""
+Columnar view of wttr.in forecasts for fetch_my_weather.
+
+``WeatherResponse.weather[*].hourly[*]`` is a list of lists of pydantic
+objects, which is convenient for reading one value and slow for aggregating
+thousands of them. ``ForecastFrame`` packs the numeric hourly and daily fields
+into one contiguous ``array.array("d")`` per field, so min/max/mean and
+threshold masks run over flat arrays, and frames for many cities can be
+stacked into one::
+
+    frame = get_weather(location="Perth").to_columns()
+    frame.max("tempC")
+    frame.mask("chanceofrain", ">=", 50)
+
+    frames = [r.data.to_columns() for r in get_weather_many(cities)]
+    ForecastFrame.stack(frames).mean("humidity")
+
+The aggregations use NumPy when it is installed (``pip install
+"fetch-my-weather[numpy]"``) and plain Python loops otherwise. ``to_numpy``
+returns the columns as NumPy arrays without copying them.
+
+Missing values ("", "No moonrise", fields wttr.in left out) are stored as NaN
+and ignored by the aggregations.
+"""
+
+import functools
+import math
+import operator
+from array import array
+from collections.abc import Callable, Iterable
+from datetime import date, time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .models import WeatherResponse
+
+
+@functools.cache
+def _load_numpy() -> Any:
+    """Imports NumPy on first use, so importing this module stays cheap."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return numpy
+
+
+# Numeric fields of HourlyForecast, packed one array per field. "hour" is the
+# forecast time as hours after midnight (wttr.in sends "0" to "2100").
+HOURLY_COLUMNS = (
+    "DewPointC",
+    "DewPointF",
+    "FeelsLikeC",
+    "FeelsLikeF",
+    "HeatIndexC",
+    "HeatIndexF",
+    "WindChillC",
+    "WindChillF",
+    "WindGustKmph",
+    "WindGustMiles",
+    "chanceoffog",
+    "chanceoffrost",
+    "chanceofhightemp",
+    "chanceofovercast",
+    "chanceofrain",
+    "chanceofremdry",
+    "chanceofsnow",
+    "chanceofsunshine",
+    "chanceofthunder",
+    "chanceofwindy",
+    "cloudcover",
+    "humidity",
+    "precipInches",
+    "precipMM",
+    "pressure",
+    "pressureInches",
+    "tempC",
+    "tempF",
+    "uvIndex",
+    "visibility",
+    "visibilityMiles",
+    "weatherCode",
+    "winddirDegree",
+    "windspeedKmph",
+    "windspeedMiles",
+)
+
+# Numeric fields of DailyForecast, plus the day's moon illumination. "date" is
+# stored as date.toordinal() so it fits in a numeric array.
+DAILY_COLUMNS = (
+    "avgtempC",
+    "avgtempF",
+    "maxtempC",
+    "maxtempF",
+    "mintempC",
+    "mintempF",
+    "sunHour",
+    "totalSnow_cm",
+    "uvIndex",
+)
+
+_COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_NAN = math.nan
+
+
+def _to_float(value: Any) -> float:
+    """
+    Converts a wttr.in value (string or typed) to a float.
+
+    Args:
+        value: A string such as "17" or "0.4", a number, or None.
+
+    Returns:
+        The value as a float, or NaN if it is missing or not a number.
+    """
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def _to_hour(value: Any) -> float:
+    """
+    Converts an hourly forecast time to hours after midnight.
+
+    Args:
+        value: "0" to "2100" from the string models, or a datetime.time from
+               the typed models.
+
+    Returns:
+        Hours after midnight (e.g. 21.0 for "2100"), or NaN if missing.
+    """
+    if isinstance(value, time):
+        return value.hour + value.minute / 60
+    number = _to_float(value)
+    if math.isnan(number):
+        return number
+    hours, minutes = divmod(int(number), 100)
+    return hours + minutes / 60
+
+
+def _to_ordinal(value: Any) -> float:
+    """
+    Converts a forecast date to its proleptic Gregorian ordinal.
+
+    Args:
+        value: "2025-04-13" from the string models, or a datetime.date from
+               the typed models.
+
+    Returns:
+        date.toordinal() as a float, or NaN if missing or malformed.
+    """
+    if isinstance(value, date):
+        return float(value.toordinal())
+    try:
+        return float(date.fromisoformat(value).toordinal())
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def _location_name(response: "WeatherResponse") -> str:
+    """
+    Returns a label for the location a response describes.
+
+    Args:
+        response: The weather response.
+
+    Returns:
+        The nearest area's name, the request query, or "" if neither is set.
+    """
+    for area in response.nearest_area:
+        if area.areaName:
+            return area.areaName[0].value
+    for request in response.request:
+        if request.query:
+            return request.query
+    return ""
+
+
+def _empty_columns(names: Iterable[str]) -> dict[str, array]:
+    return {name: array("d") for name in names}
+
+
+def _hourly_columns() -> dict[str, array]:
+    return _empty_columns(("source", "day", "hour", *HOURLY_COLUMNS))
+
+
+def _daily_columns() -> dict[str, array]:
+    return _empty_columns(("source", "date", "moon_illumination", *DAILY_COLUMNS))
+
+
+class ForecastFrame:
+    """
+    Hourly and daily forecast fields packed into contiguous numeric arrays.
+
+    Attributes:
+        hourly: One array("d") per hourly field, all the same length. Besides
+                HOURLY_COLUMNS it has "hour" (hours after midnight), "day" (the
+                row in ``daily`` the hour belongs to) and "source".
+        daily: One array("d") per daily field. Besides DAILY_COLUMNS it has
+               "date" (date.toordinal()), "moon_illumination" and "source".
+        sources: The location of each stacked response; the "source" columns
+                 index into this list.
+    """
+
+    def __init__(
+        self,
+        hourly: dict[str, array],
+        daily: dict[str, array],
+        sources: list[str],
+    ) -> None:
+        self.hourly = hourly
+        self.daily = daily
+        self.sources = sources
+
+    @classmethod
+    def from_response(cls, response: "WeatherResponse") -> "ForecastFrame":
+        """
+        Packs one weather response into columns.
+
+        Works with both the string models and the typed models.
+
+        Args:
+            response: The response to convert.
+
+        Returns:
+            A ForecastFrame with one daily row per forecast day and one hourly
+            row per forecast hour.
+        """
+        hourly = _hourly_columns()
+        daily = _daily_columns()
+
+        for day_index, day in enumerate(response.weather):
+            daily["source"].append(0.0)
+            daily["date"].append(_to_ordinal(day.date))
+            daily["moon_illumination"].append(
+                _to_float(day.astronomy[0].moon_illumination) if day.astronomy else _NAN
+            )
+            for name in DAILY_COLUMNS:
+                daily[name].append(_to_float(getattr(day, name)))
+
+            for hour in day.hourly:
+                hourly["source"].append(0.0)
+                hourly["day"].append(float(day_index))
+                hourly["hour"].append(_to_hour(hour.time))
+                for name in HOURLY_COLUMNS:
+                    hourly[name].append(_to_float(getattr(hour, name)))
+
+        return cls(hourly, daily, [_location_name(response)])
+
+    @classmethod
+    def stack(cls, frames: Iterable["ForecastFrame"]) -> "ForecastFrame":
+        """
+        Concatenates frames, e.g. one per city, into a single frame.
+
+        The "source" and "day" columns are renumbered so they index into the
+        combined ``sources`` list and ``daily`` rows.
+
+        Args:
+            frames: The frames to stack, in order.
+
+        Returns:
+            A new ForecastFrame holding every row of every frame.
+        """
+        hourly = _hourly_columns()
+        daily = _daily_columns()
+        sources: list[str] = []
+
+        for frame in frames:
+            source_offset = float(len(sources))
+            day_offset = float(len(daily["source"]))
+            for name, column in frame.hourly.items():
+                if name == "source":
+                    hourly[name].extend(v + source_offset for v in column)
+                elif name == "day":
+                    hourly[name].extend(v + day_offset for v in column)
+                else:
+                    hourly[name].extend(column)
+            for name, column in frame.daily.items():
+                if name == "source":
+                    daily[name].extend(v + source_offset for v in column)
+                else:
+                    daily[name].extend(column)
+            sources.extend(frame.sources)
+
+        return cls(hourly, daily, sources)
+
+    @classmethod
+    def from_response_list(
+        cls, responses: Iterable["WeatherResponse"]
+    ) -> "ForecastFrame":
+        """
+        Packs several weather responses into one stacked frame.
+
+        Args:
+            responses: The responses to convert, e.g. one per city.
+
+        Returns:
+            The stacked ForecastFrame.
+        """
+        return cls.stack(cls.from_response(response) for response in responses)
+
+    def __len__(self) -> int:
+        """Returns the number of hourly rows."""
+        return len(self.hourly["source"])
+
+    def __repr__(self) -> str:
+        return (
+            f"ForecastFrame(hourly_rows={len(self)}, "
+            f"daily_rows={len(self.daily['source'])}, sources={self.sources!r})"
+        )
+
+    def column(self, name: str, table: str = "hourly") -> array:
+        """
+        Returns one column.
+
+        Args:
+            name: The field name, e.g. "tempC".
+            table: "hourly" or "daily".
+
+        Returns:
+            The column's array("d"); not a copy.
+
+        Raises:
+            KeyError: If the table or column doesn't exist.
+        """
+        if table == "hourly":
+            return self.hourly[name]
+        if table == "daily":
+            return self.daily[name]
+        raise KeyError(f"Unknown table {table!r}; use 'hourly' or 'daily'")
+
+    def to_numpy(self, table: str = "hourly", copy: bool = True) -> dict[str, Any]:
+        """
+        Returns a table's columns as NumPy arrays.
+
+        With ``copy=False`` the arrays share memory with the frame's columns,
+        so no data is copied, but the columns can't grow while any of the
+        arrays exist: appending to them raises BufferError.
+
+        Args:
+            table: "hourly" or "daily".
+            copy: Whether to copy the data, leaving the frame free to change.
+
+        Returns:
+            A dict of column name to float64 numpy.ndarray.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            KeyError: If the table doesn't exist.
+        """
+        numpy = _load_numpy()
+        if numpy is None:
+            raise ImportError(
+                "to_numpy() requires NumPy: pip install 'fetch-my-weather[numpy]'"
+            )
+        if table not in ("hourly", "daily"):
+            raise KeyError(f"Unknown table {table!r}; use 'hourly' or 'daily'")
+        columns = self.hourly if table == "hourly" else self.daily
+        if copy:
+            return {
+                name: numpy.array(column, dtype=numpy.float64)
+                for name, column in columns.items()
+            }
+        return {
+            name: numpy.frombuffer(column, dtype=numpy.float64)
+            for name, column in columns.items()
+        }
+
+    def _reduce(self, name: str, table: str, reducer: str) -> float:
+        """
+        Applies min, max or mean to one column, ignoring NaN.
+
+        Args:
+            name: The column name.
+            table: "hourly" or "daily".
+            reducer: "min", "max" or "mean".
+
+        Returns:
+            The result, or NaN if the column has no values.
+        """
+        column = self.column(name, table)
+        numpy = _load_numpy()
+        if numpy is not None:
+            values = numpy.frombuffer(column, dtype=numpy.float64)
+            values = values[~numpy.isnan(values)]
+            if not len(values):
+                return _NAN
+            return float(getattr(values, reducer)())
+
+        present = [value for value in column if not math.isnan(value)]
+        if not present:
+            return _NAN
+        if reducer == "mean":
+            return math.fsum(present) / len(present)
+        return float(min(present) if reducer == "min" else max(present))
+
+    def min(self, name: str, table: str = "hourly") -> float:
+        """
+        Returns the smallest value in a column, ignoring missing values.
+
+        Args:
+            name: The column name, e.g. "tempC".
+            table: "hourly" or "daily".
+
+        Returns:
+            The minimum, or NaN if the column has no values.
+        """
+        return self._reduce(name, table, "min")
+
+    def max(self, name: str, table: str = "hourly") -> float:
+        """
+        Returns the largest value in a column, ignoring missing values.
+
+        Args:
+            name: The column name, e.g. "tempC".
+            table: "hourly" or "daily".
+
+        Returns:
+            The maximum, or NaN if the column has no values.
+        """
+        return self._reduce(name, table, "max")
+
+    def mean(self, name: str, table: str = "hourly") -> float:
+        """
+        Returns the mean of a column, ignoring missing values.
+
+        Args:
+            name: The column name, e.g. "tempC".
+            table: "hourly" or "daily".
+
+        Returns:
+            The mean, or NaN if the column has no values.
+        """
+        return self._reduce(name, table, "mean")
+
+    def mask(
+        self, name: str, op: str, threshold: float, table: str = "hourly"
+    ) -> list[bool]:
+        """
+        Compares every value in a column with a threshold.
+
+        Missing values never match (NaN compares false), except for "!=".
+
+        Args:
+            name: The column name, e.g. "chanceofrain".
+            op: One of "<", "<=", ">", ">=", "==", "!=".
+            threshold: The value to compare with.
+            table: "hourly" or "daily".
+
+        Returns:
+            One bool per row.
+
+        Raises:
+            ValueError: If op is not a supported comparison.
+        """
+        compare = _COMPARISONS.get(op)
+        if compare is None:
+            raise ValueError(
+                f"Unsupported comparison {op!r}; use one of {list(_COMPARISONS)}"
+            )
+        column = self.column(name, table)
+        numpy = _load_numpy()
+        if numpy is not None:
+            result: list[bool] = compare(
+                numpy.frombuffer(column, dtype=numpy.float64), threshold
+            ).tolist()
+            return result
+        return [bool(compare(value, threshold)) for value in column]
@@ -0,0 +1,410 @@
+"""
+Metrics hooks for fetch_my_weather.
+
+A WeatherClient reports what happens to every request to a ``Metrics``
+object: cache hits and misses per format, upstream responses by status code,
+upstream errors and mock fallbacks by error type, retries, and the latency of each
+call. The default ``Metrics`` does nothing. ``InMemoryMetrics`` keeps counters
+and fixed-bucket latency histograms that ``get_stats()`` returns as a
+snapshot, and ``to_prometheus`` renders a snapshot in the Prometheus text
+exposition format::
+
+    from fetch_my_weather import InMemoryMetrics, get_stats, set_metrics, to_prometheus
+
+    set_metrics(InMemoryMetrics())
+    ...
+    print(to_prometheus(get_stats()))
+
+To feed another metrics system, subclass ``Metrics`` and override the hooks.
+Hooks are called on the request path, from any thread, so they must be fast
+and thread-safe.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    15.0,
+)
+
+PROMETHEUS_PREFIX = "fetch_my_weather_"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Metrics:
+    """
+    Receives metrics events from a WeatherClient. Every hook does nothing.
+
+    ``format`` is the requested format ("json", "raw_json", "text", "png") or
+    "fields" for projected requests.
+    """
+
+    def cache_hit(self, format: str, stale: bool) -> None:
+        """
+        A request was answered from the cache.
+
+        Args:
+            format: The requested format.
+            stale: Whether the entry was past its cache duration.
+        """
+
+    def cache_miss(self, format: str) -> None:
+        """
+        A request found nothing usable in the cache.
+
+        Args:
+            format: The requested format.
+        """
+
+    def upstream_response(self, format: str, status_code: int, seconds: float) -> None:
+        """
+        wttr.in answered a request.
+
+        Args:
+            format: The requested format.
+            status_code: The HTTP status code.
+            seconds: How long the request took.
+        """
+
+    def upstream_error(self, format: str, error_type: str, seconds: float) -> None:
+        """
+        A request to wttr.in failed without a response.
+
+        Args:
+            format: The requested format.
+            error_type: The exception class name, e.g. "Timeout".
+            seconds: How long until the request failed.
+        """
+
+    def retry(self, format: str, reason: str, delay: float) -> None:
+        """
+        A failed request is about to be retried.
+
+        Args:
+            format: The requested format.
+            reason: The failure class, e.g. "timeout" or "rate_limited".
+            delay: Seconds until the retry.
+        """
+
+    def rate_limited(self, format: str, seconds: float, rejected: bool) -> None:
+        """
+        The rate limiter had no token for a request.
+
+        Args:
+            format: The requested format.
+            seconds: How long the request waited for a token.
+            rejected: Whether the request failed instead of waiting.
+        """
+
+    def circuit_changed(self, state: str) -> None:
+        """
+        The circuit breaker entered a new state.
+
+        Args:
+            state: "closed", "open" or "half_open".
+        """
+
+    def fallback(self, error_type: str) -> None:
+        """
+        A call returned mock data because of an error.
+
+        Args:
+            error_type: The error_type in the response metadata.
+        """
+
+    def request(self, format: str, seconds: float) -> None:
+        """
+        A get_weather call finished.
+
+        Args:
+            format: The requested format.
+            seconds: How long the call took, wherever the data came from.
+        """
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the collected metrics.
+
+        Returns:
+            A dictionary with "counters" and "histograms"; empty here.
+        """
+        return {"counters": {}, "histograms": {}}
+
+
+class Histogram:
+    """A latency histogram with fixed bucket bounds."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Create an empty histogram.
+
+        Args:
+            bounds: Sorted upper bounds of the buckets, in seconds.
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Adds a value to the bucket with the smallest bound >= value.
+
+        Args:
+            value: The value, in seconds.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the cumulative bucket counts, sum and count.
+
+        Returns:
+            A dictionary with "buckets" as [upper bound, cumulative count]
+            pairs (the last bound is "+Inf"), "sum" and "count".
+        """
+        buckets: list[list[Any]] = []
+        total = 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts, strict=True):
+            total += count
+            buckets.append([bound, total])
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class InMemoryMetrics(Metrics):
+    """
+    Keeps counters and latency histograms in memory.
+
+    Counters:
+
+    - ``cache_hits_total{format}`` and ``cache_stale_hits_total{format}``
+    - ``cache_misses_total{format}``
+    - ``upstream_requests_total{format, status}``
+    - ``upstream_errors_total{format, error_type}``
+    - ``retries_total{format, reason}`` and ``retry_backoff_seconds_total{format}``
+    - ``rate_limited_total{format, outcome}`` ("waited" or "rejected") and
+      ``rate_limit_wait_seconds_total{format}``
+    - ``circuit_transitions_total{state}``
+    - ``fallbacks_total{error_type}``
+
+    Histograms, in seconds: ``request_duration_seconds{format}`` for whole
+    get_weather calls and ``upstream_duration_seconds{format}`` for requests to
+    wttr.in.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Create an empty collector.
+
+        Args:
+            buckets: Upper bounds of the latency histogram buckets, in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+
+    def increment(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """
+        Adds to a counter.
+
+        Args:
+            name: The counter name, e.g. "cache_hits_total".
+            labels: (name, value) label pairs.
+            value: The amount to add.
+        """
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        """
+        Adds a value to a histogram.
+
+        Args:
+            name: The histogram name, e.g. "request_duration_seconds".
+            value: The value, in seconds.
+            labels: (name, value) label pairs.
+        """
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def cache_hit(self, format: str, stale: bool) -> None:
+        name = "cache_stale_hits_total" if stale else "cache_hits_total"
+        self.increment(name, (("format", format),))
+
+    def cache_miss(self, format: str) -> None:
+        self.increment("cache_misses_total", (("format", format),))
+
+    def upstream_response(self, format: str, status_code: int, seconds: float) -> None:
+        labels = (("format", format),)
+        self.increment(
+            "upstream_requests_total", (*labels, ("status", str(status_code)))
+        )
+        self.observe("upstream_duration_seconds", seconds, labels)
+
+    def upstream_error(self, format: str, error_type: str, seconds: float) -> None:
+        labels = (("format", format),)
+        self.increment("upstream_errors_total", (*labels, ("error_type", error_type)))
+        self.observe("upstream_duration_seconds", seconds, labels)
+
+    def retry(self, format: str, reason: str, delay: float) -> None:
+        self.increment("retries_total", (("format", format), ("reason", reason)))
+        self.increment("retry_backoff_seconds_total", (("format", format),), delay)
+
+    def rate_limited(self, format: str, seconds: float, rejected: bool) -> None:
+        outcome = "rejected" if rejected else "waited"
+        self.increment("rate_limited_total", (("format", format), ("outcome", outcome)))
+        if seconds:
+            self.increment(
+                "rate_limit_wait_seconds_total", (("format", format),), seconds
+            )
+
+    def circuit_changed(self, state: str) -> None:
+        self.increment("circuit_transitions_total", (("state", state),))
+
+    def fallback(self, error_type: str) -> None:
+        self.increment("fallbacks_total", (("error_type", error_type),))
+
+    def request(self, format: str, seconds: float) -> None:
+        self.observe("request_duration_seconds", seconds, (("format", format),))
+
+    def reset(self) -> None:
+        """Clears every counter and histogram."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns a copy of every counter and histogram.
+
+        Returns:
+            ``{"counters": {name: [{"labels": {...}, "value": n}, ...]},
+            "histograms": {name: [{"labels": {...}, "buckets": [...], "sum": s,
+            "count": n}, ...]}}``
+        """
+        counters: dict[str, list[dict[str, Any]]] = {}
+        histograms: dict[str, list[dict[str, Any]]] = {}
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+            for (name, labels), histogram in sorted(
+                self._histograms.items(), key=lambda item: item[0]
+            ):
+                histograms.setdefault(name, []).append(
+                    {"labels": dict(labels), **histogram.snapshot()}
+                )
+        return {"counters": counters, "histograms": histograms}
+
+
+def _escape(value: Any) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: dict[str, Any]) -> str:
+    """Formats labels as {name="value",...}."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    """Formats a sample value like Prometheus client libraries do."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def to_prometheus(stats: dict[str, Any], prefix: str = PROMETHEUS_PREFIX) -> str:
+    """
+    Renders a ``get_stats()`` snapshot in the Prometheus text format.
+
+    Args:
+        stats: A snapshot from ``get_stats()``.
+        prefix: Prefix for every metric name.
+
+    Returns:
+        The exposition text, ending with a newline.
+    """
+    lines: list[str] = []
+
+    # Counters and gauges kept by the cache backend itself
+    cache = stats.get("cache") or {}
+    for key, kind in (
+        ("entries", "gauge"),
+        ("bytes", "gauge"),
+        ("expirations", "counter"),
+        ("evictions", "counter"),
+        ("errors", "counter"),
+    ):
+        value = cache.get(key)
+        if isinstance(value, int | float):
+            name = f"{prefix}cache_{key}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_number(value)}")
+
+    # The circuit breaker's state as one 0/1 series per state
+    circuit = stats.get("circuit")
+    if circuit:
+        name = f"{prefix}circuit_state"
+        lines.append(f"# TYPE {name} gauge")
+        for state in ("closed", "open", "half_open"):
+            value = int(circuit.get("state") == state)
+            lines.append(f'{name}{{state="{state}"}} {value}')
+        name = f"{prefix}circuit_rejected_total"
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {_number(circuit.get('rejected', 0))}")
+
+    for name, samples in stats.get("counters", {}).items():
+        full_name = prefix + name
+        lines.append(f"# TYPE {full_name} counter")
+        for sample in samples:
+            lines.append(
+                f"{full_name}{_label_text(sample['labels'])} {_number(sample['value'])}"
+            )
+
+    for name, samples in stats.get("histograms", {}).items():
+        full_name = prefix + name
+        lines.append(f"# TYPE {full_name} histogram")
+        for sample in samples:
+            labels = sample["labels"]
+            for bound, count in sample["buckets"]:
+                le = bound if isinstance(bound, str) else _number(bound)
+                lines.append(
+                    f"{full_name}_bucket{_label_text({**labels, 'le': le})} {count}"
+                )
+            lines.append(
+                f"{full_name}_sum{_label_text(labels)} {_number(sample['sum'])}"
+            )
+            lines.append(f"{full_name}_count{_label_text(labels)} {sample['count']}")
+
+    return "\n".join(lines) + "\n"
@@ -5,9 +5,36 @@ These models define the structure of the JSON data returned by the wttr.in API,
 providing type safety, validation, and easier access to weather data.
 """
 
-from typing import Any
+import threading
+from collections.abc import Callable
+from datetime import date as dt_date
+from datetime import datetime
+from datetime import time as dt_time
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar, get_args, get_origin
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator, validator
+
+if TYPE_CHECKING:
+    from .frame import ForecastFrame
+
+
+class ResponseTimings(BaseModel):
+    """Where the time of one get_weather call went, in milliseconds.
+
+    Phases that didn't happen (e.g. connect on a reused connection, or
+    everything after the cache lookup on a cache hit) are None.
+    """
+
+    url_build_ms: float | None = None  # Building the request URL
+    cache_lookup_ms: float | None = None  # Looking the URL up in the cache
+    throttle_ms: float | None = None  # Waiting for a rate limiter token
+    connect_ms: float | None = None  # DNS lookup, TCP connect and TLS handshake
+    ttfb_ms: float | None = None  # Sending the request until the headers arrive
+    download_ms: float | None = None  # Reading the response body
+    decode_ms: float | None = None  # Decoding the body into text and JSON
+    validate_ms: float | None = None  # Building and validating the models
+    total_ms: float | None = None  # The whole call
+    size_bytes: int | None = None  # Size of the response body
 
 
 class ResponseMetadata(BaseModel):
@@ -17,6 +44,7 @@ class ResponseMetadata(BaseModel):
     is_real_data: bool = True  # Whether this is real data from the API
     is_cached: bool = False  # Whether this came from cache
     is_mock: bool = False  # Whether this is fallback mock data
+    is_stale: bool = False  # Whether this is cached data past its cache duration
 
     # Error information
     status_code: int | None = None  # HTTP status code if available
@@ -27,6 +55,14 @@ class ResponseMetadata(BaseModel):
     url: str | None = None  # URL that was requested
     timestamp: float | None = None  # When the request was made
 
+    # Retries, counted when with_metadata=True
+    attempts: int = 0  # Requests sent to the server, including retries
+    backoff_ms: float = 0.0  # Time spent waiting between retries
+    circuit_state: str | None = None  # Circuit breaker state, if one was consulted
+
+    # Per-phase timings, filled in when with_metadata=True
+    timings: ResponseTimings | None = None
+
 
 class WeatherDesc(BaseModel):
     """Weather description model."""
@@ -187,9 +223,623 @@ class WeatherResponse(BaseModel):
     # Metadata for tracking response type and status
     metadata: ResponseMetadata = Field(default_factory=ResponseMetadata)
 
+    def to_columns(self) -> "ForecastFrame":
+        """
+        Packs the hourly and daily forecasts into numeric column arrays.
+
+        Returns:
+            A ForecastFrame for fast aggregation over the forecast.
+        """
+        from .frame import ForecastFrame
+
+        return ForecastFrame.from_response(self)
+
+
+class WeatherFields(BaseModel):
+    """
+    A few current values, fetched with ``get_weather(fields=[...])``.
+
+    Only the requested fields are filled in; the others are None. Numbers are
+    parsed without their unit, which follows the ``units`` of the request.
+    """
+
+    condition: str | None = None  # e.g. "Partly cloudy"
+    temperature: float | None = None
+    feels_like: float | None = None
+    humidity: int | None = None  # Percent
+    wind: float | None = None  # Wind speed
+    wind_direction: str | None = None  # Arrow pointing where the wind blows, e.g. "↗"
+    precipitation: float | None = None  # mm over the next 3 hours
+    pressure: int | None = None  # hPa
+    uv_index: int | None = None
+    location: str | None = None
+    moon_phase: str | None = None  # Moon phase emoji
+    moon_day: int | None = None  # Days since the new moon
+    dawn: dt_time | None = None
+    sunrise: dt_time | None = None
+    zenith: dt_time | None = None
+    sunset: dt_time | None = None
+    dusk: dt_time | None = None
+    local_time: dt_time | None = None
+    timezone: str | None = None
+
+    requested: list[str] = Field(default_factory=list)  # Fields that were asked for
+
+    # Metadata for tracking response type and status
+    metadata: ResponseMetadata = Field(default_factory=ResponseMetadata)
+
+
+class MoonPhase(BaseModel):
+    """The moon phase at one moment, computed locally by the astronomy module."""
+
+    name: str  # e.g. "Waxing Gibbous", as in Astronomy.moon_phase
+    emoji: str  # e.g. "🌔"
+    illumination: float  # Percent of the disc that is lit
+    age: float  # Days since the new moon
+    waxing: bool
+
 
 class ResponseWrapper(BaseModel):
     """Wrapper for any response with metadata."""
 
     data: Any  # The actual response data (text, bytes, dict)
     metadata: ResponseMetadata  # Metadata about the response
+
+
+# --- Typed models ---
+# The models above keep every value as the string wttr.in sends. The Typed*
+# variants below convert numbers, dates and times once at parse time, so
+# consumers don't have to call int()/float() themselves. Request them with
+# get_weather(typed=True).
+
+# Values wttr.in uses for "no value", e.g. on days without a moonrise
+_NO_VALUE = {"", "no moonrise", "no moonset", "no sunrise", "no sunset"}
+
+
+def _is_no_value(value: Any) -> bool:
+    """Returns True for the strings wttr.in uses when a value is missing."""
+    return isinstance(value, str) and value.strip().lower() in _NO_VALUE
+
+
+def _parse_clock_time(value: Any) -> Any:
+    """
+    Parses a 12-hour clock time such as "06:12 AM" into a time.
+
+    Args:
+        value: The raw field value.
+
+    Returns:
+        A datetime.time, None for a missing value, or the value unchanged if
+        it isn't a string.
+    """
+    if _is_no_value(value):
+        return None
+    if isinstance(value, str):
+        return datetime.strptime(value.strip(), "%I:%M %p").time()
+    return value
+
+
+class _TypedModel(BaseModel):
+    """Base for typed models: blank and "No ..." values become None."""
+
+    # One pass over the raw dict; a "*" field validator would add a Python
+    # call to every field of every nested model. Numbers, dates and most
+    # text can't be "no value", so only blank or N-words are looked at closely
+    @root_validator(pre=True, allow_reuse=True)
+    def _no_value_to_none(cls, values: Any) -> Any:  # noqa: N805
+        if not isinstance(values, dict):
+            return values
+        missing = [
+            name
+            for name, value in values.items()
+            if isinstance(value, str)
+            and (not value or value[0] in "Nn" or value[0].isspace())
+            and _is_no_value(value)
+        ]
+        if not missing:
+            return values
+        values = dict(values)  # Leave the caller's dict alone
+        for name in missing:
+            values[name] = None
+        return values
+
+
+class TypedAstronomy(_TypedModel):
+    """Astronomy information with times parsed into datetime.time values."""
+
+    moon_illumination: int | None = None
+    moon_phase: str | None = None
+    moonrise: dt_time | None = None
+    moonset: dt_time | None = None
+    sunrise: dt_time | None = None
+    sunset: dt_time | None = None
+
+    @validator("moonrise", "moonset", "sunrise", "sunset", pre=True, allow_reuse=True)
+    def _parse_times(cls, value: Any) -> Any:  # noqa: N805
+        return _parse_clock_time(value)
+
+
+class TypedHourlyForecast(_TypedModel):
+    """Hourly weather forecast data with numeric fields parsed."""
+
+    DewPointC: int | None = None
+    DewPointF: int | None = None
+    FeelsLikeC: int | None = None
+    FeelsLikeF: int | None = None
+    HeatIndexC: int | None = None
+    HeatIndexF: int | None = None
+    WindChillC: int | None = None
+    WindChillF: int | None = None
+    WindGustKmph: int | None = None
+    WindGustMiles: int | None = None
+    chanceoffog: int | None = None
+    chanceoffrost: int | None = None
+    chanceofhightemp: int | None = None
+    chanceofovercast: int | None = None
+    chanceofrain: int | None = None
+    chanceofremdry: int | None = None
+    chanceofsnow: int | None = None
+    chanceofsunshine: int | None = None
+    chanceofthunder: int | None = None
+    chanceofwindy: int | None = None
+    cloudcover: int | None = None
+    humidity: int | None = None
+    precipInches: float | None = None
+    precipMM: float | None = None
+    pressure: int | None = None
+    pressureInches: float | None = None
+    tempC: int | None = None
+    tempF: int | None = None
+    time: dt_time | None = None  # Local time of the forecast slot
+    uvIndex: int | None = None
+    visibility: int | None = None
+    visibilityMiles: int | None = None
+    weatherCode: int | None = None
+    weatherDesc: list[WeatherDesc] = Field(default_factory=list)
+    weatherIconUrl: list[WeatherIconUrl] = Field(default_factory=list)
+    winddir16Point: str | None = None
+    winddirDegree: int | None = None
+    windspeedKmph: int | None = None
+    windspeedMiles: int | None = None
+
+    @validator("time", pre=True, allow_reuse=True)
+    def _parse_slot_time(cls, value: Any) -> Any:  # noqa: N805
+        # wttr.in sends slot times as "0", "300", ..., "2100" (HHMM)
+        if _is_no_value(value):
+            return None
+        if isinstance(value, str) and value.strip().isdigit():
+            hhmm = int(value)
+            return dt_time(hhmm // 100, hhmm % 100)
+        return value
+
+
+class TypedCurrentCondition(_TypedModel):
+    """Current weather conditions with numeric fields parsed."""
+
+    FeelsLikeC: int | None = None
+    FeelsLikeF: int | None = None
+    cloudcover: int | None = None
+    humidity: int | None = None
+    localObsDateTime: datetime | None = None  # Local observation time
+    observation_time: dt_time | None = None  # Observation time in UTC
+    precipInches: float | None = None
+    precipMM: float | None = None
+    pressure: int | None = None
+    pressureInches: float | None = None
+    temp_C: int | None = None
+    temp_F: int | None = None
+    uvIndex: int | None = None
+    visibility: int | None = None
+    visibilityMiles: int | None = None
+    weatherCode: int | None = None
+    weatherDesc: list[WeatherDesc] = Field(default_factory=list)
+    weatherIconUrl: list[WeatherIconUrl] = Field(default_factory=list)
+    winddir16Point: str | None = None
+    winddirDegree: int | None = None
+    windspeedKmph: int | None = None
+    windspeedMiles: int | None = None
+
+    @validator("observation_time", pre=True, allow_reuse=True)
+    def _parse_observation_time(cls, value: Any) -> Any:  # noqa: N805
+        return _parse_clock_time(value)
+
+    @validator("localObsDateTime", pre=True, allow_reuse=True)
+    def _parse_local_datetime(cls, value: Any) -> Any:  # noqa: N805
+        # e.g. "2025-04-13 10:24 AM"
+        if _is_no_value(value):
+            return None
+        if isinstance(value, str):
+            return datetime.strptime(value.strip(), "%Y-%m-%d %I:%M %p")
+        return value
+
+
+class TypedDailyForecast(_TypedModel):
+    """Daily weather forecast data with numeric fields parsed."""
+
+    astronomy: list[TypedAstronomy] = Field(default_factory=list)
+    avgtempC: int | None = None
+    avgtempF: int | None = None
+    date: dt_date | None = None
+    hourly: list[TypedHourlyForecast] = Field(default_factory=list)
+    maxtempC: int | None = None
+    maxtempF: int | None = None
+    mintempC: int | None = None
+    mintempF: int | None = None
+    sunHour: float | None = None
+    totalSnow_cm: float | None = None
+    uvIndex: int | None = None
+
+
+class TypedNearestArea(_TypedModel):
+    """Information about the nearest area with coordinates parsed."""
+
+    areaName: list[AreaName] = Field(default_factory=list)
+    country: list[Country] = Field(default_factory=list)
+    latitude: float | None = None
+    longitude: float | None = None
+    population: int | None = None
+    region: list[Region] = Field(default_factory=list)
+    weatherUrl: list[WeatherIconUrl] = Field(default_factory=list)
+
+
+class TypedWeatherResponse(WeatherResponse):
+    """
+    Complete weather response with numbers, dates and times parsed.
+
+    Has the same structure as WeatherResponse, but numeric fields are ints or
+    floats, dates are datetime.date, times are datetime.time and
+    ``localObsDateTime`` is a datetime. Missing or blank values are None.
+    """
+
+    current_condition: list[TypedCurrentCondition] = Field(default_factory=list)  # type: ignore[assignment]
+    nearest_area: list[TypedNearestArea] = Field(default_factory=list)  # type: ignore[assignment]
+    weather: list[TypedDailyForecast] = Field(default_factory=list)  # type: ignore[assignment]
+
+
+# --- Trusted construction ---
+# Data that has already been validated once (cache entries, the bundled mock
+# data) doesn't need validating again. construct_trusted builds models from it
+# the cheapest way the installed pydantic offers.
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# pydantic 2 validates in compiled code; pydantic 1 validates in Python
+_PYDANTIC_V1 = not hasattr(BaseModel, "model_validate")
+
+# Per model class: (field name, nested model class or None, is a list,
+# default factory, default)
+_CONSTRUCT_PLANS: dict[type[BaseModel], list[tuple[str, Any, bool, Any, Any]]] = {}
+
+
+def _construct_plan(
+    model_type: type[BaseModel],
+) -> list[tuple[str, Any, bool, Any, Any]]:
+    """
+    Describes how to build each field of a pydantic 1 model.
+
+    Args:
+        model_type: A pydantic 1 model class.
+
+    Returns:
+        (name, nested model class or None, is_list, default_factory, default)
+        for every field.
+    """
+    plan = _CONSTRUCT_PLANS.get(model_type)
+    if plan is None:
+        plan = []
+        # pydantic 1 ModelField objects
+        fields: dict[str, Any] = model_type.__fields__  # type: ignore[assignment]
+        for name, field in fields.items():
+            annotation = field.outer_type_
+            is_list = get_origin(annotation) is list
+            if is_list:
+                annotation = get_args(annotation)[0]
+            nested = (
+                annotation
+                if isinstance(annotation, type) and issubclass(annotation, BaseModel)
+                else None
+            )
+            plan.append((name, nested, is_list, field.default_factory, field.default))
+        _CONSTRUCT_PLANS[model_type] = plan
+    return plan
+
+
+def _construct(model_type: type[ModelT], data: dict[str, Any]) -> ModelT:
+    """
+    Recursively builds a pydantic 1 model without validating it.
+
+    This does what ``construct()`` does, but with the field plan worked out
+    once per class. Keys that aren't fields of the model are dropped, as
+    validation would. Plain defaults are shared rather than copied, which is
+    safe because every plain default in these models is None.
+
+    Args:
+        model_type: The model class to build.
+        data: Decoded JSON matching the model.
+
+    Returns:
+        The model.
+    """
+    values: dict[str, Any] = {}
+    for name, nested, is_list, default_factory, default in _construct_plan(model_type):
+        if name not in data:
+            values[name] = default_factory() if default_factory else default
+            continue
+        value = data[name]
+        if nested is not None:
+            if is_list and isinstance(value, list):
+                value = [
+                    _construct(nested, item) if isinstance(item, dict) else item
+                    for item in value
+                ]
+            elif isinstance(value, dict):
+                value = _construct(nested, value)
+        values[name] = value
+    model = model_type.__new__(model_type)
+    object.__setattr__(model, "__dict__", values)
+    object.__setattr__(model, "__fields_set__", set(data).intersection(values))
+    return model
+
+
+def construct_trusted(model_type: type[ModelT], data: dict[str, Any]) -> ModelT:
+    """
+    Builds a model from data that is known to be valid, skipping validation.
+
+    Only use this for data that has been validated before, such as cache
+    entries and the bundled mock data; network responses should go through
+    ``parse_obj``.
+
+    With pydantic 1 the model tree is assembled directly, about five times
+    faster than validating it. pydantic 2 validates in compiled code that is
+    faster than any Python-level construction (including ``model_construct``),
+    so its validator is used instead. Typed models always validate, since
+    their values have to be converted.
+
+    Args:
+        model_type: The model class to build, e.g. WeatherResponse.
+        data: Decoded JSON matching the model.
+
+    Returns:
+        The model.
+    """
+    if (
+        not _PYDANTIC_V1
+        or issubclass(model_type, TypedWeatherResponse)
+        or issubclass(model_type, _LazyModel)
+    ):
+        return model_type.parse_obj(data)
+    return _construct(model_type, data)
+
+
+# --- Lazy models ---
+# Most callers read current_condition and never look at the 3 x 8 hourly
+# forecasts. The Lazy* models validate the small sections up front and keep
+# the big ones (weather, hourly, astronomy, nearest_area) as decoded JSON until
+# they are first accessed. Request them with get_weather(lazy=True).
+
+
+class _LazySections:
+    """
+    The not yet validated sections of a lazy model.
+
+    Shallow copies of a lazy model share one _LazySections, so a section is
+    validated at most once however many copies read it.
+    """
+
+    __slots__ = ("raw", "built", "lock")
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        self.raw = raw  # Field name -> decoded JSON, never modified
+        self.built: dict[str, Any] = {}  # Field name -> validated value
+        self.lock = threading.Lock()
+
+    def get(self, name: str, build: Callable[[Any], Any]) -> Any:
+        """
+        Returns a validated section, building it on first use.
+
+        Args:
+            name: The field name.
+            build: Converts the decoded JSON into the field value.
+
+        Returns:
+            The validated value.
+        """
+        with self.lock:
+            if name not in self.built:
+                self.built[name] = build(self.raw[name])
+            return self.built[name]
+
+
+if TYPE_CHECKING:
+    _LazyBase = BaseModel
+else:
+    _LazyBase = object
+
+
+class _LazyModel(_LazyBase):
+    """
+    Mixin for models whose list sections are validated on first access.
+
+    Subclasses list their lazy fields in ``__lazy_fields__`` (field name to
+    the model class of its items) and declare ``__slots__ =
+    ("_lazy_sections",)``. The pending sections are left out of the model's
+    ``__dict__``, so the first attribute access falls through to
+    ``__getattr__``, which validates the section and stores it like a normal
+    field. Anything that reads every field (dict(), json(), comparisons, deep
+    copies, pickling) validates the remaining sections first.
+    """
+
+    __slots__ = ()
+
+    __lazy_fields__: ClassVar[dict[str, type[BaseModel]]] = {}
+
+    @classmethod
+    def parse_obj(cls, obj: Any) -> Any:
+        """
+        Validates the eager fields of ``obj`` and keeps the lazy ones as-is.
+
+        Args:
+            obj: Decoded JSON.
+
+        Returns:
+            The lazy model.
+
+        Raises:
+            ValidationError: If an eager field doesn't match the model. Lazy
+                             sections raise it on first access instead.
+        """
+        if not isinstance(obj, dict):
+            return super().parse_obj(obj)
+        lazy_fields = cls.__lazy_fields__
+        model = super().parse_obj(
+            {key: value for key, value in obj.items() if key not in lazy_fields}
+        )
+        raw = {name: obj[name] for name in lazy_fields if name in obj}
+        for name in raw:
+            del model.__dict__[name]
+        fields_set = model.__fields_set__ if _PYDANTIC_V1 else model.model_fields_set
+        fields_set.update(raw)
+        object.__setattr__(model, "_lazy_sections", _LazySections(raw))
+        return model
+
+    def _pending_sections(self) -> "_LazySections | None":
+        try:
+            sections: _LazySections = object.__getattribute__(self, "_lazy_sections")
+        except AttributeError:
+            return None
+        return sections
+
+    def _build_section(self, name: str, value: Any) -> Any:
+        """
+        Validates one lazy section.
+
+        Args:
+            name: The field name.
+            value: The section's decoded JSON.
+
+        Returns:
+            The validated field value.
+
+        Raises:
+            ValidationError: If the section doesn't match the model.
+        """
+        item_model = self.__lazy_fields__[name]
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            return [item_model.parse_obj(item) for item in value]
+        # Anything else gets the error normal validation would give
+        return getattr(super().parse_obj({name: value}), name)
+
+    def __getattr__(self, name: str) -> Any:
+        if not name.startswith("_"):
+            sections = self._pending_sections()
+            if sections is not None and name in sections.raw:
+                value = sections.get(name, lambda raw: self._build_section(name, raw))
+                self.__dict__[name] = value
+                return value
+        parent = getattr(super(), "__getattr__", None)
+        if parent is None:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        return parent(name)
+
+    def _materialize(self) -> None:
+        """Validates every pending section, including those of nested models."""
+        sections = self._pending_sections()
+        if sections is None:
+            return
+        for name in sections.raw:
+            value = getattr(self, name)
+            for item in value if isinstance(value, list) else ():
+                if isinstance(item, _LazyModel):
+                    item._materialize()
+
+    def copy(self, *args: Any, **kwargs: Any) -> Any:
+        if args or kwargs:
+            # include/exclude/update/deep need every field
+            self._materialize()
+            return super().copy(*args, **kwargs)
+        new = super().copy()
+        object.__setattr__(new, "_lazy_sections", self._pending_sections())
+        return new
+
+    def model_copy(self, *args: Any, **kwargs: Any) -> Any:
+        if args or kwargs:
+            self._materialize()
+            return super().model_copy(*args, **kwargs)
+        new = super().model_copy()
+        object.__setattr__(new, "_lazy_sections", self._pending_sections())
+        return new
+
+    def dict(self, *args: Any, **kwargs: Any) -> Any:
+        self._materialize()
+        return super().dict(*args, **kwargs)
+
+    def json(self, *args: Any, **kwargs: Any) -> Any:
+        self._materialize()
+        return super().json(*args, **kwargs)
+
+    def model_dump(self, *args: Any, **kwargs: Any) -> Any:
+        self._materialize()
+        return super().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args: Any, **kwargs: Any) -> Any:
+        self._materialize()
+        return super().model_dump_json(*args, **kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        self._materialize()
+        if isinstance(other, _LazyModel):
+            other._materialize()
+        return bool(super().__eq__(other))
+
+    def __iter__(self) -> Any:
+        self._materialize()
+        return super().__iter__()
+
+    def __repr_args__(self) -> Any:
+        self._materialize()
+        return super().__repr_args__()
+
+    def __getstate__(self) -> Any:
+        self._materialize()
+        return super().__getstate__()
+
+
+class LazyDailyForecast(_LazyModel, DailyForecast):
+    """Daily forecast whose hourly and astronomy lists are validated on access."""
+
+    __slots__ = ("_lazy_sections",)
+    __lazy_fields__ = {"hourly": HourlyForecast, "astronomy": Astronomy}
+
+
+class LazyWeatherResponse(_LazyModel, WeatherResponse):
+    """
+    Weather response whose forecast and area sections are validated on access.
+
+    Behaves exactly like WeatherResponse (and is one), but ``weather`` and
+    ``nearest_area`` stay decoded JSON until first read, and so do each day's
+    ``hourly`` and ``astronomy``. Reading only ``current_condition`` never
+    builds the forecast models. A section that doesn't match the model raises
+    ValidationError on first access rather than when the response is parsed.
+    """
+
+    __slots__ = ("_lazy_sections",)
+    __lazy_fields__ = {"weather": LazyDailyForecast, "nearest_area": NearestArea}
+
+
+class LazyTypedDailyForecast(_LazyModel, TypedDailyForecast):
+    """Typed daily forecast whose hourly and astronomy lists are validated on access."""
+
+    __slots__ = ("_lazy_sections",)
+    __lazy_fields__ = {"hourly": TypedHourlyForecast, "astronomy": TypedAstronomy}
+
+
+class LazyTypedWeatherResponse(_LazyModel, TypedWeatherResponse):
+    """Typed weather response whose sections are parsed on first access."""
+
+    __slots__ = ("_lazy_sections",)
+    __lazy_fields__ = {
+        "weather": LazyTypedDailyForecast,
+        "nearest_area": TypedNearestArea,
+    }
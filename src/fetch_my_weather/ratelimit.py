@@ -0,0 +1,241 @@
+"""
+Client-side rate limiting for requests to wttr.in.
+
+A ``RateLimiter`` sits in front of the transport: every request, including
+retries, takes a token first. ``TokenBucket`` allows ``burst`` requests at
+once and refills at ``rate`` requests per second. It is thread-safe, so one
+bucket can be shared by several clients, threads and an ``AsyncWeatherClient``.
+``FileTokenBucket`` keeps the bucket in a small file under an exclusive lock,
+so every process on the host draws from the same budget::
+
+    from fetch_my_weather import TokenBucket, set_rate_limiter
+
+    set_rate_limiter(TokenBucket(rate=1, burst=5), on_limit="cache")
+"""
+
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+# What a client does when no token is available
+ON_LIMIT_MODES = (
+    "block",  # Wait for a token
+    "fail",  # Fail at once, like any other failed request
+    "cache",  # Serve the stale cache entry if there is one, otherwise wait
+)
+
+_STATE = struct.Struct("<dd")  # FileTokenBucket state: tokens, updated at
+
+
+class RateLimitError(Exception):
+    """Raised instead of sending a request when no token is available."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Client-side rate limit reached, retry in {retry_after:.3f}s")
+        self.retry_after = retry_after  # Seconds until a token is available
+
+
+def _refill(
+    tokens: float, updated: float, now: float, rate: float, burst: float
+) -> float:
+    """Returns the tokens in a bucket after refilling it up to ``now``."""
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class RateLimiter(ABC):
+    """
+    Interface for limiting how often requests are sent.
+
+    Implementations must be thread-safe.
+    """
+
+    @abstractmethod
+    def _take(self, take: bool) -> float:
+        """
+        Takes a token if one is available.
+
+        Args:
+            take: Whether to take the token; False only looks.
+
+        Returns:
+            0.0 if a token was (or could be) taken, otherwise the seconds
+            until one will be available.
+        """
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if one is available, without waiting.
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds until one will be.
+        """
+        return self._take(True)
+
+    def wait_time(self) -> float:
+        """
+        Looks at the bucket without taking a token.
+
+        Returns:
+            The seconds until a token is available, 0.0 if one is now.
+        """
+        return self._take(False)
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Takes a token, waiting for one if needed.
+
+        Args:
+            timeout: Seconds to wait at most, or None to wait as long as it takes.
+
+        Returns:
+            Whether a token was taken.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self._take(True)
+            if delay == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+
+    async def acquire_async(self, timeout: float | None = None) -> bool:
+        """
+        Like ``acquire``, but waits on the event loop instead of a thread.
+
+        Args:
+            timeout: Seconds to wait at most, or None to wait as long as it takes.
+
+        Returns:
+            Whether a token was taken.
+        """
+        # Imported here so synchronous users of this module don't load asyncio
+        import asyncio
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self._take(True)
+            if delay == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+
+
+class TokenBucket(RateLimiter):
+    """A token bucket shared by the threads and event loops of one process."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Create a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Most tokens the bucket holds, i.e. the largest burst of
+                   requests sent at once.
+
+        Raises:
+            ValueError: If rate isn't positive or burst is below 1.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, take: bool) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = _refill(
+                self._tokens, self._updated, now, self.rate, self.burst
+            )
+            self._updated = now
+            if self._tokens >= 1.0:
+                if take:
+                    self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate}, burst={self.burst})"
+
+
+class FileTokenBucket(RateLimiter):
+    """
+    A token bucket kept in a file, shared by every process that opens it.
+
+    The file holds the token count and the time it was last updated, and is
+    locked while a token is taken. All processes sharing a file should use the
+    same rate and burst.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], rate: float, burst: int = 1
+    ) -> None:
+        """
+        Open (and create if needed) a shared bucket.
+
+        Args:
+            path: Path of the bucket file. "~" is expanded.
+            rate: Tokens added per second.
+            burst: Most tokens the bucket holds.
+
+        Raises:
+            ValueError: If rate isn't positive or burst is below 1.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.path = os.path.expanduser(os.fspath(path))
+        self.rate = float(rate)
+        self.burst = int(burst)
+
+    def _take(self, take: bool) -> float:
+        # The file is opened for every call: locks on a descriptor inherited
+        # through fork() wouldn't keep parent and child apart
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        fd = os.open(self.path, flags, 0o644)
+        try:
+            _lock(fd)
+            data = os.read(fd, _STATE.size)
+            now = time.time()  # Wall clock, since it is shared between processes
+            if len(data) == _STATE.size:
+                tokens, updated = _STATE.unpack(data)
+                tokens = _refill(tokens, updated, now, self.rate, self.burst)
+            else:
+                tokens = float(self.burst)  # New file: start full
+            if tokens >= 1.0:
+                delay = 0.0
+                if take:
+                    tokens -= 1.0
+            else:
+                delay = (1.0 - tokens) / self.rate
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, _STATE.pack(tokens, now))
+            return delay
+        finally:
+            os.close(fd)  # Also releases the lock
+
+    def __repr__(self) -> str:
+        return f"FileTokenBucket({self.path!r}, rate={self.rate}, burst={self.burst})"
+
+
+def _lock(fd: int) -> None:
+    """Takes an exclusive lock on an open file, waiting for other processes."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:  # pragma: no cover - Windows
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
@@ -0,0 +1,222 @@
+"""
+Retry policies for requests to wttr.in.
+
+A failed request falls into one of four classes: ``timeout``,
+``connection_error``, ``server_error`` (5xx) and ``rate_limited`` (503 and
+429). A ``RetryPolicy`` gives each class its own ``Backoff``, or None to not
+retry it, plus a deadline for all attempts of one request together::
+
+    from fetch_my_weather import Backoff, RetryPolicy, set_retry_policy
+
+    set_retry_policy(RetryPolicy(server_error=None, deadline=10))
+
+Delays grow exponentially with full jitter: before retry ``n`` the client
+waits a random time between 0 and ``min(max_delay, base_delay * 2 ** (n - 1))``
+seconds, so clients that failed together don't retry together. A rate-limited
+response with a ``Retry-After`` header is retried after exactly that long. No
+retry is made that would end after the deadline.
+"""
+
+import random
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+# Failure classes, in the order they are checked
+RETRY_REASONS = ("timeout", "connection_error", "rate_limited", "server_error")
+
+_random = random.Random()
+
+
+class Backoff:
+    """Exponential backoff with full jitter for one class of failures."""
+
+    __slots__ = ("max_attempts", "base_delay", "max_delay")
+
+    def __init__(
+        self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0
+    ) -> None:
+        """
+        Create a backoff schedule.
+
+        Args:
+            max_attempts: Requests to send in total, counting the first one.
+            base_delay: Upper bound of the first delay, in seconds.
+            max_delay: Upper bound of any delay, in seconds.
+
+        Raises:
+            ValueError: If max_attempts is below 1 or a delay is negative.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("Delays must not be negative")
+        self.max_attempts = int(max_attempts)
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+
+    def delay(self, retry: int, rand: Callable[[], float] = _random.random) -> float:
+        """
+        Picks the delay before a retry.
+
+        Args:
+            retry: Which retry this is, 1 for the first.
+            rand: Returns a random number in [0, 1).
+
+        Returns:
+            The delay in seconds.
+        """
+        return rand() * min(self.max_delay, self.base_delay * 2.0 ** (retry - 1))
+
+    def __repr__(self) -> str:
+        return (
+            f"Backoff(max_attempts={self.max_attempts}, "
+            f"base_delay={self.base_delay}, max_delay={self.max_delay})"
+        )
+
+
+# Default schedules; a server error is retried once, and rate limits back off longer
+DEFAULT_BACKOFF = Backoff()
+SERVER_ERROR_BACKOFF = Backoff(max_attempts=2)
+RATE_LIMITED_BACKOFF = Backoff(base_delay=1.0, max_delay=8.0)
+
+
+class RetryPolicy:
+    """Which failures are retried, how often, and within what deadline."""
+
+    def __init__(
+        self,
+        timeout: Backoff | None = DEFAULT_BACKOFF,
+        connection_error: Backoff | None = DEFAULT_BACKOFF,
+        server_error: Backoff | None = SERVER_ERROR_BACKOFF,
+        rate_limited: Backoff | None = RATE_LIMITED_BACKOFF,
+        deadline: float | None = 30.0,
+        respect_retry_after: bool = True,
+    ) -> None:
+        """
+        Create a retry policy.
+
+        Args:
+            timeout: Backoff for requests that timed out.
+            connection_error: Backoff for requests that couldn't connect or
+                              lost the connection.
+            server_error: Backoff for 5xx responses other than 503.
+            rate_limited: Backoff for 503 and 429 responses.
+            deadline: Seconds all attempts of one request may take together,
+                      counted from the first attempt. None for no limit.
+            respect_retry_after: Whether a rate-limited response's
+                                 Retry-After header sets the delay.
+        """
+        self.backoffs: dict[str, Backoff | None] = {
+            "timeout": timeout,
+            "connection_error": connection_error,
+            "server_error": server_error,
+            "rate_limited": rate_limited,
+        }
+        self.deadline = None if deadline is None else max(0.0, float(deadline))
+        self.respect_retry_after = bool(respect_retry_after)
+
+    def next_delay(
+        self,
+        reason: str,
+        attempts: int,
+        elapsed: float,
+        retry_after: float | None = None,
+        rand: Callable[[], float] = _random.random,
+    ) -> float | None:
+        """
+        Decides whether to retry a failed request, and when.
+
+        Args:
+            reason: The failure class, one of RETRY_REASONS.
+            attempts: Requests sent so far.
+            elapsed: Seconds since the first attempt started.
+            retry_after: The response's Retry-After, in seconds, if any.
+            rand: Returns a random number in [0, 1).
+
+        Returns:
+            The seconds to wait before the next attempt, or None to give up.
+        """
+        backoff = self.backoffs.get(reason)
+        if backoff is None or attempts >= backoff.max_attempts:
+            return None
+        if (
+            reason == "rate_limited"
+            and retry_after is not None
+            and self.respect_retry_after
+        ):
+            delay = retry_after
+        else:
+            delay = backoff.delay(attempts, rand)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+    def __repr__(self) -> str:
+        backoffs = ", ".join(
+            f"{name}={value!r}" for name, value in self.backoffs.items()
+        )
+        return (
+            f"RetryPolicy({backoffs}, deadline={self.deadline}, "
+            f"respect_retry_after={self.respect_retry_after})"
+        )
+
+
+def retry_reason(
+    response: Any = None, error: BaseException | None = None
+) -> str | None:
+    """
+    Classifies a failed request.
+
+    Exceptions are matched by class name, so requests doesn't have to be
+    imported to classify its errors.
+
+    Args:
+        response: The HTTP response, if one arrived.
+        error: The exception the request raised, if any.
+
+    Returns:
+        One of RETRY_REASONS, or None if the request succeeded or the failure
+        isn't worth retrying (e.g. a 404).
+    """
+    if error is not None:
+        names = {cls.__name__ for cls in type(error).__mro__}
+        if "Timeout" in names or "TimeoutError" in names:
+            return "timeout"
+        if "ConnectionError" in names:
+            return "connection_error"
+        return None
+    status_code = getattr(response, "status_code", None)
+    if not isinstance(status_code, int):
+        return None
+    if status_code in (429, 503):
+        return "rate_limited"
+    if 500 <= status_code < 600:
+        return "server_error"
+    return None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a Retry-After header.
+
+    Args:
+        value: The header value, either seconds or an HTTP date.
+
+    Returns:
+        The seconds to wait (0 for dates in the past), or None if the value
+        is missing or invalid.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
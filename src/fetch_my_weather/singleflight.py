@@ -0,0 +1,193 @@
+"""
+Request coalescing for fetch_my_weather.
+
+When many callers ask for the same URL at the same moment on a cold cache,
+only the first one (the leader) should go to the network. The others wait for
+the leader's call to finish and share its outcome. This module provides that
+"single-flight" behaviour for threads (``SingleFlight``) and for asyncio
+(``AsyncSingleFlight``).
+"""
+
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Deduplicates concurrent calls that share a key across threads.
+
+    Example::
+
+        flight = SingleFlight()
+        result, shared = flight.do(url, fetch, url)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future[T]] = {}
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> tuple[T, bool]:
+        """
+        Call ``fn`` unless a call with the same key is already in flight.
+
+        Args:
+            key: Identifies calls that can share a result.
+            fn: The function to call.
+            *args: Positional arguments for fn.
+            timeout: Seconds a waiter waits for the leader at most, or None
+                     to wait as long as it takes.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            A (result, shared) tuple. shared is True when this caller waited
+            for another caller's result instead of calling fn itself.
+
+        Raises:
+            Exception: Whatever fn raised, for the leader and every waiter.
+            TimeoutError: If a waiter's timeout passed first; the leader's
+                          call carries on.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            try:
+                return future.result(timeout), True
+            except FuturesTimeoutError:
+                raise TimeoutError("Timed out waiting for a shared call") from None
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        """
+        Returns how many distinct keys currently have a call in flight.
+
+        Returns:
+            Number of in-flight calls.
+        """
+        with self._lock:
+            return len(self._calls)
+
+
+class _LeaderCancelledError(Exception):
+    """Set on an AsyncSingleFlight call whose leader was cancelled."""
+
+
+class AsyncSingleFlight(Generic[T]):
+    """
+    Deduplicates concurrent awaits that share a key on one event loop.
+
+    Waiters do not use any worker threads or concurrency slots while they
+    wait for the leader.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[T]],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> tuple[T, bool]:
+        """
+        Await ``fn`` unless a call with the same key is already in flight.
+
+        Args:
+            key: Identifies calls that can share a result.
+            fn: The coroutine function to await.
+            *args: Positional arguments for fn.
+            timeout: Seconds a waiter waits for the leader at most, or None
+                     to wait as long as it takes.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            A (result, shared) tuple. shared is True when this caller waited
+            for another caller's result instead of awaiting fn itself.
+
+        Raises:
+            Exception: Whatever fn raised, for the leader and every waiter.
+            TimeoutError: If a waiter's timeout passed first; the leader's
+                          call carries on.
+
+        If the leader is cancelled, its waiters aren't: one of them calls
+        ``fn`` again as the new leader, and the others wait for it.
+        """
+        # Imported here so synchronous users of this module don't load asyncio
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        expires = None if timeout is None else loop.time() + timeout
+        while True:
+            future = self._calls.get(key)
+            if future is None or future.get_loop() is not loop:
+                break
+            remaining = None if expires is None else max(0.0, expires - loop.time())
+            # Shield so a cancelled waiter doesn't cancel the leader's call
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), remaining), True
+            except _LeaderCancelledError:
+                continue  # Call fn again; the first waiter back becomes the leader
+            except asyncio.TimeoutError:
+                raise TimeoutError("Timed out waiting for a shared call") from None
+
+        future = loop.create_future()
+        self._calls[key] = future
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Only the leader was cancelled; its waiters start over
+            future.set_exception(_LeaderCancelledError())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        """
+        Returns how many distinct keys currently have a call in flight.
+
+        Returns:
+            Number of in-flight calls.
+        """
+        return len(self._calls)
@@ -0,0 +1,470 @@
+"""
+Persistent SQLite cache backend for fetch_my_weather.
+
+This module provides ``SQLiteCache``, a ``CacheBackend`` that stores responses
+in a SQLite database in WAL mode. The cache survives restarts and can be
+shared by several worker processes on the same host::
+
+    from fetch_my_weather import set_cache_backend
+    from fetch_my_weather.sqlite_cache import SQLiteCache
+
+    set_cache_backend(SQLiteCache("~/.cache/fetch-my-weather.db"))
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from . import codec
+from .cache import CacheBackend, CachedJSON, CacheEntry
+from .models import LazyWeatherResponse, WeatherResponse
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at);
+CREATE INDEX IF NOT EXISTS idx_cache_created_at ON cache (created_at);
+-- Running total of cache.size, so the byte limit is checked without a scan
+CREATE TABLE IF NOT EXISTS cache_size (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_size (id, bytes)
+    SELECT 0, COALESCE(SUM(size), 0) FROM cache;
+CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache BEGIN
+    UPDATE cache_size SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache BEGIN
+    UPDATE cache_size SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache BEGIN
+    UPDATE cache_size SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+END;
+"""
+
+PURGE_INTERVAL_SECONDS = 60  # How often expired rows are deleted
+
+# Stored kind of each model class that can be rebuilt from its own JSON. Typed
+# models can't: their JSON holds converted values, not wttr.in's strings.
+_MODEL_KINDS: dict[type[WeatherResponse], str] = {
+    WeatherResponse: "model",
+    LazyWeatherResponse: "model:LazyWeatherResponse",
+}
+_MODEL_TYPES = {kind: model_type for model_type, kind in _MODEL_KINDS.items()}
+
+
+@contextmanager
+def _immediate(connection: sqlite3.Connection) -> Iterator[None]:
+    """
+    Runs a block as one write transaction, taking the write lock up front so
+    no other process can write between its statements.
+
+    Args:
+        connection: A connection in autocommit mode.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def _encode(data: Any) -> tuple[str, str | bytes]:
+    """
+    Converts cached data into a (kind, value) pair for storage.
+
+    Args:
+        data: A str, bytes, dict, WeatherResponse (or LazyWeatherResponse) or
+              CachedJSON.
+
+    Returns:
+        A tag describing the original type and the stored value.
+
+    Raises:
+        TypeError: If the data type cannot be stored.
+    """
+    if isinstance(data, CachedJSON):
+        return "json", data.text
+    if isinstance(data, str):
+        return "str", data
+    if isinstance(data, bytes | bytearray):
+        return "bytes", bytes(data)
+    if isinstance(data, dict):
+        return "dict", codec.dumps(data)
+    model_kind = _MODEL_KINDS.get(type(data))
+    if model_kind is not None:
+        return model_kind, data.json()
+    raise TypeError(f"Cannot cache values of type {type(data).__name__}")
+
+
+def _decode(kind: str, value: str | bytes) -> Any:
+    """
+    Rebuilds cached data from its stored (kind, value) pair.
+
+    Args:
+        kind: The tag written by _encode.
+        value: The stored value.
+
+    Returns:
+        The data with the same type it was stored with.
+    """
+    if kind == "bytes":
+        return value if isinstance(value, bytes) else value.encode("utf-8")
+    text = value.decode("utf-8") if isinstance(value, bytes) else value
+    if kind == "json":
+        return CachedJSON(text, codec.loads(text))
+    if kind == "dict":
+        return codec.loads(text)
+    model_type = _MODEL_TYPES.get(kind)
+    if model_type is not None:
+        return model_type.parse_obj(codec.loads(text))
+    return text
+
+
+class SQLiteCache(CacheBackend):
+    """
+    A SQLite-backed cache that can be shared by several processes on one host.
+
+    The database uses WAL mode so readers never block the writer. Each thread
+    gets its own connection, and a forked process opens new ones rather than
+    using its parent's. Expired rows are found through an index on the
+    expiry column and are purged at most once every PURGE_INTERVAL_SECONDS.
+    When ``max_entries`` or ``max_bytes`` is set, the oldest entries are
+    evicted first.
+
+    A database that can't be read or written, e.g. because it is corrupt or
+    locked for longer than ``timeout``, never fails a request: lookups are
+    counted as misses, writes are skipped, and both count as errors.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        Open (and create if needed) a cache database.
+
+        Args:
+            path: Path of the database file. "~" is expanded.
+            max_entries: Maximum number of entries, or None for no limit.
+            max_bytes: Maximum total size of stored values, or None for no limit.
+            timeout: Seconds to wait for another process's write lock.
+        """
+        self.path = os.path.expanduser(os.fspath(path))
+        self.timeout = timeout
+        self.max_entries: int | None = None
+        self.max_bytes: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.errors = 0  # Lookups and writes that failed with a sqlite3 error
+        self._local = threading.local()
+        self._lock = threading.Lock()  # Guards the connection list and counters
+        self._connections: list[sqlite3.Connection] = []
+        self._pid = os.getpid()
+        self._last_purge = 0.0
+
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        self.set_limits(max_entries, max_bytes)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection, opening it on first use.
+
+        Returns:
+            A sqlite3 connection in autocommit mode.
+        """
+        if self._pid != os.getpid():
+            # Forked: the parent's connections must not be used or closed
+            # here, and its lock may have been held by another thread
+            self._local = threading.local()
+            self._lock = threading.Lock()
+            self._connections = []
+            self._pid = os.getpid()
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            # Each connection is only used by the thread that opened it, but
+            # close() may run on another thread
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                # So rows replaced by INSERT OR REPLACE update cache_size
+                connection.execute("PRAGMA recursive_triggers=ON")
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def set_limits(
+        self, max_entries: int | None = None, max_bytes: int | None = None
+    ) -> tuple[int | None, int | None]:
+        """
+        Change the size limits, evicting entries if the cache is now too big.
+
+        Args:
+            max_entries: Maximum number of entries, or None for no limit.
+            max_bytes: Maximum total size of stored values, or None for no limit.
+
+        Returns:
+            The new (max_entries, max_bytes) limits.
+        """
+        self.max_entries = None if max_entries is None else max(0, int(max_entries))
+        self.max_bytes = None if max_bytes is None else max(0, int(max_bytes))
+        connection = self._connection()
+        with _immediate(connection):
+            self._evict(connection)
+        return self.max_entries, self.max_bytes
+
+    def get(self, key: str, max_age: float | None = None) -> CacheEntry | None:
+        """
+        Look up an entry.
+
+        Args:
+            key: The cache key (usually a URL).
+            max_age: If given, entries older than this many seconds are
+                     treated as a miss.
+
+        Returns:
+            A (timestamp, data) tuple, or None if the key is missing or expired.
+        """
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT kind, value, created_at, expires_at FROM cache"
+                    " WHERE key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+                self.misses += 1
+            return None
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        kind, value, created_at, expires_at = row
+        now = time.time()
+        if (expires_at is not None and now >= expires_at) or (
+            max_age is not None and now - created_at >= max_age
+        ):
+            with self._lock:
+                self.expirations += 1
+                self.misses += 1
+            return None
+        try:
+            data = _decode(kind, value)
+        except (ValueError, UnicodeDecodeError):
+            # A corrupt row is treated as a miss and removed
+            self.delete(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return created_at, data
+
+    def put(
+        self,
+        key: str,
+        data: Any,
+        timestamp: float | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Add or replace an entry.
+
+        Args:
+            key: The cache key (usually a URL).
+            data: The data to cache.
+            timestamp: When the data was fetched (defaults to now).
+            ttl: Seconds until the row may be purged, or None for no expiry.
+        """
+        kind, value = _encode(data)
+        size = len(value.encode("utf-8") if isinstance(value, str) else value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            with self._lock:
+                self.evictions += 1
+            return
+        created_at = time.time() if timestamp is None else timestamp
+        expires_at = None if ttl is None else created_at + ttl
+        try:
+            connection = self._connection()
+            with _immediate(connection):
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache"
+                    " (key, kind, value, size, created_at, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, value, size, created_at, expires_at),
+                )
+                self._evict(connection)
+            if time.time() - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                self.purge_expired()
+        except sqlite3.Error:
+            # The response is still returned; it just isn't cached
+            with self._lock:
+                self.errors += 1
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: The cache key to remove.
+
+        Returns:
+            True if an entry was removed.
+        """
+        try:
+            cursor = self._connection().execute(
+                "DELETE FROM cache WHERE key = ?", (key,)
+            )
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+            return False
+        return cursor.rowcount > 0
+
+    def clear(self) -> int:
+        """
+        Remove all entries.
+
+        Returns:
+            Number of entries removed.
+        """
+        cursor = self._connection().execute("DELETE FROM cache")
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """
+        Delete all rows whose expiry time has passed.
+
+        Returns:
+            Number of rows deleted.
+        """
+        self._last_purge = time.time()
+        cursor = self._connection().execute(
+            "DELETE FROM cache WHERE expires_at < ?", (self._last_purge,)
+        )
+        with self._lock:
+            self.expirations += cursor.rowcount
+        return cursor.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns a snapshot of the cache size, limits and counters.
+
+        Counters only cover lookups made by this process. Entries and bytes
+        are None if the database can't be read.
+
+        Returns:
+            A dictionary of cache statistics.
+        """
+        try:
+            entries, size = (
+                self._connection()
+                .execute("SELECT COUNT(*), (SELECT bytes FROM cache_size) FROM cache")
+                .fetchone()
+            )
+        except sqlite3.Error:
+            entries = size = None
+        with self._lock:
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "path": self.path,
+            }
+
+    def close(self) -> None:
+        """Close every connection opened by this cache."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """
+        Deletes the oldest rows until the cache is within its limits.
+
+        Runs inside the caller's write transaction, so the limits hold even
+        with several processes writing.
+
+        Args:
+            connection: The connection to use.
+        """
+        if self.max_entries is not None:
+            cursor = connection.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache"
+                " ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            with self._lock:
+                self.evictions += max(0, cursor.rowcount)
+        if self.max_bytes is not None:
+            (total,) = connection.execute("SELECT bytes FROM cache_size").fetchone()
+            if total > self.max_bytes:
+                # Keep the newest rows that fit, counting sizes from the newest
+                cursor = connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM (SELECT key,"
+                    " SUM(size) OVER (ORDER BY created_at DESC, key) AS running"
+                    " FROM cache) WHERE running > ?)",
+                    (self.max_bytes,),
+                )
+                with self._lock:
+                    self.evictions += max(0, cursor.rowcount)
+
+    def __len__(self) -> int:
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()
+        return int(count)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        row = (
+            self._connection()
+            .execute(
+                "SELECT 1 FROM cache WHERE key = ? AND"
+                " (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row is not None
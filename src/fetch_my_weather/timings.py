@@ -0,0 +1,188 @@
+"""
+Per-phase timing of requests, reported in ``ResponseMetadata.timings``.
+
+``get_weather(with_metadata=True)`` starts a PhaseTimer for the request, and
+the code that builds URLs, reads the cache, talks to the server, decodes and
+validates wraps its work in ``with phase("decode"): ...``. The current timer
+is held in a context variable, so concurrent requests in other threads or
+asyncio tasks each record into their own timer, and ``phase`` is close to free
+when nothing is being recorded.
+"""
+
+from contextvars import ContextVar, Token
+from time import perf_counter
+from types import TracebackType
+from typing import Any
+
+# Phase names, in the order they happen during a request
+PHASES = (
+    "url_build",
+    "cache_lookup",
+    "throttle",
+    "connect",
+    "ttfb",
+    "download",
+    "decode",
+    "validate",
+)
+
+
+class PhaseTimer:
+    """Accumulates the time spent in each phase of one request."""
+
+    __slots__ = (
+        "_start",
+        "_phases",
+        "_token",
+        "size_bytes",
+        "attempts",
+        "backoff",
+        "circuit_state",
+    )
+
+    def __init__(self) -> None:
+        self._start = perf_counter()
+        self._phases: dict[str, float] = {}
+        self._token: Token[PhaseTimer | None] | None = None
+        self.size_bytes: int | None = None  # Size of the response body
+        self.attempts = 0  # Requests sent to the server
+        self.backoff = 0.0  # Seconds spent waiting between retries
+        self.circuit_state: str | None = None  # Circuit breaker state, if consulted
+
+    def __enter__(self) -> "PhaseTimer":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Adds time to a phase.
+
+        Args:
+            name: The phase, one of PHASES.
+            seconds: Time spent, in seconds.
+        """
+        self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+    def get(self, name: str) -> float:
+        """
+        Gets the time recorded for a phase so far.
+
+        Args:
+            name: The phase, one of PHASES.
+
+        Returns:
+            The time in seconds, 0.0 if the phase didn't happen.
+        """
+        return self._phases.get(name, 0.0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Reports the recorded phases in milliseconds.
+
+        Returns:
+            A ``<phase>_ms`` entry for every phase (None for phases that didn't
+            happen), ``total_ms`` since the timer was created, and
+            ``size_bytes``.
+        """
+        report: dict[str, Any] = {
+            f"{name}_ms": (self._phases[name] * 1000 if name in self._phases else None)
+            for name in PHASES
+        }
+        report["total_ms"] = (perf_counter() - self._start) * 1000
+        report["size_bytes"] = self.size_bytes
+        return report
+
+
+_current: ContextVar[PhaseTimer | None] = ContextVar(
+    "fetch_my_weather_timer", default=None
+)
+
+
+class _Phase:
+    """Adds the time spent in a ``with`` block to a phase."""
+
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer: PhaseTimer, name: str) -> None:
+        self._timer = timer
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._timer.add(self._name, perf_counter() - self._start)
+
+
+class _NoPhase:
+    """Stands in for _Phase when no request is being timed."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def current() -> PhaseTimer | None:
+    """
+    Returns the timer of the request being timed in this context.
+
+    Returns:
+        The PhaseTimer, or None if no request is being timed.
+    """
+    return _current.get()
+
+
+def phase(name: str) -> _Phase | _NoPhase:
+    """
+    Times a ``with`` block as part of a phase of the current request.
+
+    Args:
+        name: The phase, one of PHASES.
+
+    Returns:
+        A context manager; it does nothing if no request is being timed.
+    """
+    timer = _current.get()
+    return _NO_PHASE if timer is None else _Phase(timer, name)
+
+
+def recording() -> PhaseTimer:
+    """
+    Times the phases of the requests made inside a ``with`` block::
+
+        with timings.recording() as timer:
+            ...
+        timer.as_dict()
+
+    Returns:
+        The PhaseTimer the phases are recorded in, as a context manager.
+    """
+    return PhaseTimer()
@@ -0,0 +1,191 @@
+"""
+HTTP transport for fetch_my_weather.
+
+This module wraps a pooled ``requests.Session`` so that repeated lookups reuse
+keep-alive connections to wttr.in instead of opening a new socket (and doing a
+new TLS handshake) for every request.
+
+``requests`` is imported when the first transport is created, so importing
+this module (and the package) stays cheap for code that never reaches the
+network, e.g. in mock mode.
+
+When a request is being timed (see ``timings``), the transport records how
+long connecting took (DNS, TCP and TLS), the time to the response headers and
+the time to download the body.
+"""
+
+import functools
+from time import perf_counter
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+from . import timings
+
+if TYPE_CHECKING:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10  # Keep-alive connections kept open per host
+DEFAULT_POOL_CONNECTIONS = 4  # Number of distinct hosts to keep pools for
+
+
+@functools.cache
+def _timed_adapter() -> type["HTTPAdapter"]:
+    """
+    Builds an HTTPAdapter whose new connections record the connect phase.
+
+    The classes are created on first use, so that requests and urllib3 are
+    only imported once a transport is needed.
+
+    Returns:
+        The adapter class.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnection(HTTPConnection):
+        def connect(self) -> None:
+            with timings.phase("connect"):
+                super().connect()
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        def connect(self) -> None:
+            with timings.phase("connect"):
+                super().connect()
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    class TimedHTTPAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": TimedHTTPConnectionPool,
+                "https": TimedHTTPSConnectionPool,
+            }
+
+    return TimedHTTPAdapter
+
+
+class WeatherTransport:
+    """
+    A pooled, keep-alive HTTP transport backed by ``requests.Session``.
+
+    The transport owns its session and connection pools. Close it explicitly
+    with ``close()`` or use it as a context manager::
+
+        with WeatherTransport(pool_size=20) as transport:
+            response = transport.get("http://wttr.in/London?format=j1")
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_block: bool = False,
+    ) -> None:
+        """
+        Create a new transport.
+
+        Args:
+            pool_size: Maximum number of connections kept open per host.
+            pool_connections: Number of per-host pools to cache.
+            pool_block: If True, wait for a free connection when the pool is
+                        exhausted instead of opening a throwaway one.
+        """
+        self.pool_size = max(1, int(pool_size))
+        self.pool_connections = max(1, int(pool_connections))
+        self.pool_block = bool(pool_block)
+        self._closed = False
+
+        import requests
+
+        self._session = requests.Session()
+        adapter = _timed_adapter()(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @property
+    def closed(self) -> bool:
+        """Whether ``close()`` has been called on this transport."""
+        return self._closed
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float | tuple[float, float] = 15,
+    ) -> "requests.Response":
+        """
+        Perform a GET request over the pooled session.
+
+        Args:
+            url: URL to request.
+            headers: Extra headers to send with the request.
+            timeout: Timeout in seconds, or a (connect, read) tuple.
+
+        Returns:
+            The ``requests.Response`` object.
+
+        Raises:
+            RuntimeError: If the transport has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("WeatherTransport is closed")
+        timer = timings.current()
+        if timer is None:
+            return self._session.get(url, headers=headers, timeout=timeout)
+
+        # Stream, so the wait for the headers and the body download are
+        # measured separately; the body is then read in full as usual
+        start = perf_counter()
+        connect = timer.get("connect")
+        response = self._session.get(url, headers=headers, timeout=timeout, stream=True)
+        headers_received = perf_counter()
+        try:
+            content = response.content
+        except BaseException:
+            # A streamed response holds its connection until read or closed
+            response.close()
+            raise
+        timer.add("ttfb", headers_received - start - (timer.get("connect") - connect))
+        timer.add("download", perf_counter() - headers_received)
+        if isinstance(content, bytes):
+            timer.size_bytes = len(content)
+        return response
+
+    def close(self) -> None:
+        """Close the session and release all pooled connections."""
+        if not self._closed:
+            self._closed = True
+            self._session.close()
+
+    def __enter__(self) -> "WeatherTransport":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else "open"
+        return f"WeatherTransport(pool_size={self.pool_size}, {state})"
+
+    def __del__(self) -> None:
+        # Best-effort cleanup if the owner forgot to close the transport
+        try:
+            self.close()
+        except Exception:
+            pass
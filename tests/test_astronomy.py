@@ -0,0 +1,193 @@
+"""
+Tests for the offline astronomy of the fetch-my-weather package.
+"""
+
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import astronomy
+from fetch_my_weather.astronomy import (
+    get_astronomy,
+    moon_age,
+    moon_illumination,
+    moon_phase,
+    moon_times,
+    sun_times,
+)
+from fetch_my_weather.batch import get_weather_many
+from fetch_my_weather.core import WeatherClient, get_weather, set_offline_moon
+from fetch_my_weather.models import ResponseWrapper, TypedWeatherResponse
+
+LONDON = (51.5074, -0.1278)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def engine(request: pytest.FixtureRequest, mocker: MockerFixture) -> Iterator[str]:
+    """Run a test with and without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        mocker.patch.object(astronomy, "_load_numpy", return_value=None)
+    yield request.param
+
+
+class TestMoonPhase:
+    """Tests for the moon phase computation."""
+
+    def test_known_phases(self) -> None:
+        """Test the phase at known new, full and quarter moons."""
+        new = moon_phase(datetime(2024, 4, 8, 18, 21, tzinfo=timezone.utc))
+        full = moon_phase(datetime(2025, 4, 13, 0, 22))
+        quarter = moon_phase(datetime(2025, 4, 5, 2, 15))
+
+        assert new.name == "New Moon"
+        assert new.illumination < 0.5
+        assert new.age < 0.2
+        assert full.name == "Full Moon"
+        assert full.emoji == "🌕"
+        assert full.illumination > 99.5
+        assert quarter.name == "First Quarter"
+        assert quarter.waxing
+        assert abs(quarter.illumination - 50) < 1
+
+    def test_intermediate_phases(self) -> None:
+        """Test that days between the principal phases get intermediate names."""
+        assert moon_phase(date(2025, 4, 2)).name == "Waxing Crescent"
+        assert moon_phase(date(2025, 4, 9)).name == "Waxing Gibbous"
+        assert moon_phase(date(2025, 4, 17)).name == "Waning Gibbous"
+        assert not moon_phase(date(2025, 4, 17)).waxing
+
+    def test_vectorized_matches_scalar(self, engine: str) -> None:
+        """Test that the array functions agree with moon_phase."""
+        days = [date(2025, 1, 1) + timedelta(days=n) for n in range(60)]
+
+        illumination = moon_illumination(days)
+        ages = moon_age(days)
+
+        assert len(illumination) == len(ages) == 60
+        for day, lit, age in zip(days, illumination, ages, strict=True):
+            phase = moon_phase(day)
+            assert lit == pytest.approx(phase.illumination)
+            assert age == pytest.approx(phase.age)
+
+
+class TestSunAndMoonTimes:
+    """Tests for sunrise, sunset, moonrise and moonset."""
+
+    def test_sun_times(self, engine: str) -> None:
+        """Test sunrise and sunset in London against published times."""
+        sunrise, sunset = sun_times(*LONDON, [date(2025, 4, 13), date(2025, 6, 21)])
+
+        # 05:09 and 18:53 UTC, then 03:43 and 20:21 UTC
+        assert sunrise[0] == pytest.approx(5.15, abs=0.05)
+        assert sunset[0] == pytest.approx(18.88, abs=0.05)
+        assert sunrise[1] == pytest.approx(3.72, abs=0.05)
+        assert sunset[1] == pytest.approx(20.36, abs=0.05)
+
+    def test_polar_day(self, engine: str) -> None:
+        """Test that the sun not setting gives NaN."""
+        sunrise, sunset = sun_times(78.2, 15.6, [date(2025, 6, 21)])
+
+        assert sunrise[0] != sunrise[0]
+        assert sunset[0] != sunset[0]
+
+    def test_moon_times(self) -> None:
+        """Test moonrise and moonset in London."""
+        tz = ZoneInfo("Europe/London")
+
+        moonrise, moonset = moon_times(*LONDON, date(2025, 4, 13), tz)
+
+        # The low precision lunar position is good to a few minutes
+        assert moonrise is not None and moonset is not None
+        expected_rise = datetime(2025, 4, 13, 20, 51, tzinfo=tz)
+        expected_set = datetime(2025, 4, 13, 6, 1, tzinfo=tz)
+        assert abs(moonrise - expected_rise) < timedelta(minutes=5)
+        assert abs(moonset - expected_set) < timedelta(minutes=5)
+        assert moonrise.tzinfo is tz
+
+    def test_get_astronomy(self) -> None:
+        """Test that results use the j1 astronomy format."""
+        days = get_astronomy(
+            *LONDON, date(2025, 4, 13), days=3, tz=ZoneInfo("Europe/London")
+        )
+
+        assert len(days) == 3
+        assert days[0].sunrise == "06:09 AM"
+        assert days[0].sunset == "07:53 PM"
+        assert days[0].moon_phase == "Full Moon"
+        assert days[0].moon_illumination == "100"
+        assert days[2].moon_phase == "Waning Gibbous"
+        polar = get_astronomy(78.2, 15.6, date(2025, 6, 21))[0]
+        assert polar.sunrise == "No sunrise"
+        assert polar.sunset == "No sunset"
+
+
+class TestOfflineMoon:
+    """Tests for answering is_moon requests without the network."""
+
+    def test_text(self, mocker: MockerFixture) -> None:
+        """Test that an offline moon request makes no HTTP request."""
+        mock_get = mocker.patch("requests.Session.get")
+
+        report = get_weather(
+            is_moon=True, moon_date="2025-04-13", format="text", offline_moon=True
+        )
+
+        assert isinstance(report, str)
+        assert "Full Moon" in report
+        mock_get.assert_not_called()
+
+    def test_json(self, mocker: MockerFixture) -> None:
+        """Test that JSON requests hold the phase in the first forecast day."""
+        mock_get = mocker.patch("requests.Session.get")
+        client = WeatherClient(offline_moon=True)
+
+        result = client.get_weather(
+            is_moon=True, moon_date="2025-04-13", typed=True, with_metadata=True
+        )
+        raw = client.get_weather(
+            is_moon=True, moon_date="2025-04-13", format="raw_json"
+        )
+
+        assert isinstance(result, ResponseWrapper)
+        assert isinstance(result.data, TypedWeatherResponse)
+        assert result.data.weather[0].date == date(2025, 4, 13)
+        assert result.data.weather[0].astronomy[0].moon_phase == "Full Moon"
+        assert not result.metadata.is_mock
+        assert raw["weather"][0]["astronomy"][0]["moon_illumination"] == "100"  # type: ignore[index]
+        mock_get.assert_not_called()
+
+    def test_invalid_date(self) -> None:
+        """Test that an invalid moon_date is reported as an error."""
+        result = get_weather(is_moon=True, moon_date="13/04/2025", offline_moon=True)
+
+        assert isinstance(result, str)
+        assert result.startswith("Error")
+
+    def test_default_setting_and_batch(self, mocker: MockerFixture) -> None:
+        """Test set_offline_moon and that batches don't merge offline items."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "wttr.in moon"
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        assert set_offline_moon(True) is True
+        try:
+            offline = get_weather(is_moon=True, format="text")
+        finally:
+            assert set_offline_moon(False) is False
+        results = get_weather_many(
+            [
+                {"is_moon": True, "format": "text", "offline_moon": True},
+                {"is_moon": True, "format": "text"},
+            ]
+        )
+
+        assert isinstance(offline, str) and "Moon phase" in offline
+        assert "Moon phase" in results[0].data
+        assert results[1].data == "wttr.in moon"
+        assert mock_get.call_count == 1
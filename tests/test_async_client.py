@@ -0,0 +1,130 @@
+"""
+Tests for the asyncio API of the fetch-my-weather package.
+"""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from pytest_mock import MockerFixture
+
+from fetch_my_weather.async_client import AsyncWeatherClient, async_get_weather
+from fetch_my_weather.cache import LRUCache
+from fetch_my_weather.core import WeatherClient, get_weather
+from fetch_my_weather.models import ResponseWrapper, WeatherResponse
+from fetch_my_weather.sqlite_cache import SQLiteCache
+
+
+class TestAsyncGetWeather:
+    """Tests for async_get_weather and AsyncWeatherClient."""
+
+    def test_json_response(self, mocker: MockerFixture) -> None:
+        """Test that async_get_weather returns a WeatherResponse model."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"current_condition": [{"temp_C": "21"}]})
+        mocker.patch("requests.Session.get", return_value=mock_response)
+
+        result = asyncio.run(async_get_weather(location="AsyncCity"))
+
+        assert isinstance(result, WeatherResponse)
+        assert result.current_condition[0].temp_C == "21"
+
+    def test_mock_mode_with_metadata(self) -> None:
+        """Test that mock data is served without touching the network."""
+        result = asyncio.run(
+            async_get_weather(location="Anywhere", use_mock=True, with_metadata=True)
+        )
+
+        assert isinstance(result, ResponseWrapper)
+        assert result.metadata.is_mock
+
+    def test_shares_cache_with_sync_api(self, mocker: MockerFixture) -> None:
+        """Test that a sync fetch is served from cache by the async API."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "Shared weather"
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        assert get_weather(location="Shared", format="text") == "Shared weather"
+        result = asyncio.run(
+            async_get_weather(location="Shared", format="text", with_metadata=True)
+        )
+
+        assert isinstance(result, ResponseWrapper)
+        assert result.metadata.is_cached
+        assert mock_get.call_count == 1
+
+    def test_disk_cache_is_read_off_the_loop(
+        self, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        """Test that only the in-memory cache is read on the event loop thread."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "Cached weather"
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        readers: dict[str, set[str]] = {"lru": set(), "sqlite": set()}
+
+        def reader(name: str, get: Any) -> Any:
+            def traced(*args: Any, **kwargs: Any) -> Any:
+                readers[name].add(threading.current_thread().name)
+                return get(*args, **kwargs)
+
+            return traced
+
+        sqlite_cache = SQLiteCache(tmp_path / "async.db")
+        clients = [WeatherClient(), WeatherClient(cache=sqlite_cache)]
+        for name, client in zip(readers, clients, strict=True):
+            client.get_weather(location="Disk", format="text")
+            mocker.patch.object(client.cache, "get", reader(name, client.cache.get))
+        assert isinstance(clients[0].cache, LRUCache)
+
+        async def fetch(client: WeatherClient) -> Any:
+            async with AsyncWeatherClient(client=client) as async_client:
+                return await async_client.get_weather(
+                    location="Disk", format="text", with_metadata=True
+                )
+
+        try:
+            results = [asyncio.run(fetch(client)) for client in clients]
+        finally:
+            sqlite_cache.close()
+
+        assert all(result.metadata.is_cached for result in results)
+        assert readers["lru"] == {threading.current_thread().name}
+        assert threading.current_thread().name not in readers["sqlite"]
+
+    def test_bounded_concurrency(self, mocker: MockerFixture) -> None:
+        """Test that no more than max_concurrency requests run at once."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_get(*args: object, **kwargs: object) -> object:
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            threading.Event().wait(0.02)
+            with lock:
+                state["active"] -= 1
+            response = mocker.Mock()
+            response.status_code = 200
+            response.text = "ok"
+            return response
+
+        mocker.patch("requests.Session.get", side_effect=slow_get)
+
+        async def run() -> list[object]:
+            async with AsyncWeatherClient(max_concurrency=3) as client:
+                return await asyncio.gather(
+                    *(
+                        client.get_weather(location=f"City{i}", format="text")
+                        for i in range(12)
+                    )
+                )
+
+        results = asyncio.run(run())
+
+        assert results == ["ok"] * 12
+        assert state["peak"] <= 3
@@ -0,0 +1,70 @@
+"""
+Tests for the batch API of the fetch-my-weather package.
+"""
+
+import json
+
+from pytest_mock import MockerFixture
+
+from fetch_my_weather.batch import get_weather_many, iter_weather_many
+from fetch_my_weather.models import WeatherResponse
+
+
+class TestGetWeatherMany:
+    """Tests for get_weather_many and iter_weather_many."""
+
+    def test_results_in_input_order(self, mocker: MockerFixture) -> None:
+        """Test that results come back in the order the locations were given."""
+
+        def fake_get(url: str, *args: object, **kwargs: object) -> object:
+            response = mocker.Mock()
+            response.status_code = 200
+            response.text = f"Weather for {url.rsplit('/', 1)[-1]}"
+            return response
+
+        mocker.patch("requests.Session.get", side_effect=fake_get)
+
+        results = get_weather_many(["Paris", "Rome", "Oslo"], format="text")
+
+        assert [r.data for r in results] == [
+            "Weather for Paris",
+            "Weather for Rome",
+            "Weather for Oslo",
+        ]
+        assert all(not r.metadata.is_cached for r in results)
+
+    def test_duplicates_fetched_once(self, mocker: MockerFixture) -> None:
+        """Test that identical requests only hit the network once."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"current_condition": [{"temp_C": "5"}]})
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        results = get_weather_many(["Oslo", "Oslo", {"location": "Oslo"}])
+
+        assert mock_get.call_count == 1
+        assert len(results) == 3
+        assert all(isinstance(r.data, WeatherResponse) for r in results)
+
+    def test_per_item_parameters_and_errors(self) -> None:
+        """Test that per-item dicts override common parameters and fail alone."""
+        results = get_weather_many(
+            ["Paris", {"location": "Rome", "units": "bad"}],
+            format="raw_json",
+            use_mock=True,
+        )
+
+        assert isinstance(results[0].data, dict)
+        assert results[0].metadata.error_type is None
+        assert results[1].metadata.error_type == "ValidationError"
+
+    def test_iter_as_completed(self) -> None:
+        """Test that iter_weather_many yields every index exactly once."""
+        indexes = [
+            index
+            for index, _ in iter_weather_many(
+                ["A", "B", "A", "C"], format="text", use_mock=True
+            )
+        ]
+
+        assert sorted(indexes) == [0, 1, 2, 3]
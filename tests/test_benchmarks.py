@@ -0,0 +1,65 @@
+"""
+Tests for the offline benchmark suite.
+"""
+
+import requests
+
+from benchmarks.compare import compare
+from benchmarks.fake_server import FakeWttr
+from benchmarks.run import _missing_values, measure
+from fetch_my_weather.core import _MOCK_DATA
+from fetch_my_weather.fake_server import j1_payload
+from fetch_my_weather.models import TypedWeatherResponse, WeatherResponse
+
+
+class TestBenchmarkSuite:
+    """Tests for the benchmark helpers."""
+
+    def test_payload_is_valid_j1(self) -> None:
+        """Test that the benchmark payload validates as a full forecast."""
+        response = WeatherResponse.parse_obj(j1_payload(days=3, hours=8))
+
+        assert response.weather is not None
+        assert len(response.weather) == 3
+        assert all(len(day.hourly or []) == 8 for day in response.weather)
+
+    def test_fake_server_formats(self) -> None:
+        """Test that the fake server answers like wttr.in for each format."""
+        with FakeWttr(days=2) as server:
+            j1 = requests.get(f"{server.base_url}London?format=j1", timeout=5)
+            text = requests.get(f"{server.base_url}London", timeout=5)
+            png = requests.get(f"{server.base_url}London.png", timeout=5)
+
+        assert len(j1.json()["weather"]) == 2
+        assert text.headers["Content-Type"].startswith("text/plain")
+        assert png.headers["Content-Type"] == "image/png"
+        assert png.content == _MOCK_DATA["png"]
+
+    def test_measure(self) -> None:
+        """Test that measure reports per-call statistics."""
+        result = measure(lambda: sum(range(100)), repeat=3, target=0.001)
+
+        assert result["repeat"] == 3
+        assert result["number"] >= 1
+        assert 0 < result["min_us"] <= result["median_us"]
+        assert result["ops_per_sec"] > 0
+
+    def test_typed_parse_overhead(self) -> None:
+        """Test that typed parsing costs at most a few times a string parse."""
+        payload = j1_payload()
+        missing = _missing_values(payload)
+
+        plain = measure(lambda: WeatherResponse.parse_obj(payload), 5, 0.01)
+        typed = measure(lambda: TypedWeatherResponse.parse_obj(missing), 5, 0.01)
+
+        assert typed["min_us"] < 3 * plain["min_us"]
+        parsed = TypedWeatherResponse.parse_obj(missing)
+        assert parsed.current_condition[0].uvIndex is None
+        assert parsed.weather[0].astronomy[0].moonrise is None
+
+    def test_compare_flags_regressions(self) -> None:
+        """Test that compare reports benchmarks slower than the threshold."""
+        baseline = {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}}
+        new = {"a": {"median_us": 12.0}, "b": {"median_us": 10.5}}
+
+        assert compare(baseline, new, threshold=1.10) == ["a"]
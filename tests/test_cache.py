@@ -0,0 +1,279 @@
+"""
+Tests for the LRU cache of the fetch-my-weather package.
+"""
+
+import json
+import time
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import cache, codec, core
+from fetch_my_weather.cache import CachedJSON, LRUCache
+from fetch_my_weather.core import (
+    _add_to_cache,
+    _get_from_cache,
+    get_cache_stats,
+    get_weather,
+    set_cache_duration,
+    set_cache_limits,
+    set_stale_window,
+)
+from fetch_my_weather.models import ResponseWrapper, WeatherResponse
+
+
+class TestLRUCache:
+    """Tests for the LRUCache class."""
+
+    def test_entry_limit_evicts_least_recently_used(self) -> None:
+        """Test that the oldest untouched entry is evicted first."""
+        cache = LRUCache(max_entries=2, max_bytes=None)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        assert cache.get("a") is not None  # "a" is now most recently used
+        cache.put("c", "3")
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+
+    def test_byte_limit(self) -> None:
+        """Test that the byte budget is enforced and oversized values are skipped."""
+        cache = LRUCache(max_entries=None, max_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.put("c", b"123")
+
+        assert "a" not in cache
+        assert cache.stats()["bytes"] == 8
+
+        cache.put("huge", b"x" * 11)
+        assert "huge" not in cache
+
+    def test_max_age_expires_entries(self) -> None:
+        """Test that entries older than max_age are removed on lookup."""
+        cache = LRUCache()
+        cache["old"] = (time.time() - 100, "stale")
+
+        assert cache.get("old", max_age=50) is None
+        assert "old" not in cache
+        assert cache.expirations == 1
+
+    def test_shrinking_limits_evicts(self) -> None:
+        """Test that lowering the limits evicts entries straight away."""
+        cache = LRUCache(max_entries=10)
+        for i in range(5):
+            cache.put(str(i), "x")
+
+        assert cache.set_limits(max_entries=2, max_bytes=None) == (2, None)
+        assert len(cache) == 2
+        assert list(cache) == ["3", "4"]
+
+
+class TestCoreCacheLimits:
+    """Tests for the cache configuration functions in core."""
+
+    def test_set_cache_limits(self) -> None:
+        """Test that core's cache honours set_cache_limits."""
+        set_cache_duration(300)
+        try:
+            set_cache_limits(max_entries=1, max_bytes=None)
+            evictions_before = get_cache_stats()["evictions"] or 0
+            _add_to_cache("http://a", "first")
+            _add_to_cache("http://b", "second")
+
+            assert _get_from_cache("http://a") is None
+            assert _get_from_cache("http://b") == "second"
+            stats = get_cache_stats()
+            assert stats["entries"] == 1
+            assert stats["evictions"] == evictions_before + 1
+        finally:
+            set_cache_limits()
+
+
+class TestCachedJSON:
+    """Tests for caching decoded and validated JSON responses."""
+
+    def _mock_json(self, mocker: MockerFixture) -> Any:
+        """Mock the pooled session to return a small JSON document."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"current_condition": [{"temp_C": "20"}]})
+        return mocker.patch("requests.Session.get", return_value=mock_response)
+
+    def test_json_hit_skips_validation(self, mocker: MockerFixture) -> None:
+        """Test that a hit is built from trusted data without decoding again."""
+        self._mock_json(mocker)
+        get_weather(location="Hot", format="json")
+        loads = mocker.spy(codec, "loads")
+        construct = mocker.spy(cache, "construct_trusted")
+
+        result = get_weather(location="Hot", format="json", with_metadata=True)
+
+        assert isinstance(result, ResponseWrapper)
+        assert result.metadata.is_cached
+        assert result.data.current_condition[0].temp_C == "20"
+        assert loads.call_count == 0
+        assert construct.call_count == 1
+
+    def test_json_hits_are_private(self, mocker: MockerFixture) -> None:
+        """Test that modifying nested fields of a json result doesn't change the cache."""
+        self._mock_json(mocker)
+        fresh = get_weather(location="Deep", format="json")
+        assert isinstance(fresh, WeatherResponse)
+        fresh.current_condition[0].temp_C = "999"
+
+        cached = get_weather(location="Deep", format="json")
+        assert isinstance(cached, WeatherResponse)
+        assert cached.current_condition[0].temp_C == "20"
+        cached.current_condition[0].temp_C = "998"
+        cached.current_condition.append(cached.current_condition[0])
+
+        again = get_weather(location="Deep", format="json")
+        assert isinstance(again, WeatherResponse)
+        assert len(again.current_condition) == 1
+        assert again.current_condition[0].temp_C == "20"
+
+    @pytest.mark.parametrize("backend", codec.available_backends())
+    def test_as_dict_is_private(self, backend: str) -> None:
+        """Test that as_dict returns independent data with every JSON backend."""
+        entry = CachedJSON('{"a": [{"b": "1"}]}', {"a": [{"b": "1"}]})
+        previous = codec.get_json_backend()
+        try:
+            codec.set_json_backend(backend)
+            first = entry.as_dict()
+            first["a"][0]["b"] = "2"
+            assert entry.as_dict() == {"a": [{"b": "1"}]}
+        finally:
+            codec.set_json_backend(previous)
+
+    def test_raw_json_hits_are_private_copies(self, mocker: MockerFixture) -> None:
+        """Test that modifying a raw_json result doesn't change the cache."""
+        self._mock_json(mocker)
+        first = get_weather(location="Copy", format="raw_json")
+        assert isinstance(first, dict)
+        first["current_condition"][0]["temp_C"] = "99"
+
+        second = get_weather(location="Copy", format="raw_json")
+        assert isinstance(second, dict)
+        second["current_condition"].clear()
+
+        third = get_weather(location="Copy", format="raw_json")
+        assert isinstance(third, dict)
+        assert third["current_condition"][0]["temp_C"] == "20"
+
+    def test_model_metadata_is_not_shared(self, mocker: MockerFixture) -> None:
+        """Test that each hit gets its own model with its own metadata."""
+        self._mock_json(mocker)
+        fresh = get_weather(location="Meta", format="json")
+        cached = get_weather(location="Meta", format="json")
+
+        assert isinstance(fresh, WeatherResponse)
+        assert isinstance(cached, WeatherResponse)
+        assert fresh is not cached
+        assert not fresh.metadata.is_cached
+        assert cached.metadata.is_cached
+
+    def test_cached_model_is_not_shared(self) -> None:
+        """Test that a WeatherResponse stored in the cache is copied on each hit."""
+        url = core._build_url(location="Model", format="json")
+        _add_to_cache(url, WeatherResponse.parse_obj({"weather": []}))
+
+        first = get_weather(location="Model", format="json")
+        second = get_weather(location="Model", format="json")
+
+        assert isinstance(first, WeatherResponse)
+        assert isinstance(second, WeatherResponse)
+        assert first is not second
+        assert first.metadata is not second.metadata
+
+
+class TestStaleCache:
+    """Tests for the stale-while-revalidate and stale-if-error cache modes."""
+
+    def _expire(self, url: str) -> None:
+        """Age a cached entry so it is past its cache duration."""
+        timestamp, data = core._cache[url]
+        core._cache[url] = (timestamp - 400, data)
+
+    def test_stale_while_revalidate(self, mocker: MockerFixture) -> None:
+        """Test that stale data is served while a refresh runs in the background."""
+        set_cache_duration(300)
+        set_stale_window(600)
+        try:
+            mock_response = mocker.Mock()
+            mock_response.status_code = 200
+            mock_response.text = "old"
+            mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+            get_weather(location="Swr", format="text")
+            self._expire(core._build_url(location="Swr", format="text"))
+
+            mock_response.text = "new"
+            result = get_weather(location="Swr", format="text", with_metadata=True)
+            assert isinstance(result, ResponseWrapper)
+            assert result.data == "old"
+            assert result.metadata.is_stale
+
+            deadline = time.time() + 5
+            while core._refreshing and time.time() < deadline:
+                time.sleep(0.01)
+            assert mock_get.call_count == 2
+            assert get_weather(location="Swr", format="text") == "new"
+        finally:
+            set_stale_window(0)
+
+    def test_refresh_closes_response(self, mocker: MockerFixture) -> None:
+        """Test that a background refresh closes the response it gets back."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 503
+        mock_response.text = "Service Unavailable"
+        mock_response.headers = {}
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        client = core.WeatherClient(cache_duration=300)
+        url = core._build_url(location="Refresh", format="text")
+
+        client._refresh(url, "text", False)
+
+        mock_response.close.assert_called_once()
+        assert url not in client.cache
+
+    def test_stale_if_error(self, mocker: MockerFixture) -> None:
+        """Test that stale data is served when the upstream request fails."""
+        set_cache_duration(300)
+        set_stale_window(600, while_revalidate=False)
+        try:
+            mock_response = mocker.Mock()
+            mock_response.status_code = 200
+            mock_response.text = json.dumps({"current_condition": [{"temp_C": "8"}]})
+            mocker.patch("requests.Session.get", return_value=mock_response)
+            get_weather(location="Sie")
+            self._expire(core._build_url(location="Sie", format="json"))
+
+            mock_response.status_code = 503
+            result = get_weather(location="Sie", with_metadata=True)
+
+            assert isinstance(result, ResponseWrapper)
+            assert not result.metadata.is_mock
+            assert result.metadata.is_stale
+            assert result.metadata.status_code == 503
+            assert result.data.current_condition[0].temp_C == "8"
+        finally:
+            set_stale_window(0)
+
+    def test_no_stale_window_refetches(self, mocker: MockerFixture) -> None:
+        """Test that expired entries are refetched when the window is disabled."""
+        set_cache_duration(300)
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "data"
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+        get_weather(location="NoStale", format="text")
+        self._expire(core._build_url(location="NoStale", format="text"))
+
+        result = get_weather(location="NoStale", format="text", with_metadata=True)
+
+        assert isinstance(result, ResponseWrapper)
+        assert not result.metadata.is_stale
+        assert mock_get.call_count == 2
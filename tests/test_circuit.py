@@ -0,0 +1,276 @@
+"""
+Tests for the circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.circuit import CircuitBreaker
+from fetch_my_weather.core import WeatherClient, set_circuit_breaker
+from fetch_my_weather.metrics import InMemoryMetrics, to_prometheus
+from fetch_my_weather.ratelimit import TokenBucket
+from fetch_my_weather.retry import Backoff, RetryPolicy
+
+
+def _mock_get(mocker: MockerFixture, status_code: int) -> object:
+    """Patches the HTTP session to answer every request with a status code."""
+    mock_response = mocker.Mock()
+    mock_response.status_code = status_code
+    mock_response.text = "Sunny" if status_code == 200 else "Service Unavailable"
+    mock_response.headers = {}
+    return mocker.patch("requests.Session.get", return_value=mock_response)
+
+
+class TestCircuitBreaker:
+    """Tests for the breaker's state machine."""
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        """Test that only consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3)
+
+        for success in (False, False, True, False, False):
+            assert breaker.allow()
+            breaker.record(success)
+        assert breaker.state == "closed"
+
+        assert breaker.allow()
+        breaker.record(False)
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert breaker.rejects()
+        assert breaker.stats()["rejected"] == 2
+
+    def test_half_open_probe(self, mocker: MockerFixture) -> None:
+        """Test that the circuit half-opens after the timeout and closes on success."""
+        clock = mocker.patch("fetch_my_weather.circuit.time.monotonic")
+        clock.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.allow()
+        breaker.record(False)
+
+        clock.return_value = 105.0
+        assert not breaker.allow()
+        assert breaker.retry_after() == 5.0
+
+        clock.return_value = 110.0
+        assert breaker.allow()  # The probe
+        assert breaker.state == "half_open"
+        assert not breaker.allow()  # Only one probe at a time
+        breaker.record(True)
+        assert breaker.state == "closed"
+        assert breaker.stats()["transitions"] == {
+            "closed": 1,
+            "open": 1,
+            "half_open": 1,
+        }
+
+    def test_failed_probe_reopens(self, mocker: MockerFixture) -> None:
+        """Test that a failed probe opens the circuit for another timeout."""
+        clock = mocker.patch("fetch_my_weather.circuit.time.monotonic")
+        clock.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.allow()
+        breaker.record(False)
+
+        clock.return_value = 110.0
+        assert breaker.allow()
+        breaker.record(False)
+
+        assert breaker.state == "open"
+        assert breaker.retry_after() == 10.0
+
+    def test_lost_probe_frees_its_slot(self, mocker: MockerFixture) -> None:
+        """Test that a probe that never reports back doesn't block forever."""
+        clock = mocker.patch("fetch_my_weather.circuit.time.monotonic")
+        clock.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.allow()
+        breaker.record(False)
+
+        clock.return_value = 110.0
+        assert breaker.allow()
+        clock.return_value = 115.0
+        assert not breaker.allow()
+        clock.return_value = 120.0
+        assert breaker.allow()
+
+    def test_release_frees_probe(self, mocker: MockerFixture) -> None:
+        """Test that a probe given back uncounted frees its slot at once."""
+        clock = mocker.patch("fetch_my_weather.circuit.time.monotonic")
+        clock.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.allow()
+        breaker.record(False)
+
+        clock.return_value = 110.0
+        assert breaker.allow()
+        breaker.release()
+
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+
+    def test_invalid(self) -> None:
+        """Test that impossible settings are rejected."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(recovery_timeout=-1)
+
+
+class TestClientCircuit:
+    """Tests for circuit breaking in WeatherClient requests."""
+
+    def test_fast_fail(self, mocker: MockerFixture) -> None:
+        """Test that an open circuit answers with mock data without a request."""
+        mock_get = _mock_get(mocker, 500)
+        metrics = InMemoryMetrics()
+        client = WeatherClient(
+            cache_duration=0,
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+            metrics=metrics,
+        )
+
+        first = client.get_weather("London", with_metadata=True)
+        client.get_weather("London", with_metadata=True)
+        rejected = client.get_weather("London", with_metadata=True)
+        message = client.get_weather("London", format="text")
+
+        assert mock_get.call_count == 2
+        assert first.metadata.circuit_state == "closed"
+        assert rejected.metadata.is_mock
+        assert rejected.metadata.error_type == "CircuitOpen"
+        assert rejected.metadata.circuit_state == "open"
+        assert rejected.metadata.attempts == 0
+        assert isinstance(message, str) and message.startswith("Error:")
+        stats = client.get_stats()
+        assert stats["circuit"]["state"] == "open"
+        assert stats["circuit"]["rejected"] == 2
+        (opened,) = stats["counters"]["circuit_transitions_total"]
+        assert opened == {"labels": {"state": "open"}, "value": 1}
+        assert 'fetch_my_weather_circuit_state{state="open"} 1' in to_prometheus(stats)
+
+    def test_serves_stale_data(self, mocker: MockerFixture) -> None:
+        """Test that an open circuit serves stale cache entries."""
+        mock_get = _mock_get(mocker, 200)
+        breaker = CircuitBreaker(failure_threshold=1)
+        client = WeatherClient(cache_duration=300, circuit_breaker=breaker)
+        client.set_stale_window(600, while_revalidate=False)
+        client.get_weather("London", format="text")
+        url = core._build_url(location="London", format="text")
+        timestamp, data = client.cache[url]
+        client.cache[url] = (timestamp - 400, data)
+        breaker.allow()
+        breaker.record(False)
+
+        response = client.get_weather("London", format="text", with_metadata=True)
+
+        assert mock_get.call_count == 1
+        assert response.data == "Sunny"
+        assert response.metadata.is_stale
+        assert response.metadata.error_type == "CircuitOpen"
+
+    def test_client_errors_dont_count(self, mocker: MockerFixture) -> None:
+        """Test that 4xx responses don't open the circuit."""
+        _mock_get(mocker, 404)
+        breaker = CircuitBreaker(failure_threshold=1)
+        client = WeatherClient(cache_duration=0, circuit_breaker=breaker)
+
+        client.get_weather("Nowhere")
+        client.get_weather("Nowhere")
+
+        assert breaker.state == "closed"
+
+    def test_stops_retrying(self, mocker: MockerFixture) -> None:
+        """Test that retries stop once the circuit opens."""
+        mock_get = mocker.patch(
+            "requests.Session.get",
+            side_effect=requests.exceptions.ConnectionError("refused"),
+        )
+        mocker.patch("time.sleep")
+        client = WeatherClient(
+            retry=RetryPolicy(connection_error=Backoff(max_attempts=5)),
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        )
+
+        response = client.get_weather("London", with_metadata=True)
+
+        assert mock_get.call_count == 2
+        assert response.metadata.error_type == "ConnectionError"
+        assert response.metadata.circuit_state == "open"
+
+    @pytest.mark.parametrize(
+        ("on_rate_limit", "deadline", "error_type"),
+        [("fail", None, "RateLimitError"), ("block", 1.0, "DeadlineExceeded")],
+    )
+    def test_unsent_probe_frees_its_slot(
+        self,
+        mocker: MockerFixture,
+        on_rate_limit: str,
+        deadline: float | None,
+        error_type: str,
+    ) -> None:
+        """Test that a probe stopped before it is sent doesn't hold the slot."""
+        mock_get = _mock_get(mocker, 200)
+        clock = mocker.patch("fetch_my_weather.circuit.time.monotonic")
+        clock.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.allow()
+        breaker.record(False)
+        clock.return_value = 110.0
+        limiter = TokenBucket(rate=0.1)
+        limiter.try_acquire()
+        client = WeatherClient(
+            cache_duration=0,
+            rate_limiter=limiter,
+            on_rate_limit=on_rate_limit,
+            circuit_breaker=breaker,
+        )
+
+        response = client.get_weather(
+            "London", format="text", with_metadata=True, deadline=deadline
+        )
+
+        mock_get.assert_not_called()
+        assert response.metadata.error_type == error_type
+        assert breaker.state == "half_open"
+        assert breaker.allow()  # The next caller can probe straight away
+
+    def test_async_fast_fail(self, mocker: MockerFixture) -> None:
+        """Test that async requests fail fast while the circuit is open."""
+        mock_get = _mock_get(mocker, 200)
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.allow()
+        breaker.record(False)
+        client = WeatherClient(circuit_breaker=breaker)
+
+        async def fetch() -> list[object]:
+            async with AsyncWeatherClient(client=client) as async_client:
+                return list(
+                    await asyncio.gather(
+                        *(
+                            async_client.get_weather(f"City{i}", with_metadata=True)
+                            for i in range(3)
+                        )
+                    )
+                )
+
+        results = asyncio.run(fetch())
+
+        mock_get.assert_not_called()
+        assert [r.metadata.error_type for r in results] == ["CircuitOpen"] * 3
+        assert breaker.stats()["rejected"] == 3
+
+    def test_set_circuit_breaker(self) -> None:
+        """Test that set_circuit_breaker configures the default client."""
+        breaker = CircuitBreaker()
+        try:
+            assert set_circuit_breaker(breaker) is None
+            assert core.get_stats()["circuit"]["state"] == "closed"
+        finally:
+            assert set_circuit_breaker(None) is breaker
+        assert "circuit" not in core.get_stats()
@@ -0,0 +1,75 @@
+"""
+Tests for the pluggable JSON codec of the fetch-my-weather package.
+"""
+
+import json
+from collections.abc import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import codec
+from fetch_my_weather.core import get_weather
+from fetch_my_weather.models import ResponseWrapper, WeatherResponse
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request: pytest.FixtureRequest) -> Iterator[str]:
+    """Run a test once with every installed JSON backend."""
+    previous = codec.get_json_backend()
+    codec.set_json_backend(request.param)
+    yield request.param
+    codec.set_json_backend(previous)
+
+
+class TestCodec:
+    """Tests for codec.loads, codec.dumps and backend selection."""
+
+    def test_round_trip(self, backend: str) -> None:
+        """Test that every backend decodes what it encodes."""
+        data = {"weather": [{"hourly": [{"tempC": "10"}]}], "note": "café"}
+
+        text = codec.dumps(data)
+
+        assert isinstance(text, str)
+        assert codec.loads(text) == data
+        assert codec.loads(text.encode("utf-8")) == data
+
+    def test_invalid_json_raises_json_decode_error(self, backend: str) -> None:
+        """Test that every backend raises the standard library's error type."""
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads("This is not JSON")
+
+    def test_default_for_unsupported_values(self, backend: str) -> None:
+        """Test that the default hook is used for values JSON can't hold."""
+        assert codec.loads(codec.dumps({"value": {1, 2}}, default=sorted)) == {
+            "value": [1, 2]
+        }
+
+    def test_json_is_always_available(self) -> None:
+        """Test that the standard library backend is always an option."""
+        assert codec.available_backends()[-1] == "json"
+
+    def test_unknown_backend(self) -> None:
+        """Test that choosing an unknown backend raises ValueError."""
+        with pytest.raises(ValueError):
+            codec.set_json_backend("yaml")
+
+    def test_get_weather_with_backend(
+        self, backend: str, mocker: MockerFixture
+    ) -> None:
+        """Test that get_weather decodes and caches JSON with every backend."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"current_condition": [{"temp_C": "12"}]})
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        result = get_weather(location=f"Codec{backend}", format="raw_json")
+        assert result == {"current_condition": [{"temp_C": "12"}]}
+
+        cached = get_weather(location=f"Codec{backend}", with_metadata=True)
+        assert isinstance(cached, ResponseWrapper)
+        assert isinstance(cached.data, WeatherResponse)
+        assert cached.data.current_condition[0].temp_C == "12"
+        assert cached.metadata.is_cached
+        assert mock_get.call_count == 1
@@ -2,13 +2,19 @@
 Tests for the core functionality of the fetch-my-weather package.
 """
 
+import asyncio
 import json
+import threading
 import time
 
 from pytest_mock import MockerFixture
 
 # Import the package
+from fetch_my_weather import core
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.batch import get_weather_many
 from fetch_my_weather.core import (
+    WeatherClient,
     _build_url,
     _cache,
     clear_cache,
@@ -16,6 +22,7 @@ from fetch_my_weather.core import (
     set_cache_duration,
     set_user_agent,
 )
+from fetch_my_weather.models import ResponseWrapper
 
 
 class TestCoreConfiguration:
@@ -172,11 +179,11 @@ class TestWeatherFetching:
 
     def test_get_weather_success_text(self, mocker: MockerFixture) -> None:
         """Test get_weather with a successful text response."""
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.text = "Weather data for location"
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Get weather with text format
         result = get_weather(location="TestCity", format="text")
@@ -186,14 +193,14 @@ class TestWeatherFetching:
 
     def test_get_weather_success_json(self, mocker: MockerFixture) -> None:
         """Test get_weather with a successful JSON response."""
-        # Mock requests.get
+        # Mock the pooled session
         sample_json = {
             "current_condition": [{"temp_C": "20", "weatherDesc": [{"value": "Sunny"}]}]
         }
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.text = json.dumps(sample_json)
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Get weather with json format (default)
         result = get_weather(location="TestCity")
@@ -208,11 +215,11 @@ class TestWeatherFetching:
 
     def test_get_weather_invalid_json(self, mocker: MockerFixture) -> None:
         """Test get_weather with an invalid JSON response."""
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.text = "This is not valid JSON"
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Get weather with json format
         result = get_weather(location="TestCity", format="json")
@@ -223,11 +230,11 @@ class TestWeatherFetching:
 
     def test_get_weather_png_deprecated(self, mocker: MockerFixture) -> None:
         """Test get_weather with PNG format using deprecated is_png parameter."""
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.content = b"PNG image data"
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Get weather as PNG using is_png
         result = get_weather(location="TestCity", is_png=True)
@@ -237,11 +244,11 @@ class TestWeatherFetching:
 
     def test_get_weather_png_format(self, mocker: MockerFixture) -> None:
         """Test get_weather with PNG format using format parameter."""
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.content = b"PNG image data"
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Get weather as PNG using format parameter
         result = get_weather(location="TestCity", format="png")
@@ -251,11 +258,11 @@ class TestWeatherFetching:
 
     def test_get_weather_error_response(self, mocker: MockerFixture) -> None:
         """Test get_weather with an error response."""
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 404
         mock_response.text = "Not found"
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Get weather
         result = get_weather(location="NonExistentCity")
@@ -275,8 +282,8 @@ class TestWeatherFetching:
         # Rename the class to match what our code is looking for
         MockTimeoutError.__name__ = "Timeout"
 
-        # Mock requests.get to raise our custom Timeout
-        mocker.patch("requests.get", side_effect=MockTimeoutError())
+        # Mock the pooled session to raise our custom Timeout
+        mocker.patch("requests.Session.get", side_effect=MockTimeoutError())
 
         # Get weather
         result = get_weather()
@@ -295,8 +302,8 @@ class TestWeatherFetching:
         # Rename the class to match what our code is looking for
         MockNetworkError.__name__ = "ConnectionError"
 
-        # Mock requests.get to raise our custom ConnectionError
-        mocker.patch("requests.get", side_effect=MockNetworkError())
+        # Mock the pooled session to raise our custom ConnectionError
+        mocker.patch("requests.Session.get", side_effect=MockNetworkError())
 
         # Get weather
         result = get_weather()
@@ -313,11 +320,11 @@ class TestWeatherFetching:
         # Clear cache
         clear_cache()
 
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.text = "Cached weather data"
-        mock_get = mocker.patch("requests.get", return_value=mock_response)
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
         # First call should make a request
         result1 = get_weather(location="CacheTest", format="text")
@@ -343,11 +350,11 @@ class TestWeatherFetching:
         # Sample JSON data
         sample_json = {"current_condition": [{"temp_C": "20"}]}
 
-        # Mock requests.get
+        # Mock the pooled session
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.text = json.dumps(sample_json)
-        mock_get = mocker.patch("requests.get", return_value=mock_response)
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
         # First call should make a request
         result1 = get_weather(location="CacheTest", format="json")
@@ -441,3 +448,118 @@ class TestWeatherFetching:
         assert hasattr(model, "current_condition")
         assert len(model.current_condition) == 1
         assert hasattr(model.current_condition[0], "temp_C")
+
+
+class TestWeatherClient:
+    """Tests for independent WeatherClient instances."""
+
+    def _mock_text(self, mocker: MockerFixture, text: str = "Sunny") -> object:
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = text
+        return mocker.patch("requests.Session.get", return_value=mock_response)
+
+    def test_clients_have_separate_caches(self, mocker: MockerFixture) -> None:
+        """Test that a response cached by one client is not seen by another."""
+        mock_get = self._mock_text(mocker)
+        first = WeatherClient()
+        second = WeatherClient()
+
+        first.get_weather(location="Oslo", format="text")
+        first.get_weather(location="Oslo", format="text")
+        assert mock_get.call_count == 1
+
+        second.get_weather(location="Oslo", format="text")
+        assert mock_get.call_count == 2
+        assert len(_cache) == 0  # The default client was not touched
+
+    def test_clients_have_separate_configuration(self) -> None:
+        """Test that configuring one client leaves the others alone."""
+        client = WeatherClient(cache_duration=0, use_mock=True, user_agent="a/1")
+
+        assert client.set_cache_duration(30) == 30
+        assert core._CACHE_DURATION_SECONDS == 600
+        assert core._USE_MOCK_DATA is False
+        assert client._request_headers() == {"User-Agent": "a/1"}
+        result = client.get_weather(location="Anywhere", with_metadata=True)
+        assert isinstance(result, ResponseWrapper)
+        assert result.metadata.is_mock
+
+    def test_module_functions_use_default_client(self, mocker: MockerFixture) -> None:
+        """Test that get_weather and the setters go through the default client."""
+        self._mock_text(mocker)
+
+        get_weather(location="Default", format="text")
+
+        assert core._default_client.cache is _cache
+        assert len(core._default_client.cache) == 1
+        assert core._default_client.get_cache_stats()["entries"] == 1
+
+    def test_concurrent_requests(self, mocker: MockerFixture) -> None:
+        """Test that one client can be used from many threads at once."""
+
+        def fake_get(url: str, *args: object, **kwargs: object) -> object:
+            response = mocker.Mock()
+            response.status_code = 200
+            response.text = url
+            return response
+
+        mocker.patch("requests.Session.get", side_effect=fake_get)
+        client = WeatherClient()
+        client.set_cache_limits(max_entries=10)
+        errors: list[BaseException] = []
+
+        def worker(n: int) -> None:
+            try:
+                for i in range(20):
+                    url = _build_url(location=f"City{(n + i) % 15}", format="text")
+                    assert (
+                        client.get_weather(
+                            location=f"City{(n + i) % 15}", format="text"
+                        )
+                        == url
+                    )
+            except BaseException as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert errors == []
+        stats = client.get_cache_stats()
+        assert stats["entries"] <= 10
+        assert stats["hits"] + stats["misses"] >= 16 * 20
+
+    def test_close_releases_transport(self, mocker: MockerFixture) -> None:
+        """Test that closing a client closes the transport it created."""
+        self._mock_text(mocker)
+
+        with WeatherClient() as client:
+            client.get_weather(location="Closing", format="text")
+            transport = client._get_transport()
+
+        assert transport.closed
+        assert client._transport is None
+
+    def test_async_and_batch_accept_a_client(self, mocker: MockerFixture) -> None:
+        """Test that the async and batch APIs can run on a specific client."""
+        mock_get = self._mock_text(mocker)
+        client = WeatherClient()
+
+        results = get_weather_many(["Rome", "Rome"], format="text", client=client)
+        assert [r.data for r in results] == ["Sunny", "Sunny"]
+
+        async def main() -> object:
+            async with AsyncWeatherClient(client=client) as async_client:
+                return await async_client.get_weather(
+                    location="Rome", format="text", with_metadata=True
+                )
+
+        result = asyncio.run(main())
+        assert isinstance(result, ResponseWrapper)
+        assert result.metadata.is_cached
+        assert mock_get.call_count == 1
+        assert len(_cache) == 0
@@ -0,0 +1,308 @@
+"""
+Tests for request timeouts and per-call deadlines.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.batch import get_weather_many
+from fetch_my_weather.circuit import CircuitBreaker
+from fetch_my_weather.core import WeatherClient, set_timeouts
+from fetch_my_weather.deadlines import (
+    Budget,
+    DeadlineExceeded,
+    check_deadline,
+    split_timeout,
+)
+from fetch_my_weather.ratelimit import TokenBucket
+from fetch_my_weather.retry import RetryPolicy
+
+
+def _response(mocker: MockerFixture, status_code: int = 200, **headers: str) -> object:
+    """Builds a mock HTTP response."""
+    response = mocker.Mock()
+    response.status_code = status_code
+    response.text = "Sunny" if status_code == 200 else "Service Unavailable"
+    response.headers = headers
+    return response
+
+
+def _slow_timeout(delay: float) -> object:
+    """Returns a fake Session.get that times out after a delay."""
+
+    def fake_get(*args: object, **kwargs: object) -> object:
+        time.sleep(delay)
+        raise requests.exceptions.ReadTimeout("read timed out")
+
+    return fake_get
+
+
+def _make_stale(client: WeatherClient, location: str) -> None:
+    """Ages a cached text entry past its cache duration."""
+    client.set_stale_window(600, while_revalidate=False)
+    url = core._build_url(location=location, format="text")
+    timestamp, data = client.cache[url]
+    client.cache[url] = (timestamp - 400, data)
+
+
+class TestBudget:
+    """Tests for the per-call budget."""
+
+    def test_timeouts_cut_to_deadline(self, mocker: MockerFixture) -> None:
+        """Test that the timeouts shrink as the deadline approaches."""
+        clock = mocker.patch("fetch_my_weather.deadlines.time.monotonic")
+        clock.return_value = 100.0
+        budget = Budget(connect=1.0, read=5.0, deadline=3.0)
+
+        assert budget.timeout() == (1.0, 3.0)
+        clock.return_value = 102.5
+        assert budget.timeout() == (0.5, 0.5)
+        assert not budget.expired()
+        clock.return_value = 103.0
+        assert budget.expired()
+        assert budget.remaining() == 0.0
+        with pytest.raises(DeadlineExceeded):
+            budget.timeout()
+
+    def test_no_deadline(self) -> None:
+        """Test that a budget without a deadline never expires."""
+        budget = Budget(connect=2.0, read=7.0)
+
+        assert budget.remaining() is None
+        assert not budget.expired()
+        assert budget.timeout() == (2.0, 7.0)
+
+    def test_split_timeout(self) -> None:
+        """Test that a timeout is a number for both parts or a tuple."""
+        assert split_timeout(3) == (3.0, 3.0)
+        assert split_timeout((0.5, 2)) == (0.5, 2.0)
+
+    @pytest.mark.parametrize(
+        "timeout",
+        [0, -1, "5", None, True, float("nan"), float("inf"), (1,), (1, 0), (1, "2")],
+    )
+    def test_invalid_timeout(self, timeout: Any) -> None:
+        """Test that anything but positive seconds is rejected."""
+        with pytest.raises(ValueError):
+            split_timeout(timeout)
+
+    def test_check_deadline(self) -> None:
+        """Test that a deadline may be zero but not negative or non-numeric."""
+        assert check_deadline(0) == 0.0
+        assert check_deadline(1.5) == 1.5
+        for deadline in (-0.1, "1", float("nan"), False):
+            with pytest.raises(ValueError):
+                check_deadline(deadline)  # type: ignore[arg-type]
+
+
+class TestClientTimeouts:
+    """Tests for the timeouts requests are sent with."""
+
+    def test_default_timeouts(self, mocker: MockerFixture) -> None:
+        """Test that requests use the configured connect and read timeouts."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        client = WeatherClient(cache_duration=0)
+
+        client.get_weather("London", format="text")
+        assert mock_get.call_args.kwargs["timeout"] == (15.0, 15.0)
+
+        assert client.set_timeouts(connect=1, read=5) == (1.0, 5.0, None)
+        client.get_weather("London", format="text")
+        assert mock_get.call_args.kwargs["timeout"] == (1.0, 5.0)
+
+    def test_per_call_timeout(self, mocker: MockerFixture) -> None:
+        """Test that a call's timeout overrides the client's."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        client = WeatherClient(cache_duration=0, connect_timeout=1, read_timeout=5)
+
+        client.get_weather("London", format="text", timeout=2)
+        assert mock_get.call_args.kwargs["timeout"] == (2.0, 2.0)
+        client.get_weather("London", format="text", timeout=(0.5, 30))
+        assert mock_get.call_args.kwargs["timeout"] == (0.5, 30.0)
+
+    def test_deadline_cuts_timeouts(self, mocker: MockerFixture) -> None:
+        """Test that no request may outlast the call's deadline."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        client = WeatherClient(cache_duration=0)
+
+        client.get_weather("London", format="text", timeout=(3, 10), deadline=0.5)
+
+        connect, read = mock_get.call_args.kwargs["timeout"]
+        assert 0 < connect <= 0.5 and 0 < read <= 0.5
+
+    def test_invalid(self) -> None:
+        """Test that impossible settings are rejected."""
+        client = WeatherClient()
+        with pytest.raises(ValueError):
+            client.set_timeouts(connect=0)
+        with pytest.raises(ValueError):
+            client.set_timeouts(deadline=-1)
+        with pytest.raises(ValueError):
+            WeatherClient(read_timeout=-5)
+        with pytest.raises(ValueError):
+            WeatherClient(connect_timeout="1")  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"timeout": 0}, {"timeout": (1, -1)}, {"timeout": "5"}, {"deadline": -1}],
+    )
+    def test_invalid_per_call(self, mocker: MockerFixture, options: Any) -> None:
+        """Test that a bad timeout or deadline gets an error result, not a request."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        client = WeatherClient(cache_duration=0)
+
+        message = client.get_weather("London", format="text", **options)
+        response = client.get_weather("London", with_metadata=True, **options)
+
+        async def fetch() -> Any:
+            async with AsyncWeatherClient(client=client) as async_client:
+                return await async_client.get_weather(
+                    "London", format="text", **options
+                )
+
+        async_message = asyncio.run(fetch())
+
+        mock_get.assert_not_called()
+        assert isinstance(message, str) and message.startswith("Error: Invalid")
+        assert async_message == message
+        assert response.metadata.error_type == "ValidationError"
+        assert response.metadata.is_mock
+
+    def test_set_timeouts(self, mocker: MockerFixture) -> None:
+        """Test that set_timeouts configures the default client."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        try:
+            assert set_timeouts(connect=2, read=4, deadline=10) == (2.0, 4.0, 10.0)
+            core.get_weather("London", format="text")
+            assert mock_get.call_args.kwargs["timeout"] == (2.0, 4.0)
+        finally:
+            assert set_timeouts() == (15.0, 15.0, None)
+
+
+class TestDeadlines:
+    """Tests for calls that run out of time."""
+
+    def test_serves_stale_data(self, mocker: MockerFixture) -> None:
+        """Test that a request cut short by the deadline is answered from cache."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        breaker = CircuitBreaker(failure_threshold=1)
+        client = WeatherClient(cache_duration=300, circuit_breaker=breaker)
+        client.get_weather("London", format="text")
+        _make_stale(client, "London")
+        mock_get.side_effect = _slow_timeout(0.05)
+
+        response = client.get_weather(
+            "London", format="text", with_metadata=True, deadline=0.02
+        )
+
+        assert response.data == "Sunny"
+        assert response.metadata.is_stale
+        assert response.metadata.error_type == "DeadlineExceeded"
+        assert breaker.state == "closed"  # Not the server's fault
+
+    def test_error_without_cache(self, mocker: MockerFixture) -> None:
+        """Test that a call with nothing cached reports the missed deadline."""
+        mocker.patch("requests.Session.get", side_effect=_slow_timeout(0.05))
+        client = WeatherClient()
+
+        response = client.get_weather("London", with_metadata=True, deadline=0.02)
+        message = client.get_weather("Paris", format="text", deadline=0.02)
+
+        assert response.metadata.is_mock
+        assert response.metadata.error_type == "DeadlineExceeded"
+        assert isinstance(message, str) and message.startswith("Error: Deadline")
+
+    def test_no_retry_past_deadline(self, mocker: MockerFixture) -> None:
+        """Test that a retry that would end after the deadline isn't made."""
+        mock_get = mocker.patch(
+            "requests.Session.get",
+            return_value=_response(mocker, 503, **{"Retry-After": "2"}),
+        )
+        sleep = mocker.patch("time.sleep")
+        client = WeatherClient(retry=RetryPolicy())
+
+        response = client.get_weather("London", with_metadata=True, deadline=1)
+
+        assert mock_get.call_count == 1
+        sleep.assert_not_called()
+        assert response.metadata.status_code == 503
+
+    def test_rate_limit_wait(self, mocker: MockerFixture) -> None:
+        """Test that no token is waited for past the deadline."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        client = WeatherClient(cache_duration=0, rate_limiter=TokenBucket(rate=0.1))
+        client.get_weather("London", format="text")
+        start = time.perf_counter()
+
+        response = client.get_weather(
+            "London", format="text", with_metadata=True, deadline=0.5
+        )
+
+        assert time.perf_counter() - start < 0.5
+        assert mock_get.call_count == 1
+        assert response.metadata.error_type == "DeadlineExceeded"
+
+    def test_coalesced_waiter(self, mocker: MockerFixture) -> None:
+        """Test that a caller waiting on another's request gives up in time."""
+        release = threading.Event()
+
+        def slow_get(*args: object, **kwargs: object) -> object:
+            release.wait(5)
+            return _response(mocker)
+
+        mocker.patch("requests.Session.get", side_effect=slow_get)
+        client = WeatherClient()
+        leader = threading.Thread(
+            target=lambda: client.get_weather(
+                "London", format="text", with_metadata=True
+            )
+        )
+        leader.start()
+        time.sleep(0.05)
+        try:
+            response = client.get_weather(
+                "London", format="text", with_metadata=True, deadline=0.05
+            )
+        finally:
+            release.set()
+            leader.join(5)
+
+        assert response.metadata.error_type == "DeadlineExceeded"
+        assert client.get_weather("London", format="text") == "Sunny"
+
+    def test_async(self, mocker: MockerFixture) -> None:
+        """Test that async calls carry their deadline to the worker thread."""
+        mocker.patch("requests.Session.get", side_effect=_slow_timeout(0.05))
+        client = WeatherClient()
+
+        async def fetch() -> Any:
+            async with AsyncWeatherClient(client=client) as async_client:
+                return await async_client.get_weather(
+                    "London", with_metadata=True, deadline=0.02
+                )
+
+        response = asyncio.run(fetch())
+
+        assert response.metadata.error_type == "DeadlineExceeded"
+
+    def test_batch_partial_results(self, mocker: MockerFixture) -> None:
+        """Test that a batch past its deadline still returns what is cached."""
+        mock_get = mocker.patch("requests.Session.get", return_value=_response(mocker))
+        client = WeatherClient(cache_duration=300)
+        client.get_weather("London", format="text")
+
+        results = get_weather_many(
+            ["London", "Paris"], client=client, format="text", deadline=0
+        )
+
+        assert mock_get.call_count == 1
+        assert results[0].data == "Sunny" and results[0].metadata.is_cached
+        assert results[1].metadata.error_type == "DeadlineExceeded"
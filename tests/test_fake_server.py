@@ -0,0 +1,128 @@
+"""
+Tests for the local fake wttr.in server and base URL overrides.
+"""
+
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from fetch_my_weather import core
+from fetch_my_weather.core import WeatherClient, _build_url, set_base_url
+from fetch_my_weather.fake_server import FakeWttrServer
+from fetch_my_weather.models import WeatherFields, WeatherResponse
+
+
+@pytest.fixture
+def server() -> Iterator[FakeWttrServer]:
+    """A fake wttr.in with default settings."""
+    with FakeWttrServer() as fake:
+        yield fake
+
+
+class TestBaseUrl:
+    """Tests for sending requests to another server."""
+
+    def test_build_url_base(self) -> None:
+        """Test that _build_url uses the given base URL."""
+        url = _build_url(location="London", base_url="http://127.0.0.1:8002/")
+
+        assert url == "http://127.0.0.1:8002/London"
+
+    def test_set_base_url(self) -> None:
+        """Test that set_base_url adds a trailing slash and can be reset."""
+        try:
+            assert set_base_url("http://localhost:8002") == "http://localhost:8002/"
+            assert core._default_client._base_url == "http://localhost:8002/"
+        finally:
+            assert set_base_url(None) == core.BASE_URL
+
+    def test_invalid_base_url(self) -> None:
+        """Test that non-http URLs are rejected."""
+        with pytest.raises(ValueError):
+            WeatherClient(base_url="localhost:8002")
+        with pytest.raises(ValueError):
+            set_base_url("ftp://example.com/")
+
+
+class TestFakeServer:
+    """Tests for the real request path against FakeWttrServer."""
+
+    def test_json(self, server: FakeWttrServer) -> None:
+        """Test that j1 requests get a full 3-day forecast."""
+        client = WeatherClient(base_url=server.base_url)
+
+        response = client.get_weather("London", with_metadata=True)
+
+        assert isinstance(response.data, WeatherResponse)
+        assert response.metadata.is_real_data
+        assert response.metadata.url == f"{server.base_url}London?format=j1"
+        assert response.data.weather is not None
+        assert len(response.data.weather) == 3
+        assert server.get_stats()["ok"] == 1
+
+    def test_text_png_moon_and_fields(self, server: FakeWttrServer) -> None:
+        """Test that every kind of URL gets the matching payload."""
+        client = WeatherClient(base_url=server.base_url)
+
+        text = client.get_weather("London", format="text")
+        png = client.get_weather("London", format="png")
+        moon = client.get_weather(is_moon=True, moon_date="2025-04-13", format="text")
+        fields = client.get_weather("Oslo", fields=["temperature", "humidity"])
+
+        assert isinstance(text, str) and "MockCity" in text
+        assert isinstance(png, bytes) and png == core._MOCK_DATA["png"]
+        assert isinstance(moon, str) and "Full Moon" in moon
+        assert isinstance(fields, WeatherFields)
+        assert fields.temperature == 17
+        assert fields.humidity == 72
+
+    def test_errors(self) -> None:
+        """Test that server errors reach the client's error handling."""
+        with FakeWttrServer(error_rate=1.0) as fake:
+            client = WeatherClient(base_url=fake.base_url)
+            response = client.get_weather("London", with_metadata=True)
+
+        assert response.metadata.status_code == 500
+        assert response.metadata.error_type == "HTTPError"
+
+    def test_rate_limit(self) -> None:
+        """Test that requests above the rate limit get a 503 with Retry-After."""
+        with FakeWttrServer(rate_limit=2, retry_after=7) as fake:
+            client = WeatherClient(base_url=fake.base_url, cache_duration=0)
+            statuses = [
+                client.get_weather(
+                    "London", format="text", with_metadata=True
+                ).metadata.status_code
+                for _ in range(4)
+            ]
+            stats = fake.get_stats()
+
+        assert statuses == [200, 200, 503, 503]
+        assert stats == {"requests": 4, "ok": 2, "errors": 0, "unavailable": 2}
+
+    def test_latency(self) -> None:
+        """Test that answers are delayed by the configured latency."""
+        with FakeWttrServer(latency=0.05) as fake:
+            client = WeatherClient(base_url=fake.base_url)
+            start = time.perf_counter()
+            client.get_weather("London", format="text")
+            elapsed = time.perf_counter() - start
+
+        assert elapsed >= 0.05
+
+    def test_payload_size(self) -> None:
+        """Test that the j1 payload size follows days and hours."""
+        with FakeWttrServer(days=5, hours=24) as fake:
+            client = WeatherClient(base_url=fake.base_url)
+            weather = client.get_weather("London")
+
+        assert isinstance(weather, WeatherResponse)
+        assert weather.weather is not None
+        assert len(weather.weather) == 5
+        assert all(len(day.hourly or []) == 24 for day in weather.weather)
+
+    def test_invalid_rate(self) -> None:
+        """Test that failure rates outside [0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            FakeWttrServer(error_rate=1.5)
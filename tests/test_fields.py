@@ -0,0 +1,158 @@
+"""
+Tests for field projection in the fetch-my-weather package.
+"""
+
+import asyncio
+from datetime import time
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.batch import get_weather_many
+from fetch_my_weather.core import _build_url, get_weather
+from fetch_my_weather.fields import format_string, parse_fields, resolve_fields
+from fetch_my_weather.models import ResponseWrapper, WeatherFields
+
+
+class TestFieldParsing:
+    """Tests for building format strings and parsing one-line responses."""
+
+    def test_format_string(self) -> None:
+        """Test that fields map to an encoded wttr.in format string."""
+        names = resolve_fields(["temperature", "humidity", "wind", "wind_direction"])
+
+        assert format_string(names) == "%25t%7C%25h%7C%25w"
+
+    def test_unknown_or_empty_fields(self) -> None:
+        """Test that unknown names and empty lists raise ValueError."""
+        with pytest.raises(ValueError):
+            resolve_fields(["temperature", "temp_C"])
+        with pytest.raises(ValueError):
+            resolve_fields([])
+
+    def test_parse_values(self) -> None:
+        """Test that values are parsed without their units."""
+        names = ("temperature", "humidity", "wind", "wind_direction", "sunset")
+
+        record = parse_fields("-3°C|75%|↑11km/h|19:59:01\n", names)
+
+        assert record.temperature == -3.0
+        assert record.humidity == 75
+        assert record.wind == 11.0
+        assert record.wind_direction == "↑"
+        assert record.sunset == time(19, 59, 1)
+        assert record.pressure is None
+        assert record.requested == list(names)
+
+    def test_unexpected_response(self) -> None:
+        """Test that a response with the wrong number of values gives no values."""
+        record = parse_fields("Unknown location", ("temperature", "humidity"))
+
+        assert record.temperature is None
+        assert record.humidity is None
+
+
+class TestFieldRequests:
+    """Tests for get_weather(fields=...)."""
+
+    def _mock_text(self, mocker: MockerFixture, text: str) -> object:
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = text
+        return mocker.patch("requests.Session.get", return_value=mock_response)
+
+    def test_build_url(self) -> None:
+        """Test that fields replace the j1 format in the URL."""
+        url = _build_url(
+            location="Oslo", units="m", fields=["temperature", "humidity", "wind"]
+        )
+
+        assert url == "http://wttr.in/Oslo?m&format=%25t%7C%25h%7C%25w"
+
+    def test_get_weather_fields(self, mocker: MockerFixture) -> None:
+        """Test that a projection is fetched, parsed and cached on its own."""
+        mock_get = self._mock_text(mocker, "+12°C|75%|↑11km/h")
+
+        record = get_weather(
+            location="Oslo", units="m", fields=["temperature", "humidity", "wind"]
+        )
+        cached = get_weather(
+            location="Oslo",
+            units="m",
+            fields=["temperature", "humidity", "wind"],
+            with_metadata=True,
+        )
+
+        assert isinstance(record, WeatherFields)
+        assert record.temperature == 12.0
+        assert record.humidity == 75
+        assert record.metadata.is_real_data
+        assert isinstance(cached, ResponseWrapper)
+        assert cached.metadata.is_cached
+        assert cached.data.wind == 11.0  # type: ignore[union-attr]
+        assert mock_get.call_count == 1
+        assert "format=%25t%7C%25h%7C%25w" in mock_get.call_args[0][0]
+
+    def test_mock_mode(self) -> None:
+        """Test that mock mode returns plausible values for every field."""
+        record = get_weather(fields=["temperature", "sunrise"], use_mock=True)
+
+        assert isinstance(record, WeatherFields)
+        assert record.temperature == 17.0
+        assert record.sunrise == time(6, 12, 34)
+        assert record.metadata.is_mock
+
+    def test_unknown_field(self) -> None:
+        """Test that an unknown field is reported like other invalid parameters."""
+        result = get_weather(fields=["temp_C"])
+        assert isinstance(result, str)
+        assert "Unknown field" in result
+
+        wrapped = get_weather(fields=["temp_C"], with_metadata=True)
+        assert isinstance(wrapped, ResponseWrapper)
+        assert wrapped.metadata.error_type == "ValidationError"
+
+    def test_http_error(self, mocker: MockerFixture) -> None:
+        """Test that errors give a message, or mock values with metadata."""
+        mocker.patch(
+            "requests.Session.get", side_effect=requests.ConnectionError("down")
+        )
+
+        message = get_weather(location="Down", fields=["temperature"])
+        wrapped = get_weather(
+            location="Down", fields=["temperature"], with_metadata=True
+        )
+
+        assert isinstance(message, str)
+        assert "Error" in message
+        assert isinstance(wrapped, ResponseWrapper)
+        assert wrapped.metadata.error_type == "ConnectionError"
+        assert isinstance(wrapped.data, WeatherFields)
+        assert wrapped.data.temperature == 17.0
+
+    def test_async_and_batch(self, mocker: MockerFixture) -> None:
+        """Test projections through the async client and batches."""
+        mock_get = self._mock_text(mocker, "+5°C|Clear")
+
+        async def fetch() -> object:
+            async with AsyncWeatherClient() as client:
+                return await client.get_weather(
+                    location="Bergen", fields=["temperature", "condition"]
+                )
+
+        record = asyncio.run(fetch())
+        results = get_weather_many(
+            [
+                {"location": "Bergen", "fields": ["temperature", "condition"]},
+                {"location": "Bergen", "fields": ["bogus"]},
+            ]
+        )
+
+        assert isinstance(record, WeatherFields)
+        assert record.condition == "Clear"
+        assert isinstance(results[0].data, WeatherFields)
+        assert results[0].data.temperature == 5.0
+        assert results[1].metadata.error_type is not None
+        assert mock_get.call_count == 1
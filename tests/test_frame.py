@@ -0,0 +1,155 @@
+"""
+Tests for the columnar forecast view of the fetch-my-weather package.
+"""
+
+import math
+from datetime import date
+
+import pytest
+
+from fetch_my_weather import frame as frame_module
+from fetch_my_weather.core import _MOCK_DATA
+from fetch_my_weather.frame import HOURLY_COLUMNS, ForecastFrame
+from fetch_my_weather.models import TypedWeatherResponse, WeatherResponse
+
+
+def _response(city: str, temps: list[str]) -> WeatherResponse:
+    """Builds a one-day response with one hourly row per temperature."""
+    return WeatherResponse.parse_obj(
+        {
+            "nearest_area": [{"areaName": [{"value": city}]}],
+            "weather": [
+                {
+                    "date": "2025-04-13",
+                    "maxtempC": max((t for t in temps if t), key=float),
+                    "hourly": [
+                        {"time": str(i * 300), "tempC": t, "chanceofrain": "0"}
+                        for i, t in enumerate(temps)
+                    ],
+                }
+            ],
+        }
+    )
+
+
+@pytest.fixture(params=["python", "numpy"])
+def engine(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with the pure-Python path and, if installed, with NumPy."""
+    if request.param == "python":
+        monkeypatch.setattr(frame_module, "_load_numpy", lambda: None)
+    else:
+        pytest.importorskip("numpy")
+    return str(request.param)
+
+
+class TestForecastFrame:
+    """Tests for packing forecasts into columns and aggregating them."""
+
+    def test_to_columns(self) -> None:
+        """Test that hourly and daily fields become aligned float arrays."""
+        response = WeatherResponse.parse_obj(_MOCK_DATA["json"])
+
+        frame = response.to_columns()
+
+        assert len(frame) == 1
+        assert frame.sources == ["MockCity"]
+        assert list(frame.hourly["tempC"]) == [10.0]
+        assert list(frame.hourly["hour"]) == [0.0]
+        assert list(frame.hourly["day"]) == [0.0]
+        assert frame.daily["date"][0] == date(2025, 4, 13).toordinal()
+        assert frame.daily["moon_illumination"][0] == 75.0
+        assert set(HOURLY_COLUMNS) <= set(frame.hourly)
+
+    def test_typed_models_give_the_same_columns(self) -> None:
+        """Test that typed and string models produce identical frames."""
+        plain = WeatherResponse.parse_obj(_MOCK_DATA["json"]).to_columns()
+        typed = TypedWeatherResponse.parse_obj(_MOCK_DATA["json"]).to_columns()
+
+        # Compare bytes, since NaN != NaN
+        for table in ("hourly", "daily"):
+            typed_columns = getattr(typed, table)
+            plain_columns = getattr(plain, table)
+            assert typed_columns.keys() == plain_columns.keys()
+            for name, column in plain_columns.items():
+                assert typed_columns[name].tobytes() == column.tobytes(), name
+
+    def test_missing_values_are_nan(self, engine: str) -> None:
+        """Test that blank values are stored as NaN and skipped by aggregates."""
+        frame = _response("Gaps", ["10", "", "14"]).to_columns()
+
+        assert list(frame.hourly["hour"]) == [0.0, 3.0, 6.0]
+
+        assert math.isnan(frame.hourly["tempC"][1])
+        assert math.isnan(frame.hourly["humidity"][0])
+        assert frame.min("tempC") == 10.0
+        assert frame.max("tempC") == 14.0
+        assert frame.mean("tempC") == 12.0
+        assert math.isnan(frame.mean("humidity"))
+
+    def test_mask(self, engine: str) -> None:
+        """Test threshold masks over a column."""
+        frame = _response("Mask", ["10", "20", "", "30"]).to_columns()
+
+        assert frame.mask("tempC", ">=", 20) == [False, True, False, True]
+        assert frame.mask("tempC", "!=", 20) == [True, False, True, True]
+        with pytest.raises(ValueError):
+            frame.mask("tempC", "~", 20)
+
+    def test_stack(self, engine: str) -> None:
+        """Test that frames for several cities stack into one."""
+        frames = [
+            _response("Perth", ["20", "30"]).to_columns(),
+            _response("Oslo", ["-5", "1", "3"]).to_columns(),
+        ]
+
+        stacked = ForecastFrame.stack(frames)
+
+        assert len(stacked) == 5
+        assert stacked.sources == ["Perth", "Oslo"]
+        assert list(stacked.hourly["source"]) == [0, 0, 1, 1, 1]
+        assert list(stacked.hourly["day"]) == [0, 0, 1, 1, 1]
+        assert list(stacked.daily["maxtempC"]) == [30.0, 3.0]
+        assert stacked.min("tempC") == -5.0
+        assert stacked.max("maxtempC", table="daily") == 30.0
+        assert len(ForecastFrame.stack([])) == 0
+
+    def test_to_numpy(self) -> None:
+        """Test that to_numpy copies, so the frame can still grow."""
+        numpy = pytest.importorskip("numpy")
+        frame = _response("NumPy", ["1", "2"]).to_columns()
+
+        columns = frame.to_numpy()
+        frame.column("tempC").append(3.0)
+
+        assert isinstance(columns["tempC"], numpy.ndarray)
+        assert columns["tempC"].dtype == numpy.float64
+        assert columns["tempC"].tolist() == [1.0, 2.0]
+
+    def test_to_numpy_without_copy(self) -> None:
+        """Test that to_numpy(copy=False) shares memory and freezes the columns."""
+        pytest.importorskip("numpy")
+        frame = _response("NumPy", ["1", "2"]).to_columns()
+
+        columns = frame.to_numpy(copy=False)
+        frame.column("tempC")[0] = 5.0
+
+        assert columns["tempC"].tolist() == [5.0, 2.0]
+        with pytest.raises(BufferError):
+            frame.column("tempC").append(3.0)
+        del columns
+        frame.column("tempC").append(3.0)
+
+    def test_to_numpy_without_numpy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that to_numpy explains how to install NumPy when it's missing."""
+        monkeypatch.setattr(frame_module, "_load_numpy", lambda: None)
+        frame = _response("NoNumPy", ["1"]).to_columns()
+
+        with pytest.raises(ImportError, match="numpy"):
+            frame.to_numpy()
+
+    def test_unknown_table(self) -> None:
+        """Test that an unknown table name raises KeyError."""
+        frame = _response("Table", ["1"]).to_columns()
+
+        with pytest.raises(KeyError):
+            frame.min("tempC", table="weekly")
@@ -0,0 +1,69 @@
+"""
+Tests for the lazy top-level package of fetch-my-weather.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import fetch_my_weather
+
+
+class TestLazyImports:
+    """Tests for loading the public API on first access."""
+
+    def test_import_loads_no_dependencies(self) -> None:
+        """Test that importing the package doesn't import requests or pydantic."""
+        code = (
+            "import sys, fetch_my_weather\n"
+            "heavy = ['requests', 'pydantic', 'numpy', 'fetch_my_weather.core']\n"
+            "print([name for name in heavy if name in sys.modules])"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+
+        assert output.strip() == "[]"
+
+    def test_sync_use_loads_no_asyncio(self) -> None:
+        """Test that the synchronous API doesn't import asyncio."""
+        code = (
+            "import sys, fetch_my_weather.core\n"
+            "loaded = ['asyncio' in sys.modules]\n"
+            "fetch_my_weather.get_weather(use_mock=True)\n"
+            "loaded.append('asyncio' in sys.modules)\n"
+            "print(loaded)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+
+        assert output.strip() == "[False, False]"
+
+    def test_mock_mode_needs_no_requests(self) -> None:
+        """Test that requests is only imported once a transport is created."""
+        code = (
+            "import sys, fetch_my_weather\n"
+            "fetch_my_weather.get_weather(use_mock=True)\n"
+            "print('requests' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+
+        assert output.strip() == "False"
+
+    def test_every_public_name_resolves(self) -> None:
+        """Test that every name in __all__ can be loaded and is listed by dir()."""
+        from fetch_my_weather.core import get_weather
+
+        for name in fetch_my_weather.__all__:
+            assert getattr(fetch_my_weather, name) is not None
+        assert fetch_my_weather.get_weather is get_weather
+        assert set(fetch_my_weather.__all__) <= set(dir(fetch_my_weather))
+
+    def test_unknown_attribute(self) -> None:
+        """Test that unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            _ = fetch_my_weather.no_such_function  # type: ignore[attr-defined]
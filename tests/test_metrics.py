@@ -0,0 +1,173 @@
+"""
+Tests for the metrics hooks of fetch-my-weather.
+"""
+
+import asyncio
+import json
+
+import requests
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.core import WeatherClient, get_stats, set_metrics
+from fetch_my_weather.metrics import Histogram, InMemoryMetrics, Metrics, to_prometheus
+
+
+def _counter(stats: dict, name: str, **labels: str) -> float:
+    """Reads one counter sample from a snapshot, 0 if missing."""
+    for sample in stats["counters"].get(name, []):
+        if sample["labels"] == labels:
+            return float(sample["value"])
+    return 0
+
+
+class TestHistogram:
+    """Tests for the fixed-bucket histogram."""
+
+    def test_buckets_are_cumulative(self) -> None:
+        """Test that values land in the smallest bucket that fits them."""
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["buckets"] == [[0.1, 2], [1.0, 3], ["+Inf", 4]]
+        assert snapshot["count"] == 4
+        assert abs(snapshot["sum"] - 2.65) < 1e-9
+
+
+class TestClientMetrics:
+    """Tests for the events a WeatherClient reports."""
+
+    def test_default_collects_nothing(self) -> None:
+        """Test that clients report to a no-op Metrics by default."""
+        stats = WeatherClient(use_mock=True).get_stats()
+
+        assert stats["counters"] == {} and stats["histograms"] == {}
+        assert "hits" in stats["cache"]
+
+    def test_cache_and_upstream(self, mocker: MockerFixture) -> None:
+        """Test cache hit/miss and upstream status counters and latency."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps(core._MOCK_DATA["json"])
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        client = WeatherClient(metrics=InMemoryMetrics())
+
+        client.get_weather("London")
+        client.get_weather("London")
+        stats = client.get_stats()
+
+        assert _counter(stats, "cache_misses_total", format="json") == 1
+        assert _counter(stats, "cache_hits_total", format="json") == 1
+        assert (
+            _counter(stats, "upstream_requests_total", format="json", status="200") == 1
+        )
+        (requests_histogram,) = stats["histograms"]["request_duration_seconds"]
+        assert requests_histogram["labels"] == {"format": "json"}
+        assert requests_histogram["count"] == 2
+        assert stats["histograms"]["upstream_duration_seconds"][0]["count"] == 1
+
+    def test_errors_and_fallbacks(self, mocker: MockerFixture) -> None:
+        """Test that failed requests and mock fallbacks are counted by type."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 503
+        mock_response.text = "Service Unavailable"
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+        client = WeatherClient(metrics=InMemoryMetrics(), cache_duration=0)
+
+        client.get_weather("London", with_metadata=True)
+        mock_get.side_effect = requests.exceptions.Timeout("timed out")
+        client.get_weather("Paris", format="text", with_metadata=True)
+        stats = client.get_stats()
+
+        assert (
+            _counter(stats, "upstream_requests_total", format="json", status="503") == 1
+        )
+        assert (
+            _counter(
+                stats, "upstream_errors_total", format="text", error_type="Timeout"
+            )
+            == 1
+        )
+        assert _counter(stats, "fallbacks_total", error_type="HTTPError") == 1
+        assert _counter(stats, "fallbacks_total", error_type="Timeout") == 1
+
+    def test_mock_mode_is_not_a_fallback(self) -> None:
+        """Test that mock mode isn't counted as a fallback."""
+        client = WeatherClient(use_mock=True, metrics=InMemoryMetrics())
+
+        client.get_weather("London", with_metadata=True)
+        client.get_weather("London", fields=["temperature"])
+        stats = client.get_stats()
+
+        assert "fallbacks_total" not in stats["counters"]
+        formats = {
+            sample["labels"]["format"]
+            for sample in stats["histograms"]["request_duration_seconds"]
+        }
+        assert formats == {"json", "fields"}
+
+    def test_async_requests(self, mocker: MockerFixture) -> None:
+        """Test that async requests report to the client's metrics."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "Sunny"
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        client = WeatherClient(metrics=InMemoryMetrics())
+
+        async def fetch() -> None:
+            async with AsyncWeatherClient(client=client) as async_client:
+                await async_client.get_weather("London", format="text")
+
+        asyncio.run(fetch())
+        stats = client.get_stats()
+
+        assert _counter(stats, "cache_misses_total", format="text") == 1
+        assert stats["histograms"]["request_duration_seconds"][0]["count"] == 1
+
+    def test_set_metrics(self) -> None:
+        """Test that set_metrics swaps the default client's metrics."""
+        metrics = InMemoryMetrics()
+        previous = set_metrics(metrics)
+        try:
+            core.get_weather("London", use_mock=True)
+            assert get_stats()["histograms"]["request_duration_seconds"]
+        finally:
+            assert set_metrics(previous) is metrics
+        assert isinstance(previous, Metrics)
+
+
+class TestPrometheus:
+    """Tests for the Prometheus text export."""
+
+    def test_format(self) -> None:
+        """Test counter, histogram and cache lines."""
+        metrics = InMemoryMetrics(buckets=(0.5,))
+        metrics.cache_hit("json", stale=False)
+        metrics.upstream_response("text", 200, 0.25)
+        metrics.increment("custom_total", (("name", 'a "b"'),))
+
+        text = to_prometheus({"cache": {"entries": 3}, **metrics.snapshot()})
+        lines = text.splitlines()
+
+        assert text.endswith("\n")
+        assert "# TYPE fetch_my_weather_cache_entries gauge" in lines
+        assert "fetch_my_weather_cache_entries 3" in lines
+        assert "# TYPE fetch_my_weather_cache_hits_total counter" in lines
+        assert 'fetch_my_weather_cache_hits_total{format="json"} 1' in lines
+        assert 'fetch_my_weather_custom_total{name="a \\"b\\""} 1' in lines
+        assert "# TYPE fetch_my_weather_upstream_duration_seconds histogram" in lines
+        assert (
+            'fetch_my_weather_upstream_duration_seconds_bucket{format="text",le="0.5"} 1'
+            in lines
+        )
+        assert (
+            'fetch_my_weather_upstream_duration_seconds_bucket{format="text",le="+Inf"} 1'
+            in lines
+        )
+        assert (
+            'fetch_my_weather_upstream_duration_seconds_count{format="text"} 1' in lines
+        )
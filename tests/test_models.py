@@ -0,0 +1,307 @@
+"""
+Tests for the typed models of the fetch-my-weather package.
+"""
+
+import json
+import pickle
+from datetime import date, datetime, time
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core
+from fetch_my_weather.batch import get_weather_many
+from fetch_my_weather.core import (
+    _MOCK_DATA,
+    WeatherClient,
+    get_weather,
+    set_lazy_models,
+    set_trusted_models,
+)
+from fetch_my_weather.models import (
+    HourlyForecast,
+    LazyDailyForecast,
+    LazyTypedWeatherResponse,
+    LazyWeatherResponse,
+    ResponseWrapper,
+    TypedWeatherResponse,
+    WeatherResponse,
+    construct_trusted,
+)
+from fetch_my_weather.sqlite_cache import SQLiteCache
+
+
+class TestTypedModels:
+    """Tests for parsing wttr.in strings into typed values."""
+
+    def test_numbers_dates_and_times(self) -> None:
+        """Test that numeric, date and time fields are parsed."""
+        model = TypedWeatherResponse.parse_obj(_MOCK_DATA["json"])
+
+        current = model.current_condition[0]
+        assert current.temp_C == 17
+        assert current.precipMM == 0.0
+        assert current.pressureInches == 30.0
+        day = model.weather[0]
+        assert day.date == date(2025, 4, 13)
+        assert day.sunHour == 10.5
+        assert day.hourly[0].time == time(0, 0)
+        assert day.hourly[0].tempC == 10
+        assert day.astronomy[0].sunset == time(19, 59)
+        assert day.astronomy[0].moon_illumination == 75
+        assert model.nearest_area[0].latitude == 51.517
+
+    def test_observation_times(self) -> None:
+        """Test that localObsDateTime and observation_time are parsed."""
+        model = TypedWeatherResponse.parse_obj(
+            {
+                "current_condition": [
+                    {
+                        "localObsDateTime": "2025-04-13 10:24 PM",
+                        "observation_time": "09:24 AM",
+                    }
+                ],
+                "weather": [{"hourly": [{"time": "2100"}]}],
+            }
+        )
+
+        current = model.current_condition[0]
+        assert current.localObsDateTime == datetime(2025, 4, 13, 22, 24)
+        assert current.observation_time == time(9, 24)
+        assert model.weather[0].hourly[0].time == time(21, 0)
+
+    def test_missing_values_become_none(self) -> None:
+        """Test that blank values and "No moonrise" are parsed as None."""
+        model = TypedWeatherResponse.parse_obj(
+            {
+                "current_condition": [{"temp_C": "", "humidity": " "}],
+                "weather": [{"astronomy": [{"moonrise": "No moonrise"}]}],
+            }
+        )
+
+        assert model.current_condition[0].temp_C is None
+        assert model.current_condition[0].humidity is None
+        assert model.weather[0].astronomy[0].moonrise is None
+
+
+class TestTypedRequests:
+    """Tests for selecting typed models per call and per client."""
+
+    def _mock_json(self, mocker: MockerFixture) -> object:
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps(
+            {"current_condition": [{"temp_C": "21", "precipMM": "0.4"}]}
+        )
+        return mocker.patch("requests.Session.get", return_value=mock_response)
+
+    def test_typed_per_call(self, mocker: MockerFixture) -> None:
+        """Test that typed and string models are served from one cache entry."""
+        mock_get = self._mock_json(mocker)
+
+        typed = get_weather(location="Typed", typed=True)
+        plain = get_weather(location="Typed")
+
+        assert isinstance(typed, TypedWeatherResponse)
+        assert typed.current_condition[0].temp_C == 21
+        assert typed.current_condition[0].precipMM == 0.4
+        assert isinstance(plain, WeatherResponse)
+        assert not isinstance(plain, TypedWeatherResponse)
+        assert plain.current_condition[0].temp_C == "21"
+        assert mock_get.call_count == 1
+
+    def test_typed_per_client(self, mocker: MockerFixture) -> None:
+        """Test that a client can return typed models by default."""
+        self._mock_json(mocker)
+        client = WeatherClient(typed=True)
+
+        result = client.get_weather(location="TypedClient", with_metadata=True)
+        plain = client.get_weather(location="TypedClient", typed=False)
+
+        assert isinstance(result, ResponseWrapper)
+        assert isinstance(result.data, TypedWeatherResponse)
+        assert result.metadata.is_real_data
+        assert not isinstance(plain, TypedWeatherResponse)
+        assert isinstance(get_weather(location="TypedClient"), WeatherResponse)
+
+    def test_typed_mock_data(self) -> None:
+        """Test that mock mode honours the typed setting."""
+        result = get_weather(location="Anywhere", use_mock=True, typed=True)
+
+        assert isinstance(result, TypedWeatherResponse)
+        assert result.current_condition[0].temp_C == 17
+
+    def test_batch_keeps_typed_items_apart(self, mocker: MockerFixture) -> None:
+        """Test that typed and string items in a batch are not merged."""
+        self._mock_json(mocker)
+
+        results = get_weather_many(
+            [{"location": "Mixed", "typed": True}, {"location": "Mixed"}]
+        )
+
+        assert isinstance(results[0].data, TypedWeatherResponse)
+        assert not isinstance(results[1].data, TypedWeatherResponse)
+
+
+class TestTrustedConstruction:
+    """Tests for building models from already validated data."""
+
+    def test_matches_validated_model(self) -> None:
+        """Test that trusted construction builds the same model as parse_obj."""
+        data = dict(_MOCK_DATA["json"], unknown_key="dropped")
+
+        trusted = construct_trusted(WeatherResponse, data)
+        validated = WeatherResponse.parse_obj(data)
+
+        assert trusted == validated
+        assert trusted.dict() == validated.dict()
+        assert isinstance(trusted.weather[0].hourly[0], HourlyForecast)
+        assert trusted.metadata == validated.metadata
+
+    def test_typed_models_still_convert(self) -> None:
+        """Test that typed models are converted even when trusted."""
+        model = construct_trusted(TypedWeatherResponse, _MOCK_DATA["json"])
+
+        assert model.current_condition[0].temp_C == 17
+
+    def test_trusted_mock_data(self, mocker: MockerFixture) -> None:
+        """Test that trusted mock models skip the copy but share nothing."""
+        client = WeatherClient(use_mock=True, trusted=True)
+        copy_json = mocker.spy(core, "copy_json")
+
+        first = client.get_weather(location="A")
+        assert isinstance(first, WeatherResponse)
+        first.current_condition[0].temp_C = "999"
+        first.weather.clear()
+        second = client.get_weather(location="B", with_metadata=True)
+
+        assert isinstance(second, ResponseWrapper)
+        assert copy_json.call_count == 0
+        assert second.data.current_condition[0].temp_C == "17"
+        assert len(second.data.weather) == len(_MOCK_DATA["json"]["weather"])
+        first = client.get_weather(location="A")
+        assert isinstance(first, WeatherResponse)
+        validated = get_weather(location="A", use_mock=True)
+        assert isinstance(validated, WeatherResponse)
+        assert first.weather == validated.weather
+        assert first.current_condition == validated.current_condition
+        assert first.metadata.is_mock and second.metadata.is_mock
+
+    def test_trusted_cache_hits(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Test that trusted cache hits equal validated ones, per model class."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps(_MOCK_DATA["json"])
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+        cache = SQLiteCache(tmp_path / "trusted.db")
+        fetched = WeatherClient(cache=cache).get_weather(location="Trust")
+
+        client = WeatherClient(cache=cache, trusted=True)
+        hit = client.get_weather(location="Trust", with_metadata=True)
+        typed_hit = client.get_weather(location="Trust", typed=True)
+
+        assert mock_get.call_count == 1
+        assert isinstance(hit, ResponseWrapper)
+        assert hit.metadata.is_cached
+        assert hit.data.current_condition == fetched.current_condition  # type: ignore[union-attr]
+        assert isinstance(typed_hit, TypedWeatherResponse)
+        assert typed_hit.current_condition[0].temp_C == 17
+
+    def test_set_trusted_models(self) -> None:
+        """Test the module-level switch."""
+        assert set_trusted_models(True) is True
+        assert set_trusted_models(False) is False
+
+
+class TestLazyModels:
+    """Tests for models that validate their forecast sections on access."""
+
+    def test_sections_are_built_on_first_access(self) -> None:
+        """Test that forecast sections stay raw until they are read."""
+        model = LazyWeatherResponse.parse_obj(_MOCK_DATA["json"])
+
+        assert model.current_condition[0].temp_C == "17"
+        assert "weather" not in model.__dict__
+        assert "nearest_area" not in model.__dict__
+
+        day = model.weather[0]
+        assert isinstance(day, LazyDailyForecast)
+        assert "hourly" not in day.__dict__
+        assert day.hourly[0].tempC == "10"
+        assert isinstance(day.hourly[0], HourlyForecast)
+        assert model.weather is model.weather
+
+    def test_same_surface_as_weather_response(self) -> None:
+        """Test that a lazy model serializes like the eager one."""
+        lazy = LazyWeatherResponse.parse_obj(_MOCK_DATA["json"])
+        eager = WeatherResponse.parse_obj(_MOCK_DATA["json"])
+
+        assert isinstance(lazy, WeatherResponse)
+        assert lazy.dict() == eager.dict()
+        assert json.loads(lazy.json()) == json.loads(eager.json())
+        assert LazyWeatherResponse.parse_obj({}).weather == []
+
+    def test_copies_share_validated_sections(self) -> None:
+        """Test that shallow copies validate each section only once."""
+        original = LazyWeatherResponse.parse_obj(_MOCK_DATA["json"])
+        first = original.copy()
+        second = original.copy()
+
+        assert first.weather is second.weather
+        assert "weather" not in original.__dict__
+        assert original.copy(deep=True).weather[0].date == "2025-04-13"
+
+    def test_pickle_round_trip(self) -> None:
+        """Test that pickling materializes and restores every section."""
+        model = pickle.loads(
+            pickle.dumps(LazyWeatherResponse.parse_obj(_MOCK_DATA["json"]))
+        )
+
+        assert model.weather[0].astronomy[0].sunset == "07:59 PM"
+
+    def test_invalid_section_raises_on_access(self) -> None:
+        """Test that a malformed section raises ValidationError when read."""
+        model = LazyWeatherResponse.parse_obj(
+            {"current_condition": [{"temp_C": "5"}], "weather": "broken"}
+        )
+
+        assert model.current_condition[0].temp_C == "5"
+        with pytest.raises(ValidationError):
+            _ = model.weather
+
+    def test_lazy_typed(self) -> None:
+        """Test that lazy typed models still convert values."""
+        model = LazyTypedWeatherResponse.parse_obj(_MOCK_DATA["json"])
+
+        assert isinstance(model, TypedWeatherResponse)
+        assert model.weather[0].hourly[0].tempC == 10
+
+    def test_get_weather_lazy(self, mocker: MockerFixture) -> None:
+        """Test lazy models from the network, the cache and mock mode."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps(_MOCK_DATA["json"])
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        fetched = get_weather(location="Lazy", lazy=True)
+        cached = get_weather(location="Lazy", lazy=True, with_metadata=True)
+        eager = get_weather(location="Lazy")
+        mock = WeatherClient(use_mock=True, lazy=True).get_weather(location="Lazy")
+
+        assert mock_get.call_count == 1
+        assert isinstance(fetched, LazyWeatherResponse)
+        assert isinstance(cached, ResponseWrapper)
+        assert isinstance(cached.data, LazyWeatherResponse)
+        assert cached.metadata.is_cached
+        assert not isinstance(eager, LazyWeatherResponse)
+        assert isinstance(mock, LazyWeatherResponse)
+        assert mock.metadata.is_mock
+        assert fetched.weather[0].maxtempC == "18"
+
+    def test_set_lazy_models(self) -> None:
+        """Test the module-level switch."""
+        assert set_lazy_models(True) is True
+        assert isinstance(get_weather(use_mock=True), LazyWeatherResponse)
+        assert set_lazy_models(False) is False
@@ -0,0 +1,234 @@
+"""
+Tests for client-side rate limiting.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.core import WeatherClient, set_rate_limiter
+from fetch_my_weather.metrics import InMemoryMetrics
+from fetch_my_weather.ratelimit import FileTokenBucket, TokenBucket
+
+
+def _take_tokens(
+    path: str, attempts: int, results: "multiprocessing.Queue[int]"
+) -> None:
+    """Takes tokens from a shared bucket in a child process."""
+    bucket = FileTokenBucket(path, rate=0.001, burst=10)
+    results.put(sum(bucket.try_acquire() == 0.0 for _ in range(attempts)))
+
+
+def _mock_get(mocker: MockerFixture) -> object:
+    """Patches the HTTP session to answer every request with "Sunny"."""
+    mock_response = mocker.Mock()
+    mock_response.status_code = 200
+    mock_response.text = "Sunny"
+    return mocker.patch("requests.Session.get", return_value=mock_response)
+
+
+class TestTokenBucket:
+    """Tests for the in-process token bucket."""
+
+    def test_burst_and_refill(self, mocker: MockerFixture) -> None:
+        """Test that a full bucket allows a burst and then refills at the rate."""
+        clock = mocker.patch("fetch_my_weather.ratelimit.time.monotonic")
+        clock.return_value = 100.0
+        bucket = TokenBucket(rate=2, burst=3)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+        clock.return_value = 100.25
+        assert bucket.try_acquire() == pytest.approx(0.25)
+        clock.return_value = 100.5
+        assert bucket.try_acquire() == 0.0
+
+        clock.return_value = 200.0  # Refills up to burst only
+        assert [bucket.try_acquire() for _ in range(4)].count(0.0) == 3
+
+    def test_threads_share_budget(self) -> None:
+        """Test that concurrent callers never get more tokens than the burst."""
+        bucket = TokenBucket(rate=0.001, burst=100)
+        granted = []
+
+        def worker() -> None:
+            granted.append(sum(bucket.try_acquire() == 0.0 for _ in range(50)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(granted) == 100
+
+    def test_acquire(self) -> None:
+        """Test that acquire waits for a token and gives up after the timeout."""
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.perf_counter()
+
+        assert bucket.acquire()
+        assert bucket.acquire()
+        assert time.perf_counter() - start >= 0.015
+        empty = TokenBucket(rate=0.01)
+        empty.try_acquire()
+        assert not empty.acquire(timeout=0.01)
+
+    def test_acquire_async(self) -> None:
+        """Test that acquire_async waits on the event loop."""
+        bucket = TokenBucket(rate=50, burst=1)
+
+        async def take() -> list[bool]:
+            return list(
+                await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+            )
+
+        start = time.perf_counter()
+        assert asyncio.run(take()) == [True, True, True]
+        assert time.perf_counter() - start >= 0.035
+
+    def test_invalid(self) -> None:
+        """Test that impossible buckets are rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestFileTokenBucket:
+    """Tests for the bucket shared through a file."""
+
+    def test_instances_share_budget(self, tmp_path: Path) -> None:
+        """Test that two buckets on one file draw from the same tokens."""
+        path = tmp_path / "bucket"
+        first = FileTokenBucket(path, rate=0.001, burst=3)
+        second = FileTokenBucket(path, rate=0.001, burst=3)
+
+        assert first.try_acquire() == 0.0
+        assert second.try_acquire() == 0.0
+        assert first.try_acquire() == 0.0
+        assert second.try_acquire() > 0
+        assert first.wait_time() > 0
+
+    @pytest.mark.skipif(os.name != "posix", reason="Uses fork")
+    def test_processes_share_budget(self, tmp_path: Path) -> None:
+        """Test that processes never get more tokens than the burst."""
+        path = str(tmp_path / "bucket")
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [
+            context.Process(target=_take_tokens, args=(path, 10, results))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        granted = [results.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join()
+
+        assert sum(granted) == 10
+
+
+class TestClientRateLimit:
+    """Tests for rate limiting WeatherClient requests."""
+
+    def test_block(self, mocker: MockerFixture) -> None:
+        """Test that requests wait for tokens by default."""
+        mock_get = _mock_get(mocker)
+        metrics = InMemoryMetrics()
+        client = WeatherClient(
+            cache_duration=0, rate_limiter=TokenBucket(rate=20), metrics=metrics
+        )
+        start = time.perf_counter()
+
+        for _ in range(3):
+            response = client.get_weather("London", format="text", with_metadata=True)
+
+        assert time.perf_counter() - start >= 0.09
+        assert mock_get.call_count == 3
+        assert response.metadata.timings.throttle_ms > 0
+        waited = metrics.snapshot()["counters"]["rate_limited_total"]
+        assert waited[0]["labels"] == {"format": "text", "outcome": "waited"}
+
+    def test_fail(self, mocker: MockerFixture) -> None:
+        """Test that "fail" returns an error without sending a request."""
+        mock_get = _mock_get(mocker)
+        client = WeatherClient(
+            cache_duration=0,
+            rate_limiter=TokenBucket(rate=0.01),
+            on_rate_limit="fail",
+        )
+
+        client.get_weather("London", format="text")
+        message = client.get_weather("London", format="text")
+        response = client.get_weather("London", with_metadata=True)
+
+        assert mock_get.call_count == 1
+        assert isinstance(message, str) and message.startswith("Error:")
+        assert response.metadata.is_mock
+        assert response.metadata.error_type == "RateLimitError"
+        assert response.metadata.attempts == 0
+
+    def test_cache(self, mocker: MockerFixture) -> None:
+        """Test that "cache" serves stale data at once, and waits without it."""
+        mock_get = _mock_get(mocker)
+        client = WeatherClient(
+            cache_duration=300,
+            rate_limiter=TokenBucket(rate=20),
+            on_rate_limit="cache",
+        )
+        client.set_stale_window(600, while_revalidate=False)
+        client.get_weather("London", format="text")
+        url = core._build_url(location="London", format="text")
+        timestamp, data = client.cache[url]
+        client.cache[url] = (timestamp - 400, data)
+
+        response = client.get_weather("London", format="text", with_metadata=True)
+        fresh = client.get_weather("Paris", format="text", with_metadata=True)
+
+        assert response.metadata.is_stale
+        assert response.metadata.error_type == "RateLimitError"
+        assert response.data == "Sunny"
+        assert fresh.metadata.is_real_data and not fresh.metadata.error_type
+        assert mock_get.call_count == 2
+
+    def test_async(self, mocker: MockerFixture) -> None:
+        """Test that async requests share the client's limiter."""
+        mock_get = _mock_get(mocker)
+        client = WeatherClient(cache_duration=0, rate_limiter=TokenBucket(rate=50))
+
+        async def fetch() -> None:
+            async with AsyncWeatherClient(client=client) as async_client:
+                await asyncio.gather(
+                    *(
+                        async_client.get_weather(f"City{i}", format="text")
+                        for i in range(5)
+                    )
+                )
+
+        start = time.perf_counter()
+        asyncio.run(fetch())
+
+        assert time.perf_counter() - start >= 0.075
+        assert mock_get.call_count == 5
+
+    def test_set_rate_limiter(self) -> None:
+        """Test that set_rate_limiter configures the default client."""
+        limiter = TokenBucket(rate=1)
+        try:
+            assert set_rate_limiter(limiter, on_limit="fail") is None
+            assert core._default_client._rate_limiter is limiter
+            with pytest.raises(ValueError):
+                set_rate_limiter(limiter, on_limit="drop")
+        finally:
+            assert set_rate_limiter(None) is limiter
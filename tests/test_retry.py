@@ -0,0 +1,210 @@
+"""
+Tests for retrying failed requests.
+"""
+
+from email.utils import formatdate
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core
+from fetch_my_weather.core import WeatherClient, set_retry_policy
+from fetch_my_weather.fake_server import FakeWttrServer
+from fetch_my_weather.metrics import InMemoryMetrics
+from fetch_my_weather.retry import (
+    Backoff,
+    RetryPolicy,
+    parse_retry_after,
+    retry_reason,
+)
+
+FAST = Backoff(max_attempts=3, base_delay=0.001, max_delay=0.001)
+
+
+def _response(mocker: MockerFixture, status_code: int, **headers: str) -> object:
+    """Builds a mock HTTP response."""
+    response = mocker.Mock()
+    response.status_code = status_code
+    response.text = "Sunny" if status_code == 200 else "Service Unavailable"
+    response.headers = headers
+    return response
+
+
+class TestRetryPolicy:
+    """Tests for the retry decisions."""
+
+    def test_full_jitter(self) -> None:
+        """Test that delays are drawn below an exponentially growing cap."""
+        backoff = Backoff(max_attempts=10, base_delay=0.5, max_delay=3.0)
+
+        assert backoff.delay(1, lambda: 0.5) == 0.25
+        assert backoff.delay(3, lambda: 0.5) == 1.0
+        assert backoff.delay(6, lambda: 0.5) == 1.5  # Capped at max_delay
+        assert backoff.delay(2, lambda: 0.0) == 0.0
+
+    def test_attempt_limit(self) -> None:
+        """Test that each failure class stops after its own max_attempts."""
+        policy = RetryPolicy(timeout=Backoff(max_attempts=2), server_error=None)
+
+        assert policy.next_delay("timeout", 1, 0.0) is not None
+        assert policy.next_delay("timeout", 2, 0.0) is None
+        assert policy.next_delay("server_error", 1, 0.0) is None
+
+    def test_retry_after_and_deadline(self) -> None:
+        """Test that Retry-After sets the delay unless it passes the deadline."""
+        policy = RetryPolicy(deadline=10)
+
+        assert policy.next_delay("rate_limited", 1, 0.0, retry_after=4) == 4
+        assert policy.next_delay("rate_limited", 1, 7.0, retry_after=4) is None
+        assert policy.next_delay("timeout", 1, 10.0) is None
+
+        ignoring = RetryPolicy(respect_retry_after=False)
+        delay = ignoring.next_delay(
+            "rate_limited", 1, 0.0, retry_after=4, rand=lambda: 0.5
+        )
+        assert delay == 0.5
+
+    def test_invalid_backoff(self) -> None:
+        """Test that impossible schedules are rejected."""
+        with pytest.raises(ValueError):
+            Backoff(max_attempts=0)
+        with pytest.raises(ValueError):
+            Backoff(base_delay=-1)
+
+    def test_retry_reason(self, mocker: MockerFixture) -> None:
+        """Test how failures are classified."""
+        assert retry_reason(error=requests.exceptions.ConnectTimeout()) == "timeout"
+        assert retry_reason(error=requests.exceptions.ReadTimeout()) == "timeout"
+        assert (
+            retry_reason(error=requests.exceptions.ConnectionError())
+            == "connection_error"
+        )
+        assert retry_reason(error=ValueError()) is None
+        assert retry_reason(_response(mocker, 503)) == "rate_limited"
+        assert retry_reason(_response(mocker, 429)) == "rate_limited"
+        assert retry_reason(_response(mocker, 502)) == "server_error"
+        assert retry_reason(_response(mocker, 404)) is None
+        assert retry_reason(_response(mocker, 200)) is None
+
+    def test_parse_retry_after(self) -> None:
+        """Test Retry-After in seconds and as an HTTP date."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(formatdate(0, usegmt=True)) == 0.0
+        future = parse_retry_after(formatdate(2**31, usegmt=True))
+        assert future is not None and future > 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestClientRetries:
+    """Tests for retries in WeatherClient requests."""
+
+    def test_no_retries_by_default(self, mocker: MockerFixture) -> None:
+        """Test that a failure falls back at once without a policy."""
+        mock_get = mocker.patch(
+            "requests.Session.get", return_value=_response(mocker, 500)
+        )
+
+        response = WeatherClient().get_weather(
+            "London", format="text", with_metadata=True
+        )
+
+        assert mock_get.call_count == 1
+        assert response.metadata.attempts == 1
+        assert response.metadata.error_type == "HTTPError"
+
+    def test_retry_after_timeout(self, mocker: MockerFixture) -> None:
+        """Test that a transient timeout is retried and the retry recorded."""
+        mocker.patch(
+            "requests.Session.get",
+            side_effect=[requests.exceptions.Timeout(), _response(mocker, 200)],
+        )
+        sleep = mocker.patch("time.sleep")
+        metrics = InMemoryMetrics()
+        client = WeatherClient(retry=RetryPolicy(timeout=FAST), metrics=metrics)
+
+        response = client.get_weather("London", format="text", with_metadata=True)
+
+        assert response.data == "Sunny"
+        assert response.metadata.is_real_data
+        assert response.metadata.attempts == 2
+        assert sleep.call_count == 1
+        assert response.metadata.backoff_ms == pytest.approx(
+            sleep.call_args[0][0] * 1000
+        )
+        (retries,) = metrics.snapshot()["counters"]["retries_total"]
+        assert retries["labels"] == {"format": "text", "reason": "timeout"}
+
+    def test_retry_after_header(self, mocker: MockerFixture) -> None:
+        """Test that a 503 is retried after its Retry-After delay."""
+        mocker.patch(
+            "requests.Session.get",
+            side_effect=[
+                _response(mocker, 503, **{"Retry-After": "2"}),
+                _response(mocker, 200),
+            ],
+        )
+        sleep = mocker.patch("time.sleep")
+        client = WeatherClient(retry=RetryPolicy())
+
+        response = client.get_weather("London", format="text", with_metadata=True)
+
+        sleep.assert_called_once_with(2.0)
+        assert response.metadata.attempts == 2
+        assert response.metadata.backoff_ms == 2000
+
+    def test_gives_up_past_deadline(self, mocker: MockerFixture) -> None:
+        """Test that a Retry-After beyond the deadline isn't waited for."""
+        mock_get = mocker.patch(
+            "requests.Session.get",
+            return_value=_response(mocker, 503, **{"Retry-After": "120"}),
+        )
+        sleep = mocker.patch("time.sleep")
+        client = WeatherClient(retry=RetryPolicy(deadline=30))
+
+        response = client.get_weather("London", with_metadata=True)
+
+        assert mock_get.call_count == 1
+        sleep.assert_not_called()
+        assert response.metadata.is_mock
+        assert response.metadata.status_code == 503
+
+    def test_exhausted_retries_fall_back(self, mocker: MockerFixture) -> None:
+        """Test that the last error is reported once retries run out."""
+        mock_get = mocker.patch(
+            "requests.Session.get",
+            side_effect=requests.exceptions.ConnectionError("reset"),
+        )
+        mocker.patch("time.sleep")
+        client = WeatherClient(retry=RetryPolicy(connection_error=FAST))
+
+        response = client.get_weather("London", with_metadata=True)
+        message = client.get_weather("Paris", format="text")
+
+        assert mock_get.call_count == 6
+        assert response.metadata.attempts == 3
+        assert response.metadata.error_type == "ConnectionError"
+        assert isinstance(message, str) and message.startswith("Error:")
+
+    def test_fake_server(self) -> None:
+        """Test retries of real 500 responses."""
+        with FakeWttrServer(error_rate=1.0) as fake:
+            client = WeatherClient(
+                base_url=fake.base_url, retry=RetryPolicy(server_error=FAST)
+            )
+            response = client.get_weather("London", with_metadata=True)
+            stats = fake.get_stats()
+
+        assert stats["requests"] == 3
+        assert response.metadata.attempts == 3
+        assert response.metadata.status_code == 500
+
+    def test_set_retry_policy(self) -> None:
+        """Test that set_retry_policy configures the default client."""
+        policy = RetryPolicy()
+        try:
+            assert set_retry_policy(policy) is None
+            assert core._default_client._retry is policy
+        finally:
+            assert set_retry_policy(None) is policy
@@ -0,0 +1,297 @@
+"""
+Tests for request coalescing in the fetch-my-weather package.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.core import get_weather, set_request_coalescing
+from fetch_my_weather.models import ResponseWrapper, WeatherResponse
+from fetch_my_weather.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _slow_response(mocker: MockerFixture, text: str, delay: float = 0.2) -> object:
+    """Returns a fake Session.get that answers after a short delay."""
+
+    def fake_get(*args: object, **kwargs: object) -> object:
+        time.sleep(delay)
+        response = mocker.Mock()
+        response.status_code = 200
+        response.text = text
+        return response
+
+    return fake_get
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight and AsyncSingleFlight primitives."""
+
+    def test_concurrent_calls_share_one_result(self) -> None:
+        """Test that callers with the same key share the leader's call."""
+        flight: SingleFlight[int] = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def work() -> int:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        results: list[tuple[int, bool]] = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", work)))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("k", work)))
+            for _ in range(5)
+        ]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert sorted(results) == [(42, False)] + [(42, True)] * 5
+        assert flight.in_flight() == 0
+
+    def test_exceptions_reach_every_caller(self) -> None:
+        """Test that an exception raised by the leader is raised for waiters too."""
+        flight: SingleFlight[None] = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors: list[BaseException] = []
+
+        def fail() -> None:
+            started.set()
+            release.wait(5)
+            raise ValueError("upstream down")
+
+        def call() -> None:
+            try:
+                flight.do("k", fail)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        assert len(errors) == 2
+        assert flight.in_flight() == 0
+
+    def test_waiter_timeout(self) -> None:
+        """Test that a waiter gives up after its timeout without stopping the leader."""
+        flight: SingleFlight[int] = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def work() -> int:
+            started.set()
+            release.wait(5)
+            return 42
+
+        results: list[tuple[int, bool]] = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", work)))
+        leader.start()
+        started.wait(5)
+        with pytest.raises(TimeoutError):
+            flight.do("k", work, timeout=0.01)
+        release.set()
+        leader.join(5)
+
+        assert results == [(42, False)]
+        assert flight.in_flight() == 0
+
+    def test_async_calls_share_one_result(self) -> None:
+        """Test that tasks with the same key await a single coroutine."""
+        flight: AsyncSingleFlight[str] = AsyncSingleFlight()
+        calls = []
+
+        async def work() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main() -> list[tuple[str, bool]]:
+            return await asyncio.gather(*(flight.do("k", work) for _ in range(10)))
+
+        results = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert sum(shared for _, shared in results) == 9
+        assert all(result == "done" for result, _ in results)
+
+    def test_cancelled_leader_hands_over(self) -> None:
+        """Test that cancelling the leader doesn't cancel the tasks waiting on it."""
+        flight: AsyncSingleFlight[str] = AsyncSingleFlight()
+        calls = []
+
+        async def work() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main() -> tuple[str, bool]:
+            leader = asyncio.ensure_future(flight.do("k", work))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(flight.do("k", work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await waiter
+
+        assert asyncio.run(main()) == ("done", False)
+        assert len(calls) == 2
+        assert flight.in_flight() == 0
+
+
+class TestRequestCoalescing:
+    """Tests for coalescing identical get_weather calls."""
+
+    def test_threads_on_cold_cache_make_one_request(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test that 50 threads asking for the same city cause one HTTP request."""
+        payload = json.dumps({"current_condition": [{"temp_C": "15"}]})
+        mock_get = mocker.patch(
+            "requests.Session.get", side_effect=_slow_response(mocker, payload)
+        )
+        results: list[object] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            result = get_weather(location="Busy City")
+            with lock:
+                results.append(result)
+
+        threads = [threading.Thread(target=worker) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert mock_get.call_count == 1
+        assert len(results) == 50
+        assert all(isinstance(r, WeatherResponse) for r in results)
+        # Every caller gets its own model
+        assert len({id(r) for r in results}) == 50
+
+    def test_asyncio_gather_makes_one_request(self, mocker: MockerFixture) -> None:
+        """Test that concurrent async lookups for one city cause one HTTP request."""
+        mock_get = mocker.patch(
+            "requests.Session.get",
+            side_effect=_slow_response(mocker, "Sunny", delay=0.1),
+        )
+
+        async def main() -> list[object]:
+            async with AsyncWeatherClient(max_concurrency=4) as client:
+                return await asyncio.gather(
+                    *(
+                        client.get_weather(
+                            location="Async City", format="text", with_metadata=True
+                        )
+                        for _ in range(20)
+                    )
+                )
+
+        results = asyncio.run(main())
+
+        assert mock_get.call_count == 1
+        assert all(isinstance(r, ResponseWrapper) for r in results)
+        assert all(r.data == "Sunny" for r in results)  # type: ignore[union-attr]
+
+    def test_errors_are_shared_with_waiters(self, mocker: MockerFixture) -> None:
+        """Test that waiters get the leader's error result, not a second request."""
+
+        def fake_get(*args: object, **kwargs: object) -> object:
+            time.sleep(0.2)
+            response = mocker.Mock()
+            response.status_code = 503
+            return response
+
+        mock_get = mocker.patch("requests.Session.get", side_effect=fake_get)
+        results: list[object] = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    get_weather(location="Down", format="text")
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert mock_get.call_count == 1
+        assert len(results) == 5
+        assert all(str(r).startswith("Error fetching data") for r in results)
+
+    @pytest.fixture
+    def no_coalescing(self) -> Iterator[None]:
+        """Disable coalescing for one test."""
+        set_request_coalescing(False)
+        yield
+        set_request_coalescing(True)
+
+    def test_can_be_disabled(self, mocker: MockerFixture, no_coalescing: None) -> None:
+        """Test that every caller fetches when coalescing is turned off."""
+        mock_get = mocker.patch(
+            "requests.Session.get",
+            side_effect=_slow_response(mocker, "Rain", delay=0.2),
+        )
+
+        threads = [
+            threading.Thread(
+                target=get_weather, kwargs={"location": "X", "format": "text"}
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert mock_get.call_count == 3
+
+    def test_cancelled_leader_async_client(self, mocker: MockerFixture) -> None:
+        """Test that a waiting async_get_weather call gets a result, not an error."""
+        mock_get = mocker.patch(
+            "requests.Session.get", side_effect=_slow_response(mocker, "Sunny", 0.05)
+        )
+
+        async def main() -> object:
+            async with AsyncWeatherClient() as client:
+                leader = asyncio.ensure_future(
+                    client.get_weather("Cancel City", format="text")
+                )
+                await asyncio.sleep(0.01)
+                waiter = asyncio.ensure_future(
+                    client.get_weather("Cancel City", format="text")
+                )
+                await asyncio.sleep(0.01)
+                leader.cancel()
+                return await waiter
+
+        assert asyncio.run(main()) == "Sunny"
+        assert mock_get.call_count == 1  # The new leader joins the running fetch
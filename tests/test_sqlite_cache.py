@@ -0,0 +1,234 @@
+"""
+Tests for the SQLite cache backend of the fetch-my-weather package.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fetch_my_weather.cache import CachedJSON
+from fetch_my_weather.core import get_weather, set_cache_backend
+from fetch_my_weather.models import (
+    LazyWeatherResponse,
+    ResponseWrapper,
+    TypedWeatherResponse,
+    WeatherResponse,
+)
+from fetch_my_weather.sqlite_cache import SQLiteCache
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path: Path) -> Iterator[SQLiteCache]:
+    """Provide a SQLite cache in a temporary directory."""
+    cache = SQLiteCache(tmp_path / "cache.db")
+    yield cache
+    cache.close()
+
+
+class TestSQLiteCache:
+    """Tests for the SQLiteCache class."""
+
+    def test_wal_mode(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that the database is opened in WAL mode."""
+        (mode,) = sqlite_cache._connection().execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_values_keep_their_type(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that str, bytes, dict and JSON entries round-trip."""
+        sqlite_cache.put("text", "hello")
+        sqlite_cache.put("png", b"\x89PNG")
+        sqlite_cache.put("dict", {"a": [1, 2]})
+        sqlite_cache.put("json", CachedJSON('{"request": []}', {"request": []}))
+
+        assert sqlite_cache["text"][1] == "hello"
+        assert sqlite_cache["png"][1] == b"\x89PNG"
+        assert sqlite_cache["dict"][1] == {"a": [1, 2]}
+        entry = sqlite_cache["json"][1]
+        assert isinstance(entry, CachedJSON)
+        assert entry.as_dict() == {"request": []}
+
+    def test_models_keep_their_class(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that models come back as the class they were stored as."""
+        data = {"current_condition": [{"temp_C": "12"}], "weather": []}
+        sqlite_cache.put("plain", WeatherResponse.parse_obj(data))
+        sqlite_cache.put("lazy", LazyWeatherResponse.parse_obj(data))
+
+        plain = sqlite_cache["plain"][1]
+        lazy = sqlite_cache["lazy"][1]
+
+        assert type(plain) is WeatherResponse
+        assert type(lazy) is LazyWeatherResponse
+        assert lazy.current_condition[0].temp_C == "12"
+        with pytest.raises(TypeError):
+            sqlite_cache.put("typed", TypedWeatherResponse.parse_obj(data))
+
+    def test_expiry(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that expired entries are misses and get purged."""
+        sqlite_cache.put("new", "y", ttl=10)  # Runs the periodic purge
+        sqlite_cache.put("old", "x", timestamp=time.time() - 100, ttl=10)
+
+        assert sqlite_cache.get("old") is None
+        assert sqlite_cache.get("new", max_age=0) is None
+        assert sqlite_cache.purge_expired() == 1
+        assert len(sqlite_cache) == 1
+
+    def test_entry_limit_evicts_oldest(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that the oldest entries are evicted first."""
+        sqlite_cache.set_limits(max_entries=2)
+        now = time.time()
+        for i in range(3):
+            sqlite_cache.put(str(i), "x", timestamp=now + i)
+
+        assert "0" not in sqlite_cache
+        assert len(sqlite_cache) == 2
+
+    def test_byte_limit_evicts_oldest(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that the byte limit keeps the newest entries that fit."""
+        sqlite_cache.set_limits(max_bytes=10)
+        now = time.time()
+        for i in range(3):
+            sqlite_cache.put(str(i), "abcd", timestamp=now + i)
+        sqlite_cache.put("2", "ab", timestamp=now + 2)  # Replacing updates the total
+
+        assert "0" not in sqlite_cache
+        assert sqlite_cache.stats()["bytes"] == 6
+        sqlite_cache.delete("1")
+        (total,) = (
+            sqlite_cache._connection()
+            .execute("SELECT COALESCE(SUM(size), 0) FROM cache")
+            .fetchone()
+        )
+        assert sqlite_cache.stats()["bytes"] == total == 2
+
+    def test_byte_limit_with_two_writers(self, tmp_path: Path) -> None:
+        """Test that writers sharing one file (as in two processes) keep the limit."""
+        caches = [SQLiteCache(tmp_path / "shared.db", max_bytes=100) for _ in range(2)]
+
+        def worker(cache: SQLiteCache, n: int) -> None:
+            for i in range(50):
+                cache.put(f"{n}-{i}", "x" * 30)
+
+        threads = [
+            threading.Thread(target=worker, args=(cache, n))
+            for n, cache in enumerate(caches)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            (total,) = (
+                caches[0]
+                ._connection()
+                .execute("SELECT COALESCE(SUM(size), 0) FROM cache")
+                .fetchone()
+            )
+            assert total == caches[1].stats()["bytes"] == 90
+        finally:
+            for cache in caches:
+                cache.close()
+
+    def test_shared_between_instances(self, tmp_path: Path) -> None:
+        """Test that two caches on one file (as in two processes) share data."""
+        writer = SQLiteCache(tmp_path / "shared.db")
+        reader = SQLiteCache(tmp_path / "shared.db")
+        try:
+            writer.put("key", "shared value", ttl=60)
+            assert reader["key"][1] == "shared value"
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_concurrent_threads(self, sqlite_cache: SQLiteCache) -> None:
+        """Test that several threads can write and read at once."""
+
+        def worker(n: int) -> None:
+            for i in range(20):
+                sqlite_cache.put(f"{n}-{i}", str(i), ttl=60)
+                assert sqlite_cache.get(f"{n}-{i}") is not None
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(sqlite_cache) == 80
+        assert sqlite_cache.stats()["hits"] == 80
+
+    def test_forked_process_reconnects(
+        self, sqlite_cache: SQLiteCache, mocker: MockerFixture
+    ) -> None:
+        """Test that a forked process opens its own connection."""
+        sqlite_cache.put("key", "value", ttl=60)
+        parent = sqlite_cache._connection()
+        mocker.patch("fetch_my_weather.sqlite_cache.os.getpid", return_value=-1)
+
+        child = sqlite_cache._connection()
+
+        assert child is not parent
+        assert sqlite_cache._connection() is child
+        assert sqlite_cache["key"][1] == "value"
+        parent.execute("SELECT 1")  # Left open for the parent
+        parent.close()
+
+
+class TestSQLiteCacheBackend:
+    """Tests for using SQLiteCache as the core cache backend."""
+
+    def test_get_weather_uses_backend(
+        self, sqlite_cache: SQLiteCache, mocker: MockerFixture
+    ) -> None:
+        """Test that get_weather reads and writes through the SQLite backend."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"current_condition": [{"temp_C": "12"}]})
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        previous = set_cache_backend(sqlite_cache)
+        try:
+            get_weather(location="Disk")
+            result = get_weather(location="Disk", with_metadata=True)
+        finally:
+            set_cache_backend(previous)
+
+        assert mock_get.call_count == 1
+        assert isinstance(result, ResponseWrapper)
+        assert result.metadata.is_cached
+        assert isinstance(result.data, WeatherResponse)
+        assert result.data.current_condition[0].temp_C == "12"
+
+    def test_unreadable_database(
+        self, sqlite_cache: SQLiteCache, mocker: MockerFixture
+    ) -> None:
+        """Test that a corrupt database is skipped instead of failing requests."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"current_condition": [{"temp_C": "12"}]})
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+        sqlite_cache.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(sqlite_cache.path + suffix).unlink(missing_ok=True)
+        Path(sqlite_cache.path).write_bytes(b"not a database" * 100)
+
+        previous = set_cache_backend(sqlite_cache)
+        try:
+            first = get_weather(location="Corrupt", format="json")
+            second = get_weather(location="Corrupt", with_metadata=True)
+        finally:
+            set_cache_backend(previous)
+
+        assert mock_get.call_count == 2
+        assert isinstance(first, WeatherResponse)
+        assert first.current_condition[0].temp_C == "12"
+        assert isinstance(second, ResponseWrapper)
+        assert not second.metadata.is_cached
+        stats = sqlite_cache.stats()
+        assert stats["entries"] is None
+        assert stats["misses"] == 2
+        assert stats["errors"] >= 4
@@ -0,0 +1,114 @@
+"""
+Tests for the per-phase timings in ResponseMetadata.
+"""
+
+import asyncio
+import json
+
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import timings
+from fetch_my_weather.async_client import AsyncWeatherClient
+from fetch_my_weather.core import _MOCK_DATA, WeatherClient
+from fetch_my_weather.fake_server import FakeWttrServer
+from fetch_my_weather.models import ResponseWrapper
+
+
+class TestPhaseTimer:
+    """Tests for recording phases."""
+
+    def test_phases_accumulate(self) -> None:
+        """Test that repeated phases add up and missing ones are None."""
+        with timings.recording() as timer:
+            timer.add("decode", 0.001)
+            timer.add("decode", 0.002)
+            with timings.phase("validate"):
+                pass
+
+        report = timer.as_dict()
+        assert abs(report["decode_ms"] - 3.0) < 1e-9  # type: ignore[operator]
+        assert report["validate_ms"] is not None
+        assert report["connect_ms"] is None
+        assert report["total_ms"] is not None
+
+    def test_no_recording(self) -> None:
+        """Test that phases outside a recording go nowhere."""
+        assert timings.current() is None
+        with timings.phase("decode"):
+            pass
+        assert timings.current() is None
+
+
+class TestResponseTimings:
+    """Tests for the timings get_weather reports."""
+
+    def test_cache_miss_and_hit(self, mocker: MockerFixture) -> None:
+        """Test that a miss reports decoding and validation, and a hit doesn't."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps(_MOCK_DATA["json"])
+        mocker.patch("requests.Session.get", return_value=mock_response)
+        client = WeatherClient()
+
+        miss = client.get_weather("London", with_metadata=True)
+        hit = client.get_weather("London", with_metadata=True)
+
+        assert isinstance(miss, ResponseWrapper) and isinstance(hit, ResponseWrapper)
+        assert miss.metadata.timings is not None
+        assert miss.metadata.timings.url_build_ms is not None
+        assert miss.metadata.timings.cache_lookup_ms is not None
+        assert miss.metadata.timings.ttfb_ms is not None
+        assert miss.metadata.timings.decode_ms is not None
+        assert miss.metadata.timings.validate_ms is not None
+        assert hit.metadata.timings is not None
+        assert hit.metadata.timings.cache_lookup_ms is not None
+        assert hit.metadata.timings.ttfb_ms is None
+        assert hit.metadata.timings.decode_ms is None
+
+    def test_without_metadata(self, mocker: MockerFixture) -> None:
+        """Test that nothing is recorded or streamed without metadata."""
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "Sunny"
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        WeatherClient().get_weather("London", format="text")
+
+        assert "stream" not in mock_get.call_args.kwargs
+
+    def test_network_phases(self) -> None:
+        """Test connect, time to first byte, download and size over real HTTP."""
+        with FakeWttrServer(latency=0.02) as server:
+            client = WeatherClient(base_url=server.base_url)
+            first = client.get_weather("London", with_metadata=True)
+            second = client.get_weather("Paris", format="text", with_metadata=True)
+
+        assert isinstance(first, ResponseWrapper)
+        assert isinstance(second, ResponseWrapper)
+        assert first.metadata.timings is not None
+        assert first.metadata.timings.connect_ms is not None
+        assert first.metadata.timings.ttfb_ms is not None
+        assert first.metadata.timings.ttfb_ms >= 20
+        assert first.metadata.timings.download_ms is not None
+        assert first.metadata.timings.size_bytes == len(server._j1)
+        # The second request reuses the pooled connection
+        assert second.metadata.timings is not None
+        assert second.metadata.timings.connect_ms is None
+        assert second.metadata.timings.size_bytes == len(server._text)
+
+    def test_async(self) -> None:
+        """Test that async requests record phases run on worker threads."""
+
+        async def fetch(base_url: str) -> ResponseWrapper:
+            client = WeatherClient(base_url=base_url)
+            async with AsyncWeatherClient(client=client) as async_client:
+                result = await async_client.get_weather("London", with_metadata=True)
+            assert isinstance(result, ResponseWrapper)
+            return result
+
+        with FakeWttrServer() as server:
+            result = asyncio.run(fetch(server.base_url))
+
+        assert result.metadata.timings is not None
+        assert result.metadata.timings.ttfb_ms is not None
+        assert result.metadata.timings.validate_ms is not None
@@ -0,0 +1,89 @@
+"""
+Tests for the pooled HTTP transport of the fetch-my-weather package.
+"""
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from fetch_my_weather import core, timings
+from fetch_my_weather.core import (
+    close_transport,
+    get_weather,
+    set_pool_size,
+    set_transport,
+)
+from fetch_my_weather.transport import WeatherTransport
+
+
+class TestWeatherTransport:
+    """Tests for the WeatherTransport class."""
+
+    def test_pool_configuration(self) -> None:
+        """Test that the adapter is mounted with the requested pool size."""
+        with WeatherTransport(pool_size=7) as transport:
+            adapter = transport._session.get_adapter("http://wttr.in/")
+            assert adapter._pool_maxsize == 7  # type: ignore[attr-defined]
+            assert transport.pool_size == 7
+
+    def test_context_manager_closes(self) -> None:
+        """Test that leaving the context manager closes the transport."""
+        with WeatherTransport() as transport:
+            assert not transport.closed
+        assert transport.closed
+
+    def test_get_after_close_raises(self) -> None:
+        """Test that a closed transport refuses new requests."""
+        transport = WeatherTransport()
+        transport.close()
+        with pytest.raises(RuntimeError):
+            transport.get("http://wttr.in/")
+
+    def test_failed_read_closes_response(self, mocker: MockerFixture) -> None:
+        """Test that a timed response is closed if reading its body fails."""
+        response = mocker.Mock()
+        type(response).content = mocker.PropertyMock(
+            side_effect=requests.exceptions.ChunkedEncodingError("connection reset")
+        )
+        mocker.patch("requests.Session.get", return_value=response)
+
+        with WeatherTransport() as transport, timings.recording():
+            with pytest.raises(requests.exceptions.ChunkedEncodingError):
+                transport.get("http://wttr.in/")
+
+        response.close.assert_called_once()
+
+
+class TestSharedTransport:
+    """Tests for the module-level transport management in core."""
+
+    def test_transport_is_reused(self, mocker: MockerFixture) -> None:
+        """Test that consecutive requests share one transport."""
+        close_transport()
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.text = "Weather"
+        mocker.patch("requests.Session.get", return_value=mock_response)
+
+        get_weather(location="A", format="text")
+        first = core._transport
+        get_weather(location="B", format="text")
+        assert core._transport is first
+        close_transport()
+        assert core._transport is None
+
+    def test_set_pool_size_recreates_transport(self, mocker: MockerFixture) -> None:
+        """Test that changing the pool size closes the current transport."""
+        transport = core._get_transport()
+        assert set_pool_size(3) == 3
+        assert transport.closed
+        assert core._get_transport().pool_size == 3
+        set_pool_size(core.DEFAULT_POOL_SIZE)
+
+    def test_set_transport(self) -> None:
+        """Test that a caller-owned transport is used and not closed."""
+        with WeatherTransport(pool_size=2) as transport:
+            set_transport(transport)
+            assert core._get_transport() is transport
+            assert set_transport(None) is transport
+            assert not transport.closed